@@ -15,20 +15,23 @@ from starlette.templating import _TemplateResponse
 from starlette.templating import _TemplateResponse
 
 from auth.database import get_db
+from config.settings import settings
 
 from controllers.chat_controller import chat_router
 from controllers.alerts_controller import alerts_router
 from controllers.confidence_controller import confidence_router
 from controllers.dashboard_controller import dashboard_router
+from controllers.debug_controller import debug_router
 from controllers.rca_controller import rca_router
 
 from data_engine.data_fetcher import DataFetcher
-from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, INIT_STATUS, set_system_ready
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, INIT_STATUS, set_system_ready, publish_snapshot, get_data_generation
 
 from incident_engine.risk_trend_analyzer import RiskTrendAnalyzer
-from learning.pattern_engine import PatternEngine
-from data_engine.target_normalizer import TargetNormalizer
-from storage.database import Database
+from services.chat_process_pool import CHAT_PROCESS_POOL
+from services.lazy_registry import ENGINE_REGISTRY
+from services.shared_session_store import SHARED_SESSION_STORE
+from services.warmup_scheduler import WARMUP_SCHEDULER
 
 
 # =====================================================
@@ -65,6 +68,10 @@ def load_oem_data() -> None:
     Load all OEM data synchronously on startup.
     CRITICAL: This ensures GLOBAL_DATA is fully populated 
     before any API requests are served.
+
+    Predictions, RCA summaries, validations and patterns are not
+    computed here; WARMUP_SCHEDULER computes them in the background
+    and publishes each one into the snapshot as it completes.
     """
     
     print("=" * 60)
@@ -116,11 +123,8 @@ def load_oem_data() -> None:
         #     print("[!] Warning: Incident persistence failed: {0}".format(str(e)))
         print("[OK] Database persistence skipped")
 
-        # Stage 2: Validation is now LAZY (computed on-demand)
-        print("[*] Stage 2: Validation configured for on-demand computation")
-        print("[OK] Validations will be computed when requested")
-        INIT_STATUS["validations_computed"] = True
-        validated_alerts = []  # Empty initially, computed on demand
+        # Stage 2: Validation runs as a background warm-up job
+        print("[*] Stage 2: Validation scheduled for background computation")
 
         # Stage 3: Build risk trends
         print("[*] Stage 3: Computing risk trends...")
@@ -137,71 +141,21 @@ def load_oem_data() -> None:
             if not INIT_STATUS["error"]:
                 INIT_STATUS["error"] = "Risk trends failed: {0}".format(str(e))
 
-        # Stage 4: Learn patterns from historical data
-        print("[*] Stage 4: Learning patterns from historical data...")
-        patterns = []
-        try:
-            # Initialize database for pattern engine
-            db = Database()
-            
-            # Get unique targets
-            targets = set()
-            for alert in alerts:
-                if alert and alert.get("target"):
-                    normalized = TargetNormalizer.normalize(alert.get("target"))
-                    if normalized:
-                        targets.add(normalized)
-            
-            # Learn patterns for each target
-            pattern_engine = PatternEngine(db, min_confidence=0.60, lookback_days=60)
-            for target in sorted(targets):
-                try:
-                    # Day of week patterns
-                    day_patterns = pattern_engine.detect_day_of_week_patterns(target)
-                    patterns.extend(day_patterns)
-                    
-                    # Hour of day patterns
-                    hour_patterns = pattern_engine.detect_hour_of_day_patterns(target)
-                    patterns.extend(hour_patterns)
-                except Exception:
-                    pass
-            
-            db.close()
-            print("[OK] Patterns learned     : {0}".format(len(patterns)))
-            INIT_STATUS["patterns_computed"] = True
-        except Exception as e:
-            print("[!] Pattern learning failed: {0}".format(str(e)))
-            import traceback
-            traceback.print_exc()
-            if not INIT_STATUS["error"]:
-                INIT_STATUS["error"] = "Pattern learning failed: {0}".format(str(e))
-
-        # Stage 5: Computing failure predictions...
-        print("[*] Stage 5: Computing failure predictions...")
-        print("[*] Skipping prediction computation for quick startup...")
-        predictions = []
-        print("[OK] Predictions skipped for quick startup")
-        INIT_STATUS["predictions_computed"] = True
-
-        # Stage 6: Computing RCA summaries...
-        print("[*] Stage 6: Computing RCA summaries...")
-        print("[*] Skipping RCA computation for quick startup...")
-        rca_summaries = []
-        print("[OK] RCA computation skipped")
-        INIT_STATUS["rca_computed"] = True
+        # Stages 4-6 (patterns, predictions, RCA summaries) run as
+        # prioritized background warm-up jobs once the snapshot is published
+        print("[*] Stages 4-6: Patterns, predictions and RCA scheduled for background warm-up")
 
         # Stage 7: Update global cache (ATOMIC)
         print("[*] Stage 7: Populating GLOBAL_DATA...")
-        GLOBAL_DATA.clear()
-        GLOBAL_DATA.update({
+        generation = publish_snapshot({
             "alerts": alerts,
             "metrics": metrics,
             "incidents": incidents,
-            "validated_alerts": validated_alerts,
+            "validated_alerts": [],
             "risk_trends": risk_trends,
-            "patterns": patterns,
-            "predictions": predictions,
-            "rca_summaries": rca_summaries
+            "patterns": [],
+            "predictions": [],
+            "rca_summaries": []
         })
 
         # Mark system as ready
@@ -212,6 +166,9 @@ def load_oem_data() -> None:
         print("[OK] SYSTEM READY - All components operational")
         print("=" * 60)
 
+        # Start background warm-up (predictions, RCA, validations, patterns)
+        WARMUP_SCHEDULER.schedule_all(generation)
+
     except Exception as e:
         print("=" * 60)
         print("[ERROR] OEM data load FAILED: {0}".format(str(e)))
@@ -222,6 +179,61 @@ def load_oem_data() -> None:
         set_system_ready(False)
 
 
+# =====================================================
+# PRELOAD (GUNICORN MASTER, BEFORE FORK)
+# =====================================================
+_PRELOAD_STATE = {"loaded": False}
+
+
+def preload_for_fork() -> None:
+    """
+    Load data once in the gunicorn master (PRELOAD_DATA=true).
+
+    Called from gunicorn.conf.py before workers are forked:
+    1. Full data load + background warm-up, waited on so the
+       precomputed results are shared too
+    2. PRELOAD_COLUMNAR_ALERTS: alerts swapped for the mmap columnar
+       snapshot. Reading an alert dict bumps its refcount and copies
+       its page into the worker; snapshot reads never write to it
+    3. gc.freeze() moves every object into the permanent generation,
+       so garbage collection in the workers never writes to them
+
+    Workers inherit GLOBAL_DATA copy-on-write and skip load_oem_data
+    (and re-queue the warm-up if it had not finished at fork).
+    """
+    import gc
+    import time
+    from config.settings import settings
+    from data_engine.global_cache import publish_result
+
+    started = time.time()
+    load_oem_data()
+    if not SYSTEM_READY.get("ready", False):
+        print("[!] Preload failed - workers will load data themselves")
+        return
+
+    if not WARMUP_SCHEDULER.wait_idle(timeout=settings.PRELOAD_WARMUP_TIMEOUT):
+        print("[!] Warm-up still running at fork; workers will run it again")
+
+    if settings.PRELOAD_COLUMNAR_ALERTS:
+        from data_engine.alert_snapshot import attach_alert_snapshot
+        # Same file the chat worker processes attach to (one shared copy)
+        path = CHAT_PROCESS_POOL.ensure_snapshot()
+        publish_result("alerts", attach_alert_snapshot(path), get_data_generation())
+
+    # Workers fork with the engines already imported (shared pages)
+    ENGINE_REGISTRY.warm_up()
+
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+    _PRELOAD_STATE["loaded"] = True
+    print("[OK] Preloaded for fork in {0:.1f}s ({1} frozen objects)".format(
+        time.time() - started,
+        gc.get_freeze_count() if hasattr(gc, "get_freeze_count") else "n/a"
+    ))
+
+
 # =====================================================
 # STARTUP (SYNCHRONOUS - NO BACKGROUND THREAD)
 # =====================================================
@@ -233,16 +245,42 @@ def startup_event() -> None:
     This is CRITICAL for production systems.
     """
     print("[*] Server startup initiated")
-    print("[*] Loading OEM data BEFORE accepting requests...")
     
-    # Load data synchronously - this blocks until complete
-    load_oem_data()
+    if _PRELOAD_STATE["loaded"]:
+        # Forked from a preloaded gunicorn master - data is already here
+        print("[OK] Using OEM data preloaded by the master (pid {0})".format(os.getppid()))
+        # Warm-up still queued or running at fork has no thread in this
+        # process (only the forking thread is copied): queue it again
+        if not WARMUP_SCHEDULER.wait_idle(0):
+            WARMUP_SCHEDULER.schedule_all(get_data_generation())
+    else:
+        print("[*] Loading OEM data BEFORE accepting requests...")
+        # Load data synchronously - this blocks until complete
+        load_oem_data()
+    
+    # Process-mode chat: spawn workers (they attach to the alert snapshot)
+    if CHAT_PROCESS_POOL.enabled:
+        CHAT_PROCESS_POOL.start()
+    
+    # Import the reasoning engines in the background, so /health answers
+    # right away and the first question does not pay for the imports
+    if settings.ENGINE_WARMUP:
+        ENGINE_REGISTRY.start_warmup(delay=settings.ENGINE_WARMUP_DELAY)
     
     print("[OK] Startup event completed")
     print("[OK] Server is now accepting requests")
     print("")
 
 
+@app.on_event("shutdown")
+def shutdown_event() -> None:
+    """Stop chat worker processes, remove their snapshot files, write queued sessions."""
+    if CHAT_PROCESS_POOL.enabled:
+        CHAT_PROCESS_POOL.shutdown()
+    if SHARED_SESSION_STORE is not None:
+        SHARED_SESSION_STORE.flush()
+
+
 # =====================================================
 # ROUTERS - ALL UNDER /api PREFIX
 # =====================================================
@@ -251,6 +289,7 @@ app.include_router(chat_router, prefix="/api/chat", tags=["Chat"])
 app.include_router(alerts_router, prefix="/api/alerts", tags=["Alerts"])
 app.include_router(confidence_router, prefix="/api/confidence", tags=["Confidence"])
 app.include_router(rca_router, prefix="/api/rca", tags=["RCA"])
+app.include_router(debug_router, prefix="/api/debug", tags=["Debug"])
 
 
 # =====================================================
@@ -262,7 +301,9 @@ def health_check():
     Health check endpoint for production monitoring.
     Returns system status and data counts.
     """
+    from services.chat_executor import CHAT_EXECUTOR
     is_ready: bool = SYSTEM_READY.get("ready", False)
+    chat_stats = CHAT_EXECUTOR.stats()
     
     return {
         "status": "UP" if is_ready else "INITIALIZING",
@@ -270,7 +311,9 @@ def health_check():
         "alerts": len(GLOBAL_DATA.get("alerts", [])),
         "incidents": len(GLOBAL_DATA.get("incidents", [])),
         "metrics": len(GLOBAL_DATA.get("metrics", [])),
-        "init_status": INIT_STATUS
+        "init_status": INIT_STATUS,
+        "chat_queue_depth": chat_stats["queue_depth"],
+        "chat_in_flight": chat_stats["in_flight"]
     }
 
 
@@ -400,6 +443,8 @@ def logout() -> RedirectResponse:
 # =====================================================
 from pydantic import BaseModel
 from data_engine.target_normalizer import TargetNormalizer
+from data_engine.target_dictionary import TargetDictionary
+from data_engine.time_histograms import TimeHistogramIndex, TimeScheme
 from collections import Counter
 from datetime import datetime
 import re
@@ -410,54 +455,45 @@ class ChatMessage(BaseModel):
 
 def fuzzy_match_database(query: str, alerts: list) -> str:
     """Fuzzy match database name from query against known databases"""
-    # Get all known database names
-    known_dbs = set()
-    for a in alerts:
-        if a and a.get("target"):
-            db = TargetNormalizer.normalize(a.get("target"))
-            if db:
-                known_dbs.add(db)
-    
-    query_upper: str = query.upper()
+    targets = TargetDictionary.for_alerts(alerts)
     
-    # Direct match
-    for db in known_dbs:
-        if db in query_upper:
-            return db
+    # Direct match (whole name, longest wins: MIDEVSTBN is not MIDEVSTB)
+    db = targets.mention(query)
+    if db:
+        return db
     
-    # Partial match (e.g., MIDDEVSTB matches MIDEVSTB or MIDEVSTBN)
-    query_tokens = re.findall(r'[A-Za-z0-9_]{3,}', query_upper)
+    # Typo match (e.g., MIDDEVSTBN -> MIDEVSTBN), only if unambiguous
+    query_tokens = re.findall(r'[A-Za-z0-9_]{3,}', query.upper())
     for token in query_tokens:
-        for db in known_dbs:
-            # Check if token is similar to db name (allowing for typos)
-            if token in db or db in token:
-                return db
-            # Check Levenshtein-like similarity
-            if len(token) >= 4 and len(db) >= 4:
-                common: int = sum(1 for a, b in zip(token, db) if a == b)
-                if common >= min(len(token), len(db)) * 0.6:
-                    return db
+        db = targets.closest(token)
+        if db:
+            return db
     
     return None
 
+def _parse_chat_time(time_str) -> tuple:
+    """(hour, weekday) of a string alert time, None if not a string or unparseable"""
+    if not isinstance(time_str, str):
+        return None
+    for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]:
+        try:
+            dt: datetime = datetime.strptime(time_str[:19], fmt[:19])
+            return dt.hour, dt.weekday()
+        except:
+            pass
+    return None
+
+CHAT_TIME_SCHEME = TimeScheme(
+    "app",
+    target_key=lambda a: (a.get("target") or "").upper(),
+    timestamp=lambda a: a.get("time") or a.get("first_seen"),
+    parse=_parse_chat_time,
+    severity=lambda a: (a.get("severity") or "INFO").upper()
+)
+
 def analyze_time_distribution(alerts: list) -> dict:
-    """Analyze time distribution of alerts"""
-    hour_counts = Counter()
-    for a in alerts:
-        if a:
-            time_str = a.get("time") or a.get("first_seen") or ""
-            if time_str and isinstance(time_str, str):
-                try:
-                    for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]:
-                        try:
-                            dt: datetime = datetime.strptime(time_str[:19], fmt[:19])
-                            hour_counts[dt.hour] += 1
-                            break
-                        except:
-                            pass
-                except:
-                    pass
-    return dict(hour_counts)
+    """Analyze time distribution of alerts (hour -> count, from the shared hour histograms)"""
+    return TimeHistogramIndex.for_alerts(alerts, CHAT_TIME_SCHEME).scope().distribution()
 
 def get_severity_distribution(alerts: list) -> dict:
     """Get severity distribution"""
@@ -546,31 +582,11 @@ async def chat_direct(request: Request, payload: ChatMessage):
     if not SYSTEM_READY.get("ready", False):
         return {"reply": "System is initializing. Please wait..."}
     
-    # =====================================================
-    # CRITICAL FIX: Always reset per-question context
-    # Prevents formatter leakage between questions
-    # =====================================================
-    from services.session_store import SessionStore
-    SessionStore.reset_question_context()
-    
-    # =====================================================
-    # DASHBOARD FIX: Reset session for new conversations
-    # =====================================================
-    if payload.new_conversation:
-        SessionStore.reset()
-        try:
-            from incident_engine.production_intelligence_engine import SessionMemoryEngine
-            SessionMemoryEngine.reset()
-        except ImportError:
-            pass
-    
-    # CRITICAL: Use the IntelligenceService for enhanced analysis
-    # The service internally handles formatter context reset
-    from services.intelligence_service import INTELLIGENCE_SERVICE
-    from nlp_engine.intent_response_router import IntentResponseRouter
+    # CPU-bound analysis runs on the chat executor, not the event loop
+    from services.chat_executor import CHAT_EXECUTOR, ChatQueueFull, ChatTimeout
     
     try:
-        result = INTELLIGENCE_SERVICE.analyze(question)
+        result = await CHAT_EXECUTOR.run(_analyze_direct, question, payload.new_conversation)
         
         # =====================================================
         # API-LEVEL INTENT FILTERING (DASHBOARD FIX)
@@ -605,6 +621,16 @@ async def chat_direct(request: Request, payload: ChatMessage):
         
         return response
         
+    except ChatQueueFull:
+        return JSONResponse({"reply": "Chat is busy. Please retry shortly."}, status_code=503)
+    
+    except ChatTimeout:
+        return {
+            "reply": "This question is taking longer than expected to analyze. Please try a narrower question.",
+            "confidence": 0.0,
+            "confidence_label": "TIMEOUT"
+        }
+    
     except Exception as e:
         # ===========================================================
         # PRODUCTION: Log error but DO NOT return generic summary
@@ -625,6 +651,46 @@ async def chat_direct(request: Request, payload: ChatMessage):
         }
 
 
+def _analyze_direct(question, new_conversation):
+    """
+    Session handling + analysis for /chat (runs on CHAT_EXECUTOR).
+    One request trace and one request scope, like /api/chat/: the
+    anonymous session and question context are not shared with
+    requests running at the same time.
+    """
+    from services.request_context import request_scope
+    from services.request_tracer import REQUEST_TRACER
+    with request_scope(), REQUEST_TRACER.trace("chat", question=question, session_id=None):
+        return _answer_direct(question, new_conversation)
+
+
+def _answer_direct(question, new_conversation):
+    """Session reset and analysis of one /chat request (see _analyze_direct)."""
+    # =====================================================
+    # CRITICAL FIX: Always reset per-question context
+    # Prevents formatter leakage between questions
+    # =====================================================
+    from services.session_store import SessionStore
+    SessionStore.reset_question_context()
+    
+    # =====================================================
+    # DASHBOARD FIX: Reset session for new conversations
+    # =====================================================
+    if new_conversation:
+        SessionStore.reset()
+        try:
+            from incident_engine.production_intelligence_engine import SessionMemoryEngine
+            SessionMemoryEngine.reset()
+        except ImportError:
+            pass
+    
+    # CRITICAL: Use the IntelligenceService for enhanced analysis
+    # The service internally handles formatter context reset
+    # (in a chat worker process when CHAT_EXECUTION_MODE=process)
+    from services.chat_process_pool import analyze_question
+    return analyze_question(question, reset_memory=new_conversation)
+
+
 # =====================================================
 # SESSION RESET ENDPOINT (DASHBOARD FIX)
 # =====================================================
@@ -637,6 +703,15 @@ async def chat_reset():
     Prevents root cause, actions, and locked values from
     bleeding into unrelated conversations.
     """
+    from services.chat_executor import CHAT_EXECUTOR
+    
+    # Session state is shared with in-flight analysis - mutate it on the executor
+    await CHAT_EXECUTOR.run(_reset_session_memory)
+    
+    return {"status": "success", "message": "Session memory cleared"}
+
+
+def _reset_session_memory():
     from services.session_store import SessionStore
     SessionStore.reset()
     
@@ -645,8 +720,6 @@ async def chat_reset():
         SessionMemoryEngine.reset()
     except ImportError:
         pass
-    
-    return {"status": "success", "message": "Session memory cleared"}
 
 
 # =====================================================
@@ -52,6 +52,115 @@ class Settings(object):
     # Rolling window for anomaly detection (minutes)
     ANOMALY_ROLLING_WINDOW_MINUTES = int(os.getenv('ANOMALY_ROLLING_WINDOW_MINUTES', '30'))
     
+    # =====================================================
+    # CHAT EXECUTION
+    # =====================================================
+    
+    # Worker threads running chat analysis off the event loop
+    CHAT_EXECUTOR_WORKERS = int(os.getenv('CHAT_EXECUTOR_WORKERS', '1'))
+    
+    # Requests allowed to wait for a worker before new ones are rejected
+    CHAT_EXECUTOR_MAX_QUEUE = int(os.getenv('CHAT_EXECUTOR_MAX_QUEUE', '32'))
+    
+    # Per-request analysis timeout (seconds)
+    CHAT_TIMEOUT_SECONDS = float(os.getenv('CHAT_TIMEOUT_SECONDS', '30'))
+    
+    # "thread" (analysis in this process) or "process" (worker processes
+    # attached to a shared mmap alert snapshot)
+    CHAT_EXECUTION_MODE = os.getenv('CHAT_EXECUTION_MODE', 'thread').lower()
+    
+    # Worker processes for CHAT_EXECUTION_MODE=process
+    CHAT_PROCESS_WORKERS = int(os.getenv('CHAT_PROCESS_WORKERS', str(min(4, os.cpu_count() or 1))))
+    
+    # Directory for shared alert snapshot files (default: system temp dir)
+    CHAT_SNAPSHOT_DIR = os.getenv('CHAT_SNAPSHOT_DIR', '')
+    
+    # Cached answers for repeated questions (0 entries disables the cache)
+    ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '512'))
+    
+    # Approximate memory limit of all cached answers (MB)
+    ANSWER_CACHE_MAX_MB = float(os.getenv('ANSWER_CACHE_MAX_MB', '32'))
+    
+    # Lifetime of a cached answer (seconds); reloads invalidate earlier
+    ANSWER_CACHE_TTL_SECONDS = float(os.getenv('ANSWER_CACHE_TTL_SECONDS', '300'))
+    
+    # Conversations kept in memory (least recently used beyond it are
+    # dropped; applies to each session store)
+    SESSION_MAX_ENTRIES = int(os.getenv('SESSION_MAX_ENTRIES', '1000'))
+    
+    # Approximate memory limit of each session store (MB)
+    SESSION_MAX_MB = float(os.getenv('SESSION_MAX_MB', '64'))
+    
+    # Sessions idle longer than this are dropped (seconds; 0 = never)
+    SESSION_IDLE_TTL_SECONDS = float(os.getenv('SESSION_IDLE_TTL_SECONDS', '7200'))
+    
+    # Analyses remembered per session
+    SESSION_HISTORY_SIZE = int(os.getenv('SESSION_HISTORY_SIZE', '20'))
+    
+    # Where conversation state lives: 'sqlite' (one file shared by all
+    # server workers, with an in-process cache) or 'memory' (per process)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')
+    
+    # SQLite file of the shared session store (WAL mode)
+    SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', 'oem_sessions.db')
+    
+    # Write-behind batching window of the shared session store (ms)
+    SESSION_WRITE_DELAY_MS = float(os.getenv('SESSION_WRITE_DELAY_MS', '20'))
+    
+    # Workers with the same generation share sessions (set by the
+    # gunicorn master; empty = this process only)
+    SESSION_GENERATION = os.getenv('SESSION_GENERATION', '')
+    
+    # Paging result sets (row ids of a filter) kept per session for
+    # follow-ups like "show me 20" / "next" (0 = re-filter every page)
+    RESULT_HANDLES_PER_SESSION = int(os.getenv('RESULT_HANDLES_PER_SESSION', '4'))
+    
+    # Most questions accepted by one /api/chat/batch request
+    CHAT_BATCH_MAX_QUESTIONS = int(os.getenv('CHAT_BATCH_MAX_QUESTIONS', '100'))
+    
+    # Conversations of a parallel batch answered at the same time
+    CHAT_BATCH_PARALLEL = int(os.getenv('CHAT_BATCH_PARALLEL', '4'))
+    
+    # Per-stage latency spans of chat requests (/api/debug/traces)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'true').lower() == 'true'
+    
+    # Finished request traces kept for inspection (ring buffer)
+    TRACE_BUFFER_SIZE = int(os.getenv('TRACE_BUFFER_SIZE', '200'))
+    
+    # Latest durations per stage used for the percentiles
+    TRACE_SAMPLES = int(os.getenv('TRACE_SAMPLES', '1000'))
+    
+    # =====================================================
+    # SERVER PROCESS MODEL
+    # =====================================================
+    
+    # Concurrent identical dashboard / RCA requests (same route,
+    # parameters and data generation) share one computation
+    REQUEST_COALESCING = os.getenv('REQUEST_COALESCING', 'true').lower() == 'true'
+    
+    # Load data once in the gunicorn master and fork workers from it
+    # (copy-on-write sharing; see gunicorn.conf.py)
+    PRELOAD_DATA = os.getenv('PRELOAD_DATA', 'false').lower() == 'true'
+    
+    # Seconds the master waits for background warm-up before forking
+    # (workers forked before it finished run the warm-up again)
+    PRELOAD_WARMUP_TIMEOUT = float(os.getenv('PRELOAD_WARMUP_TIMEOUT', '600'))
+    
+    # Preload: hand workers the alerts as the read-only mmap columnar
+    # snapshot instead of dicts (reads never dirty shared pages)
+    PRELOAD_COLUMNAR_ALERTS = os.getenv('PRELOAD_COLUMNAR_ALERTS', 'false').lower() == 'true'
+    
+    # Import heavy engines (intelligence service, reasoning guardrails)
+    # on first use instead of at app import (false: import up front)
+    LAZY_ENGINES = os.getenv('LAZY_ENGINES', 'true').lower() == 'true'
+    
+    # Load the lazy engines in a background thread once the server is up
+    ENGINE_WARMUP = os.getenv('ENGINE_WARMUP', 'true').lower() == 'true'
+    
+    # Seconds after startup before the warm-up begins (keeps the first
+    # requests from competing with the imports)
+    ENGINE_WARMUP_DELAY = float(os.getenv('ENGINE_WARMUP_DELAY', '1.0'))
+    
     # =====================================================
     # LOGGING
     # =====================================================
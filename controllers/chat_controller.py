@@ -1,15 +1,31 @@
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List
+import asyncio
+import json
 import re
+import time
 
-from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY
+from config.settings import settings
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, pin_generation, unpin_generation
 from data_engine.target_normalizer import TargetNormalizer
+from data_engine.target_dictionary import TargetDictionary
 from incident_engine.correlation_engine import CorrelationEngine
 from incident_engine.recommendation_engine import RecommendationEngine
 from nlp_engine.nlp_reasoner import NLPReasoner
-from services.intelligence_service import INTELLIGENCE_SERVICE
+from services.chat_executor import CHAT_EXECUTOR, ChatQueueFull, ChatTimeout
+from services.chat_process_pool import CHAT_PROCESS_POOL, analyze_question
+from services.lazy_registry import ENGINE_REGISTRY
+from services.request_context import request_scope
+from services.request_tracer import REQUEST_TRACER
 from services.session_store import SessionStore
 
+# Imported on first use (or by the background engine warm-up)
+INTELLIGENCE_SERVICE = ENGINE_REGISTRY.proxy("intelligence_service")
+
 # PHASE-12.1: Import scope reset
 try:
     from reasoning.phase12_guardrails import Phase12Guardrails
@@ -56,6 +72,9 @@ _reasoner = None
 _recommendation_engine = None
 _last_target = None
 
+# Stream / batch tasks outlive their endpoint call: keep them referenced
+_BACKGROUND_TASKS = set()
+
 
 def get_reasoner() -> NLPReasoner:
     """
@@ -99,13 +118,7 @@ def extract_target_from_question(question):
     if not alerts:
         return None
 
-    known_targets = set()
-    for a in alerts:
-        if not a:
-            continue
-        t = normalize_target(a.get("target"))
-        if t:
-            known_targets.add(t)
+    known_targets = TargetDictionary.current()
 
     tokens = re.findall(r"[A-Za-z0-9_.-]{3,}", question.upper())
     for t in tokens:
@@ -288,20 +301,63 @@ async def chat(request: Request, payload: ChatRequest) :
         "session_context": dict   # Memory summary
     }
     """
-    global _last_target
     require_login(request)
 
     question = payload.message.strip()
     if not question:
         raise HTTPException(status_code=400, detail="Message is required")
 
+    # =====================================================
+    # Run session handling + analysis on the chat executor
+    # (CPU-bound - must not block the event loop)
+    # =====================================================
+    try:
+        return await CHAT_EXECUTOR.run(_process_chat, payload, question)
+    except ChatQueueFull:
+        raise HTTPException(status_code=503, detail="Chat is busy. Please retry shortly.")
+    except ChatTimeout:
+        return _timeout_response(question)
+
+
+def _timeout_response(question):
+    """Response for a question that exceeded the per-request timeout."""
+    return {
+        "question": question,
+        "answer": "This question is taking longer than expected to analyze. Please try a narrower question (for example, a single database).",
+        "confidence": 0.0,
+        "confidence_label": "TIMEOUT",
+        "actions": [],
+        "root_cause": None,
+        "question_type": "FACT"
+    }
+
+
+def _process_chat(payload, question, on_stage=None):
+    """
+    Synchronous body of the chat endpoint.
+    Runs on CHAT_EXECUTOR - session switching and analysis
+    execute together as one unit of work. on_stage receives the
+    reasoning pipeline stage events (streaming endpoint).
+    Each call is one request trace (see /api/debug/traces) and one
+    request scope: its session, scope and formatter context are not
+    shared with requests running at the same time.
+    """
+    with request_scope(), REQUEST_TRACER.trace("chat", question=question, session_id=payload.session_id or None):
+        return _answer_chat(payload, question, on_stage)
+
+
+def _answer_chat(payload, question, on_stage=None):
+    """Session handling and analysis of one chat request (see _process_chat)."""
+    global _last_target
+
     # =====================================================
     # SESSION ID MANAGEMENT (v3.0 - DASHBOARD FIX)
     # =====================================================
     # Use session_id from payload to isolate conversations
     session_id = payload.session_id
     if session_id:
-        SessionStore.set_session_id(session_id)
+        with REQUEST_TRACER.span("session.activate"):
+            SessionStore.set_session_id(session_id)
         print("[DEBUG] Using session_id:", session_id)
     
     # =====================================================
@@ -330,10 +386,11 @@ async def chat(request: Request, payload: ChatRequest) :
     if payload.new_conversation and not is_followup_question:
         print("[DEBUG] new_conversation=True, resetting session for:", session_id)
         # If we have a session_id, reset that specific session
-        if session_id:
-            SessionStore.reset_session(session_id)
-        else:
-            SessionStore.reset()
+        with REQUEST_TRACER.span("session.reset"):
+            if session_id:
+                SessionStore.reset_session(session_id)
+            else:
+                SessionStore.reset()
         _last_target = None
         if PRODUCTION_ENGINE_AVAILABLE:
             SessionMemoryEngine.reset()
@@ -367,7 +424,13 @@ async def chat(request: Request, payload: ChatRequest) :
     # No trend appending, no extra detection, no reformatting.
     # Dashboard must behave EXACTLY like terminal tests.
     # =====================================================
-    result = INTELLIGENCE_SERVICE.analyze(question)
+    # (runs in a chat worker process when CHAT_EXECUTION_MODE=process)
+    result = analyze_question(
+        question,
+        session_id=session_id or None,
+        reset_memory=payload.new_conversation and not is_followup_question,
+        on_stage=on_stage
+    )
     
     # Extract the answer - this is the ONLY response
     answer = result.get("answer", "Unable to process question.")
@@ -398,6 +461,208 @@ async def chat(request: Request, payload: ChatRequest) :
     return response
 
 
+# =====================================================
+# STREAMING ENDPOINT (SERVER-SENT EVENTS)
+# =====================================================
+@chat_router.post("/stream")
+async def chat_stream(request: Request, payload: ChatRequest):
+    """
+    Same question and answer as /api/chat/, streamed as Server-Sent Events
+    while the reasoning pipeline runs:
+
+        event: accepted       {"question": str} - sent at once
+        event: intent         intent, target
+        event: counts         alert / critical counts and a count sentence
+        event: evidence       peak hour, widening
+        event: root_cause     top scored causes, inferred cause, risk level
+        event: decision       conclusion
+        event: actions        mapped actions
+        event: short_answer   short answer of the formatted response
+        event: answer         final answer, after every guardrail - the
+                              same body /api/chat/ returns
+        event: done           {}
+
+    Partial events are provisional; only "answer" is authoritative.
+    Cached answers and direct routes (counts, inventory, follow-ups)
+    skip straight to "answer". With CHAT_EXECUTION_MODE=process the
+    events are relayed from the chat worker.
+    """
+    require_login(request)
+
+    question = payload.message.strip()
+    if not question:
+        raise HTTPException(status_code=400, detail="Message is required")
+
+    loop = asyncio.get_event_loop()
+    events = asyncio.Queue()
+
+    def on_stage(stage, data):
+        # Called on the chat executor thread
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, (stage, data))
+        except RuntimeError:
+            pass  # event loop closed (server shutting down)
+
+    events.put_nowait(("accepted", {"question": question}))
+    _spawn(_run_stream(payload, question, on_stage, events))
+    return StreamingResponse(
+        _stream_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _spawn(coro):
+    """Run coro in the background until it finishes, even if no one awaits it."""
+    task = asyncio.ensure_future(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_background_done)
+    return task
+
+
+def _background_done(task):
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print("[CHAT API] background task failed:", repr(task.exception()))
+
+
+async def _run_stream(payload, question, on_stage, events):
+    try:
+        answer = await CHAT_EXECUTOR.run(_process_chat, payload, question, on_stage=on_stage)
+    except ChatQueueFull:
+        answer = {"question": question, "error": "Chat is busy. Please retry shortly."}
+    except ChatTimeout:
+        answer = _timeout_response(question)
+    except Exception as e:
+        answer = {"question": question, "error": str(e)}
+    # Executor-thread events were scheduled before the result was set,
+    # so they are already queued ahead of these
+    await events.put(("answer", answer))
+    await events.put(("done", {}))
+
+
+async def _stream_events(events):
+    while True:
+        stage, data = await events.get()
+        yield "event: {0}\ndata: {1}\n\n".format(stage, json.dumps(data, default=str))
+        if stage == "done":
+            break
+
+
+# =====================================================
+# BATCH ENDPOINT (RUNBOOKS / SCHEDULED CHECKS)
+# =====================================================
+class ChatBatchRequest(BaseModel):
+    questions: List[ChatRequest] = []
+    session_id: str = ""    # Default session for questions without one
+    parallel: bool = False  # Answer different sessions concurrently
+
+
+@chat_router.post("/batch")
+async def chat_batch(request: Request, payload: ChatBatchRequest):
+    """
+    Answer an ordered list of questions against one pinned data generation.
+
+    Questions of the same session_id run in order, as if sent one by one
+    to /api/chat/. With parallel=true, different sessions run concurrently
+    (up to CHAT_BATCH_PARALLEL); otherwise the whole list runs in order.
+    A reload waits until the batch is answered, so every question sees the
+    same data and the per-generation analyses (target scans, root cause and
+    time indexes, cached answers) are shared across the batch.
+
+    Streams one JSON line per answer as it completes:
+        {"index": int, "session_id": str, ...same fields as /api/chat/...}
+    followed by {"done": true, "generation": int, "count": int, "elapsed_ms": float}.
+    """
+    require_login(request)
+
+    items = []
+    for item in payload.questions:
+        question = item.message.strip()
+        if not question:
+            raise HTTPException(status_code=400, detail="Every question needs a message")
+        if not item.session_id:
+            item.session_id = payload.session_id
+        items.append((question, item))
+    if not items:
+        raise HTTPException(status_code=400, detail="At least one question is required")
+    if len(items) > settings.CHAT_BATCH_MAX_QUESTIONS:
+        raise HTTPException(status_code=413, detail="A batch accepts at most {0} questions".format(
+            settings.CHAT_BATCH_MAX_QUESTIONS))
+
+    # Answers are computed independently of how fast the client reads them,
+    # so the generation pin is held only for the analysis itself
+    lines = asyncio.Queue()
+    _spawn(_run_batch(items, payload.parallel, lines))
+    return StreamingResponse(_stream_batch(lines), media_type="application/x-ndjson")
+
+
+async def _run_batch(items, parallel, lines):
+    started = time.time()
+    loop = asyncio.get_event_loop()
+    generation = await loop.run_in_executor(None, pin_generation)
+    try:
+        if parallel:
+            sessions = OrderedDict()
+            for index, (question, item) in enumerate(items):
+                sessions.setdefault(item.session_id, []).append((index, question, item))
+            slots = asyncio.Semaphore(max(1, settings.CHAT_BATCH_PARALLEL))
+            await asyncio.gather(*[
+                _run_batch_session(entries, lines, slots) for entries in sessions.values()
+            ])
+        else:
+            await _run_batch_session(
+                [(index, question, item) for index, (question, item) in enumerate(items)], lines)
+    finally:
+        unpin_generation()
+        await lines.put({
+            "done": True,
+            "generation": generation,
+            "count": len(items),
+            "elapsed_ms": round((time.time() - started) * 1000.0, 1)
+        })
+
+
+async def _run_batch_session(entries, lines, slots=None):
+    """Answer one session's questions in order, queueing each answer line."""
+    if slots is not None:
+        await slots.acquire()
+    try:
+        running = None
+        for index, question, item in entries:
+            if running is not None:
+                # A timed-out answer is still running on its thread; the
+                # session's next question must not overlap it
+                await asyncio.wait([asyncio.wrap_future(running)])
+            line = {"index": index, "session_id": item.session_id}
+            answer, running = await _answer_batch_question(question, item)
+            line.update(answer)
+            await lines.put(line)
+    finally:
+        if slots is not None:
+            slots.release()
+
+
+async def _answer_batch_question(question, item):
+    """Returns (answer, the executor job still running after a timeout or None)."""
+    try:
+        return await CHAT_EXECUTOR.run(_process_chat, item, question), None
+    except ChatQueueFull:
+        return {"question": question, "error": "Chat is busy. Please retry shortly."}, None
+    except ChatTimeout as e:
+        return _timeout_response(question), e.future
+    except Exception as e:
+        return {"question": question, "error": str(e)}, None
+
+
+async def _stream_batch(lines):
+    while True:
+        line = await lines.get()
+        yield json.dumps(line, default=str) + "\n"
+        if line.get("done"):
+            break
+
+
 # =====================================================
 # SESSION RESET (DASHBOARD FIX)
 # =====================================================
@@ -410,14 +675,10 @@ async def reset_session(request: Request):
     to prevent root cause, actions, and locked values from
     bleeding into unrelated conversations.
     """
-    global _last_target
     require_login(request)
     
-    SessionStore.reset()
-    _last_target = None
-    
-    if PRODUCTION_ENGINE_AVAILABLE:
-        SessionMemoryEngine.reset()
+    # Session state is shared with in-flight analysis - mutate it on the executor
+    await CHAT_EXECUTOR.run(_reset_all_sessions)
     
     return {
         "status": "success",
@@ -425,17 +686,22 @@ async def reset_session(request: Request):
     }
 
 
+def _reset_all_sessions():
+    global _last_target
+    SessionStore.reset()
+    _last_target = None
+    
+    if PRODUCTION_ENGINE_AVAILABLE:
+        SessionMemoryEngine.reset()
+
+
 # =====================================================
 # DEBUG ENDPOINT (NO AUTH - FOR TESTING)
 # =====================================================
 @chat_router.get("/debug/context")
 async def debug_context(session_id: str = None):
     """Debug endpoint to check session context (no auth required)."""
-    # If session_id provided, switch to that session first
-    if session_id:
-        SessionStore.set_session_id(session_id)
-    
-    context = SessionStore.get_conversation_context()
+    context = await CHAT_EXECUTOR.run(_read_session_context, session_id)
     
     # Also show all sessions in storage
     from services.session_store import _SESSION_STORAGE, _ACTIVE_SESSION_ID
@@ -453,6 +719,24 @@ async def debug_context(session_id: str = None):
     }
 
 
+def _read_session_context(session_id):
+    # If session_id provided, switch to that session first
+    with _viewing_session(session_id):
+        return SessionStore.get_conversation_context()
+
+
+@contextmanager
+def _viewing_session(session_id=None):
+    """
+    Request scope on session_id (default: the most recently active
+    session) for the session read endpoints.
+    """
+    from services import session_store
+    with request_scope():
+        SessionStore.set_session_id(session_id or session_store._ACTIVE_SESSION_ID)
+        yield
+
+
 # =====================================================
 # WARMUP
 # =====================================================
@@ -470,9 +754,10 @@ async def warmup(request: Request) :
 # SESSION STATE (NEW - EXPOSES MEMORY)
 # =====================================================
 @chat_router.get("/session")
-async def get_session(request: Request):
+async def get_session(request: Request, session_id: str = None):
     """
-    Get current session state.
+    Get current session state (of session_id, default: the most
+    recently active session).
     
     Returns the accumulated knowledge from prior questions:
     - Highest risk database (LOCKED once identified)
@@ -488,31 +773,33 @@ async def get_session(request: Request):
     """
     require_login(request)
     
-    state = SessionStore.get_state()
-    
-    return {
-        "status": "success",
-        "session": state,
-        "context_phrase": SessionStore.get_context_phrase(),
-        "summary": SessionStore.get_context_summary(),
-        "unstable_systems": SessionStore.get_unstable_systems(),
-        "down_events": SessionStore.get_recent_down_events(),
-        "critical_but_running": SessionStore.get_critical_but_running(),
-        # PRODUCTION: Expose locked values
-        "locked_values": {
-            "root_cause": state.get("locked_root_cause"),
-            "highest_risk_db": state.get("locked_highest_risk_db"),
-            "peak_hour": state.get("locked_peak_hour"),
-            "root_cause_by_db": state.get("locked_root_cause_db", {})
+    with _viewing_session(session_id):
+        state = SessionStore.get_state()
+        state["analysis_history"] = SessionStore.get_analysis_history()
+        
+        return {
+            "status": "success",
+            "session": state,
+            "context_phrase": SessionStore.get_context_phrase(),
+            "summary": SessionStore.get_context_summary(),
+            "unstable_systems": SessionStore.get_unstable_systems(),
+            "down_events": SessionStore.get_recent_down_events(),
+            "critical_but_running": SessionStore.get_critical_but_running(),
+            # PRODUCTION: Expose locked values
+            "locked_values": {
+                "root_cause": state.get("locked_root_cause"),
+                "highest_risk_db": state.get("locked_highest_risk_db"),
+                "peak_hour": state.get("locked_peak_hour"),
+                "root_cause_by_db": state.get("locked_root_cause_db", {})
+            }
         }
-    }
 
 
 # =====================================================
 # STATS (ENHANCED - INCLUDES SESSION)
 # =====================================================
 @chat_router.get("/stats")
-async def get_stats(request: Request):
+async def get_stats(request: Request, session_id: str = None):
     """
     Get learning statistics and session analytics.
     """
@@ -524,7 +811,9 @@ async def get_stats(request: Request):
     except Exception:
         learning_stats = {}
     
-    session_summary = SessionStore.get_context_summary()
+    with _viewing_session(session_id):
+        session_summary = SessionStore.get_context_summary()
+        unstable_systems = SessionStore.get_unstable_systems()
     
     return {
         "learning_statistics": learning_stats,
@@ -532,10 +821,34 @@ async def get_stats(request: Request):
         "questions_analyzed": session_summary.get("questions_analyzed", 0),
         "highest_risk_database": session_summary.get("highest_risk_database"),
         "dominant_ora_codes": session_summary.get("dominant_ora_codes", []),
-        "unstable_systems": SessionStore.get_unstable_systems()
+        "unstable_systems": unstable_systems
     }
 
 
+# =====================================================
+# CHAT EXECUTOR METRICS
+# =====================================================
+@chat_router.get("/executor")
+async def executor_stats():
+    """Queue depth, in-flight count and latency of the chat executor."""
+    stats = CHAT_EXECUTOR.stats()
+    if CHAT_PROCESS_POOL.enabled:
+        stats["process_pool"] = CHAT_PROCESS_POOL.status()
+    return stats
+
+
+@chat_router.get("/routing")
+async def routing_stats():
+    """Per-rule prefilter/match/handled counters of the intent dispatch tables."""
+    return {"dispatchers": INTELLIGENCE_SERVICE.routing_stats()}
+
+
+@chat_router.get("/cache")
+async def answer_cache_stats():
+    """Hit/miss/eviction counters of the answer cache."""
+    return INTELLIGENCE_SERVICE.answer_cache_stats()
+
+
 # =====================================================
 # FEEDBACK
 # =====================================================
@@ -612,13 +925,14 @@ async def chat_v2(request: Request, payload: ChatRequest):
     # Use session_id from payload or generate default
     session_id = payload.session_id or 'default'
     
-    # Handle new conversation - clear session context
-    if payload.new_conversation:
-        orchestrator = get_orchestrator()
-        orchestrator.clear_session(session_id)
-    
-    # Process query through NLP orchestrator
-    result = process_query(question, session_id)
+    # Handle new conversation + process query through NLP orchestrator
+    # on the chat executor (CPU-bound - must not block the event loop)
+    try:
+        result = await CHAT_EXECUTOR.run(_process_v2, question, session_id, payload.new_conversation)
+    except ChatQueueFull:
+        raise HTTPException(status_code=503, detail="Chat is busy. Please retry shortly.")
+    except ChatTimeout:
+        return _timeout_response(question)
     
     # Build response (compatible with frontend expectations)
     return {
@@ -638,6 +952,18 @@ async def chat_v2(request: Request, payload: ChatRequest):
     }
 
 
+def _process_v2(question, session_id, new_conversation):
+    """
+    Synchronous body of the v2 endpoint (runs on CHAT_EXECUTOR).
+    One request scope: the NLP context is read from and written back
+    to the shared session store like a v1 conversation.
+    """
+    with request_scope():
+        if new_conversation:
+            get_orchestrator().clear_session(session_id)
+        return process_query(question, session_id)
+
+
 def _confidence_to_label(confidence: float) -> str:
     """Convert confidence score to label"""
     if confidence >= 0.8:
@@ -660,7 +986,8 @@ async def get_v2_context(request: Request, session_id: str = "default"):
         raise HTTPException(status_code=503, detail="NLP Orchestrator not available")
     
     orchestrator = get_orchestrator()
-    context = orchestrator.get_session_context(session_id)
+    with request_scope():
+        context = orchestrator.get_session_context(session_id)
     
     return {
         "status": "ok",
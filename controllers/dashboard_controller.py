@@ -2,10 +2,13 @@ from datetime import datetime
 from fastapi import APIRouter
 from collections import Counter
 
-from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, INIT_STATUS
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, INIT_STATUS, get_data_generation, publish_result
 from data_engine.target_normalizer import TargetNormalizer
-from incident_engine.metric_alert_validator import MetricAlertValidator
 from incident_engine.risk_analyzer import RiskAnalyzer
+from services.validation_service import ALERT_VALIDATION_SERVICE
+from services.process_memory import memory_report
+from services.single_flight import coalesced
+from services.warmup_scheduler import WARMUP_SCHEDULER
 
 dashboard_router = APIRouter()
 
@@ -15,11 +18,13 @@ dashboard_router = APIRouter()
 # =====================================================
 @dashboard_router.get("/system-status")
 def system_status():
-    """Check if system is ready to serve data."""
+    """Check if system is ready to serve data (plus background job and memory status)."""
     return {
         "ready": SYSTEM_READY.get("ready", False),
         "status": "READY" if SYSTEM_READY.get("ready", False) else "INITIALIZING",
-        "init_status": INIT_STATUS
+        "init_status": INIT_STATUS,
+        "background_jobs": WARMUP_SCHEDULER.status(),
+        "process_memory": memory_report()
     }
 
 
@@ -45,17 +50,12 @@ def debug_global_data():
 def force_reload():
     from data_engine.data_fetcher import DataFetcher
     from incident_engine.risk_trend_analyzer import RiskTrendAnalyzer
-    from incident_engine.failure_predictor import FailurePredictor
-    from incident_engine.correlation_engine import CorrelationEngine
-    from learning.pattern_engine import PatternEngine
-    from storage.database import Database
-    from data_engine.global_cache import set_system_ready
-    from data_engine.target_normalizer import TargetNormalizer
-    global _validation_cache, _validation_cache_timestamp
+    from data_engine.global_cache import set_system_ready, publish_snapshot
     
     try:
-        # Mark system as not ready during reload
-        set_system_ready(False)
+        # The system stays ready during the reload: requests keep reading
+        # the current snapshot until publish_snapshot() swaps it in one
+        # step (after pinned chat batches have finished their questions)
         INIT_STATUS["alerts_loaded"] = False
         INIT_STATUS["metrics_loaded"] = False
         INIT_STATUS["incidents_built"] = False
@@ -65,9 +65,8 @@ def force_reload():
         INIT_STATUS["predictions_computed"] = False
         INIT_STATUS["rca_computed"] = False
         
-        # Clear validation cache
-        _validation_cache = None
-        _validation_cache_timestamp = None
+        # Stored per-alert validations are kept: only newly
+        # ingested alerts are validated by the warm-up job
         
         fetcher = DataFetcher()
         data = fetcher.fetch({})
@@ -79,135 +78,39 @@ def force_reload():
         INIT_STATUS["alerts_loaded"] = True
         INIT_STATUS["metrics_loaded"] = True
         INIT_STATUS["incidents_built"] = True
-        INIT_STATUS["validations_computed"] = True  # Will compute on-demand
         
         trend_analyzer: RiskTrendAnalyzer = RiskTrendAnalyzer(alerts, incidents)
         risk_trends = trend_analyzer.build_trends()
         INIT_STATUS["risk_trends_computed"] = True
         
-        # Recompute patterns
-        patterns = []
-        try:
-            db = Database()
-            targets = set()
-            for alert in alerts:
-                if alert and alert.get("target"):
-                    normalized = TargetNormalizer.normalize(alert.get("target"))
-                    if normalized:
-                        targets.add(normalized)
-            
-            pattern_engine: PatternEngine = PatternEngine(db, min_confidence=0.60, lookback_days=60)
-            for target in sorted(targets):
-                try:
-                    day_patterns = pattern_engine.detect_day_of_week_patterns(target)
-                    patterns.extend(day_patterns)
-                    hour_patterns = pattern_engine.detect_hour_of_day_patterns(target)
-                    patterns.extend(hour_patterns)
-                except Exception:
-                    pass
-            db.close()
-            INIT_STATUS["patterns_computed"] = True
-        except Exception:
-            pass
-        
-        # Recompute predictions
-        predictions = []
-        try:
-            predictor: FailurePredictor = FailurePredictor(alerts, incidents, risk_trends)
-            targets = set()
-            for alert in alerts:
-                if alert and alert.get("target"):
-                    normalized = TargetNormalizer.normalize(alert.get("target"))
-                    if normalized:
-                        targets.add(normalized)
-            
-            for target in sorted(targets):
-                try:
-                    prediction = predictor.predict(target)
-                    if prediction.get("failure_probability", 0) >= 15:
-                        predictions.append(prediction)
-                except Exception:
-                    pass
-            
-            predictions.sort(key=lambda p: p.get("failure_probability", 0), reverse=True)
-            INIT_STATUS["predictions_computed"] = True
-        except Exception:
-            pass
-        
-        # Recompute RCA summaries
-        rca_summaries = []
-        try:
-            critical_incidents = [
-                i for i in incidents
-                if i and i.get("severity") == "CRITICAL"
-            ]
-            critical_incidents.sort(
-                key=lambda x: x.get("last_seen") or x.get("first_seen"),
-                reverse=True
-            )
-            recent_criticals = critical_incidents[:10]
-            
-            for incident in recent_criticals:
-                try:
-                    target = incident.get("target")
-                    if not target:
-                        continue
-                    
-                    related_alerts = [
-                        a for a in alerts
-                        if a and TargetNormalizer.equals(a.get("target"), target)
-                    ]
-                    
-                    if related_alerts:
-                        latest_alert = sorted(
-                            related_alerts, 
-                            key=lambda x: x.get("time"),
-                            reverse=True
-                        )[0]
-                        
-                        engine: CorrelationEngine = CorrelationEngine(alerts, metrics, incidents)
-                        rca = engine.analyze(latest_alert)
-                        
-                        rca_summaries.append({
-                            "incident": incident,
-                            "rca": rca
-                        })
-                except Exception:
-                    pass
-            
-            INIT_STATUS["rca_computed"] = True
-        except Exception:
-            pass
-        
-        GLOBAL_DATA.clear()
-        GLOBAL_DATA.update({
+        # Patterns, predictions, RCA and validations are recomputed by
+        # the background warm-up scheduler, not inside this request
+        generation = publish_snapshot({
             "alerts": alerts,
             "metrics": metrics,
             "incidents": incidents,
-            "validated_alerts": [],  # Empty, computed on-demand
+            "validated_alerts": [],
             "risk_trends": risk_trends,
-            "patterns": patterns,
-            "predictions": predictions,
-            "rca_summaries": rca_summaries
+            "patterns": [],
+            "predictions": [],
+            "rca_summaries": []
         })
         
-        # Mark system as ready after successful reload
         set_system_ready(True)
+        WARMUP_SCHEDULER.schedule_all(generation)
         
         return {
             "success": True,
             "alerts_count": len(alerts),
             "incidents_count": len(incidents),
             "metrics_count": len(metrics),
-            "validated_count": "computed on-demand",
             "trends_count": len(risk_trends),
-            "patterns_count": len(patterns),
-            "predictions_count": len(predictions),
-            "rca_count": len(rca_summaries)
+            "data_generation": generation,
+            "background_jobs": WARMUP_SCHEDULER.status()["jobs"]
         }
     except Exception as e:
         import traceback
-        set_system_ready(False)
+        # The previous snapshot (if any) is still published and served
         INIT_STATUS["error"] = str(e)
         return {
             "success": False,
@@ -312,6 +215,7 @@ def summary():
 # DATABASE LIST (PRODUCTION WIRING - CHECK SYSTEM READY)
 # =====================================================
 @dashboard_router.get("/databases")
+@coalesced("dashboard.databases")
 def databases():
     # Check if system is initialized
     if not SYSTEM_READY.get("ready", False):
@@ -373,54 +277,55 @@ def incidents():
 
 
 # =====================================================
-# ALERT ↔ METRIC VALIDATION (ON-DEMAND WITH CACHING)
+# ALERT ↔ METRIC VALIDATION (BACKGROUND, INCREMENTAL)
 # =====================================================
-_validation_cache = None
-_validation_cache_timestamp = None
-
 @dashboard_router.get("/alert-validation")
+@coalesced("dashboard.alert_validation")
 def alert_validation():
     """
-    On-demand validation computation with caching.
-    Enterprise approach: Don't block startup, compute when needed.
+    Background validation with per-alert result storage.
+    Enterprise approach: Don't block the request, report progress
+    while the process pool validates target shards.
     """
-    global _validation_cache, _validation_cache_timestamp
-    
     # Check if system is initialized
     if not SYSTEM_READY.get("ready", False):
         return []
-    
-    # Return cached results if available
-    if _validation_cache is not None:
-        return _validation_cache[:100]
-    
-    # Compute validation on first request
-    print("[*] Computing alert validation on-demand...")
-    from incident_engine.metric_alert_validator import MetricAlertValidator
-    from datetime import datetime
-    
+
     alerts = GLOBAL_DATA.get("alerts", [])
     metrics = GLOBAL_DATA.get("metrics", [])
-    
+
     if not alerts or not metrics:
         return []
-    
-    try:
-        validator: MetricAlertValidator = MetricAlertValidator(alerts, metrics)
-        _validation_cache = validator.validate()
-        _validation_cache_timestamp = datetime.now()
-        
-        # Update GLOBAL_DATA for consistency
-        GLOBAL_DATA["validated_alerts"] = _validation_cache
-        
-        print("[OK] Validation computed: {0} alerts validated".format(len(_validation_cache)))
-        return _validation_cache[:100]
-    except Exception as e:
-        print("[ERROR] Validation computation failed: {0}".format(str(e)))
-        import traceback
-        traceback.print_exc()
+
+    generation = get_data_generation()
+    status = ALERT_VALIDATION_SERVICE.ensure_started(
+        alerts, metrics,
+        on_complete=lambda results: publish_result("validated_alerts", results, generation)
+    )
+
+    if status["state"] == ALERT_VALIDATION_SERVICE.STATE_RUNNING:
+        return {
+            "status": "COMPUTING",
+            "message": "Alert validation is running in the background.",
+            "progress": status
+        }
+
+    if status["state"] == ALERT_VALIDATION_SERVICE.STATE_FAILED:
+        print("[ERROR] Validation computation failed: {0}".format(status.get("error")))
         return []
 
+    validated = GLOBAL_DATA.get("validated_alerts") or []
+    if not validated:
+        validated = ALERT_VALIDATION_SERVICE.results_for(alerts)
+        publish_result("validated_alerts", validated, generation)
+    return validated[:100]
+
+
+@dashboard_router.get("/alert-validation/status")
+def alert_validation_status():
+    """Progress of the background alert validation run."""
+    return ALERT_VALIDATION_SERVICE.status()
+
 
 # =====================================================
 # RISK TREND (PRODUCTION WIRING)
@@ -514,6 +419,7 @@ def rca_summary():
 # OEM DASHBOARD SUMMARY (COMPREHENSIVE)
 # =====================================================
 @dashboard_router.get("/oem-summary")
+@coalesced("dashboard.oem_summary")
 def oem_summary():
     """
     Comprehensive OEM dashboard data.
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, HTTPException
+
+from services.lazy_registry import ENGINE_REGISTRY, import_profile
+from services.request_tracer import REQUEST_TRACER
+from services.result_handles import RESULT_HANDLES
+from services.session_backend import session_backend_stats
+from services.shared_session_store import SHARED_SESSION_STORE
+from services.single_flight import SINGLE_FLIGHT
+
+debug_router = APIRouter(tags=["Debug"])
+
+
+# =====================================================
+# REQUEST TRACES (PER-STAGE LATENCY)
+# =====================================================
+@debug_router.get("/traces")
+async def traces(limit: int = 20, min_ms: float = None):
+    """
+    Recent chat request traces and per-stage latency percentiles.
+
+    Query parameters:
+        limit:  most recent traces returned (default 20)
+        min_ms: only traces that took at least this long
+
+    Response:
+    {
+        "stats":  {"request_ms": {p50, p95, p99, max, count},
+                   "stages_ms": {stage: {p50, p95, p99, max, mean, count}}, ...},
+        "traces": [{"id", "question", "duration_ms", "stages": {stage: ms},
+                    "spans": [{"stage", "start_ms", "duration_ms", "depth"}]}]
+    }
+    """
+    return {
+        "stats": REQUEST_TRACER.stats(),
+        "traces": REQUEST_TRACER.recent(limit, min_ms)
+    }
+
+
+@debug_router.delete("/traces")
+async def clear_traces():
+    """Drop buffered traces and latency samples."""
+    REQUEST_TRACER.clear()
+    return {"cleared": True}
+
+
+# =====================================================
+# ENGINE LOADING / IMPORT TIME
+# =====================================================
+@debug_router.get("/engines")
+async def engines():
+    """Lazy engines: loaded or not, load time, modules imported, errors."""
+    return ENGINE_REGISTRY.stats()
+
+
+@debug_router.get("/sessions")
+async def sessions():
+    """
+    Session stores: sessions held, approximate bytes, evictions by
+    cause; "shared_store": reads / batched writes of the SQLite store
+    shared by the workers (null with SESSION_BACKEND=memory);
+    "result_handles": paging result sets reused vs scanned.
+    """
+    stats = session_backend_stats()
+    stats["shared_store"] = SHARED_SESSION_STORE.stats() if SHARED_SESSION_STORE is not None else None
+    stats["result_handles"] = RESULT_HANDLES.stats()
+    return stats
+
+
+# =====================================================
+# REQUEST COALESCING
+# =====================================================
+@debug_router.get("/coalescing")
+async def coalescing():
+    """
+    Single-flight coalescing of dashboard / RCA requests: per route,
+    calls, computations run, calls that shared a running computation,
+    errors and the most callers waiting on one computation.
+    """
+    return SINGLE_FLIGHT.stats()
+
+
+@debug_router.get("/imports")
+def imports(module: str = "app", top: int = 25):
+    """
+    -X importtime profile of importing `module` in a fresh interpreter:
+    {"total_ms", "modules", "slowest": [{module, self_ms, cumulative_ms, depth}],
+     "packages_ms": {package: self ms}}
+    """
+    try:
+        return import_profile(module, top)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,12 +1,14 @@
 from fastapi import APIRouter
 from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY
 from incident_engine.correlation_engine import CorrelationEngine
+from services.single_flight import coalesced
 
 rca_router = APIRouter(
     tags=["RCA"]
 )
 
 @rca_router.get("/latest")
+@coalesced("rca.latest")
 def latest_rca():
     """
     Returns RCA for the latest critical incident.
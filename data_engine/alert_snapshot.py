@@ -0,0 +1,415 @@
+# data_engine/alert_snapshot.py
+"""
+==============================================================
+COLUMNAR ALERT SNAPSHOT (MMAP, READ-ONLY, SHARED)
+==============================================================
+
+Serializes the normalized alert list into one columnar file that
+any number of processes can mmap read-only. The OS page cache holds
+a single copy, so N chat worker processes cost roughly one snapshot
+of memory instead of N copies of GLOBAL_DATA["alerts"].
+
+FILE LAYOUT:
+    MAGIC (8 bytes) | header length (8 bytes, little endian)
+    | JSON header | column buffers (8-byte aligned)
+
+COLUMN KINDS:
+- time:   int64 microseconds since 1970-01-01 (naive datetimes)
+- int:    int64
+- float:  float64
+- dict:   int32 codes into a small value table (target, severity...)
+- text:   int64 start offsets + int32 lengths into a UTF-8 blob
+          (high-cardinality strings such as message)
+- pickle: same as text, pickled values (anything else)
+
+A column whose key is absent from some rows also carries an int8
+"missing" mask, so `a.get(key, default)` and `key in a` behave
+exactly as they did on the original dicts.
+
+AlertSnapshotView exposes the file as a read-only sequence of
+dict-like rows, so existing code (`a.get("target")`, `a["time"]`,
+iteration, slicing, len()) works unchanged on top of it.
+
+Python 3.6.8 compatible.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+
+MAGIC = b"OEMSNAP1"
+_EPOCH = datetime(1970, 1, 1)
+_NULL_INT = -(2 ** 63)
+_MISSING = object()
+
+# Columns with more distinct values than this are stored as text blobs
+DICT_MAX_VALUES = 4096
+
+
+# =====================================================
+# WRITER
+# =====================================================
+def _column_kind(values):
+    """Pick the narrowest column kind that round-trips every value."""
+    present = [v for v in values if v is not None]
+    if not present:
+        return "dict"
+    if all(type(v) is datetime and v.tzinfo is None for v in present):
+        return "time"
+    if all(type(v) is int for v in present):
+        return "int"
+    if all(type(v) is float for v in present):
+        return "float"
+    if all(type(v) in (str, bool) for v in present):
+        distinct = set(present)
+        if len(distinct) <= DICT_MAX_VALUES:
+            return "dict"
+        if all(type(v) is str for v in present):
+            return "text"
+    return "pickle"
+
+
+def _encode_column(values, kind):
+    """Encode one column. Returns (meta, [buffers])."""
+    meta = {"kind": kind}
+
+    if kind == "time":
+        data = array("q", (
+            _NULL_INT if v is None else
+            ((v - _EPOCH).days * 86400 + (v - _EPOCH).seconds) * 1000000 + v.microsecond
+            for v in values
+        ))
+        return meta, [data.tobytes()]
+
+    if kind == "int":
+        return meta, [array("q", (_NULL_INT if v is None else v for v in values)).tobytes()]
+
+    if kind == "float":
+        return meta, [array("d", (float("nan") if v is None else v for v in values)).tobytes()]
+
+    if kind == "dict":
+        table = []
+        codes = {}
+        encoded = array("i")
+        for v in values:
+            if v is None:
+                encoded.append(-1)
+                continue
+            code = codes.get((type(v), v))
+            if code is None:
+                code = codes[(type(v), v)] = len(table)
+                table.append(v)
+            encoded.append(code)
+        meta["values"] = table
+        return meta, [encoded.tobytes()]
+
+    # text / pickle: offsets + lengths into one blob
+    starts = array("q")
+    lengths = array("i")
+    chunks = []
+    position = 0
+    for v in values:
+        if v is None:
+            starts.append(position)
+            lengths.append(-1)
+            continue
+        raw = v.encode("utf-8") if kind == "text" else pickle.dumps(v, protocol=2)
+        starts.append(position)
+        lengths.append(len(raw))
+        chunks.append(raw)
+        position += len(raw)
+    return meta, [starts.tobytes(), lengths.tobytes(), b"".join(chunks)]
+
+
+def write_alert_snapshot(alerts, path, generation=None):
+    """
+    Write alerts to a columnar snapshot file.
+
+    Args:
+        alerts: list of alert dicts (None entries are skipped)
+        path: destination file (written atomically via rename)
+        generation: data generation recorded in the header
+
+    Returns:
+        Number of rows written
+    """
+    rows = [a for a in alerts if a]
+    names = []
+    seen = set()
+    for a in rows:
+        for key in a:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+
+    columns = []
+    buffers = []
+    offset = 0
+    for name in names:
+        values = [a.get(name, _MISSING) for a in rows]
+        missing = array("b", (v is _MISSING for v in values))
+        if any(missing):
+            values = [None if v is _MISSING else v for v in values]
+        else:
+            missing = None
+        meta, parts = _encode_column(values, _column_kind(values))
+        meta["name"] = name
+        meta["buffers"] = []
+        if missing is not None:
+            parts.append(missing.tobytes())
+            meta["has_missing"] = True
+        for part in parts:
+            meta["buffers"].append([offset, len(part)])
+            buffers.append(part)
+            padding = (-len(part)) % 8
+            if padding:
+                buffers.append(b"\0" * padding)
+            offset += len(part) + padding
+        columns.append(meta)
+
+    header = json.dumps({
+        "rows": len(rows),
+        "generation": generation,
+        "created": datetime.now().isoformat(),
+        "columns": columns
+    }).encode("utf-8")
+    header += b" " * ((-len(header)) % 8)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<q", len(header)))
+        f.write(header)
+        for part in buffers:
+            f.write(part)
+    os.rename(tmp_path, path)
+    return len(rows)
+
+
+# =====================================================
+# READER
+# =====================================================
+class AlertSnapshot:
+    """
+    Read-only mmap attachment to a snapshot file.
+
+    Column buffers are zero-copy memoryviews over the mapping; only
+    the small dict-column value tables are materialized per process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:8] != MAGIC:
+            raise ValueError("Not an alert snapshot: {0}".format(path))
+        header_len = struct.unpack("<q", self._mmap[8:16])[0]
+        header = json.loads(self._mmap[16:16 + header_len].decode("utf-8"))
+        base = 16 + header_len
+        buf = memoryview(self._mmap)
+
+        self.rows = header["rows"]
+        self.generation = header.get("generation")
+        self.columns = [c["name"] for c in header["columns"]]
+        self._decoders = {}
+        self._missing = {}
+        for meta in header["columns"]:
+            parts = [buf[base + start:base + start + length] for start, length in meta["buffers"]]
+            if meta.get("has_missing"):
+                self._missing[meta["name"]] = parts.pop()
+                self._decoders[meta["name"]] = self._with_missing(
+                    self._decoder(meta, parts), self._missing[meta["name"]]
+                )
+            else:
+                self._decoders[meta["name"]] = self._decoder(meta, parts)
+
+    @staticmethod
+    def _with_missing(decode, mask):
+        def decode_present(i):
+            return _MISSING if mask[i] else decode(i)
+        return decode_present
+
+    @staticmethod
+    def _decoder(meta, parts):
+        kind = meta["kind"]
+
+        if kind == "time":
+            col = parts[0].cast("q")
+
+            def decode(i):
+                v = col[i]
+                return None if v == _NULL_INT else _EPOCH + timedelta(microseconds=v)
+            return decode
+
+        if kind == "int":
+            col = parts[0].cast("q")
+
+            def decode(i):
+                v = col[i]
+                return None if v == _NULL_INT else v
+            return decode
+
+        if kind == "float":
+            col = parts[0].cast("d")
+
+            def decode(i):
+                v = col[i]
+                return None if v != v else v
+            return decode
+
+        if kind == "dict":
+            col = parts[0].cast("i")
+            table = meta["values"]
+
+            def decode(i):
+                code = col[i]
+                return None if code < 0 else table[code]
+            return decode
+
+        starts = parts[0].cast("q")
+        lengths = parts[1].cast("i")
+        blob = parts[2]
+        if kind == "text":
+            def decode(i):
+                n = lengths[i]
+                if n < 0:
+                    return None
+                s = starts[i]
+                return str(blob[s:s + n], "utf-8")
+            return decode
+
+        def decode(i):
+            n = lengths[i]
+            if n < 0:
+                return None
+            s = starts[i]
+            return pickle.loads(blob[s:s + n])
+        return decode
+
+    def value(self, column, i):
+        decoder = self._decoders.get(column)
+        value = decoder(i) if decoder is not None else None
+        return None if value is _MISSING else value
+
+    def has(self, column, i):
+        if column not in self._decoders:
+            return False
+        mask = self._missing.get(column)
+        return mask is None or not mask[i]
+
+    def view(self):
+        return AlertSnapshotView(self)
+
+
+class SnapshotAlert(Mapping):
+    """
+    One alert row, decoded on access.
+
+    Behaves like the original alert dict for reads. Writes go to a
+    private overlay, so a caller annotating an alert never touches
+    the shared snapshot. Pickles as a plain dict.
+    """
+
+    __slots__ = ("_snapshot", "_index", "_overlay")
+
+    def __init__(self, snapshot, index):
+        self._snapshot = snapshot
+        self._index = index
+        self._overlay = None
+
+    def __getitem__(self, key):
+        if self._overlay is not None and key in self._overlay:
+            return self._overlay[key]
+        decoder = self._snapshot._decoders.get(key)
+        value = _MISSING if decoder is None else decoder(self._index)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if self._overlay is not None and key in self._overlay:
+            return self._overlay[key]
+        decoder = self._snapshot._decoders.get(key)
+        value = _MISSING if decoder is None else decoder(self._index)
+        return default if value is _MISSING else value
+
+    def __setitem__(self, key, value):
+        if self._overlay is None:
+            self._overlay = {}
+        self._overlay[key] = value
+
+    def __contains__(self, key):
+        if self._overlay is not None and key in self._overlay:
+            return True
+        return self._snapshot.has(key, self._index)
+
+    def __iter__(self):
+        snapshot = self._snapshot
+        for name in snapshot.columns:
+            if snapshot.has(name, self._index) or (self._overlay and name in self._overlay):
+                yield name
+        if self._overlay:
+            for key in self._overlay:
+                if key not in snapshot._decoders:
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self.items())
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
+class AlertSnapshotView(Sequence):
+    """Read-only sequence of SnapshotAlert rows (stands in for the alert list)."""
+
+    def __init__(self, snapshot, indices=None):
+        self._snapshot = snapshot
+        self._indices = indices
+
+    @property
+    def generation(self):
+        return self._snapshot.generation
+
+    def __len__(self):
+        return self._snapshot.rows if self._indices is None else len(self._indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            indices = range(self._snapshot.rows)[item] if self._indices is None else self._indices[item]
+            return [SnapshotAlert(self._snapshot, i) for i in indices]
+        if self._indices is not None:
+            return SnapshotAlert(self._snapshot, self._indices[item])
+        if item < 0:
+            item += self._snapshot.rows
+        if not 0 <= item < self._snapshot.rows:
+            raise IndexError(item)
+        return SnapshotAlert(self._snapshot, item)
+
+    def __iter__(self):
+        snapshot = self._snapshot
+        indices = range(snapshot.rows) if self._indices is None else self._indices
+        for i in indices:
+            yield SnapshotAlert(snapshot, i)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def attach_alert_snapshot(path):
+    """Attach to a snapshot file and return its row view."""
+    return AlertSnapshot(path).view()
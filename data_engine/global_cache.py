@@ -15,8 +15,18 @@ PRODUCTION FIX (v2.2):
 - Added safe data access functions
 - Added data freshness tracking
 - Prevents stale/partial data access
+
+DATA GENERATIONS (v2.3):
+- Every full (re)load publishes a new snapshot and bumps the generation
+- Background jobs publish results tagged with the generation they
+  were computed for; results for a superseded generation are dropped
+- Caches keyed on the generation invalidate automatically on reload
+- pin_generation() / unpin_generation() hold the current snapshot for
+  a unit of work spanning several questions (chat batches); a reload
+  waits until every pin is released, new pins wait for that reload
 """
 
+import threading
 from datetime import datetime
 
 GLOBAL_DATA = {
@@ -30,6 +40,14 @@ GLOBAL_DATA = {
     "rca_summaries": []       # NEW: RCA analyses for dashboard
 }
 
+# Data generation (incremented on every full snapshot publish)
+_GENERATION = {"value": 0}
+_PUBLISH_LOCK = threading.Lock()
+
+# Generation pins (held snapshots) and snapshot publishes waiting for them
+_PINS = {"held": 0, "publishing": 0}
+_PIN_CONDITION = threading.Condition(threading.Lock())
+
 # System readiness flag (mutable container to allow modification)
 _SYSTEM_STATE = {
     "ready": False,
@@ -95,6 +113,90 @@ def is_data_fresh(max_age_seconds=3600):
         return False
 
 
+def get_data_generation():
+    """Get the current data generation number."""
+    return _GENERATION["value"]
+
+
+def pin_generation():
+    """
+    Hold the current snapshot: publish_snapshot() waits until every
+    pin is released with unpin_generation(). Blocks while a publish is
+    pending (call from a worker thread, not the event loop).
+
+    Returns:
+        The pinned data generation number
+    """
+    with _PIN_CONDITION:
+        while _PINS["publishing"]:
+            _PIN_CONDITION.wait()
+        _PINS["held"] += 1
+        return _GENERATION["value"]
+
+
+def unpin_generation():
+    """Release a pin_generation() hold."""
+    with _PIN_CONDITION:
+        _PINS["held"] -= 1
+        _PIN_CONDITION.notify_all()
+
+
+def publish_snapshot(data, generation=None):
+    """
+    Replace GLOBAL_DATA with a new snapshot.
+    Waits for pinned generations to be released first. Lock-free
+    readers never see an empty cache or a shared key missing.
+
+    Args:
+        data: dict of GLOBAL_DATA keys -> values
+        generation: generation number to adopt (a chat worker attaching
+            to the parent's snapshot); default is the next number
+
+    Returns:
+        The new data generation number
+    """
+    with _PIN_CONDITION:
+        _PINS["publishing"] += 1
+        while _PINS["held"]:
+            _PIN_CONDITION.wait()
+    try:
+        with _PUBLISH_LOCK:
+            # Readers take no lock: add every new key before dropping stale
+            # ones, so a key present in both snapshots is never missing
+            GLOBAL_DATA.update(data)
+            for key in [k for k in GLOBAL_DATA if k not in data]:
+                GLOBAL_DATA.pop(key, None)
+            if generation is None:
+                _GENERATION["value"] += 1
+            else:
+                _GENERATION["value"] = generation
+            return _GENERATION["value"]
+    finally:
+        with _PIN_CONDITION:
+            _PINS["publishing"] -= 1
+            _PIN_CONDITION.notify_all()
+
+
+def publish_result(key, value, generation=None):
+    """
+    Publish one precomputed result into the current snapshot.
+
+    Args:
+        key: GLOBAL_DATA key (e.g. "predictions")
+        value: computed result
+        generation: generation the result was computed for; if the
+            snapshot has since been replaced, the result is discarded
+
+    Returns:
+        True if published, False if stale
+    """
+    with _PUBLISH_LOCK:
+        if generation is not None and generation != _GENERATION["value"]:
+            return False
+        GLOBAL_DATA[key] = value
+        return True
+
+
 # Backward compatibility
 SYSTEM_READY = _SYSTEM_STATE
 
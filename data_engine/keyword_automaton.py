@@ -0,0 +1,81 @@
+# data_engine/keyword_automaton.py
+"""
+==============================================================
+KEYWORD AUTOMATON (AHO-CORASICK)
+==============================================================
+
+Finds every keyword of a fixed set occurring in a text in one
+left-to-right pass, however many keywords there are.
+
+Shared by the intent dispatch table (rule triggers), the target
+dictionary (database names in a question) and the answer
+post-processor (guardrail rule triggers).
+
+Python 3.6.8 compatible.
+"""
+
+from collections import deque
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton: finds every keyword occurring in a text
+    in a single left-to-right pass.
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(keyword)
+
+        # Breadth-first failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Set of keywords occurring in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def spans(self, text):
+        """(start, end, keyword) for every occurrence in text, by end position."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in out[state]:
+                found.append((end - len(keyword), end, keyword))
+        return found
@@ -1,34 +1,108 @@
-# -*- coding: utf-8 -*-
+# data_engine/query_executor.py
 """
-Query Executor - Executes query plans against the alert data
-Works at the raw data level (CSV rows) to get accurate results
+==============================================================
+QUERY EXECUTOR - Query plans over the shared in-memory alerts
+==============================================================
+
+The v2 chat API (NLPOrchestrator) used to run QueryPlans against its
+own pandas DataFrame of oem_alerts_raw.csv, reloaded every 5 minutes
+and copied by every filter call: a second copy of the alerts in
+memory, and a data version of its own, so v1 and v2 could answer from
+different loads.
+
+QueryExecutor now runs plans against GLOBAL_DATA["alerts"], the
+snapshot every other engine reads:
+
+- generation:  a plan reads one snapshot (the alert list is taken once
+               per execute) and reports its data generation;
+               data_version() is get_data_generation(), so cached v2
+               answers invalidate with the same reloads as v1
+- selections:  filters narrow a selection of row ids (array("I") of
+               positions, ascending) instead of copying frames;
+               indexed filters combine first, scanning filters then
+               test only the remaining rows
+- indexes:     database / databases -> TargetDictionary positions
+               (no scan); severity / severities and time ranges ->
+               AlertColumns, built once per data generation
+- pages:       LIST / DETAIL order only the rows they return (heap
+               selection of offset + limit by time); only those
+               alerts are converted to records
+
+Alerts are read with the store's field names and the CSV column names
+the plans use (target / target_name, severity / alert_state,
+time / alert_time); records carry both.
+
+Usage:
+    result = get_executor().execute(plan)
+    result.filtered_count, result.aggregations, result.data
+
+Python 3.6.8 compatible.
 """
 
-import os
-import pandas as pd
+import heapq
+from bisect import bisect_left
+import threading
+from array import array
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
-import re
+from typing import Dict, Any, List
+
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+from data_engine.root_cause_index import epoch_us, parse_legacy_timestamp
+from data_engine.target_dictionary import TargetDictionary
+from data_engine.time_histograms import alert_severity
+
+
+_NO_TIME = -(2 ** 63)     # AlertColumns.times entry of an alert without a timestamp
+
+
+def alert_time(alert):
+    """datetime of an alert's time (or alert_time), None if missing or unparsable."""
+    value = alert.get("time") or alert.get("alert_time")
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value.strip():
+        return parse_legacy_timestamp(value.strip())
+    return None
+
+
+# Plan column -> value of an alert (store field first, CSV column second)
+_FIELDS = {
+    "target_name": lambda a: a.get("target_name") or a.get("target"),
+    "alert_state": lambda a: a.get("severity") or a.get("alert_state"),
+    "severity": lambda a: a.get("severity") or a.get("alert_state"),
+    "alert_time": alert_time,
+}
+
+
+# Columns a LIST plan can sort by
+_SORT_COLUMNS = ("alert_time", "target_name", "alert_state", "message")
+
+
+def _field(name):
+    return _FIELDS.get(name) or (lambda a: a.get(name))
 
 
 class QueryResult:
     """Structured query result"""
-    
+
     def __init__(self):
         self.success = True
         self.error_message = None
         self.query_type = None
+        self.generation = None
         self.total_count = 0
         self.filtered_count = 0
         self.data = []  # List of alert dicts
         self.aggregations = {}  # severity counts, database counts, etc.
         self.metadata = {}  # offset, limit, has_more, etc.
-    
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'success': self.success,
             'error_message': self.error_message,
             'query_type': self.query_type,
+            'generation': self.generation,
             'total_count': self.total_count,
             'filtered_count': self.filtered_count,
             'data': self.data,
@@ -37,182 +111,262 @@ class QueryResult:
         }
 
 
+class AlertColumns(object):
+    """Severity positions and parsed times of one alert list."""
+
+    _CURRENT = {"key": None, "columns": None}
+    _OTHER = {"key": None, "alerts": None, "columns": None}
+    _LOCK = threading.Lock()
+
+    def __init__(self, alerts, generation=None):
+        self.alerts = alerts
+        self.generation = generation
+        self.severities = OrderedDict()     # SEVERITY -> array of positions
+        for position, alert in enumerate(alerts):
+            if not alert:
+                continue
+            severity = alert_severity(alert)
+            found = self.severities.get(severity)
+            if found is None:
+                found = self.severities[severity] = array("I")
+            found.append(position)
+        self._times = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_alerts(cls, alerts):
+        """Columns per data generation for GLOBAL_DATA["alerts"], else the last one-off."""
+        if alerts is GLOBAL_DATA.get("alerts"):
+            key = (get_data_generation(), id(alerts), len(alerts))
+            with cls._LOCK:
+                if cls._CURRENT["key"] == key:
+                    return cls._CURRENT["columns"]
+            columns = cls(alerts, generation=key[0])
+            with cls._LOCK:
+                cls._CURRENT.update(key=key, columns=columns)
+            return columns
+        key = (id(alerts), len(alerts))
+        with cls._LOCK:
+            if cls._OTHER["key"] == key and cls._OTHER["alerts"] is alerts:
+                return cls._OTHER["columns"]
+        columns = cls(alerts)
+        with cls._LOCK:
+            cls._OTHER.update(key=key, alerts=alerts, columns=columns)
+        return columns
+
+    def severity_rows(self, severities):
+        """Sorted positions of the alerts with any of the (uppercased) severities."""
+        found = [self.severities.get(sev.upper()) for sev in severities]
+        found = [rows for rows in found if rows]
+        if len(found) == 1:
+            return found[0]
+        return array("I", sorted(set(position for rows in found for position in rows)))
+
+    @property
+    def times(self):
+        """epoch_us() of each alert's time (_NO_TIME if none), parsed on first use."""
+        if self._times is None:
+            with self._lock:
+                if self._times is None:
+                    times = array("q")
+                    parsed = {}
+                    for alert in self.alerts:
+                        raw = (alert.get("time") or alert.get("alert_time")) if alert else None
+                        if isinstance(raw, str):
+                            value = parsed.get(raw)
+                            if value is None:
+                                moment = parse_legacy_timestamp(raw.strip()) if raw.strip() else None
+                                value = parsed[raw] = epoch_us(moment) if moment else _NO_TIME
+                        elif isinstance(raw, datetime):
+                            value = epoch_us(raw)
+                        else:
+                            value = _NO_TIME
+                        times.append(value)
+                    self._times = times
+        return self._times
+
+
+def _intersect(rows, other):
+    """Sorted positions in both selections (None = every alert)."""
+    if rows is None:
+        return other
+    if other is None:
+        return rows
+    if len(other) < len(rows):
+        rows, other = other, rows
+    # Binary search of the smaller selection in the larger one
+    size = len(other)
+    found = array("I")
+    for position in rows:
+        i = bisect_left(other, position)
+        if i < size and other[i] == position:
+            found.append(position)
+    return found
+
+
 class QueryExecutor:
-    """Executes query plans against the CSV alert data"""
-    
-    def __init__(self, data_path: str = None):
-        self.data_path = data_path or os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            'data', 'alerts', 'oem_alerts_raw.csv'
-        )
-        self._df = None
-        self._last_load_time = None
-        self._cache_duration = 300  # 5 minutes cache
-    
-    def _load_data(self) -> pd.DataFrame:
-        """Load alert data from CSV with caching"""
-        now = datetime.now()
-        
-        if self._df is not None and self._last_load_time:
-            if (now - self._last_load_time).total_seconds() < self._cache_duration:
-                return self._df
-        
-        if not os.path.exists(self.data_path):
-            raise FileNotFoundError(f"Alert data file not found: {self.data_path}")
-        
-        self._df = pd.read_csv(self.data_path, encoding='utf-8', low_memory=False)
-        self._last_load_time = now
-        
-        # Normalize column names
-        self._df.columns = [c.strip().lower() for c in self._df.columns]
-        
-        # Parse alert_time if exists
-        if 'alert_time' in self._df.columns:
-            self._df['alert_time'] = pd.to_datetime(
-                self._df['alert_time'], 
-                errors='coerce',
-                format='%Y-%m-%d %H:%M:%S'
-            )
-        
-        return self._df
-    
+    """Executes query plans against the shared in-memory alerts"""
+
+    def __init__(self, alerts=None):
+        """
+        Args:
+            alerts: alert list to query (None: GLOBAL_DATA["alerts"] at
+                each execute)
+        """
+        self._alerts = alerts
+
+    def _snapshot(self):
+        """(alerts, generation) the next plan reads."""
+        if self._alerts is not None:
+            return self._alerts, None
+        generation = get_data_generation()
+        return GLOBAL_DATA.get("alerts") or [], generation
+
+    def data_version(self):
+        """Data generation of the alerts (changes whenever they are reloaded)."""
+        return get_data_generation() if self._alerts is None else id(self._alerts)
+
     def execute(self, query_plan) -> QueryResult:
         """Execute a query plan and return results"""
         result = QueryResult()
         result.query_type = query_plan.query_type
-        
+
         try:
-            df = self._load_data()
-            result.total_count = len(df)
-            
+            alerts, result.generation = self._snapshot()
+            result.total_count = len(alerts)
+
             # Apply filters
-            filtered_df = self._apply_filters(df, query_plan.filters)
-            result.filtered_count = len(filtered_df)
-            
+            rows = self._apply_filters(alerts, query_plan.filters)
+            result.filtered_count = len(alerts) if rows is None else len(rows)
+
             # Execute based on query type
             if query_plan.query_type == 'COUNT':
-                result = self._execute_count(filtered_df, query_plan, result)
+                result = self._execute_count(alerts, rows, query_plan, result)
             elif query_plan.query_type == 'SUMMARY':
-                result = self._execute_summary(filtered_df, query_plan, result)
+                result = self._execute_summary(alerts, rows, query_plan, result)
             elif query_plan.query_type == 'LIST':
-                result = self._execute_list(filtered_df, query_plan, result)
+                result = self._execute_list(alerts, rows, query_plan, result)
             elif query_plan.query_type == 'AGGREGATE':
-                result = self._execute_aggregate(filtered_df, query_plan, result)
+                result = self._execute_aggregate(alerts, rows, query_plan, result)
             elif query_plan.query_type == 'DETAIL':
-                result = self._execute_detail(filtered_df, query_plan, result)
+                result = self._execute_detail(alerts, rows, query_plan, result)
             elif query_plan.query_type == 'COMPARE':
-                result = self._execute_compare(df, query_plan, result)
+                result = self._execute_compare(alerts, query_plan, result)
             else:
                 # Default to summary
-                result = self._execute_summary(filtered_df, query_plan, result)
-            
+                result = self._execute_summary(alerts, rows, query_plan, result)
+
         except Exception as e:
             result.success = False
             result.error_message = str(e)
-        
+
         return result
-    
-    def _apply_filters(self, df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Apply all filters to the dataframe"""
+
+    # =====================================================
+    # FILTERS
+    # =====================================================
+    def _apply_filters(self, alerts, filters: Dict[str, Any]):
+        """
+        Positions of the alerts matching every filter (None: no filter).
+        Index lookups narrow the selection first; scanning filters then
+        test the remaining alerts only.
+        """
         if not filters:
-            return df
-        
-        filtered = df.copy()
-        
-        # Database filter (target_name) - STRICT EXACT MATCHING (BUG FIX)
+            return None
+
+        rows = None
+
+        # Database filter (target) - STRICT EXACT MATCHING
         # MIDEVSTB should NOT match MIDEVSTBN
+        databases = []
         if filters.get('database'):
-            db_pattern = filters['database'].upper()
-            if 'target_name' in filtered.columns:
-                # STRICT match - exact database name only
-                mask = filtered['target_name'].fillna('').str.upper() == db_pattern
-                filtered = filtered[mask]
-        
-        # Multiple databases filter - STRICT EXACT MATCHING
+            databases.append([filters['database'].upper()])
         if filters.get('databases'):
-            if 'target_name' in filtered.columns:
-                db_list = [d.upper() for d in filters['databases']]
-                mask = filtered['target_name'].fillna('').str.upper().isin(db_list)
-                filtered = filtered[mask]
-        
-        # Severity filter - case insensitive
+            databases.append([d.upper() for d in filters['databases']])
+        if databases:
+            targets = TargetDictionary.for_alerts(alerts)
+            for keys in databases:
+                rows = _intersect(rows, array("I", targets.alert_indices(keys)))
+
+        # Severity filters - case insensitive
+        severities = []
         if filters.get('severity'):
-            sev = filters['severity'].upper()
-            if 'alert_state' in filtered.columns:
-                mask = filtered['alert_state'].fillna('').str.upper() == sev
-                filtered = filtered[mask]
-        
-        # Multiple severities filter
+            severities.append([filters['severity']])
         if filters.get('severities'):
-            if 'alert_state' in filtered.columns:
-                sev_list = [s.upper() for s in filters['severities']]
-                mask = filtered['alert_state'].fillna('').str.upper().isin(sev_list)
-                filtered = filtered[mask]
-        
+            severities.append(list(filters['severities']))
+        if severities:
+            columns = AlertColumns.for_alerts(alerts)
+            for values in severities:
+                rows = _intersect(rows, columns.severity_rows(values))
+
+        # Time range filter
+        start_time = self._range_start(filters.get('time_range'))
+        if start_time is not None:
+            times = AlertColumns.for_alerts(alerts).times
+            start = epoch_us(start_time)
+            candidates = range(len(alerts)) if rows is None else rows
+            rows = array("I", (position for position in candidates if times[position] >= start))
+
+        # Message filters: one pass over the remaining alerts, each
+        # distinct message tested once
+        tests = self._message_tests(filters)
+        if tests:
+            candidates = range(len(alerts)) if rows is None else rows
+            matching = array("I")
+            verdicts = {}
+            for position in candidates:
+                alert = alerts[position]
+                message = (alert.get('message') or '') if alert else ''
+                verdict = verdicts.get(message)
+                if verdict is None:
+                    verdict = verdicts[message] = all(test(message) for test in tests)
+                if verdict:
+                    matching.append(position)
+            rows = matching
+
+        return rows
+
+    def _message_tests(self, filters):
+        """Predicates on an alert message for the message-content filters."""
+        tests = []
+
         # Alert type filter (message content)
         if filters.get('alert_type'):
             alert_type = filters['alert_type'].lower()
-            if 'message' in filtered.columns:
-                mask = filtered['message'].fillna('').str.lower().str.contains(
-                    alert_type, regex=False, na=False
-                )
-                filtered = filtered[mask]
-        
+            tests.append(lambda message: alert_type in message.lower())
+
         # Issue type filter (maps to keywords in message)
         if filters.get('issue_type'):
-            issue_type = filters['issue_type'].upper()
-            if 'message' in filtered.columns:
-                issue_keywords = self._get_issue_keywords(issue_type)
-                if issue_keywords:
-                    pattern = '|'.join(issue_keywords)
-                    mask = filtered['message'].fillna('').str.lower().str.contains(
-                        pattern, regex=True, case=False, na=False
-                    )
-                    filtered = filtered[mask]
-        
+            keywords = self._get_issue_keywords(filters['issue_type'].upper())
+            if keywords:
+                tests.append(lambda message: any(keyword in message.lower() for keyword in keywords))
+
         # ORA code filter
         if filters.get('ora_codes'):
-            if 'message' in filtered.columns:
-                ora_patterns = [f"ORA-{code}" for code in filters['ora_codes']]
-                pattern = '|'.join(ora_patterns)
-                mask = filtered['message'].fillna('').str.contains(
-                    pattern, regex=True, case=False, na=False
-                )
-                filtered = filtered[mask]
-        
-        # Time range filter
-        if filters.get('time_range') and 'alert_time' in filtered.columns:
-            time_range = filters['time_range']
-            now = datetime.now()
-            
-            if time_range == 'today':
-                start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-            elif time_range == 'last_24h':
-                start_time = now - timedelta(hours=24)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-            elif time_range == 'last_hour':
-                start_time = now - timedelta(hours=1)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-            elif time_range == 'this_week':
-                start_time = now - timedelta(days=now.weekday())
-                start_time = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-            elif time_range == 'last_7_days':
-                start_time = now - timedelta(days=7)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-            elif time_range == 'this_month':
-                start_time = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                mask = filtered['alert_time'] >= start_time
-                filtered = filtered[mask]
-        
-        return filtered
-    
+            codes = ["ORA-{0}".format(code).upper() for code in filters['ora_codes']]
+            tests.append(lambda message: any(code in message.upper() for code in codes))
+
+        return tests
+
+    @staticmethod
+    def _range_start(time_range):
+        """Start of a time range filter, None for no (or an unknown) range."""
+        now = datetime.now()
+        if time_range == 'today':
+            return now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if time_range == 'last_24h':
+            return now - timedelta(hours=24)
+        if time_range == 'last_hour':
+            return now - timedelta(hours=1)
+        if time_range == 'this_week':
+            start_time = now - timedelta(days=now.weekday())
+            return start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        if time_range == 'last_7_days':
+            return now - timedelta(days=7)
+        if time_range == 'this_month':
+            return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return None
+
     def _get_issue_keywords(self, issue_type: str) -> List[str]:
         """Get keywords for issue types"""
         issue_map = {
@@ -228,157 +382,162 @@ class QueryExecutor:
             'ARCHIVE': ['archive', 'archivelog', 'redo'],
         }
         return issue_map.get(issue_type, [])
-    
-    def _execute_count(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    # =====================================================
+    # SELECTION HELPERS
+    # =====================================================
+    @staticmethod
+    def _selected(alerts, rows):
+        """The selected alerts (a generator; no list is built)."""
+        if rows is None:
+            return (alert for alert in alerts if alert)
+        return (alerts[position] for position in rows)
+
+    def _value_counts(self, alerts, rows, column, top=None):
+        """{value: alerts} of a column over the selection, most frequent first."""
+        value = _field(column)
+        counts = Counter()
+        for alert in self._selected(alerts, rows):
+            counts[value(alert) or 'Unknown'] += 1
+        return dict(counts.most_common(top))
+
+    def _severity_counts(self, alerts, rows):
+        return self._value_counts(alerts, rows, 'alert_state')
+
+    def _ordered(self, alerts, rows, sort_by, descending, count):
+        """
+        The first `count` positions of the selection ordered by sort_by
+        (alerts without a value last). Time order selects them from the
+        parsed time column without sorting the whole selection.
+        """
+        candidates = range(len(alerts)) if rows is None else rows
+        if sort_by == 'alert_time':
+            times = AlertColumns.for_alerts(alerts).times
+            sign = -1 if descending else 1
+            key = lambda p: (times[p] == _NO_TIME, sign * times[p], p)
+            return heapq.nsmallest(count, candidates, key=key)
+        value = _field(sort_by)
+        keyed = [(value(alerts[p]), p) for p in candidates if alerts[p]]
+        present = sorted(((v, p) for v, p in keyed if v is not None),
+                         key=lambda item: item[0], reverse=descending)
+        missing = [(v, p) for v, p in keyed if v is None]
+        return [p for _, p in (present + missing)[:count]]
+
+    @staticmethod
+    def _record(alert):
+        """Result record of one alert: its fields as strings plus the plan column names."""
+        record = {}
+        for key, val in alert.items():
+            if val is None:
+                record[key] = None
+            elif isinstance(val, datetime):
+                record[key] = val.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                record[key] = str(val)
+        for column in ('target_name', 'alert_state'):
+            if record.get(column) is None:
+                val = _FIELDS[column](alert)
+                record[column] = None if val is None else str(val)
+        if record.get('alert_time') is None:
+            moment = alert_time(alert)
+            record['alert_time'] = moment.strftime('%Y-%m-%d %H:%M:%S') if moment else None
+        return record
+
+    # =====================================================
+    # QUERY TYPES
+    # =====================================================
+    def _execute_count(self, alerts, rows, query_plan, result: QueryResult) -> QueryResult:
         """Execute a COUNT query"""
         result.data = []
         result.aggregations = {
-            'total': len(df)
+            'total': result.filtered_count,
+            'by_severity': self._severity_counts(alerts, rows)
         }
-        
-        # Add severity breakdown if requested
-        if 'alert_state' in df.columns:
-            severity_counts = df['alert_state'].fillna('Unknown').value_counts().to_dict()
-            result.aggregations['by_severity'] = severity_counts
-        
         return result
-    
-    def _execute_summary(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    def _execute_summary(self, alerts, rows, query_plan, result: QueryResult) -> QueryResult:
         """Execute a SUMMARY query - counts + breakdowns without listing alerts"""
         result.data = []
         result.aggregations = {
-            'total': len(df)
+            'total': result.filtered_count,
+            'by_severity': self._severity_counts(alerts, rows),
+            'by_database': self._value_counts(alerts, rows, 'target_name', 10),
+            'top_messages': self._value_counts(alerts, rows, 'message', 5)
         }
-        
-        # Severity breakdown
-        if 'alert_state' in df.columns:
-            severity_counts = df['alert_state'].fillna('Unknown').value_counts().to_dict()
-            result.aggregations['by_severity'] = severity_counts
-        
-        # Database breakdown
-        if 'target_name' in df.columns:
-            db_counts = df['target_name'].fillna('Unknown').value_counts().head(10).to_dict()
-            result.aggregations['by_database'] = db_counts
-        
-        # Top alert messages
-        if 'message' in df.columns:
-            top_messages = df['message'].fillna('Unknown').value_counts().head(5).to_dict()
-            result.aggregations['top_messages'] = top_messages
-        
         return result
-    
-    def _execute_list(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    def _execute_list(self, alerts, rows, query_plan, result: QueryResult) -> QueryResult:
         """Execute a LIST query - return paginated alert records"""
-        # Sorting
-        if query_plan.sort_by and query_plan.sort_by in df.columns:
-            ascending = query_plan.sort_order != 'desc'
-            df = df.sort_values(by=query_plan.sort_by, ascending=ascending)
-        elif 'alert_time' in df.columns:
-            # Default sort by alert_time descending (newest first)
-            df = df.sort_values(by='alert_time', ascending=False)
-        
-        # Pagination
         offset = query_plan.offset or 0
         limit = query_plan.limit or 10
-        
-        paginated_df = df.iloc[offset:offset + limit]
-        
-        # Convert to list of dicts
-        result.data = []
-        for _, row in paginated_df.iterrows():
-            alert = {}
-            for col in df.columns:
-                val = row[col]
-                if pd.isna(val):
-                    alert[col] = None
-                elif isinstance(val, pd.Timestamp):
-                    alert[col] = val.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    alert[col] = str(val)
-            result.data.append(alert)
-        
+
+        # Sorting (default: alert_time, newest first)
+        if query_plan.sort_by in _SORT_COLUMNS:
+            sort_by, descending = query_plan.sort_by, query_plan.sort_order == 'desc'
+        else:
+            sort_by, descending = 'alert_time', True
+        page = self._ordered(alerts, rows, sort_by, descending, offset + limit)[offset:]
+
+        result.data = [self._record(alerts[position]) for position in page]
+
         # Metadata
         result.metadata = {
             'offset': offset,
             'limit': limit,
-            'has_more': (offset + limit) < len(df),
+            'has_more': (offset + limit) < result.filtered_count,
             'showing': len(result.data)
         }
-        
+
         # Also add severity breakdown
-        if 'alert_state' in df.columns:
-            severity_counts = df['alert_state'].fillna('Unknown').value_counts().to_dict()
-            result.aggregations['by_severity'] = severity_counts
-        
+        result.aggregations['by_severity'] = self._severity_counts(alerts, rows)
+
         return result
-    
-    def _execute_aggregate(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    def _execute_aggregate(self, alerts, rows, query_plan, result: QueryResult) -> QueryResult:
         """Execute an AGGREGATE query - group by and count"""
-        group_by = query_plan.aggregation.get('group_by', 'alert_state') if query_plan.aggregation else 'alert_state'
-        
-        if group_by in df.columns:
-            agg_result = df[group_by].fillna('Unknown').value_counts().to_dict()
-            result.aggregations = {
-                'group_by': group_by,
-                'counts': agg_result,
-                'total': len(df)
-            }
-        else:
-            result.aggregations = {'total': len(df)}
-        
+        aggregation = getattr(query_plan, 'aggregation', None)
+        group_by = aggregation.get('group_by', 'alert_state') if aggregation else 'alert_state'
+
+        result.aggregations = {
+            'group_by': group_by,
+            'counts': self._value_counts(alerts, rows, group_by),
+            'total': result.filtered_count
+        }
+
         return result
-    
-    def _execute_detail(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    def _execute_detail(self, alerts, rows, query_plan, result: QueryResult) -> QueryResult:
         """Execute a DETAIL query - get full details of specific alerts"""
         # For detail queries, return more fields and fewer records
         limit = min(query_plan.limit or 5, 20)
-        
-        if 'alert_time' in df.columns:
-            df = df.sort_values(by='alert_time', ascending=False)
-        
-        detailed_df = df.head(limit)
-        
-        result.data = []
-        for _, row in detailed_df.iterrows():
-            alert = {}
-            for col in df.columns:
-                val = row[col]
-                if pd.isna(val):
-                    alert[col] = None
-                elif isinstance(val, pd.Timestamp):
-                    alert[col] = val.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    alert[col] = str(val)
-            result.data.append(alert)
-        
+
+        newest = self._ordered(alerts, rows, 'alert_time', True, limit)
+        result.data = [self._record(alerts[position]) for position in newest]
+
         return result
-    
-    def _execute_compare(self, df: pd.DataFrame, query_plan, result: QueryResult) -> QueryResult:
+
+    def _execute_compare(self, alerts, query_plan, result: QueryResult) -> QueryResult:
         """Execute a COMPARE query - compare two entities"""
-        compare = query_plan.aggregation.get('compare', {}) if query_plan.aggregation else {}
+        aggregation = getattr(query_plan, 'aggregation', None)
+        compare = aggregation.get('compare', {}) if aggregation else {}
         entity1 = compare.get('entity1')
         entity2 = compare.get('entity2')
-        
+
         if not entity1 or not entity2:
             result.error_message = "Comparison requires two entities"
             return result
-        
-        if 'target_name' in df.columns:
-            # Compare two databases
-            df1 = df[df['target_name'].fillna('').str.upper().str.contains(entity1.upper())]
-            df2 = df[df['target_name'].fillna('').str.upper().str.contains(entity2.upper())]
-            
-            result.aggregations = {
-                entity1: {
-                    'total': len(df1),
-                    'by_severity': df1['alert_state'].fillna('Unknown').value_counts().to_dict() if 'alert_state' in df1.columns else {}
-                },
-                entity2: {
-                    'total': len(df2),
-                    'by_severity': df2['alert_state'].fillna('Unknown').value_counts().to_dict() if 'alert_state' in df2.columns else {}
-                }
+
+        # Compare two databases (targets whose name contains the entity)
+        targets = TargetDictionary.for_alerts(alerts)
+        result.aggregations = {}
+        for entity in (entity1, entity2):
+            keys = [key for key in targets.positions if entity.upper() in key]
+            rows = array("I", targets.alert_indices(keys))
+            result.aggregations[entity] = {
+                'total': len(rows),
+                'by_severity': self._severity_counts(alerts, rows)
             }
-        
+
         return result
 
 
@@ -395,26 +554,32 @@ def get_executor() -> QueryExecutor:
 
 # Test
 if __name__ == '__main__':
-    from query_planner import QueryPlan
-    
-    executor = QueryExecutor()
-    
+    from services.query_planner import QueryPlan
+
+    executor = QueryExecutor(alerts=[
+        {"target": "MIDEVSTB", "severity": "CRITICAL", "message": "ORA-00600 internal error",
+         "time": "2025-06-01 10:00:00"},
+        {"target": "MIDEVSTBN", "severity": "WARNING", "message": "Data Guard apply lag",
+         "time": "2025-06-01 11:00:00"},
+    ])
+
     # Test COUNT query
     plan = QueryPlan()
     plan.query_type = 'COUNT'
     plan.filters = {'database': 'MIDEVSTB'}
-    
+
     result = executor.execute(plan)
-    print(f"COUNT result: {result.filtered_count} alerts")
-    print(f"Aggregations: {result.aggregations}")
-    
+    print("COUNT result: {0} alerts".format(result.filtered_count))
+    print("Aggregations: {0}".format(result.aggregations))
+
     # Test LIST query with severity filter
     plan2 = QueryPlan()
     plan2.query_type = 'LIST'
     plan2.filters = {'database': 'MIDEVSTB', 'severity': 'CRITICAL'}
     plan2.limit = 5
-    
+
     result2 = executor.execute(plan2)
-    print(f"\nLIST result: {len(result2.data)} alerts shown")
+    print("\nLIST result: {0} alerts shown".format(len(result2.data)))
     for alert in result2.data:
-        print(f"  - {alert.get('target_name')}: {alert.get('alert_state')} - {alert.get('message', '')[:50]}...")
+        print("  - {0}: {1} - {2}...".format(alert.get('target_name'), alert.get('alert_state'),
+                                            (alert.get('message') or '')[:50]))
@@ -0,0 +1,271 @@
+# data_engine/root_cause_index.py
+"""
+==============================================================
+ROOT CAUSE INDEX - Per-target error groups with epoch arrays
+==============================================================
+
+Root cause scoring (RootCauseScorer.compute_scores in the reasoning
+pipeline, RootCauseFallbackEngine.infer_root_cause,
+intelligence_engine.RootCauseScorer.score_root_causes) used to filter
+every alert by target, extract an error key per alert and re-parse
+string timestamps through a strptime loop on every question.
+
+RootCauseIndex does that work once per (alert list, scheme, target)
+and keeps it for the data generation:
+
+- scheme:   how a scorer reads an alert (target key and matching,
+            error key, timestamp, critical flag); each scorer keeps
+            its own semantics
+- groups:   error key -> ErrorGroup, in first-seen order (score ties
+            keep their previous order)
+- epochs:   parsed timestamps of each group as an int64 microsecond
+            array (naive, 1970-01-01 based - same as alert_snapshot)
+
+Frequency, repetition and severity are counts; recency is the array
+maximum; burst density needs only the span of the (sorted) window:
+consecutive gaps telescope, so
+
+    avg_gap = (max(epochs) - min(epochs)) / (len(epochs) - 1)
+
+These are C-level array reductions instead of per-alert Python loops.
+
+Usage:
+    scope = RootCauseIndex.for_alerts(alerts, SCHEME).scope(target)
+    for group in scope.groups.values():
+        group.count, group.burst_density(), group.latest()
+
+Python 3.6.8 compatible.
+"""
+
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+
+
+_EPOCH = datetime(1970, 1, 1)
+_HOUR_US = 3600 * 1000000
+
+# String formats tried by the legacy timestamp parsers (in order)
+LEGACY_TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d-%b-%y %I.%M.%S.%f %p")
+
+
+def epoch_us(value):
+    """Microseconds since 1970-01-01 of a datetime (aware values in UTC)."""
+    offset = value.utcoffset()
+    if offset is not None:
+        value = value.replace(tzinfo=None) - offset
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def from_epoch_us(value):
+    """Naive datetime of an epoch_us() value."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def parse_legacy_timestamp(value, max_format_chars=None):
+    """
+    datetime of a string timestamp, as the legacy scorers parsed it:
+    value[:19] against each LEGACY_TIMESTAMP_FORMATS entry truncated to
+    the value's length (and to max_format_chars). None if none matches.
+    """
+    text = value[:19]
+    for fmt in LEGACY_TIMESTAMP_FORMATS:
+        width = min(len(value), len(fmt) if max_format_chars is None else max_format_chars)
+        try:
+            return datetime.strptime(text, fmt[:width])
+        except Exception:
+            pass
+    return None
+
+
+def burst_density(avg_gap, default=0.3):
+    """Burst density (0-1) of an average gap in seconds: 1 per hour or denser -> 1.0."""
+    if avg_gap is None:
+        return default
+    return min(3600 / max(avg_gap, 1), 1.0)
+
+
+class RootCauseScheme(object):
+    """How one scorer reads alerts (see module docstring)."""
+
+    def __init__(self, name, target_key, error_key, timestamp, parse, critical=None,
+                 match="exact", stamp_window=None):
+        """
+        Args:
+            name: Scheme name (cache key)
+            target_key: alert -> uppercased target key
+            error_key: alert -> (error key, display type)
+            timestamp: alert -> raw timestamp value (falsy: none)
+            parse: raw timestamp value -> datetime or None
+            critical: alert -> bool (None: not counted)
+            match: "exact" (key == target) or "contains" (target in key)
+            stamp_window: only the first N present timestamps of a
+                group are parsed into its epochs (None: all)
+        """
+        self.name = name
+        self.target_key = target_key
+        self.error_key = error_key
+        self.timestamp = timestamp
+        self.parse = parse
+        self.critical = critical
+        self.match = match
+        self.stamp_window = stamp_window
+
+
+class ErrorGroup(object):
+    """Alerts of one error key within one scope."""
+
+    __slots__ = ("key", "display", "count", "critical", "stamps", "epochs", "_hours")
+
+    def __init__(self, key):
+        self.key = key
+        self.display = key
+        self.count = 0
+        self.critical = 0
+        self.stamps = 0               # alerts with a (truthy) timestamp value
+        self.epochs = array("q")      # parsed timestamps (burst window), alert order
+        self._hours = None
+
+    def avg_gap(self):
+        """Average gap (seconds) between consecutive sorted timestamps, None if < 2."""
+        epochs = self.epochs
+        if len(epochs) < 2:
+            return None
+        return ((max(epochs) - min(epochs)) / 1000000) / (len(epochs) - 1)
+
+    def burst_density(self, default=0.3):
+        return burst_density(self.avg_gap(), default)
+
+    def latest(self):
+        """Most recent parsed timestamp (naive datetime), or None."""
+        return from_epoch_us(max(self.epochs)) if self.epochs else None
+
+    def hour_counts(self):
+        """Counter of hour of day -> parsed timestamps."""
+        if self._hours is None:
+            self._hours = Counter((epoch // _HOUR_US) % 24 for epoch in self.epochs)
+        return self._hours
+
+
+class RootCauseScope(object):
+    """Error groups of the alerts matching one target (or all alerts)."""
+
+    def __init__(self, total, groups):
+        self.total = total
+        self.groups = groups
+
+
+class RootCauseIndex(object):
+    """Memoized root cause scopes of one alert list under one scheme."""
+
+    _CURRENT = {}     # scheme name -> (key, index)
+    _OTHER = {}       # scheme name -> (key, alerts, index)
+    _LOCK = threading.Lock()
+
+    def __init__(self, alerts, scheme, generation=None):
+        self.alerts = alerts or []
+        self.scheme = scheme
+        self.generation = generation
+        self._positions = None        # target key -> alert indices
+        self._scopes = {}             # TARGET (None = all alerts) -> RootCauseScope
+        self._parsed = {}             # raw string timestamp -> epoch us (or None)
+        self._lock = threading.Lock()
+
+    # =====================================================
+    # SHARED INSTANCES
+    # =====================================================
+    @classmethod
+    def for_alerts(cls, alerts, scheme):
+        """Index for an alert list: per data generation for GLOBAL_DATA["alerts"], else the last one-off."""
+        if alerts is GLOBAL_DATA.get("alerts"):
+            key = (get_data_generation(), id(alerts), len(alerts))
+            with cls._LOCK:
+                entry = cls._CURRENT.get(scheme.name)
+                if entry is not None and entry[0] == key:
+                    return entry[1]
+                index = cls(alerts, scheme, generation=key[0])
+                cls._CURRENT[scheme.name] = (key, index)
+            return index
+        key = (id(alerts), len(alerts or []))
+        with cls._LOCK:
+            entry = cls._OTHER.get(scheme.name)
+            if entry is not None and entry[0] == key and entry[1] is alerts:
+                return entry[2]
+            index = cls(alerts, scheme)
+            cls._OTHER[scheme.name] = (key, alerts, index)
+        return index
+
+    # =====================================================
+    # SCOPES
+    # =====================================================
+    def scope(self, target=None):
+        """RootCauseScope of the alerts of target (all alerts if falsy), memoized."""
+        key = target.upper() if target else None
+        with self._lock:
+            scope = self._scopes.get(key)
+            if scope is None:
+                scope = self._build_scope(self._select(key))
+                self._scopes[key] = scope
+            return scope
+
+    def _select(self, target):
+        if target is None:
+            return self.alerts
+        if self._positions is None:
+            positions = {}
+            for index, alert in enumerate(self.alerts):
+                positions.setdefault(self.scheme.target_key(alert), []).append(index)
+            self._positions = positions
+        if self.scheme.match == "contains":
+            indices = []
+            for key, found in self._positions.items():
+                if target in key:
+                    indices.extend(found)
+            indices.sort()
+        else:
+            indices = self._positions.get(target, ())
+        alerts = self.alerts
+        return [alerts[i] for i in indices]
+
+    def _build_scope(self, alerts):
+        scheme = self.scheme
+        window = scheme.stamp_window
+        parsed = self._parsed
+        groups = OrderedDict()
+        for alert in alerts:
+            key, display = scheme.error_key(alert)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = ErrorGroup(key)
+            group.count += 1
+            group.display = display
+            if scheme.critical is not None and scheme.critical(alert):
+                group.critical += 1
+            raw = scheme.timestamp(alert)
+            if raw:
+                if window is None or group.stamps < window:
+                    if isinstance(raw, str):
+                        epoch = parsed.get(raw, parsed)
+                        if epoch is parsed:
+                            value = scheme.parse(raw)
+                            epoch = parsed[raw] = epoch_us(value) if value is not None else None
+                    else:
+                        value = scheme.parse(raw)
+                        epoch = epoch_us(value) if value is not None else None
+                    if epoch is not None:
+                        group.epochs.append(epoch)
+                group.stamps += 1
+        return RootCauseScope(len(alerts), groups)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scheme": self.scheme.name,
+                "generation": self.generation,
+                "alerts": len(self.alerts),
+                "scopes": len(self._scopes),
+            }
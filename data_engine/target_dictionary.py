@@ -0,0 +1,391 @@
+# data_engine/target_dictionary.py
+"""
+==============================================================
+TARGET DICTIONARY - Known database names per data generation
+==============================================================
+
+Resolving a database name from a question used to rebuild the set of
+known targets from every alert on every request (fuzzy_match_database,
+extract_target_from_question, IntelligenceService._detect_followup_type,
+AntiFalseZero.widen_target_search), then compare tokens x names in
+nested loops.
+
+TargetDictionary is built once per data generation (lazily, or by the
+"target_dictionary" warm-up job) and shared:
+
+- names:      canonical target names (TargetNormalizer), first-seen order
+- positions:  raw target key -> alert indices (alerts per target, no scan)
+- mentions(): Aho-Corasick scan for exact, whole-identifier mentions of
+              known names in a question
+- suggest():  SymSpell delete-neighbourhood index: ranked typo
+              candidates with edit distances, independent of fleet size
+- closest():  unique nearest suggestion
+- BK-tree:    Levenshtein radius search for larger typo budgets
+
+STRICTNESS (MIDEVSTB != MIDEVSTBN):
+- An exact known name always resolves to itself, never to a neighbour
+- Overlapping mentions resolve to the longest name ("MIDEVSTBN" is
+  not also a mention of "MIDEVSTB")
+- A typo resolves only to a unique nearest name; ties are ambiguous
+
+Usage:
+    targets = TargetDictionary.current()
+    targets.mention("why is midevstbn down")      # "MIDEVSTBN"
+    targets.closest("MIDDEVSTBN")                 # "MIDEVSTBN"
+
+Python 3.6.8 compatible.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+from data_engine.target_normalizer import TargetNormalizer
+from data_engine.keyword_automaton import KeywordAutomaton
+
+
+_IDENTIFIER_CHAR = re.compile(r'[A-Z0-9_]')
+
+
+def alert_target_key(alert):
+    """Raw per-alert target key: target (or target_name), uppercased."""
+    return (alert.get("target") or alert.get("target_name") or "").upper()
+
+
+def deletes(word, max_distance):
+    """Every string obtained from word by deleting up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        nxt = set()
+        for item in frontier:
+            for i in range(len(item)):
+                nxt.add(item[:i] + item[i + 1:])
+        nxt -= found
+        found |= nxt
+        frontier = nxt
+    return found
+
+
+def levenshtein(a, b, limit=None):
+    """Edit distance between a and b; stops early (returns limit + 1) past limit."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, cb in enumerate(b, 1):
+            cost = previous[j - 1] + (ca != cb)
+            insert = current[j - 1] + 1
+            delete = previous[j] + 1
+            value = cost if cost < insert else insert
+            value = value if value < delete else delete
+            current.append(value)
+            if value < best:
+                best = value
+        if limit is not None and best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree(object):
+    """Burkhard-Keller tree over a metric (Levenshtein) for radius queries."""
+
+    def __init__(self, words=()):
+        self._root = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, word, radius):
+        """[(distance, word), ...] within radius, nearest first."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= radius:
+                found.append((distance, node_word))
+            low, high = distance - radius, distance + radius
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class TargetDictionary(object):
+    """Known target names of one alert list, indexed for question lookups."""
+
+    # Edit distance covered by the delete-neighbourhood index
+    SUGGEST_DISTANCE = 2
+
+    _CURRENT = {"key": None, "dictionary": None}
+    _OTHER = {"key": None, "alerts": None, "dictionary": None}
+    _LOCK = threading.Lock()
+
+    def __init__(self, alerts=(), names=(), generation=None):
+        """
+        Args:
+            alerts: alert dicts to index (target keys and positions)
+            names: extra known names (e.g. an explicit database list)
+            generation: data generation the alerts belong to
+        """
+        self.generation = generation
+        self.positions = OrderedDict()
+        for index, alert in enumerate(alerts):
+            if not alert:
+                continue
+            key = alert_target_key(alert)
+            if key:
+                self.positions.setdefault(key, []).append(index)
+
+        self._display = OrderedDict()     # canonical -> name as given
+        for raw in list(self.positions) + list(names):
+            canonical = TargetNormalizer.normalize(raw)
+            if canonical and canonical not in self._display:
+                self._display[canonical] = raw.strip() if isinstance(raw, str) else canonical
+        self.names = tuple(self._display)
+        self._rank = dict((name, i) for i, name in enumerate(self.names))
+
+        self._target_counts = Counter(
+            dict((key, len(indices)) for key, indices in self.positions.items()))
+        self._top_targets = None
+
+        self._alert_counts = Counter()
+        for key, indices in self.positions.items():
+            canonical = TargetNormalizer.normalize(key)
+            if canonical:
+                self._alert_counts[canonical] += len(indices)
+
+        self._automaton = KeywordAutomaton(self.names)
+        self._tree = BKTree(self.names)
+        self._joined = "\n".join(self.names)
+
+        self._deletes = {}
+        for name in self.names:
+            for variant in deletes(name, self.SUGGEST_DISTANCE):
+                self._deletes.setdefault(variant, []).append(name)
+
+    @classmethod
+    def from_names(cls, names):
+        """Dictionary over an explicit list of database names (no alerts)."""
+        return cls(names=names or ())
+
+    # =====================================================
+    # SHARED INSTANCES
+    # =====================================================
+    @classmethod
+    def current(cls):
+        """Dictionary for GLOBAL_DATA["alerts"], rebuilt when the generation changes."""
+        alerts = GLOBAL_DATA.get("alerts") or []
+        key = (get_data_generation(), id(alerts), len(alerts))
+        with cls._LOCK:
+            if cls._CURRENT["key"] == key:
+                return cls._CURRENT["dictionary"]
+        dictionary = cls(alerts, generation=key[0])
+        with cls._LOCK:
+            cls._CURRENT["key"] = key
+            cls._CURRENT["dictionary"] = dictionary
+        return dictionary
+
+    @classmethod
+    def for_alerts(cls, alerts):
+        """Dictionary for an alert list (the current one, or a cached one-off)."""
+        if alerts is GLOBAL_DATA.get("alerts"):
+            return cls.current()
+        key = (id(alerts), len(alerts))
+        with cls._LOCK:
+            if cls._OTHER["key"] == key and cls._OTHER["alerts"] is alerts:
+                return cls._OTHER["dictionary"]
+        dictionary = cls(alerts)
+        with cls._LOCK:
+            cls._OTHER.update(key=key, alerts=alerts, dictionary=dictionary)
+        return dictionary
+
+    # =====================================================
+    # LOOKUPS
+    # =====================================================
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return bool(name) and TargetNormalizer.normalize(name) in self._display
+
+    def get(self, name):
+        """Known name as originally given (exact, case-insensitive), or None."""
+        canonical = TargetNormalizer.normalize(name)
+        return self._display.get(canonical) if canonical else None
+
+    def mentions(self, text):
+        """
+        Known names mentioned in text as whole identifiers, in order of
+        appearance; overlapping mentions keep the longest name.
+        """
+        if not text or not self.names:
+            return []
+        upper = text.upper()
+        spans = []
+        for start, end, name in self._automaton.spans(upper):
+            if start > 0 and _IDENTIFIER_CHAR.match(upper[start - 1]):
+                continue
+            if end < len(upper) and _IDENTIFIER_CHAR.match(upper[end]):
+                continue
+            spans.append((start, -(end - start), end, name))
+        spans.sort()
+        found = []
+        covered = -1
+        for start, _, end, name in spans:
+            if start >= covered:
+                found.append(name)
+                covered = end
+        return found
+
+    def mention(self, text):
+        """First known name mentioned in text, or None."""
+        found = self.mentions(text)
+        return found[0] if found else None
+
+    def related(self, token):
+        """True if a known name contains token or is contained in it."""
+        token = (token or "").upper()
+        if not token or not self.names:
+            return False
+        return token in self._joined or bool(self._automaton.find(token))
+
+    def suggest(self, token, max_distance=None):
+        """
+        Typo candidates for token as [(name, edit distance), ...], nearest
+        first, then most alerts, then first seen. A known token is its own
+        only candidate (distance 0).
+
+        SymSpell lookup: the deletes of token are looked up in the
+        precomputed deletes of every name, so the cost depends on the
+        token length, not on the number of known targets.
+        """
+        token = TargetNormalizer.normalize(token)
+        if not token:
+            return []
+        if token in self._display:
+            return [(token, 0)]
+        if max_distance is None or max_distance > self.SUGGEST_DISTANCE:
+            max_distance = self.SUGGEST_DISTANCE
+
+        candidates = set()
+        for variant in deletes(token, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        ranked = []
+        for name in candidates:
+            distance = levenshtein(token, name, max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, -self._alert_counts[name], self._rank[name], name))
+        ranked.sort()
+        return [(name, distance) for distance, _, _, name in ranked]
+
+    def closest(self, token, max_distance=None):
+        """
+        Known name for a possibly misspelled token: the token itself if
+        known, else the unique nearest name within max_distance edits
+        (default: 1, or 2 for tokens of 8+ characters). Ties -> None.
+        """
+        token = TargetNormalizer.normalize(token)
+        if not token or len(token) < 4:
+            return None
+        if max_distance is None:
+            max_distance = 2 if len(token) >= 8 else 1
+        found = self.suggest(token, max_distance)
+        if not found:
+            return None
+        if len(found) > 1 and found[1][1] == found[0][1]:
+            return None
+        return found[0][0]
+
+    def raw_keys(self, name):
+        """Raw target keys (as found in alerts) of a canonical name."""
+        if name in self.positions:
+            return [name]
+        return [key for key in self.positions if TargetNormalizer.normalize(key) == name]
+
+    def same_length_matches(self, token, min_ratio):
+        """
+        Known raw target keys of the same length as token (and != token)
+        whose positional character match ratio is >= min_ratio.
+        """
+        token = (token or "").upper()
+        if not token:
+            return []
+        # Mismatches allowed by the ratio bound the edit distance
+        radius = 0
+        while (len(token) - radius - 1) / len(token) >= min_ratio:
+            radius += 1
+        matches = []
+        for _, name in self._tree.search(token, radius):
+            for key in self.raw_keys(name):
+                if len(key) != len(token) or key == token:
+                    continue
+                same = sum(1 for c1, c2 in zip(token, key) if c1 == c2)
+                if same / len(token) >= min_ratio:
+                    matches.append(key)
+        return matches
+
+    # =====================================================
+    # ALERTS PER TARGET
+    # =====================================================
+    def alert_indices(self, keys):
+        """Sorted alert indices for one or more raw target keys."""
+        if isinstance(keys, str):
+            return list(self.positions.get(keys, ()))
+        indices = []
+        for key in keys:
+            indices.extend(self.positions.get(key, ()))
+        indices.sort()
+        return indices
+
+    def counts(self):
+        """Counter of raw target key -> number of alerts."""
+        return Counter(self._target_counts)
+
+    def top_targets(self, n):
+        """[(raw target key, alerts), ...] for the n targets with most alerts."""
+        if self._top_targets is None:
+            self._top_targets = self._target_counts.most_common()
+        return self._top_targets[:n]
+
+    def stats(self):
+        return {
+            "generation": self.generation,
+            "names": len(self.names),
+            "raw_targets": len(self.positions),
+            "bk_tree_nodes": len(self._tree),
+            "delete_index_entries": len(self._deletes),
+        }
@@ -0,0 +1,313 @@
+# data_engine/time_histograms.py
+"""
+==============================================================
+TIME HISTOGRAMS - Hour-of-day and day-of-week alert counts
+==============================================================
+
+Peak hour, night/day and failure window answers (TemporalIntelligence
+in the reasoning pipeline and in intelligence_engine,
+OEMDataAnalyzer.analyze_time_distribution, app.analyze_time_distribution)
+used to rebuild hour counts from the raw alerts on every question,
+re-parsing string timestamps each time.
+
+TimeHistogramIndex reads every alert once per (alert list, scheme) -
+for GLOBAL_DATA["alerts"] right after a data generation is published,
+through the warm-up scheduler - and keeps, for all alerts and for each
+target key:
+
+- hours:       24 counts (hour of day)
+- week:        7 x 24 counts (weekday * 24 + hour), for timestamps
+               that carry a date
+- severities:  SEVERITY -> the same histograms for that severity
+- first seen:  position of the first alert of each hour / weekday, so
+               distributions and ties keep the order in which the
+               alerts showed them (as the Counter based code did)
+
+Targets matching several keys ("contains" schemes) sum the key
+histograms once and memoize the result. Peak hour, night/day split and
+failure windows become lookups over 24 (or 168) buckets.
+
+Each caller keeps its own timestamp semantics through a TimeScheme
+(fields, string parsing, target matching). Hours outside 0-23 (from
+malformed clock strings) are not counted.
+
+Usage:
+    histogram = TimeHistogramIndex.for_alerts(alerts, SCHEME).scope(target)
+    histogram.peak_hour(), histogram.distribution(), histogram.count(hours)
+
+Python 3.6.8 compatible.
+"""
+
+import threading
+from array import array
+from operator import add
+
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+_NEVER = 2 ** 62     # first-seen position of an empty bucket
+
+
+def alert_severity(alert):
+    """Uppercased severity (or alert_state) of an alert, "" if none."""
+    return (alert.get("severity") or alert.get("alert_state") or "").upper()
+
+
+class TimeScheme(object):
+    """How one caller reads alert timestamps (see module docstring)."""
+
+    def __init__(self, name, target_key, timestamp, parse, severity=alert_severity, match="exact"):
+        """
+        Args:
+            name: Scheme name (cache key)
+            target_key: alert -> uppercased target key
+            timestamp: alert -> raw timestamp value (falsy: none)
+            parse: raw timestamp value -> (hour, weekday or None), or None
+            severity: alert -> severity label (None: no breakdown)
+            match: "exact" (key == target) or "contains" (target in key)
+        """
+        self.name = name
+        self.target_key = target_key
+        self.timestamp = timestamp
+        self.parse = parse
+        self.severity = severity
+        self.match = match
+
+
+class TimeHistogram(object):
+    """Hour-of-day and weekday x hour counts of one scope."""
+
+    __slots__ = ("total", "hours", "hour_first", "week", "day_first", "severities")
+
+    def __init__(self):
+        self.total = 0                               # alerts in scope, with or without a timestamp
+        self.hours = array("q", [0]) * 24
+        self.hour_first = array("q", [_NEVER]) * 24
+        self.week = array("q", [0]) * 168
+        self.day_first = array("q", [_NEVER]) * 7
+        self.severities = {}                         # SEVERITY -> TimeHistogram
+
+    def add(self, position, hour=None, weekday=None, severity=None, count=1):
+        """Count alerts first seen at position (hour None: no usable timestamp)."""
+        self.total += count
+        if hour is not None:
+            self.hours[hour] += count
+            if position < self.hour_first[hour]:
+                self.hour_first[hour] = position
+            if weekday is not None:
+                self.week[weekday * 24 + hour] += count
+                if position < self.day_first[weekday]:
+                    self.day_first[weekday] = position
+        if severity is not None:
+            nested = self.severities.get(severity)
+            if nested is None:
+                nested = self.severities[severity] = TimeHistogram()
+            nested.add(position, hour, weekday, None, count)
+
+    def merge(self, other):
+        """Add the counts of other into this histogram."""
+        self.total += other.total
+        self.hours = array("q", map(add, self.hours, other.hours))
+        self.hour_first = array("q", map(min, self.hour_first, other.hour_first))
+        self.week = array("q", map(add, self.week, other.week))
+        self.day_first = array("q", map(min, self.day_first, other.day_first))
+        for severity, nested in other.severities.items():
+            mine = self.severities.get(severity)
+            if mine is None:
+                mine = self.severities[severity] = TimeHistogram()
+            mine.merge(nested)
+        return self
+
+    def stamped(self):
+        """Alerts counted in an hour bucket."""
+        return sum(self.hours)
+
+    def count(self, hours):
+        """Alerts in the given hours of day."""
+        return sum(self.hours[hour] for hour in hours)
+
+    def hour_order(self):
+        """Hours with alerts, in first-seen order."""
+        return sorted((hour for hour in range(24) if self.hours[hour]), key=self.hour_first.__getitem__)
+
+    def distribution(self):
+        """{hour: count} in first-seen order."""
+        hours = self.hours
+        return dict((hour, hours[hour]) for hour in self.hour_order())
+
+    def peak_hour(self):
+        """(hour, count) of the busiest hour (first seen wins ties), None if no hours."""
+        peak = None
+        for hour in self.hour_order():
+            if peak is None or self.hours[hour] > peak[1]:
+                peak = (hour, self.hours[hour])
+        return peak
+
+    def day_counts(self):
+        """{weekday name: count} in first-seen order."""
+        days = sorted((day for day in range(7) if self.day_first[day] != _NEVER), key=self.day_first.__getitem__)
+        return dict((DAY_NAMES[day], sum(self.week[day * 24:day * 24 + 24])) for day in days)
+
+    def severity_matching(self, label):
+        """Histogram of the severities containing label (merged)."""
+        merged = TimeHistogram()
+        for severity, nested in self.severities.items():
+            if label in severity:
+                merged.merge(nested)
+        return merged
+
+
+class TimeHistogramIndex(object):
+    """Hour histograms of one alert list under one scheme, overall and per target key."""
+
+    _CURRENT = {}     # scheme name -> (key, index)
+    _OTHER = {}       # scheme name -> (key, alerts, index)
+    _LOCK = threading.Lock()
+
+    def __init__(self, alerts, scheme, generation=None):
+        self.alerts = alerts or []
+        self.scheme = scheme
+        self.generation = generation
+        self._all = None              # TimeHistogram of all alerts
+        self._targets = None          # target key -> TimeHistogram
+        self._positions = None        # target key -> alert positions
+        self._hour_of = None          # hour of each alert (-1: none)
+        self._scopes = {}             # TARGET ("contains" matches) -> merged TimeHistogram
+        self._lock = threading.Lock()
+
+    # =====================================================
+    # SHARED INSTANCES
+    # =====================================================
+    @classmethod
+    def current(cls, scheme):
+        """Index of GLOBAL_DATA["alerts"], replaced when the generation changes."""
+        return cls.for_alerts(GLOBAL_DATA.get("alerts") or [], scheme)
+
+    @classmethod
+    def for_alerts(cls, alerts, scheme):
+        """Index for an alert list: per data generation for GLOBAL_DATA["alerts"], else the last one-off."""
+        if alerts is not None and alerts is GLOBAL_DATA.get("alerts"):
+            key = (get_data_generation(), id(alerts), len(alerts))
+            with cls._LOCK:
+                entry = cls._CURRENT.get(scheme.name)
+                if entry is not None and entry[0] == key:
+                    return entry[1]
+                index = cls(alerts, scheme, generation=key[0])
+                cls._CURRENT[scheme.name] = (key, index)
+            return index
+        key = (id(alerts), len(alerts or []))
+        with cls._LOCK:
+            entry = cls._OTHER.get(scheme.name)
+            if entry is not None and entry[0] == key and entry[1] is alerts:
+                return entry[2]
+            index = cls(alerts, scheme)
+            cls._OTHER[scheme.name] = (key, alerts, index)
+        return index
+
+    # =====================================================
+    # BUILD (one pass over the alerts)
+    # =====================================================
+    def build(self):
+        """Read every alert into the histograms (once); returns self."""
+        with self._lock:
+            if self._all is None:
+                self._build()
+        return self
+
+    def _build(self):
+        scheme = self.scheme
+        severity_of = scheme.severity
+        positions = {}
+        hour_of = array("b")
+        parsed = {}                   # raw string timestamp -> (hour, weekday) or None
+        cells = {}                    # (key, severity, hour, weekday) -> [count, first position]
+        for position, alert in enumerate(self.alerts):
+            if not alert:
+                hour_of.append(-1)
+                continue
+            key = scheme.target_key(alert)
+            found = positions.get(key)
+            if found is None:
+                found = positions[key] = array("q")
+            found.append(position)
+            hour = weekday = None
+            raw = scheme.timestamp(alert)
+            if raw:
+                if isinstance(raw, str):
+                    slot = parsed.get(raw, parsed)
+                    if slot is parsed:
+                        slot = parsed[raw] = scheme.parse(raw)
+                else:
+                    slot = scheme.parse(raw)
+                if slot is not None and 0 <= slot[0] < 24:
+                    hour, weekday = slot
+            hour_of.append(-1 if hour is None else hour)
+            cell = (key, severity_of(alert) if severity_of is not None else None, hour, weekday)
+            tally = cells.get(cell)
+            if tally is None:
+                cells[cell] = [1, position]
+            else:
+                tally[0] += 1
+
+        # Distinct cells are few (targets x severities x 168): spread them into the arrays
+        everything = TimeHistogram()
+        targets = {}
+        for (key, severity, hour, weekday), (count, first) in cells.items():
+            histogram = targets.get(key)
+            if histogram is None:
+                histogram = targets[key] = TimeHistogram()
+            histogram.add(first, hour, weekday, severity, count)
+            everything.add(first, hour, weekday, severity, count)
+        self._targets = targets
+        self._positions = positions
+        self._hour_of = hour_of
+        self._all = everything
+
+    # =====================================================
+    # LOOKUPS
+    # =====================================================
+    def scope(self, target=None):
+        """TimeHistogram of the alerts of target (all alerts if falsy). Treat as read-only."""
+        self.build()
+        if not target:
+            return self._all
+        target = target.upper()
+        if self.scheme.match != "contains":
+            return self._targets.get(target) or TimeHistogram()
+        with self._lock:
+            histogram = self._scopes.get(target)
+            if histogram is None:
+                histogram = TimeHistogram()
+                for key, found in self._targets.items():
+                    if target in key:
+                        histogram.merge(found)
+                self._scopes[target] = histogram
+            return histogram
+
+    def select(self, target, hours):
+        """Alerts of target (all alerts if falsy) whose hour is in hours, in alert order."""
+        self.build()
+        wanted = set(hours)
+        hour_of = self._hour_of
+        if not target:
+            positions = range(len(self.alerts))
+        elif self.scheme.match != "contains":
+            positions = self._positions.get(target.upper(), ())
+        else:
+            target = target.upper()
+            positions = sorted(p for key, found in self._positions.items() if target in key for p in found)
+        alerts = self.alerts
+        return [alerts[p] for p in positions if hour_of[p] in wanted]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scheme": self.scheme.name,
+                "generation": self.generation,
+                "alerts": len(self.alerts),
+                "built": self._all is not None,
+                "targets": len(self._targets) if self._targets is not None else 0,
+                "scopes": len(self._scopes),
+            }
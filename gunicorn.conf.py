@@ -0,0 +1,71 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the OEM Incident Intelligence System.
+Picked up automatically by the Procfile command (gunicorn reads
+./gunicorn.conf.py by default).
+
+PRELOAD MODE (PRELOAD_DATA=true):
+- The master imports the app and runs preload_for_fork() once:
+  data load, background warm-up and gc.freeze()
+- PRELOAD_COLUMNAR_ALERTS=true also replaces the alert dicts with the
+  read-only mmap columnar snapshot, so reading alerts in a worker
+  does not copy shared pages (refcount updates)
+- Workers are forked afterwards and share that data copy-on-write,
+  so startup time and memory no longer multiply by the worker count
+- Each worker logs its shared vs private RSS after startup; live
+  numbers are in GET /api/dashboard/system-status ("process_memory")
+
+Without PRELOAD_DATA every worker loads its own data (previous behavior).
+
+SHARED SESSIONS (SESSION_BACKEND=sqlite, the default):
+- The master sets SESSION_GENERATION before anything is imported, so
+  all its workers (including ones recycled later) read and write the
+  same sessions in SESSION_DB_PATH; a follow-up question may land on
+  any worker
+- Each worker writes its queued session states when it exits
+"""
+
+import os
+import time
+
+os.environ.setdefault("SESSION_GENERATION", "gunicorn-{0}-{1}".format(os.getpid(), int(time.time())))
+
+from config.settings import settings
+
+preload_app = settings.PRELOAD_DATA
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported, before workers fork."""
+    if preload_app:
+        from app import preload_for_fork
+        preload_for_fork()
+
+
+def on_exit(server):
+    """Remove the alert snapshot file written by the master."""
+    if preload_app:
+        from services.chat_process_pool import CHAT_PROCESS_POOL
+        CHAT_PROCESS_POOL.shutdown()
+
+
+def post_worker_init(worker):
+    from services.process_memory import memory_report
+
+    report = memory_report()
+    if report.get("rss_kb") is not None:
+        worker.log.info(
+            "Worker %s memory: rss=%sMB shared=%sMB private=%sMB",
+            worker.pid,
+            report["rss_kb"] // 1024,
+            report["shared_kb"] // 1024,
+            report["private_kb"] // 1024
+        )
+
+
+def worker_exit(server, worker):
+    """Write the session states still queued by this worker."""
+    from services.shared_session_store import SHARED_SESSION_STORE
+
+    if SHARED_SESSION_STORE is not None:
+        SHARED_SESSION_STORE.flush()
@@ -1,32 +1,41 @@
+from bisect import bisect_left, bisect_right
 from datetime import timedelta, datetime
 from collections import defaultdict
 from data_engine.target_normalizer import TargetNormalizer
 
 
+# Alert evidence window: metrics from 15 minutes before to 5 minutes after
+WINDOW_BEFORE = timedelta(minutes=15)
+WINDOW_AFTER = timedelta(minutes=5)
+
+# Alert-pattern fallback lookback for CRITICAL alerts
+PATTERN_LOOKBACK = timedelta(hours=24)
+PATTERN_MIN_CRITICALS = 3
+
+
 class MetricAlertValidator:
     """
     Validates whether alerts are supported by metric evidence
-    
+
     PRODUCTION OPTIMIZATION:
-    - Pre-indexes metrics by (target, time_bucket) for O(1) lookup
-    - Reduces validation from O(N×M) to O(N) where N=alerts, M=metrics
+    - Pre-indexes metrics into sorted per-target time arrays
+    - Window lookup is two bisects per alert (no per-alert bucket lists)
+    - CRITICAL alert pattern fallback uses per-target sorted arrays too
     - Handles 650k+ alerts efficiently
     """
 
     CPU_THRESHOLD = 85
     MEMORY_THRESHOLD = 80
     STORAGE_THRESHOLD = 80
-    
-    # Time bucket size for indexing (5 minutes)
-    BUCKET_MINUTES = 5
 
     def __init__(self, alerts, metrics):
         self.alerts = alerts
         self.metrics = metrics
-        
+
         # PERFORMANCE FIX: Build metric index once at initialization
         print("[*] Building metric index for fast validation...")
         self.metric_index = self._build_metric_index()
+        self.critical_index = self.build_critical_index(self.alerts)
         print("[OK] Metric index built: {0} targets indexed".format(len(self.metric_index)))
 
     # -------------------------------------------------
@@ -34,70 +43,86 @@ class MetricAlertValidator:
     # -------------------------------------------------
     def _build_metric_index(self):
         """
-        Build time-bucketed index: {normalized_target: {bucket_key: [metrics]}}
-        This changes O(N×M) validation to O(N) with fast lookups.
-        
-        Bucket size = 5 minutes
-        Alert window = ±15 minutes (so we check 6 buckets per alert)
+        Build sorted per-target arrays: {normalized_target: (times, rows)}
+
+        times: ascending list of metric datetimes (bisect-able)
+        rows:  parallel list of (metric_name_lower, value)
+        """
+        return self.build_metric_index(self.metrics)
+
+    @staticmethod
+    def build_metric_index(metrics):
+        """
+        Build the per-target metric arrays from raw metric dicts.
+        Metrics without a datetime timestamp or a valid target are skipped.
         """
-        index = defaultdict(lambda: defaultdict(list))
-        
-        for m in self.metrics:
+        grouped = defaultdict(list)
+
+        for m in metrics or []:
             if not m:
                 continue
-            
+
             m_time = m.get("time")
-            m_target = m.get("target")
-            
-            if not m_time or not m_target:
+            if not isinstance(m_time, datetime):
                 continue
-            
+
             # Normalize target for consistent lookup
-            norm_target = TargetNormalizer.normalize(m_target)
+            norm_target = TargetNormalizer.normalize(m.get("target"))
             if not norm_target:
                 continue
-            
-            # Calculate time bucket (rounds down to nearest 5-minute interval)
-            bucket_key = self._get_time_bucket(m_time)
-            
-            # Add to index
-            index[norm_target][bucket_key].append(m)
-        
+
+            grouped[norm_target].append(
+                (m_time, (m.get("metric") or "").lower(), m.get("value", 0))
+            )
+
+        index = {}
+        for target, entries in grouped.items():
+            # Stable sort keeps load order for metrics sharing a timestamp
+            entries.sort(key=lambda e: e[0])
+            index[target] = (
+                [e[0] for e in entries],
+                [(e[1], e[2]) for e in entries]
+            )
+
         return index
 
-    def _get_time_bucket(self, dt):
+    @staticmethod
+    def build_critical_index(alerts):
         """
-        Convert datetime to 5-minute bucket key.
-        Example: 10:07 -> 10:05, 10:12 -> 10:10
+        Build sorted CRITICAL alert times per target: {normalized_target: [times]}
+        Used by the alert-pattern fallback (>= 3 CRITICAL alerts in 24h).
         """
-        if not isinstance(dt, datetime):
-            return None
-        
-        # Round down to nearest 5-minute interval
-        minutes = (dt.hour * 60 + dt.minute) // self.BUCKET_MINUTES * self.BUCKET_MINUTES
-        bucket_hour = minutes // 60
-        bucket_min = minutes % 60
-        
-        return dt.replace(hour=bucket_hour, minute=bucket_min, second=0, microsecond=0)
-
-    def _get_relevant_buckets(self, alert_time):
+        grouped = defaultdict(list)
+
+        for a in alerts or []:
+            if not a or a.get("severity") != "CRITICAL":
+                continue
+            a_time = a.get("time")
+            if not isinstance(a_time, datetime):
+                continue
+            norm_target = TargetNormalizer.normalize(a.get("target"))
+            if norm_target:
+                grouped[norm_target].append(a_time)
+
+        for times in grouped.values():
+            times.sort()
+
+        return dict(grouped)
+
+    @staticmethod
+    def alert_id(alert):
         """
-        Get all time buckets that overlap with alert window (±15 minutes).
-        With 5-minute buckets, we need to check 6 buckets total.
+        Stable identity for an alert across data reloads.
+        Validation results are stored under this key so that
+        only newly ingested alerts need validating.
         """
-        if not isinstance(alert_time, datetime):
-            return []
-        
-        buckets = []
-        
-        # Check buckets from -20 to +20 minutes (to cover ±15 min window)
-        for offset_minutes in range(-20, 25, self.BUCKET_MINUTES):
-            check_time = alert_time + timedelta(minutes=offset_minutes)
-            bucket = self._get_time_bucket(check_time)
-            if bucket and bucket not in buckets:
-                buckets.append(bucket)
-        
-        return buckets
+        alert_time = alert.get("time")
+        return "{0}|{1}|{2}|{3}".format(
+            alert.get("target") or "",
+            alert_time.isoformat() if isinstance(alert_time, datetime) else alert_time,
+            alert.get("severity") or "",
+            alert.get("message") or ""
+        )
 
     # -------------------------------------------------
     # MAIN VALIDATION (OPTIMIZED)
@@ -109,13 +134,13 @@ class MetricAlertValidator:
         """
         validated = []
         total = len(self.alerts)
-        
+
         print("[*] Validating {0} alerts against indexed metrics...".format(total))
-        
+
         for idx, alert in enumerate(self.alerts):
             result = self._validate_alert(alert)
             validated.append(result)
-            
+
             # Progress indicator
             if (idx + 1) % 50000 == 0:
                 print("[*] Validated {0}/{1} alerts...".format(idx + 1, total))
@@ -132,44 +157,50 @@ class MetricAlertValidator:
         if not alert_time or not target:
             return self._result(alert, False, ["Missing time or target"])
 
-        window_start = alert_time - timedelta(minutes=15)
-        window_end = alert_time + timedelta(minutes=5)
-
         # Normalize target for index lookup
         norm_target = TargetNormalizer.normalize(target)
         if not norm_target:
             return self._result(alert, False, ["Invalid target"])
 
-        # PERFORMANCE FIX: Use indexed lookup instead of linear scan
-        related_metrics = []
-        
-        if norm_target in self.metric_index:
-            # Get relevant time buckets
-            buckets = self._get_relevant_buckets(alert_time)
-            
-            # Collect metrics from relevant buckets
-            for bucket in buckets:
-                if bucket in self.metric_index[norm_target]:
-                    for m in self.metric_index[norm_target][bucket]:
-                        m_time = m.get("time")
-                        if m_time and window_start <= m_time <= window_end:
-                            related_metrics.append(m)
+        is_valid, reasons = self.evaluate(
+            alert_time,
+            alert.get("severity"),
+            self.metric_index.get(norm_target),
+            self.critical_index.get(norm_target)
+        )
+        return self._result(alert, is_valid, reasons)
+
+    @classmethod
+    def evaluate(cls, alert_time, severity, metric_arrays, critical_times):
+        """
+        Core validation for one alert against its target's arrays.
+
+        Args:
+            alert_time: alert datetime
+            severity: alert severity
+            metric_arrays: (times, rows) for the alert's target, or None
+            critical_times: sorted CRITICAL alert times for the target, or None
 
+        Returns:
+            (is_valid, reasons)
+        """
         reasons = []
 
-        for m in related_metrics:
-            name = (m.get("metric") or "").lower()
-            value = m.get("value", 0)
+        if metric_arrays:
+            times, rows = metric_arrays
+            lo = bisect_left(times, alert_time - WINDOW_BEFORE)
+            hi = bisect_right(times, alert_time + WINDOW_AFTER)
 
-            if "cpu" in name and value >= self.CPU_THRESHOLD:
-                reasons.append("High CPU ({0}%)".format(int(value)))
+            for name, value in rows[lo:hi]:
+                if "cpu" in name and value >= cls.CPU_THRESHOLD:
+                    reasons.append("High CPU ({0}%)".format(int(value)))
 
-            if "memory" in name and value >= self.MEMORY_THRESHOLD:
-                reasons.append("High memory usage ({0}%)".format(int(value)))
+                if "memory" in name and value >= cls.MEMORY_THRESHOLD:
+                    reasons.append("High memory usage ({0}%)".format(int(value)))
 
-            if "disk" in name or "storage" in name:
-                if value >= self.STORAGE_THRESHOLD:
-                    reasons.append("Storage pressure ({0}%)".format(int(value)))
+                if "disk" in name or "storage" in name:
+                    if value >= cls.STORAGE_THRESHOLD:
+                        reasons.append("Storage pressure ({0}%)".format(int(value)))
 
         is_valid = bool(reasons)
 
@@ -178,16 +209,15 @@ class MetricAlertValidator:
         # -------------------------------------------------
         # If metric evidence is sparse but alert is CRITICAL,
         # check for high-frequency alert pattern
-        if not is_valid and alert.get("severity") == "CRITICAL":
-            pattern_detected = self._detect_alert_pattern(target, alert_time)
-            if pattern_detected:
+        if not is_valid and severity == "CRITICAL":
+            if cls._count_criticals(critical_times, alert_time) >= PATTERN_MIN_CRITICALS:
                 is_valid = True
                 reasons = ["SUPPORTED_BY_ALERT_PATTERN: Metric data unavailable, but high-frequency critical alert pattern detected"]
 
         if not reasons:
             reasons.append("No abnormal metrics found")
 
-        return self._result(alert, is_valid, reasons)
+        return is_valid, reasons
 
     # -------------------------------------------------
     # PRODUCTION FALLBACK: ALERT PATTERN DETECTION
@@ -200,25 +230,27 @@ class MetricAlertValidator:
         if not alert_time or not target:
             return False
 
-        lookback_start = alert_time - timedelta(hours=24)
-
-        critical_count = 0
-        for a in self.alerts:
-            a_time = a.get("time")
-            a_target = a.get("target")
-            a_severity = a.get("severity")
+        critical_times = self.critical_index.get(TargetNormalizer.normalize(target))
+        return self._count_criticals(critical_times, alert_time) >= PATTERN_MIN_CRITICALS
 
-            if (a_time and a_severity == "CRITICAL" and
-                lookback_start <= a_time <= alert_time and
-                TargetNormalizer.equals(a_target, target)):
-                critical_count += 1
-
-        return critical_count >= 3
+    @staticmethod
+    def _count_criticals(critical_times, alert_time):
+        """Count CRITICAL alerts in [alert_time - 24h, alert_time]."""
+        if not critical_times:
+            return 0
+        return (
+            bisect_right(critical_times, alert_time)
+            - bisect_left(critical_times, alert_time - PATTERN_LOOKBACK)
+        )
 
     # -------------------------------------------------
     # FORMAT OUTPUT
     # -------------------------------------------------
     def _result(self, alert, valid, reasons):
+        return self.format_result(alert, valid, reasons)
+
+    @staticmethod
+    def format_result(alert, valid, reasons):
         return {
             "alert_time": alert.get("time"),
             "target": alert.get("target"),
@@ -228,3 +260,37 @@ class MetricAlertValidator:
             "reasons": reasons
         }
 
+
+# -------------------------------------------------
+# PROCESS-POOL SHARD ENTRY POINT
+# -------------------------------------------------
+def validate_shard(shard):
+    """
+    Validate one target-partitioned shard of alerts.
+
+    Module-level so it can be pickled into a process pool. Only compact
+    tuples cross the process boundary:
+
+    shard = {
+        "alerts":    [(alert_id, normalized_target, time, severity), ...],
+        "metrics":   {normalized_target: (times, rows)},
+        "criticals": {normalized_target: [times]}
+    }
+
+    Returns:
+        List of (alert_id, metric_supported, reasons)
+    """
+    metrics = shard.get("metrics", {})
+    criticals = shard.get("criticals", {})
+    results = []
+
+    for alert_id, target, alert_time, severity in shard.get("alerts", []):
+        if not alert_time or not target:
+            results.append((alert_id, False, ["Missing time or target"]))
+            continue
+        is_valid, reasons = MetricAlertValidator.evaluate(
+            alert_time, severity, metrics.get(target), criticals.get(target)
+        )
+        results.append((alert_id, is_valid, reasons))
+
+    return results
@@ -41,6 +41,8 @@ import re
 from collections import defaultdict
 from datetime import datetime
 
+from data_engine.root_cause_index import RootCauseIndex, RootCauseScheme, parse_legacy_timestamp
+
 
 class ORACodeMappingEngine:
     """
@@ -444,6 +446,40 @@ class ORACodeMappingEngine:
         }
 
 
+# Timestamps per error key that count for the fallback burst score
+FALLBACK_BURST_WINDOW = 100
+
+_FALLBACK_ORA = re.compile(r'ORA-?\d+', re.IGNORECASE)
+
+
+def _fallback_error_key(alert):
+    """First ORA code of the message (uppercased), else the issue type."""
+    msg = alert.get("message") or alert.get("msg_text") or ""
+    ora_match = _FALLBACK_ORA.search(msg)
+    error_key = ora_match.group(0).upper() if ora_match else (alert.get("issue_type") or "INTERNAL_ERROR")
+    return error_key, error_key
+
+
+def _parse_fallback_timestamp(ts):
+    if isinstance(ts, datetime):
+        return ts
+    if isinstance(ts, str):
+        return parse_legacy_timestamp(ts)
+    return None
+
+
+FALLBACK_SCHEME = RootCauseScheme(
+    "root_cause_fallback",
+    target_key=lambda a: (a.get("target_name") or a.get("target") or "").upper(),
+    error_key=_fallback_error_key,
+    timestamp=lambda a: a.get("collection_timestamp") or a.get("timestamp") or a.get("time"),
+    parse=_parse_fallback_timestamp,
+    critical=lambda a: (a.get("severity") or "").upper() == "CRITICAL",
+    match="contains",
+    stamp_window=FALLBACK_BURST_WINDOW
+)
+
+
 class RootCauseFallbackEngine:
     """
     LAYER 1: ROOT CAUSE FALLBACK (CRITICAL)
@@ -495,14 +531,10 @@ class RootCauseFallbackEngine:
                 "score_breakdown": {}
             }
         
-        # Filter by target if specified
-        if target:
-            target_upper = target.upper()
-            alerts = [a for a in alerts if 
-                     (a.get("target_name") or a.get("target") or "").upper() == target_upper or
-                     target_upper in (a.get("target_name") or a.get("target") or "").upper()]
+        # Alerts of the target (exact or partial name), grouped by error key
+        scope = RootCauseIndex.for_alerts(alerts, FALLBACK_SCHEME).scope(target)
         
-        if not alerts:
+        if not scope.total:
             return {
                 "root_cause": "No alerts for specified target",
                 "abstract_cause": "Target not found in data",
@@ -511,50 +543,24 @@ class RootCauseFallbackEngine:
                 "score_breakdown": {}
             }
         
-        # Score all error types
-        error_scores = defaultdict(lambda: {
-            "count": 0,
-            "critical_count": 0,
-            "timestamps": [],
-            "messages": []
-        })
-        
-        for alert in alerts:
-            msg = alert.get("message") or alert.get("msg_text") or ""
-            issue_type = alert.get("issue_type") or "INTERNAL_ERROR"
-            severity = (alert.get("severity") or "").upper()
-            
-            # Extract ORA code
-            ora_match = re.search(r'ORA-?\d+', msg, re.IGNORECASE)
-            error_key = ora_match.group(0).upper() if ora_match else issue_type
-            
-            error_scores[error_key]["count"] += 1
-            if severity == "CRITICAL":
-                error_scores[error_key]["critical_count"] += 1
-            
-            # Extract timestamp
-            ts = alert.get("collection_timestamp") or alert.get("timestamp") or alert.get("time")
-            if ts:
-                error_scores[error_key]["timestamps"].append(ts)
-            
-            error_scores[error_key]["messages"].append(msg[:100])
+        error_scores = scope.groups
         
         if not error_scores:
             return {
                 "root_cause": "No error patterns detected",
                 "abstract_cause": "General system instability",
                 "confidence": "LOW",
-                "evidence": ["Analyzed {} alerts but no clear pattern emerged".format(len(alerts))],
+                "evidence": ["Analyzed {} alerts but no clear pattern emerged".format(scope.total)],
                 "score_breakdown": {}
             }
         
         # Compute comprehensive scores
-        total_alerts = len(alerts)
+        total_alerts = scope.total
         scored_causes = []
         
-        for error_key, data in error_scores.items():
-            count = data["count"]
-            critical_count = data["critical_count"]
+        for error_key, group in error_scores.items():
+            count = group.count
+            critical_count = group.critical
             
             # 1. Frequency score (0-1)
             frequency_score = count / total_alerts
@@ -563,7 +569,8 @@ class RootCauseFallbackEngine:
             severity_score = critical_count / max(count, 1)
             
             # 3. Burst density (0-1) - are occurrences clustered?
-            burst_score = cls._compute_burst_score(data["timestamps"])
+            #    (first FALLBACK_BURST_WINDOW timestamps, pre-parsed)
+            burst_score = group.burst_density()
             
             # 4. Repetition score (0-1) - raw count impact
             repetition_score = min(count / 1000, 1.0)
@@ -658,37 +665,6 @@ class RootCauseFallbackEngine:
                 confidence
             )
         }
-    
-    @classmethod
-    def _compute_burst_score(cls, timestamps):
-        """Compute burst density score from timestamps."""
-        if not timestamps or len(timestamps) < 2:
-            return 0.3  # Default
-        
-        # Try to parse timestamps
-        parsed = []
-        for ts in timestamps[:100]:  # Limit for performance
-            if isinstance(ts, datetime):
-                parsed.append(ts)
-            elif isinstance(ts, str):
-                for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d-%b-%y %I.%M.%S.%f %p"]:
-                    try:
-                        parsed.append(datetime.strptime(ts[:19], fmt[:min(len(ts), len(fmt))]))
-                        break
-                    except:
-                        pass
-        
-        if len(parsed) < 2:
-            return 0.3
-        
-        parsed.sort()
-        gaps = [(parsed[i+1] - parsed[i]).total_seconds() 
-               for i in range(len(parsed)-1)]
-        
-        avg_gap = sum(gaps) / len(gaps) if gaps else 3600
-        
-        # Short gap = high burst
-        return min(3600 / max(avg_gap, 1), 1.0)
 
 
 class ActionFallbackEngine:
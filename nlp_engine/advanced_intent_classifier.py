@@ -12,6 +12,8 @@ Python 3.6 compatible.
 import re
 from datetime import datetime, timedelta
 
+from nlp_engine.intent_scoring import IntentScoringEngine, keyword_feature
+
 
 class AdvancedIntentClassifier(object):
     """
@@ -70,6 +72,27 @@ class AdvancedIntentClassifier(object):
         }
     }
     
+    _SCORING = None
+    
+    @classmethod
+    def scoring_engine(cls):
+        """
+        Sparse intent x keyword matrix compiled from INTENT_PATTERNS:
+        keyword = 1.0, each synonym of the keyword = 0.7, row scaled later
+        by the intent weight.
+        """
+        if cls._SCORING is None:
+            rows = []
+            for intent_name, intent_config in cls.INTENT_PATTERNS.items():
+                entries = []
+                for keyword in intent_config['keywords']:
+                    entries.append((keyword_feature(keyword), 1.0))
+                    for synonym in cls.SYNONYMS.get(keyword, []):
+                        entries.append((keyword_feature(synonym), 0.7))
+                rows.append((intent_name, entries))
+            cls._SCORING = IntentScoringEngine("advanced_intent", rows)
+        return cls._SCORING
+    
     def __init__(self, db=None):
         """
         Initialize classifier.
@@ -92,12 +115,10 @@ class AdvancedIntentClassifier(object):
         """
         q_lower = question.lower().strip()
         
-        # Detect primary intent
+        # Detect primary intent (synonym-expanded keyword scores)
         intent_scores = {}
-        for intent_name, intent_config in self.INTENT_PATTERNS.items():
-            score = self._score_intent(q_lower, intent_config['keywords'])
-            if score > 0:
-                intent_scores[intent_name] = score * intent_config['weight']
+        for intent_name, score in self.scoring_engine().score(question):
+            intent_scores[intent_name] = score * self.INTENT_PATTERNS[intent_name]['weight']
         
         # Get highest scoring intent
         if intent_scores:
@@ -126,26 +147,9 @@ class AdvancedIntentClassifier(object):
     # INTENT SCORING
     # =====================================================
     
-    def _score_intent(self, question, keywords):
-        """
-        Score how well question matches intent keywords.
-        
-        Uses synonym expansion for better matching.
-        """
-        score = 0
-        
-        for keyword in keywords:
-            # Direct match
-            if keyword in question:
-                score += 1.0
-            
-            # Synonym match
-            if keyword in self.SYNONYMS:
-                for synonym in self.SYNONYMS[keyword]:
-                    if synonym in question:
-                        score += 0.7  # Slightly lower confidence for synonyms
-        
-        return score
+    def classify_batch(self, questions):
+        """Classify many questions (offline evaluation); results align with questions."""
+        return [self.classify(question) for question in questions]
     
     def _find_synonyms_in_question(self, question):
         """Find which concepts were mentioned via synonyms."""
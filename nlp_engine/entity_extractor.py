@@ -15,9 +15,11 @@ Extracts:
 Python 3.6.8 compatible.
 """
 
-import re
 from typing import Dict, List, Optional, Any
 
+from data_engine.target_dictionary import TargetDictionary
+from nlp_engine.question_features import TIME_EXPRESSIONS, QuestionFeatures, keyword_group
+
 
 class EntityExtractor:
     """
@@ -67,14 +69,8 @@ class EntityExtractor:
         "internal": ["internal error", "ora-600", "ora-7445", "kernel"]
     }
     
-    # Time range patterns
-    TIME_PATTERNS = {
-        "last_hour": [r"last\s+hour", r"past\s+hour", r"1\s*h", r"one\s+hour"],
-        "last_day": [r"last\s+day", r"today", r"past\s+24", r"24\s*h"],
-        "yesterday": [r"yesterday", r"last\s+night"],
-        "last_week": [r"last\s+week", r"past\s+week", r"7\s*days?", r"this\s+week"],
-        "last_month": [r"last\s+month", r"past\s+month", r"30\s*days?"]
-    }
+    # Time range patterns (shared with QuestionFeatures.time_expressions)
+    TIME_PATTERNS = TIME_EXPRESSIONS
     
     # Action patterns
     ACTION_PATTERNS = {
@@ -86,6 +82,25 @@ class EntityExtractor:
         "predict": [r"\bpredict\b", r"\bwill\b", r"\bfuture\b", r"\brisk\b", r"\boutage\b"]
     }
     
+    # Words dropped by _tokenize
+    STOP_WORDS = frozenset([
+        "the", "a", "an", "is", "are", "was", "were", "be", "been",
+        "being", "have", "has", "had", "do", "does", "did", "will",
+        "would", "could", "should", "may", "might", "must", "shall",
+        "can", "need", "dare", "ought", "used", "to", "of", "in",
+        "for", "on", "with", "at", "by", "from", "as", "into",
+        "through", "during", "before", "after", "above", "below",
+        "between", "under", "again", "further", "then", "once",
+        "me", "my", "i", "you", "your", "we", "our", "they", "their",
+        "it", "its", "this", "that", "these", "those"
+    ])
+    
+    LIMIT_VERB_KEYWORDS = keyword_group("show", "top", "first", "last", "give")
+    
+    for _keywords in ISSUE_TYPE_PATTERNS.values():
+        keyword_group(_keywords)
+    del _keywords
+    
     def __init__(self, known_databases: List[str] = None):
         """
         Initialize the entity extractor.
@@ -93,11 +108,12 @@ class EntityExtractor:
         Args:
             known_databases: List of known database names for fuzzy matching
         """
-        self.known_databases = set(db.upper() for db in (known_databases or []))
+        self.set_known_databases(known_databases or [])
     
     def set_known_databases(self, databases: List[str]):
         """Update the list of known databases."""
         self.known_databases = set(db.upper() for db in databases)
+        self._known_targets = TargetDictionary.from_names(sorted(self.known_databases))
     
     def extract(self, query: str) -> Dict[str, Any]:
         """
@@ -120,25 +136,24 @@ class EntityExtractor:
                 "raw_query": "show me 18 warning alerts for MIDEVSTB"
             }
         """
-        q_lower = query.lower().strip()
-        q_upper = query.upper()
+        features = QuestionFeatures.of(query)
         
         entities = {
-            "databases": self._extract_databases(query, q_upper),
-            "severity": self._extract_severity(q_lower),
-            "limit": self._extract_limit(q_lower),
-            "offset": self._extract_offset(q_lower),
-            "time_range": self._extract_time_range(q_lower),
-            "issue_type": self._extract_issue_type(q_lower),
-            "action": self._extract_action(q_lower),
-            "ora_codes": self._extract_ora_codes(q_upper),
+            "databases": self._extract_databases(features),
+            "severity": self._extract_severity(features),
+            "limit": self._extract_limit(features),
+            "offset": self._extract_offset(features),
+            "time_range": self._extract_time_range(features),
+            "issue_type": self._extract_issue_type(features),
+            "action": self._extract_action(features),
+            "ora_codes": self._extract_ora_codes(features),
             "raw_query": query,
-            "tokens": self._tokenize(q_lower)
+            "tokens": self._tokenize(features)
         }
         
         return entities
     
-    def _extract_databases(self, query: str, q_upper: str) -> List[str]:
+    def _extract_databases(self, features: QuestionFeatures) -> List[str]:
         """Extract database names from query."""
         databases = []
         
@@ -155,167 +170,130 @@ class EntityExtractor:
                    "LAST", "FIRST", "TOP", "ALL", "MANY", "SOME", "ORA"}
         
         for pattern in db_patterns:
-            matches = re.findall(pattern, q_upper)
+            matches = features.findall(pattern, "upper")
             for match in matches:
                 if match not in excluded and len(match) >= 4:
                     # Check against known databases
                     if self.known_databases:
-                        # Exact match
-                        if match in self.known_databases:
+                        # Exact or partial match (MIDEVSTB matches MIDEVSTBN)
+                        if self._known_targets.related(match):
                             databases.append(match)
-                        # Partial match (MIDEVSTB matches MIDEVSTBN)
-                        else:
-                            for known_db in self.known_databases:
-                                if match in known_db or known_db in match:
-                                    databases.append(match)
-                                    break
                     else:
                         databases.append(match)
         
         return list(set(databases))
     
-    def _extract_severity(self, q_lower: str) -> Optional[str]:
+    def _extract_severity(self, features: QuestionFeatures) -> Optional[str]:
         """Extract severity level from query."""
         # Priority 1: Check for exclusion patterns (most specific)
-        if re.search(r'exclud(?:e|ing)?\s+warning', q_lower):
+        if features.search(r'exclud(?:e|ing)?\s+warning'):
             return "CRITICAL"
-        if re.search(r'exclud(?:e|ing)?\s+critical', q_lower):
+        if features.search(r'exclud(?:e|ing)?\s+critical'):
             return "WARNING"
         
         # Priority 2: Check for "only" patterns
-        if re.search(r'(?:only|just|fakt)\s+critical', q_lower):
+        if features.search(r'(?:only|just|fakt)\s+critical'):
             return "CRITICAL"
-        if re.search(r'(?:only|just|fakt)\s+warnings?', q_lower):
+        if features.search(r'(?:only|just|fakt)\s+warnings?'):
             return "WARNING"
-        if re.search(r'critical\s+(?:only|fakt)', q_lower):
+        if features.search(r'critical\s+(?:only|fakt)'):
             return "CRITICAL"
-        if re.search(r'warnings?\s+(?:only|fakt)', q_lower):
+        if features.search(r'warnings?\s+(?:only|fakt)'):
             return "WARNING"
         
         # Priority 3: Check for show only patterns
-        if re.search(r'show\s+(?:me\s+)?(?:only\s+)?warnings?', q_lower):
+        if features.search(r'show\s+(?:me\s+)?(?:only\s+)?warnings?'):
             return "WARNING"
-        if re.search(r'show\s+(?:me\s+)?(?:only\s+)?critical', q_lower):
+        if features.search(r'show\s+(?:me\s+)?(?:only\s+)?critical'):
             return "CRITICAL"
             
         # Priority 4: Check for "how many X" patterns
-        if re.search(r'how\s+many\s+(?:warning|warnings)', q_lower):
+        if features.search(r'how\s+many\s+(?:warning|warnings)'):
             return "WARNING"
-        if re.search(r'how\s+many\s+critical', q_lower):
+        if features.search(r'how\s+many\s+critical'):
             return "CRITICAL"
         
         # Priority 5: Check for explicit severity mentions at word boundaries
         # But avoid matching in "no warning alerts" context
-        if re.search(r'(?<!no\s)\bwarnings?\b', q_lower) and not re.search(r'\bcritical\b', q_lower):
+        if features.search(r'(?<!no\s)\bwarnings?\b') and not features.search(r'\bcritical\b'):
             return "WARNING"
-        if re.search(r'(?<!no\s)\bcritical\b', q_lower) and not re.search(r'\bwarnings?\b', q_lower):
+        if features.search(r'(?<!no\s)\bcritical\b') and not features.search(r'\bwarnings?\b'):
             return "CRITICAL"
         
         # If both mentioned, check context
-        has_warning = re.search(r'\bwarnings?\b', q_lower)
-        has_critical = re.search(r'\bcritical\b', q_lower)
+        has_warning = features.search(r'\bwarnings?\b')
+        has_critical = features.search(r'\bcritical\b')
         if has_warning and has_critical:
             # Check which is the focus
-            if re.search(r'(?:show|list|get)\s+(?:me\s+)?(?:the\s+)?warnings?', q_lower):
+            if features.search(r'(?:show|list|get)\s+(?:me\s+)?(?:the\s+)?warnings?'):
                 return "WARNING"
-            if re.search(r'(?:show|list|get)\s+(?:me\s+)?(?:the\s+)?critical', q_lower):
+            if features.search(r'(?:show|list|get)\s+(?:me\s+)?(?:the\s+)?critical'):
                 return "CRITICAL"
         
         return None
     
-    def _extract_limit(self, q_lower: str) -> Optional[int]:
+    def _extract_limit(self, features: QuestionFeatures) -> Optional[int]:
         """Extract numeric limit from query."""
-        # Pattern: "show me 18", "top 10", "first 5", "20 alerts"
-        limit_patterns = [
-            r'(?:show|display|list|get|give)\s+(?:me\s+)?(\d+)',
-            r'(?:top|first|last)\s+(\d+)',
-            r'(\d+)\s+(?:alerts?|issues?|errors?|warnings?)',
-            r'only\s+(\d+)',
-            r'limit\s+(\d+)'
-        ]
-        
-        for pattern in limit_patterns:
-            match = re.search(pattern, q_lower)
-            if match:
-                try:
-                    return int(match.group(1))
-                except (ValueError, IndexError):
-                    pass
+        # Pattern: "show me 18", "top 10", "first 5", "20 alerts" (LIMIT_PATTERNS)
+        if features.limit is not None:
+            return features.limit
         
         # Check word numbers
+        if not features.any_of(self.LIMIT_VERB_KEYWORDS):
+            return None
         for word, num in self.WORD_NUMBERS.items():
-            if re.search(r'\b' + word + r'\b', q_lower):
-                if any(kw in q_lower for kw in ["show", "top", "first", "last", "give"]):
-                    return num
+            if features.search(r'\b' + word + r'\b'):
+                return num
         
         return None
     
-    def _extract_offset(self, q_lower: str) -> int:
+    def _extract_offset(self, features: QuestionFeatures) -> int:
         """Extract pagination offset from query."""
         # Pattern: "next 10", "10-20", "from 20"
         
         # Range pattern: "10-20", "alerts 10 to 20"
-        range_match = re.search(r'(\d+)\s*[-–to]\s*(\d+)', q_lower)
+        range_match = features.search(r'(\d+)\s*[-–to]\s*(\d+)')
         if range_match:
             return int(range_match.group(1))
         
         # "next" implies continuation
-        if re.search(r'\bnext\b', q_lower):
+        if features.search(r'\bnext\b'):
             # Will be resolved by context manager
             return -1  # Special value indicating "continue from last"
         
         # "from X"
-        from_match = re.search(r'from\s+(\d+)', q_lower)
+        from_match = features.search(r'from\s+(\d+)')
         if from_match:
             return int(from_match.group(1))
         
         return 0
     
-    def _extract_time_range(self, q_lower: str) -> Optional[str]:
+    def _extract_time_range(self, features: QuestionFeatures) -> Optional[str]:
         """Extract time range from query."""
-        for time_key, patterns in self.TIME_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, q_lower):
-                    return time_key
-        return None
+        time_ranges = features.time_expressions
+        return time_ranges[0] if time_ranges else None
     
-    def _extract_issue_type(self, q_lower: str) -> Optional[str]:
+    def _extract_issue_type(self, features: QuestionFeatures) -> Optional[str]:
         """Extract issue type from query."""
         for issue_type, keywords in self.ISSUE_TYPE_PATTERNS.items():
-            for keyword in keywords:
-                if keyword in q_lower:
-                    return issue_type
+            if features.any_of(keywords):
+                return issue_type
         return None
     
-    def _extract_action(self, q_lower: str) -> str:
+    def _extract_action(self, features: QuestionFeatures) -> str:
         """Extract the primary action from query."""
         for action, patterns in self.ACTION_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, q_lower):
-                    return action
+            if features.any_search(patterns):
+                return action
         return "list"  # Default action
     
-    def _extract_ora_codes(self, q_upper: str) -> List[str]:
+    def _extract_ora_codes(self, features: QuestionFeatures) -> List[str]:
         """Extract ORA error codes from query."""
-        ora_pattern = r'ORA[-\s]?(\d{3,5})'
-        matches = re.findall(ora_pattern, q_upper)
-        return ["ORA-{}".format(m) for m in matches]
+        return list(features.ora_codes)
     
-    def _tokenize(self, q_lower: str) -> List[str]:
-        """Tokenize query into meaningful words."""
-        # Remove punctuation and split
-        tokens = re.findall(r'\b[a-z0-9]+\b', q_lower)
-        # Filter stop words
-        stop_words = {"the", "a", "an", "is", "are", "was", "were", "be", "been",
-                     "being", "have", "has", "had", "do", "does", "did", "will",
-                     "would", "could", "should", "may", "might", "must", "shall",
-                     "can", "need", "dare", "ought", "used", "to", "of", "in",
-                     "for", "on", "with", "at", "by", "from", "as", "into",
-                     "through", "during", "before", "after", "above", "below",
-                     "between", "under", "again", "further", "then", "once",
-                     "me", "my", "i", "you", "your", "we", "our", "they", "their",
-                     "it", "its", "this", "that", "these", "those"}
-        return [t for t in tokens if t not in stop_words]
+    def _tokenize(self, features: QuestionFeatures) -> List[str]:
+        """Tokenize query into meaningful words (stop words removed)."""
+        return [t for t in features.tokens if t not in self.STOP_WORDS]
 
 
 # Singleton instance
@@ -22,6 +22,10 @@ from collections import Counter, defaultdict
 from typing import Dict, List, Any, Optional, Tuple
 import re
 
+from data_engine.root_cause_index import RootCauseIndex, RootCauseScheme
+from data_engine.target_dictionary import TargetDictionary
+from data_engine.time_histograms import TimeHistogramIndex, TimeScheme
+
 
 # ============================================================
 # MODULE 7: REASONING MEMORY (Stateful Context)
@@ -119,81 +123,51 @@ class AntiFalseZero:
         
         target_upper = target.upper().strip()
         search_steps = []
+        targets = TargetDictionary.for_alerts(alerts)
         
         # Step 1: Exact match
-        exact_matches = []
-        for a in alerts:
-            t = (a.get("target") or a.get("target_name") or "").upper()
-            if t == target_upper:
-                exact_matches.append(a)
+        exact_matches = [alerts[i] for i in targets.alert_indices(target_upper)]
         
         if exact_matches:
             return target_upper, exact_matches, "Exact match found"
         search_steps.append("exact match: 0")
         
         # Step 2: Contains match - DISABLED to avoid MIDEVSTB matching MIDEVSTBN
-        # Only use this for TYPO correction, not substring matching
-        contains_matches = []
-        matched_target = None
-        for a in alerts:
-            t = (a.get("target") or a.get("target_name") or "").upper()
-            # STRICT: Only match if lengths are similar (typo correction, not substring)
-            if len(target_upper) > 0 and len(t) > 0:
-                if len(t) == len(target_upper) and t != target_upper:
-                    # Same length, different - might be typo
-                    matches = sum(1 for c1, c2 in zip(target_upper, t) if c1 == c2)
-                    if matches / len(target_upper) >= 0.85:  # 85% character match
-                        contains_matches.append(a)
-                        matched_target = t
-        
-        if contains_matches:
+        # Only use this for TYPO correction, not substring matching:
+        # same length, different, 85% character match
+        typo_targets = targets.same_length_matches(target_upper, 0.85)
+        if typo_targets:
+            indices = targets.alert_indices(typo_targets)
+            contains_matches = [alerts[i] for i in indices]
+            matched_target = (alerts[indices[-1]].get("target") or alerts[indices[-1]].get("target_name") or "").upper()
             return matched_target, contains_matches, "Typo correction: searched '{}', matched '{}'".format(target_upper, matched_target)
         search_steps.append("contains match: 0")
         
-        # Step 3: Fuzzy match (handle typos like MIDDEVSTBN vs MIDEVSTBN)
-        def similarity(s1, s2):
-            """Simple character-based similarity."""
-            if not s1 or not s2:
-                return 0
-            s1, s2 = s1.upper(), s2.upper()
-            matches = sum(1 for c in s1 if c in s2)
-            return matches / max(len(s1), len(s2))
-        
-        best_match = None
-        best_score = 0
-        best_target_name = None
-        
-        known_targets = set()
-        for a in alerts:
-            t = (a.get("target") or a.get("target_name") or "").upper()
-            if t:
-                known_targets.add(t)
-        
-        for known in known_targets:
-            score = similarity(target_upper, known)
-            if score > best_score and score > 0.7:  # 70% threshold
-                best_score = score
-                best_target_name = known
-        
-        if best_target_name:
-            fuzzy_matches = [a for a in alerts 
-                          if (a.get("target") or a.get("target_name") or "").upper() == best_target_name]
-            return best_target_name, fuzzy_matches, "Fuzzy match: '{}' interpreted as '{}' ({}% similar)".format(
-                target_upper, best_target_name, int(best_score * 100))
+        # Step 3: Fuzzy match (handle typos like MIDDEVSTBN vs MIDEVSTBN):
+        # ranked edit-distance candidates, only a unique nearest one is used
+        candidates = targets.suggest(target_upper)
+        best = candidates[:1]
+        if len(candidates) > 1 and candidates[1][1] == candidates[0][1]:
+            best = []
+        
+        if best:
+            best_target_name, distance = best[0]
+            indices = targets.alert_indices(targets.raw_keys(best_target_name))
+            fuzzy_matches = [alerts[i] for i in indices]
+            similar = 1.0 - float(distance) / max(len(target_upper), len(best_target_name))
+            return best_target_name, fuzzy_matches, "Fuzzy match: '{}' interpreted as '{}' ({}% similar, {} edit(s))".format(
+                target_upper, best_target_name, int(similar * 100), distance)
         search_steps.append("fuzzy match: 0")
         
         # Step 4: Return all alerts with available targets as alternative
-        all_targets = Counter()
-        for a in alerts:
-            t = (a.get("target") or a.get("target_name") or "").upper()
-            if t:
-                all_targets[t] += 1
-        
         explanation = "No alerts for '{}'. Checked: {}. Available databases: {}".format(
             target_upper,
             ", ".join(search_steps),
-            ", ".join("{} ({})".format(t, c) for t, c in all_targets.most_common(5))
+            ", ".join("{} ({})".format(t, c) for t, c in targets.top_targets(5))
         )
+        if candidates:
+            explanation += ". Did you mean: {}".format(
+                ", ".join("{} ({} edit(s))".format(name, d) for name, d in candidates[:5]))
         
         return None, [], explanation
     
@@ -418,6 +392,48 @@ class TemporalAwareness:
 # ============================================================
 # MODULE 3: TEMPORAL INTELLIGENCE
 # ============================================================
+def _parse_pattern_time(time_str):
+    """(hour, weekday) of an alert time: first of the three formats matching str(value)[:19]."""
+    text = str(time_str)[:19]
+    for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%d-%b-%y %I.%M.%S.%f %p"]:
+        try:
+            dt = datetime.strptime(text, fmt[:21])
+            return dt.hour, dt.weekday()
+        except Exception:
+            continue
+    return None
+
+
+def _parse_window_time(time_str):
+    try:
+        dt = datetime.strptime(str(time_str)[:19], "%Y-%m-%dT%H:%M:%S")
+        return dt.hour, dt.weekday()
+    except Exception:
+        return None
+
+
+def _time_target_key(alert):
+    return (alert.get("target") or alert.get("target_name") or "").upper()
+
+
+TIME_PATTERN_SCHEME = TimeScheme(
+    "intelligence_engine",
+    target_key=_time_target_key,
+    timestamp=lambda a: a.get("alert_time") or a.get("time") or a.get("first_seen"),
+    parse=_parse_pattern_time
+)
+
+FAILURE_WINDOW_SCHEME = TimeScheme(
+    "intelligence_engine.failure_windows",
+    target_key=_time_target_key,
+    timestamp=lambda a: a.get("alert_time") or a.get("time"),
+    parse=_parse_window_time
+)
+
+# Evening/night hours (18:00 - 06:00)
+NIGHT_HOURS = [18, 19, 20, 21, 22, 23, 0, 1, 2, 3, 4, 5]
+
+
 class TemporalIntelligence:
     """
     Reasons over time patterns, not just filters.
@@ -445,40 +461,15 @@ class TemporalIntelligence:
         if not alerts:
             return {"pattern_insight": "No data for temporal analysis"}
         
-        hourly = Counter()
-        daily = Counter()
-        night_count = 0  # 18:00 - 06:00
-        day_count = 0    # 06:00 - 18:00
-        
-        for a in alerts:
-            time_str = a.get("alert_time") or a.get("time") or a.get("first_seen") or ""
-            if not time_str:
-                continue
-            
-            try:
-                dt = None
-                for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%d-%b-%y %I.%M.%S.%f %p"]:
-                    try:
-                        dt = datetime.strptime(str(time_str)[:19], fmt[:21])
-                        break
-                    except:
-                        continue
-                
-                if dt:
-                    hourly[dt.hour] += 1
-                    daily[dt.strftime("%A")] += 1
-                    
-                    if dt.hour >= 18 or dt.hour < 6:
-                        night_count += 1
-                    else:
-                        day_count += 1
-            except:
-                continue
+        histogram = TimeHistogramIndex.for_alerts(alerts, TIME_PATTERN_SCHEME).scope()
+        hourly = histogram.distribution()
+        night_count = histogram.count(NIGHT_HOURS)        # 18:00 - 06:00
+        day_count = histogram.stamped() - night_count     # 06:00 - 18:00
         
         total_with_time = night_count + day_count
         
         # Find peak hour
-        peak_hour = hourly.most_common(1)[0] if hourly else (0, 0)
+        peak_hour = histogram.peak_hour() or (0, 0)
         
         # Calculate night ratio
         night_ratio = night_count / total_with_time if total_with_time > 0 else 0
@@ -502,13 +493,13 @@ class TemporalIntelligence:
                     consecutive_peaks.append((top_hours[i], top_hours[i+1]))
         
         return {
-            "hourly_distribution": dict(hourly),
+            "hourly_distribution": hourly,
             "peak_hour": peak_hour,
             "peak_hours_top5": sorted_hours[:5],
             "night_ratio": night_ratio,
             "day_ratio": 1 - night_ratio,
             "pattern_insight": insight,
-            "day_of_week": dict(daily),
+            "day_of_week": histogram.day_counts(),
             "consecutive_peak_windows": consecutive_peaks,
             "total_with_timestamps": total_with_time
         }
@@ -521,25 +512,15 @@ class TemporalIntelligence:
         
         Returns windows where failures cluster.
         """
-        hourly_severity = defaultdict(Counter)
-        
-        for a in alerts:
-            time_str = a.get("alert_time") or a.get("time") or ""
-            severity = (a.get("severity") or a.get("alert_state") or "").upper()
-            
-            if severity_filter.upper() not in severity:
-                continue
-            
-            try:
-                dt = datetime.strptime(str(time_str)[:19], "%Y-%m-%dT%H:%M:%S")
-                hourly_severity[dt.hour][severity] += 1
-            except:
-                continue
+        histogram = TimeHistogramIndex.for_alerts(alerts, FAILURE_WINDOW_SCHEME).scope()
+        label = severity_filter.upper()
+        matching = histogram.severity_matching(label)
+        exact = histogram.severities.get(label)
         
         # Find hours with high critical concentration
         failure_windows = []
-        for hour, counts in hourly_severity.items():
-            critical_count = counts.get(severity_filter.upper(), 0)
+        for hour in matching.hour_order():
+            critical_count = exact.hours[hour] if exact is not None else 0
             if critical_count > 100:  # Threshold
                 failure_windows.append({
                     "hour": hour,
@@ -553,6 +534,28 @@ class TemporalIntelligence:
 # ============================================================
 # MODULE 4: ROOT CAUSE SCORING ENGINE
 # ============================================================
+def _cause_error_key(alert):
+    cause = RootCauseScorer._categorize_cause(alert)
+    return cause, cause
+
+
+def _parse_cause_timestamp(time_str):
+    try:
+        return datetime.strptime(str(time_str)[:19], "%Y-%m-%dT%H:%M:%S")
+    except Exception:
+        return None
+
+
+CAUSE_SCHEME = RootCauseScheme(
+    "intelligence_engine",
+    target_key=lambda a: (a.get("target") or a.get("target_name") or "").upper(),
+    error_key=_cause_error_key,
+    timestamp=lambda a: a.get("alert_time") or a.get("time"),
+    parse=_parse_cause_timestamp,
+    critical=lambda a: (a.get("severity") or a.get("alert_state") or "INFO").upper() == "CRITICAL"
+)
+
+
 class RootCauseScorer:
     """
     Scores potential root causes instead of just classifying.
@@ -578,66 +581,38 @@ class RootCauseScorer:
         if not alerts:
             return []
         
-        # Filter by target if provided - STRICT EXACT MATCHING
-        if target:
-            target_upper = target.upper()
-            alerts = [a for a in alerts 
-                     if (a.get("target") or a.get("target_name") or "").upper() == target_upper]
+        # Alerts of the target - STRICT EXACT MATCHING - grouped by cause
+        scope = RootCauseIndex.for_alerts(alerts, CAUSE_SCHEME).scope(target)
         
-        if not alerts:
+        if not scope.total:
             return []
         
-        # Count causes
-        cause_counts = Counter()
-        cause_severity = defaultdict(Counter)
-        cause_times = defaultdict(list)
-        
         now = datetime.now()
-        
-        for a in alerts:
-            # Get cause category
-            cause = RootCauseScorer._categorize_cause(a)
-            cause_counts[cause] += 1
-            
-            # Track severity
-            sev = (a.get("severity") or a.get("alert_state") or "INFO").upper()
-            cause_severity[cause][sev] += 1
-            
-            # Track time for recency
-            time_str = a.get("alert_time") or a.get("time") or ""
-            try:
-                dt = datetime.strptime(str(time_str)[:19], "%Y-%m-%dT%H:%M:%S")
-                cause_times[cause].append(dt)
-            except:
-                pass
-        
-        total_alerts = len(alerts)
+        total_alerts = scope.total
         
         # Score each cause
         scored_causes = []
-        for cause, count in cause_counts.items():
+        for cause, group in scope.groups.items():
+            count = group.count
+            
             # Frequency score (0-1)
             freq_score = count / total_alerts
             
             # Recency score (0-1) - based on most recent occurrence
-            times = cause_times.get(cause, [])
-            if times:
-                most_recent = max(times)
+            most_recent = group.latest()
+            if most_recent is not None:
                 days_ago = (now - most_recent).days
                 recency_score = max(0, 1 - (days_ago / 365))  # Decay over a year
             else:
                 recency_score = 0.5  # Neutral if no time data
             
             # Severity score (0-1)
-            sev_counts = cause_severity[cause]
-            critical_ratio = sev_counts.get("CRITICAL", 0) / count if count > 0 else 0
+            critical_ratio = group.critical / count if count > 0 else 0
             severity_score = critical_ratio
             
             # Pattern score - check for time clustering
-            if len(times) > 10:
-                hours = [t.hour for t in times]
-                hour_counts = Counter(hours)
-                max_hour_concentration = max(hour_counts.values()) / len(times)
+            if len(group.epochs) > 10:
+                max_hour_concentration = max(group.hour_counts().values()) / len(group.epochs)
                 pattern_score = max_hour_concentration  # Higher if clustered
             else:
                 pattern_score = 0.3  # Neutral
@@ -30,6 +30,8 @@ Python 3.6.8 compatible.
 
 import re
 
+from nlp_engine.question_features import QuestionFeatures, keyword_group
+
 
 class IntentResponseRouter(object):
     """
@@ -274,6 +276,40 @@ class IntentResponseRouter(object):
     FACTUAL_PATTERNS = FACT_PATTERNS
     ANALYTICAL_PATTERNS = ANALYSIS_PATTERNS
     
+    # =====================================================
+    # MODE KEYWORDS (matched via shared QuestionFeatures)
+    # =====================================================
+    COUNT_MODE_KEYWORDS = keyword_group("how many", "total", "count", "number of", "tally", "sum of", "amount of")
+    HOUR_KEYWORDS = keyword_group("which hour", "what hour", "peak hour")
+    EXPLAIN_KEYWORDS = keyword_group("why", "reason", "root cause", "what caused", "explain")
+    ACTION_KEYWORDS = keyword_group("what should", "how to fix", "how do i", "recommend",
+                                    "action", "steps", "remediate", "solution")
+    PREDICT_KEYWORDS = keyword_group("risk", "predict", "likely to fail", "will fail", "forecast")
+    LIST_KEYWORDS = keyword_group("show", "list", "give me", "display", "what are")
+    FILTER_KEYWORDS = keyword_group("only", "just", "filter", "exclude", "without")
+    COUNT_QUESTION_KEYWORDS = keyword_group("how many", "total", "count", "number of", "how much")
+    TIME_QUESTION_KEYWORDS = keyword_group("which hour", "what hour", "peak hour", "highest hour",
+                                           "peak", "frequency", "when")
+    CLARIFY_FILTER_KEYWORDS = keyword_group("only", "just", "filter")
+    CLARIFY_TARGET_KEYWORDS = keyword_group("database", "alert", "standby", "tablespace")
+    WORD_NUMBERS = [
+        ("five", 5), ("ten", 10), ("twenty", 20), ("thirty", 30),
+        ("forty", 40), ("fifty", 50), ("hundred", 100)
+    ]
+    FILTER_SEVERITY_MAP = [
+        ("critical", "CRITICAL"),
+        ("high", "CRITICAL"),
+        ("error", "CRITICAL"),
+        ("medium", "WARNING"),
+        ("warning", "WARNING"),
+        ("low", "INFO"),
+        ("info", "INFO")
+    ]
+    keyword_group(word for word, _ in WORD_NUMBERS)
+    keyword_group(word for word, _ in FILTER_SEVERITY_MAP)
+    keyword_group("critical", "warning", "standby", "dataguard", "tablespace",
+                  "times", "hours", "database", "alert", "root cause")
+    
     # =====================================================
     # FOLLOWUP DETECTION METHODS (NEW - CONVERSATIONAL)
     # =====================================================
@@ -295,25 +331,23 @@ class IntentResponseRouter(object):
             tuple: (is_followup: bool, followup_type: str or None)
                 followup_type can be: LIMIT, REFERENCE, FILTER
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # Check LIMIT patterns (highest priority - very specific)
-        for pattern in cls.FOLLOWUP_LIMIT_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return (True, "LIMIT")
+        if features.any_search(cls.FOLLOWUP_LIMIT_PATTERNS, "norm", re.IGNORECASE):
+            return (True, "LIMIT")
         
         # Check REFERENCE patterns (medium priority)
-        for pattern in cls.FOLLOWUP_REFERENCE_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return (True, "REFERENCE")
+        if features.any_search(cls.FOLLOWUP_REFERENCE_PATTERNS, "norm", re.IGNORECASE):
+            return (True, "REFERENCE")
         
         # Check FILTER patterns (lower priority - could be standalone)
         for pattern in cls.FOLLOWUP_FILTER_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
+            if features.search(pattern, "norm", re.IGNORECASE):
                 # Only treat as follow-up if question is SHORT (< 8 words)
                 # "only critical" = follow-up
                 # "show me only critical alerts for MIDEVSTBN" = standalone
-                word_count = len(q_lower.split())
+                word_count = len(features.words)
                 if word_count <= 8:
                     return (True, "FILTER")
         
@@ -335,20 +369,15 @@ class IntentResponseRouter(object):
         Returns:
             int or None: The limit number, or None if not found
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # Try to find digit
-        digit_match = re.search(r"\b(\d+)\b", q_lower)
-        if digit_match:
-            return int(digit_match.group(1))
+        if features.numbers:
+            return features.numbers[0]
         
         # Try word numbers
-        word_numbers = {
-            "five": 5, "ten": 10, "twenty": 20, "thirty": 30,
-            "forty": 40, "fifty": 50, "hundred": 100
-        }
-        for word, num in word_numbers.items():
-            if word in q_lower:
+        for word, num in cls.WORD_NUMBERS:
+            if features.has(word):
                 return num
         
         return None
@@ -369,26 +398,16 @@ class IntentResponseRouter(object):
         Returns:
             str or None: Severity level, or None if not found
         """
-        q_lower = question.lower().strip()
-        
-        severity_map = {
-            "critical": "CRITICAL",
-            "high": "CRITICAL",
-            "error": "CRITICAL",
-            "medium": "WARNING",
-            "warning": "WARNING",
-            "low": "INFO",
-            "info": "INFO"
-        }
+        features = QuestionFeatures.of(question)
         
-        for keyword, severity in severity_map.items():
-            if keyword in q_lower:
+        for keyword, severity in cls.FILTER_SEVERITY_MAP:
+            if features.has(keyword):
                 return severity
         
         return None
     
     @classmethod
-    def _extract_entity_from_question(cls, q_upper):
+    def _extract_entity_from_question(cls, features):
         """
         Extract database/entity name from question text.
         
@@ -396,7 +415,7 @@ class IntentResponseRouter(object):
         Used by EXPLAIN/ACTION/PREDICT modes to know WHAT to analyze.
         
         Args:
-            q_upper: Uppercase version of question text
+            features: QuestionFeatures of the question (searched uppercase)
             
         Returns:
             str or None: Entity name if found
@@ -418,7 +437,7 @@ class IntentResponseRouter(object):
                    "WHY", "HOW", "SHOULD", "STEPS", "ACTION", "FIX", "REASON"}
         
         for pattern in entity_patterns:
-            match = re.search(pattern, q_upper)
+            match = features.search(pattern, "upper")
             if match:
                 entity = match.group(1)
                 if entity not in excluded and len(entity) >= 4:
@@ -458,9 +477,9 @@ class IntentResponseRouter(object):
                 "requires_clarification": bool
             }
         """
-        q_lower = question.lower().strip()
-        q_upper = question.upper()
-        word_count = len(q_lower.split())
+        features = QuestionFeatures.of(question)
+        q_lower = features.norm
+        word_count = len(features.words)
         
         result = {
             "mode": None,
@@ -475,23 +494,22 @@ class IntentResponseRouter(object):
         # PRIORITY 1: COUNT MODE (ABSOLUTE - HARD GUARD)
         # =====================================================
         # INTELLIGENCE: Recognize quantitative intent through various phrasings
-        count_keywords = ["how many", "total", "count", "number of", "tally", "sum of", "amount of"]
-        is_count = any(kw in q_lower for kw in count_keywords)
+        is_count = features.any_of(cls.COUNT_MODE_KEYWORDS)
         
         # Exception: "which hour" type questions are TIME, not COUNT
-        is_time_question = any(kw in q_lower for kw in ["which hour", "what hour", "peak hour"])
+        is_time_question = features.any_of(cls.HOUR_KEYWORDS)
         
         if is_count and not is_time_question:
             result["mode"] = cls.MODE_COUNT
             
             # Detect what to count
-            if "critical" in q_lower:
+            if features.has("critical"):
                 result["filters"]["severity"] = "CRITICAL"
-            if "warning" in q_lower:
+            if features.has("warning"):
                 result["filters"]["severity"] = "WARNING"
-            if "standby" in q_lower or "dataguard" in q_lower:
+            if features.has("standby") or features.has("dataguard"):
                 result["filters"]["alert_type"] = "dataguard"
-            if "tablespace" in q_lower:
+            if features.has("tablespace"):
                 result["filters"]["alert_type"] = "tablespace"
             
             return result
@@ -499,11 +517,10 @@ class IntentResponseRouter(object):
         # =====================================================
         # PRIORITY 2: EXPLAIN MODE (why, reason, root cause)
         # =====================================================
-        explain_keywords = ["why", "reason", "root cause", "what caused", "explain"]
-        if any(kw in q_lower for kw in explain_keywords):
+        if features.any_of(cls.EXPLAIN_KEYWORDS):
             result["mode"] = cls.MODE_EXPLAIN
             # INTELLIGENCE: Still extract entity for targeted explanation
-            entity = cls._extract_entity_from_question(q_upper)
+            entity = cls._extract_entity_from_question(features)
             if entity:
                 result["entity"] = entity
             return result
@@ -511,12 +528,10 @@ class IntentResponseRouter(object):
         # =====================================================
         # PRIORITY 3: ACTION MODE (what to do, fix, steps)
         # =====================================================
-        action_keywords = ["what should", "how to fix", "how do i", "recommend", 
-                          "action", "steps", "remediate", "solution"]
-        if any(kw in q_lower for kw in action_keywords):
+        if features.any_of(cls.ACTION_KEYWORDS):
             result["mode"] = cls.MODE_ACTION
             # INTELLIGENCE: Still extract entity for targeted actions
-            entity = cls._extract_entity_from_question(q_upper)
+            entity = cls._extract_entity_from_question(features)
             if entity:
                 result["entity"] = entity
             return result
@@ -524,11 +539,10 @@ class IntentResponseRouter(object):
         # =====================================================
         # PRIORITY 4: PREDICT MODE (risk, likely, will fail)
         # =====================================================
-        predict_keywords = ["risk", "predict", "likely to fail", "will fail", "forecast"]
-        if any(kw in q_lower for kw in predict_keywords):
+        if features.any_of(cls.PREDICT_KEYWORDS):
             result["mode"] = cls.MODE_PREDICT
             # INTELLIGENCE: Still extract entity for targeted prediction
-            entity = cls._extract_entity_from_question(q_upper)
+            entity = cls._extract_entity_from_question(features)
             if entity:
                 result["entity"] = entity
             return result
@@ -563,7 +577,7 @@ class IntentResponseRouter(object):
                         "PROBLEMS", "ORA", "ERROR", "WARNING", "INFO"}
         
         for pattern in db_patterns:
-            match = re.search(pattern, q_upper)
+            match = features.search(pattern, "upper")
             if match:
                 potential_db = match.group(1)
                 if potential_db not in excluded_words and len(potential_db) >= 4:
@@ -596,16 +610,15 @@ class IntentResponseRouter(object):
         # =====================================================
         # PRIORITY 7: LIST MODE (show, list, give)
         # =====================================================
-        list_keywords = ["show", "list", "give me", "display", "what are"]
-        if any(kw in q_lower for kw in list_keywords):
+        if features.any_of(cls.LIST_KEYWORDS):
             result["mode"] = cls.MODE_LIST
             
             # Extract filters
-            if "critical" in q_lower:
+            if features.has("critical"):
                 result["filters"]["severity"] = "CRITICAL"
-            if "standby" in q_lower or "dataguard" in q_lower:
+            if features.has("standby") or features.has("dataguard"):
                 result["filters"]["alert_type"] = "dataguard"
-            if "tablespace" in q_lower:
+            if features.has("tablespace"):
                 result["filters"]["alert_type"] = "tablespace"
             
             # Extract limit
@@ -618,8 +631,7 @@ class IntentResponseRouter(object):
         # =====================================================
         # PRIORITY 8: FILTER MODE (only critical, without X)
         # =====================================================
-        filter_keywords = ["only", "just", "filter", "exclude", "without"]
-        if any(kw in q_lower for kw in filter_keywords):
+        if features.any_of(cls.FILTER_KEYWORDS):
             result["mode"] = cls.MODE_FILTER
             sev = cls.extract_filter_severity(question)
             if sev:
@@ -668,8 +680,9 @@ class IntentResponseRouter(object):
         Returns:
             tuple: (needs_clarification: bool, clarification_type: str or None)
         """
-        q_lower = question.lower().strip()
-        word_count = len(q_lower.split())
+        features = QuestionFeatures.of(question)
+        q_lower = features.norm
+        word_count = len(features.words)
         
         # =====================================================
         # Rule 1: Very short queries without context
@@ -682,15 +695,15 @@ class IntentResponseRouter(object):
         # Rule 2: Pronouns without prior context
         # =====================================================
         pronouns = ["this", "that", "these", "those", "it", "them", "same"]
-        has_pronoun = any(p in q_lower.split() for p in pronouns)
+        has_pronoun = any(p in features.words for p in pronouns)
         if has_pronoun and not has_prior_context:
             return (True, "PRONOUN_REFERENCE")
         
         # =====================================================
         # Rule 3: Filter without target
         # =====================================================
-        is_filter = any(kw in q_lower for kw in ["only", "just", "filter"])
-        has_target = any(kw in q_lower for kw in ["database", "alert", "standby", "tablespace"])
+        is_filter = features.any_of(cls.CLARIFY_FILTER_KEYWORDS)
+        has_target = features.any_of(cls.CLARIFY_TARGET_KEYWORDS)
         if is_filter and not has_target and not has_prior_context:
             return (True, "FILTER_NO_TARGET")
         
@@ -774,35 +787,32 @@ class IntentResponseRouter(object):
         Returns:
             str: FACT_COUNT, FACT_TIME, or FACT_ENTITY (or None if not a FACT question)
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # =====================================================
         # PRIORITY 1: FACT_COUNT (ALWAYS WINS)
         # If COUNT keywords present, NEVER return TIME
         # =====================================================
-        for pattern in cls.FACT_COUNT_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                # Double-check: if question is ONLY about hour/time, it's TIME
-                # But if it says "how many" + anything, it's COUNT
-                is_pure_time_question = any(re.search(p, q_lower, re.IGNORECASE) 
-                                           for p in [r"which\s+hour", r"what\s+hour", r"peak\s+hour"])
-                # COUNT keywords override EVERYTHING except pure time questions
-                if not is_pure_time_question or "how many" in q_lower or "total" in q_lower or "count" in q_lower:
-                    return cls.FACT_COUNT
+        if features.any_search(cls.FACT_COUNT_PATTERNS, "norm", re.IGNORECASE):
+            # Double-check: if question is ONLY about hour/time, it's TIME
+            # But if it says "how many" + anything, it's COUNT
+            is_pure_time_question = features.any_search(
+                [r"which\s+hour", r"what\s+hour", r"peak\s+hour"], "norm", re.IGNORECASE)
+            # COUNT keywords override EVERYTHING except pure time questions
+            if not is_pure_time_question or features.has("how many") or features.has("total") or features.has("count"):
+                return cls.FACT_COUNT
         
         # =====================================================
         # PRIORITY 2: FACT_TIME (only if not COUNT)
         # =====================================================
-        for pattern in cls.FACT_TIME_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.FACT_TIME
+        if features.any_search(cls.FACT_TIME_PATTERNS, "norm", re.IGNORECASE):
+            return cls.FACT_TIME
         
         # =====================================================
         # PRIORITY 3: FACT_ENTITY
         # =====================================================
-        for pattern in cls.FACT_ENTITY_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.FACT_ENTITY
+        if features.any_search(cls.FACT_ENTITY_PATTERNS, "norm", re.IGNORECASE):
+            return cls.FACT_ENTITY
         
         return None  # Not a FACT sub-intent
     
@@ -824,18 +834,17 @@ class IntentResponseRouter(object):
         Returns:
             bool: True if this is a count question
         """
-        q_lower = question.lower().strip()
-        count_keywords = ["how many", "total", "count", "number of", "how much"]
+        features = QuestionFeatures.of(question)
         
         # STRICT: If ANY count keyword is present, this is a COUNT question
-        has_count_keyword = any(kw in q_lower for kw in count_keywords)
+        has_count_keyword = features.any_of(cls.COUNT_QUESTION_KEYWORDS)
         
         # Exception: "how many hours" or "how many times" might be frequency
         # But still treat as COUNT if combined with entity
         if has_count_keyword:
             # Check if it's asking "how many TIMES did X happen" (frequency)
-            is_frequency = "times" in q_lower or "hours" in q_lower
-            if is_frequency and ("database" not in q_lower and "alert" not in q_lower):
+            is_frequency = features.has("times") or features.has("hours")
+            if is_frequency and (not features.has("database") and not features.has("alert")):
                 return False  # It's asking about frequency pattern, not count
             return True  # It's a count question
         
@@ -857,10 +866,7 @@ class IntentResponseRouter(object):
         if cls.is_count_question(question):
             return False  # COUNT always wins
         
-        q_lower = question.lower().strip()
-        time_keywords = ["which hour", "what hour", "peak hour", "highest hour", 
-                        "peak", "frequency", "when"]
-        return any(kw in q_lower for kw in time_keywords)
+        return QuestionFeatures.of(question).any_of(cls.TIME_QUESTION_KEYWORDS)
     
     @classmethod
     def get_question_type(cls, question, intent=None):
@@ -883,32 +889,27 @@ class IntentResponseRouter(object):
         Returns:
             str: FACT, STATUS, ANALYSIS, PREDICTION, or ACTION
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # Check ACTION patterns first (most restrictive - user must EXPLICITLY ask)
-        for pattern in cls.ACTION_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.TYPE_ACTION
+        if features.any_search(cls.ACTION_PATTERNS, "norm", re.IGNORECASE):
+            return cls.TYPE_ACTION
         
         # Check STATUS patterns (DOWN/CRITICAL/RUNNING)
-        for pattern in cls.STATUS_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.TYPE_STATUS
+        if features.any_search(cls.STATUS_PATTERNS, "norm", re.IGNORECASE):
+            return cls.TYPE_STATUS
         
         # Check PREDICTION patterns (risk/forecast)
-        for pattern in cls.PREDICTION_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.TYPE_PREDICTION
+        if features.any_search(cls.PREDICTION_PATTERNS, "norm", re.IGNORECASE):
+            return cls.TYPE_PREDICTION
         
         # Check ANALYSIS patterns (WHY questions - NO actions)
-        for pattern in cls.ANALYSIS_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.TYPE_ANALYSIS
+        if features.any_search(cls.ANALYSIS_PATTERNS, "norm", re.IGNORECASE):
+            return cls.TYPE_ANALYSIS
         
         # Check FACT patterns
-        for pattern in cls.FACT_PATTERNS:
-            if re.search(pattern, q_lower, re.IGNORECASE):
-                return cls.TYPE_FACT
+        if features.any_search(cls.FACT_PATTERNS, "norm", re.IGNORECASE):
+            return cls.TYPE_FACT
         
         # Default based on intent if no pattern matched
         if intent:
@@ -983,8 +984,8 @@ class IntentResponseRouter(object):
             return True
         
         # Explicit root cause request overrides
-        q_lower = question.lower()
-        if "root cause" in q_lower or "why" in q_lower.split()[:3]:  # "why" at start
+        features = QuestionFeatures.of(question)
+        if features.has("root cause") or "why" in features.words[:3]:  # "why" at start
             return True
         
         return False
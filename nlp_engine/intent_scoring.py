@@ -0,0 +1,261 @@
+# nlp_engine/intent_scoring.py
+"""
+==============================================================
+INTENT SCORING ENGINE - Sparse intent x feature weights
+==============================================================
+
+Keyword/pattern intent tables (OEMIntentEngine.INTENT_PATTERNS,
+AdvancedIntentClassifier.INTENT_PATTERNS) used to be scored with
+nested loops: for every intent, every keyword and every regex.
+
+IntentScoringEngine compiles such a table once into a sparse
+intent x feature weight matrix:
+
+- Features:  keywords (substring of the lowercased question) and
+             regex patterns (searched on the stripped lowercase text)
+- Rows:      one per intent, (feature, weight) entries in table order
+- Columns:   feature -> intents that use it
+
+A question becomes a sparse 0/1 feature vector (keyword hits come
+from the shared QuestionFeatures scan; a regex is only evaluated when
+the longest literal it requires occurs in the text) and is scored
+with one sparse matrix-vector product. Only intents that share a
+feature with the question are touched; each row is summed in table
+order, so scores equal the old loops exactly.
+
+Usage:
+    engine = IntentScoringEngine("oem", [
+        ("ALERT_LIST", [(keyword_feature("show"), 1.0),
+                        (pattern_feature(r"list\\s+alerts"), 2.0)]),
+    ])
+    engine.score("show me alerts")        # [("ALERT_LIST", 1.0)]
+    engine.score_batch(questions)         # offline evaluation
+
+Python 3.6.8 compatible.
+"""
+
+import re
+import threading
+import time
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from nlp_engine.question_features import QuestionFeatures, compiled, keyword_group
+
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+
+def _literal_runs(items, ignore_case, runs):
+    """Collect literal runs every match of the parsed pattern must contain."""
+    run = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            runs.append(("".join(run), ignore_case))
+            run = []
+        if op is sre_constants.SUBPATTERN:
+            add_flags, del_flags, sub = av[1], av[2], av[3]
+            scoped = (ignore_case or bool(add_flags & re.IGNORECASE)) and not (del_flags & re.IGNORECASE)
+            _literal_runs(sub, scoped, runs)
+        elif op in _REPEATS and av[0] >= 1:
+            _literal_runs(av[2], ignore_case, runs)
+        # Branches, classes, anchors, optional repeats: nothing required
+    if run:
+        runs.append(("".join(run), ignore_case))
+
+
+def required_literal(pattern, flags=0):
+    """
+    Longest ASCII literal (>= 2 chars) that any match of the pattern
+    contains, lowercased when matched case-insensitively; None if the
+    pattern has no such literal. Used to skip regexes whose literal
+    cannot occur in the (lowercased) question.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError, ValueError):
+        return None
+    state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+    global_flags = getattr(state, "flags", flags)
+    runs = []
+    _literal_runs(parsed, bool(global_flags & re.IGNORECASE), runs)
+
+    best = None
+    for text, ignore_case in runs:
+        if len(text) < 2 or any(ord(ch) > 127 for ch in text):
+            continue
+        if ignore_case:
+            text = text.lower()
+        if best is None or len(text) > len(best):
+            best = text
+    return best
+
+
+def keyword_feature(keyword):
+    """Feature: keyword occurs in the lowercased question."""
+    return ("kw", keyword)
+
+
+def pattern_feature(pattern, flags=re.IGNORECASE):
+    """Feature: regex matches the stripped lowercased question."""
+    return ("re", pattern, flags)
+
+
+class IntentScoringEngine(object):
+    """Sparse intent x feature matrix built from a keyword/pattern table."""
+
+    def __init__(self, name, rows):
+        """
+        Args:
+            name: Engine name (for stats)
+            rows: [(intent, [(feature, weight), ...]), ...] in table order.
+                  Invalid regex features are dropped (they never matched).
+        """
+        self.name = name
+        self.intents = []
+        self.features = []
+        self._feature_index = {}
+        self._rows = []                 # row -> ((feature index, weight), ...)
+        self._columns = []              # feature index -> (row, ...)
+        self._keyword_columns = {}      # keyword -> feature index
+        self._pattern_columns = []      # (feature index, pattern, flags, required literal)
+
+        for intent, entries in rows:
+            row_id = len(self.intents)
+            self.intents.append(intent)
+            row = []
+            for feature, weight in entries:
+                index = self._feature(feature)
+                if index is None:
+                    continue
+                row.append((index, weight))
+                if not self._columns[index] or self._columns[index][-1] != row_id:
+                    self._columns[index].append(row_id)
+            self._rows.append(tuple(row))
+
+        self._columns = [tuple(col) for col in self._columns]
+        keyword_group(self._keyword_columns)
+
+        self._lock = threading.Lock()
+        self._stats = {"questions": 0, "seconds": 0.0}
+
+    def _feature(self, feature):
+        index = self._feature_index.get(feature)
+        if index is not None:
+            return index
+        if feature[0] == "re":
+            try:
+                compiled(feature[1], feature[2])
+            except re.error:
+                return None
+        index = len(self.features)
+        self.features.append(feature)
+        self._feature_index[feature] = index
+        self._columns.append([])
+        if feature[0] == "kw":
+            self._keyword_columns[feature[1]] = index
+        else:
+            self._pattern_columns.append(
+                (index, feature[1], feature[2], required_literal(feature[1], feature[2])))
+        return index
+
+    # =====================================================
+    # SCORING
+    # =====================================================
+    def vector(self, question):
+        """Active feature indices (sparse 0/1 vector) of a question."""
+        features = question if isinstance(question, QuestionFeatures) else QuestionFeatures.of(question)
+        active = set()
+        keyword_columns = self._keyword_columns
+        for word in features.keywords:
+            index = keyword_columns.get(word)
+            if index is not None:
+                active.add(index)
+        text = features.norm
+        try:
+            text.encode("ascii")
+            prefilter = True
+        except UnicodeEncodeError:
+            # Case folding outside ASCII ("\u017f" matches "s") defeats
+            # the literal check; evaluate every pattern
+            prefilter = False
+        for index, pattern, flags, literal in self._pattern_columns:
+            if prefilter and literal is not None and literal not in text:
+                continue
+            if features.search(pattern, "norm", flags):
+                active.add(index)
+        return active
+
+    def score(self, question):
+        """
+        Non-zero intent scores of a question (str or QuestionFeatures),
+        as [(intent, score), ...] in table order.
+        """
+        active = self.vector(question)
+        rows = set()
+        for index in active:
+            rows.update(self._columns[index])
+
+        scores = []
+        for row_id in sorted(rows):
+            score = 0
+            for index, weight in self._rows[row_id]:
+                if index in active:
+                    score += weight
+            if score > 0:
+                scores.append((self.intents[row_id], score))
+        return scores
+
+    def score_batch(self, questions):
+        """
+        Score many questions at once (offline evaluation).
+        Repeated questions are scored once.
+
+        Returns:
+            List of score lists, aligned with questions
+        """
+        start = time.time()
+        results = {}
+        for question in questions:
+            if question not in results:
+                results[question] = self.score(question)
+        with self._lock:
+            self._stats["questions"] += len(questions)
+            self._stats["seconds"] += time.time() - start
+        return [results[question] for question in questions]
+
+    def best_batch(self, questions, default=None):
+        """Highest-scoring intent per question (first in table order on ties)."""
+        best = []
+        for scores in self.score_batch(questions):
+            top = default
+            top_score = 0
+            for intent, score in scores:
+                if score > top_score:
+                    top, top_score = intent, score
+            best.append(top)
+        return best
+
+    def stats(self):
+        nnz = sum(len(row) for row in self._rows)
+        with self._lock:
+            questions = self._stats["questions"]
+            seconds = self._stats["seconds"]
+        return {
+            "name": self.name,
+            "intents": len(self.intents),
+            "features": len(self.features),
+            "keyword_features": len(self._keyword_columns),
+            "pattern_features": len(self._pattern_columns),
+            "prefiltered_patterns": sum(1 for col in self._pattern_columns if col[3] is not None),
+            "nonzero_weights": nnz,
+            "batch_questions": questions,
+            "batch_questions_per_sec": round(questions / seconds, 1) if seconds else None,
+        }
@@ -28,6 +28,7 @@ Python 3.6 compatible.
 
 from data_engine.global_cache import GLOBAL_DATA
 from nlp_engine.context_memory import ContextMemory
+from services.result_handles import RESULT_HANDLES
 
 
 class NLPReasoner:
@@ -208,13 +209,14 @@ class NLPReasoner:
                 "target": context.get("database")
             }
         
-        # Filter alerts based on last context
-        filtered_alerts = self._filter_by_context(alerts, context)
-        if not filtered_alerts:
+        # Filter alerts based on last context (row ids kept as the
+        # session's result handle, so paging does not re-filter)
+        rows = self._context_rows(alerts, context)
+        if not rows:
             return None
         
         # Get top N alerts
-        top_alerts = filtered_alerts[:limit]
+        top_alerts = RESULT_HANDLES.page(alerts, rows, 0, limit)
         
         # Build answer
         answer = self._format_alert_list(top_alerts, limit, context)
@@ -307,20 +309,29 @@ class NLPReasoner:
     
     def _filter_by_context(self, alerts, context):
         """Filter alerts based on session context."""
-        filtered = alerts
-        
+        db, sev, matches = self._context_filter(context)
+        if not db and not sev:
+            return alerts
+        return [a for a in alerts if matches(a)]
+    
+    def _context_rows(self, alerts, context):
+        """Row ids of _filter_by_context, as the session's result handle."""
+        db, sev, matches = self._context_filter(context)
+        return RESULT_HANDLES.rows(alerts, ("nlp_context", db, sev), matches)
+    
+    def _context_filter(self, context):
+        """(database, severity, per-alert test) of the session context."""
         # Filter by database if available
-        if context.get("database"):
-            db = context["database"].upper()
-            filtered = [a for a in filtered if 
-                       (a.get("target_name") or a.get("target") or "").upper() == db]
-        
+        db = context["database"].upper() if context.get("database") else None
         # Filter by severity if available
-        if context.get("severity"):
-            sev = context["severity"]
-            filtered = [a for a in filtered if a.get("severity") == sev]
+        sev = context.get("severity") or None
+        
+        def matches(a):
+            if db and (a.get("target_name") or a.get("target") or "").upper() != db:
+                return False
+            return not sev or a.get("severity") == sev
         
-        return filtered
+        return db, sev, matches
     
     def _format_alert_list(self, alerts, limit, context, severity_filter=None):
         """Format a list of alerts into a readable answer."""
@@ -12,13 +12,54 @@ CRITICAL: Extracts REAL information from OEM alerts:
 This is the data extraction layer that feeds the reasoning engine.
 INTERNAL_ERROR is a SYMPTOM, not a root cause - this module drills down.
 
+One analyzer is shared per data generation (OEMDataAnalyzer.current()
+/ for_alerts()). Each target's alerts (from a target index built once)
+are scanned in a single pass feeding ORA codes and context categories;
+over all alerts, one pass feeds the database summary and one the Data
+Guard and tablespace analyses. Hour distributions come from the shared
+hour histograms (data_engine.time_histograms). The aggregates are
+memoized, and every call builds a fresh result dict from them, so
+follow-up questions about the same database do not rescan the alerts.
+
 Python 3.6 compatible.
 """
 
 import re
+import threading
 from datetime import datetime
 from collections import Counter, defaultdict
 
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+from data_engine.time_histograms import TimeHistogramIndex, TimeScheme
+
+
+_ORA_PATTERN = re.compile(r'ORA[-\s]?(\d{3,5})(?:\s*\[(\d+)\])?', re.IGNORECASE)
+_TABLESPACE_PATTERN = re.compile(r'tablespace\s+(\w+)', re.IGNORECASE)
+
+
+def _keyword_pattern(keywords):
+    """Regex matching any of the keywords as a substring ("kw in text")."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def _parse_alert_hour(alert_time):
+    """(hour, weekday) of an alert time (datetime or ISO string), None if unparseable."""
+    if isinstance(alert_time, str):
+        try:
+            alert_time = datetime.fromisoformat(alert_time.replace("T", " ").split("+")[0])
+        except ValueError:
+            return None
+    return alert_time.hour, alert_time.weekday()
+
+
+# Handle both "alert_time" and "time" column names
+TIME_DISTRIBUTION_SCHEME = TimeScheme(
+    "oem_data_analyzer",
+    target_key=lambda a: (a.get("target_name") or a.get("target") or "").upper(),
+    timestamp=lambda a: a.get("alert_time") or a.get("time"),
+    parse=_parse_alert_hour
+)
+
 
 class OEMDataAnalyzer:
     """
@@ -74,54 +115,293 @@ class OEMDataAnalyzer:
         "INSTANCE": ["instance", "shutdown", "startup", "crash", "internal error"]
     }
     
-    def __init__(self, alerts):
+    # Data Guard / standby message keywords
+    DATAGUARD_KEYWORDS = [
+        "standby", "data guard", "dataguard", "apply lag", "transport lag",
+        "mrp", "redo apply", "gap", "archive gap", "switchover", "failover"
+    ]
+    
+    # Tablespace / storage message keywords
+    SPACE_KEYWORDS = ["tablespace", "space", "full", "storage", "datafile"]
+    
+    _CONTEXT_PATTERNS = None
+    _DATAGUARD_PATTERN = _keyword_pattern(DATAGUARD_KEYWORDS)
+    _SPACE_PATTERN = _keyword_pattern(SPACE_KEYWORDS)
+    
+    _CURRENT = {"key": None, "analyzer": None}
+    _OTHER = {"key": None, "alerts": None, "analyzer": None}
+    _REGISTRY_LOCK = threading.Lock()
+    
+    def __init__(self, alerts, generation=None):
         """
         Initialize with alert data.
         
         Args:
             alerts: List of alert dicts from GLOBAL_DATA
+            generation: Data generation the alerts belong to
         """
         self.alerts = alerts or []
+        self.generation = generation
+        self._by_target = None      # TARGET -> alerts (target_name or target)
+        self._raw_targets = None    # set of alert "target" values, uppercased
+        self._scans = {}            # TARGET (None = all alerts) -> ORA/context aggregates
+        self._times = None          # hour histograms (TimeHistogramIndex)
+        self._summary = None        # per-database and severity counts of all alerts
+        self._keywords = None       # Data Guard and tablespace alerts
+        self._ranges = {}           # (TARGET, start_hour, end_hour) -> alerts in range
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
     
-    def extract_ora_codes(self, target=None):
-        """
-        Extract all ORA codes from alerts.
-        
-        Returns:
-            {
-                "ora_codes": [{"code": "ORA-600", "count": 100, "arguments": [...]}],
-                "total_ora_errors": int,
-                "most_common": str,
-                "severity_breakdown": dict
+    # =====================================================
+    # SHARED INSTANCES
+    # =====================================================
+    @classmethod
+    def current(cls):
+        """Analyzer for GLOBAL_DATA["alerts"], replaced when the generation changes."""
+        alerts = GLOBAL_DATA.get("alerts") or []
+        key = (get_data_generation(), id(alerts), len(alerts))
+        with cls._REGISTRY_LOCK:
+            if cls._CURRENT["key"] == key:
+                return cls._CURRENT["analyzer"]
+            analyzer = cls(alerts, generation=key[0])
+            cls._CURRENT["key"] = key
+            cls._CURRENT["analyzer"] = analyzer
+        return analyzer
+    
+    @classmethod
+    def for_alerts(cls, alerts):
+        """Analyzer for an alert list (the current one, or a cached one-off)."""
+        if alerts is GLOBAL_DATA.get("alerts"):
+            return cls.current()
+        key = (id(alerts), len(alerts or []))
+        with cls._REGISTRY_LOCK:
+            if cls._OTHER["key"] == key and cls._OTHER["alerts"] is alerts:
+                return cls._OTHER["analyzer"]
+            analyzer = cls(alerts)
+            cls._OTHER.update(key=key, alerts=alerts, analyzer=analyzer)
+        return analyzer
+    
+    def warm(self):
+        """Run the all-alerts scans now (database summary, Data Guard, tablespace, hours)."""
+        self._summary_scan()
+        self._keyword_scan()
+        self._time_index().build()
+        return self
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "alerts": len(self.alerts),
+                "targets_indexed": len(self._by_target) if self._by_target is not None else 0,
+                "scans": len(self._scans) + (self._summary is not None) + (self._keywords is not None),
+                "time_ranges": len(self._ranges),
+                "hits": self._hits,
+                "misses": self._misses,
             }
+    
+    # =====================================================
+    # SCANS (one pass per target, memoized)
+    # =====================================================
+    def _target_key(self, target):
+        return target.upper() if target else None
+    
+    def _target_alerts(self, target):
+        """Alerts whose target_name (or target) equals target, case-insensitive."""
+        with self._lock:
+            if self._by_target is None:
+                by_target = {}
+                for alert in self.alerts:
+                    key = (alert.get("target_name") or alert.get("target") or "").upper()
+                    by_target.setdefault(key, []).append(alert)
+                self._by_target = by_target
+            return self._by_target.get(target.upper(), [])
+    
+    def _alert_targets(self):
+        """Set of alert "target" values, uppercased (fuzzy candidates)."""
+        with self._lock:
+            if self._raw_targets is None:
+                raw_targets = set()
+                for alert in self.alerts:
+                    t = alert.get("target", "")
+                    if t:
+                        raw_targets.add(t.upper())
+                self._raw_targets = raw_targets
+            return self._raw_targets
+    
+    def _scan(self, target):
+        """
+        ORA code and context aggregates of the alerts of target (or all
+        alerts for None), computed in a single pass and memoized.
         """
-        ora_pattern: re.Pattern[str] = re.compile(r'ORA[-\s]?(\d{3,5})(?:\s*\[(\d+)\])?', re.IGNORECASE)
+        key = self._target_key(target)
+        with self._lock:
+            scan = self._scans.get(key)
+            if scan is not None:
+                self._hits += 1
+                return scan
+            self._misses += 1
+            alerts = self.alerts if key is None else self._target_alerts(key)
+            scan = self._build_scan(alerts)
+            self._scans[key] = scan
+            return scan
+    
+    def _summary_scan(self):
+        """Per-database and severity counts of all alerts, memoized."""
+        with self._lock:
+            if self._summary is not None:
+                self._hits += 1
+                return self._summary
+            self._misses += 1
+            self._summary = self._build_summary_scan(self.alerts)
+            return self._summary
+    
+    def _keyword_scan(self):
+        """Data Guard and tablespace alerts of all alerts (one pass), memoized."""
+        with self._lock:
+            if self._keywords is not None:
+                self._hits += 1
+                return self._keywords
+            self._misses += 1
+            self._keywords = self._build_keyword_scan(self.alerts)
+            return self._keywords
+    
+    def _time_index(self):
+        """Hour histograms of the alerts (shared per data generation)."""
+        with self._lock:
+            if self._times is None:
+                self._times = TimeHistogramIndex.for_alerts(self.alerts, TIME_DISTRIBUTION_SCHEME)
+            return self._times
+    
+    @classmethod
+    def _context_patterns(cls):
+        """[(category, keyword regex), ...] in CONTEXT_KEYWORDS order."""
+        if cls._CONTEXT_PATTERNS is None:
+            cls._CONTEXT_PATTERNS = [
+                (category, _keyword_pattern(keywords))
+                for category, keywords in cls.CONTEXT_KEYWORDS.items()
+            ]
+        return cls._CONTEXT_PATTERNS
+    
+    def _build_scan(self, alerts):
         ora_counts = Counter()
         ora_arguments = defaultdict(list)
         ora_samples = defaultdict(list)
+        category_counts = Counter()
+        category_evidence = defaultdict(list)
+        context_patterns = self._context_patterns()
         
-        for alert in self.alerts:
-            if target and not self._matches_target(alert, target):
-                continue
+        for alert in alerts:
+            raw_message = alert.get("message") or ""
+            message = raw_message.lower()
             
-            message = alert.get("message", "")
-            matches = ora_pattern.findall(message)
-            
-            for match in matches:
+            # ORA codes
+            for match in _ORA_PATTERN.findall(raw_message):
                 code = "ORA-{0}".format(match[0])
                 ora_counts[code] += 1
-                
-                # Extract argument if present
                 if match[1]:
                     ora_arguments[code].append(match[1])
-                
-                # Store sample message (first 5)
                 if len(ora_samples[code]) < 5:
                     ora_samples[code].append({
-                        "message": message[:200],
+                        "message": raw_message[:200],
                         "time": alert.get("time"),
                         "target": alert.get("target")
                     })
+            
+            # Context categories
+            for category, pattern in context_patterns:
+                if pattern.search(message):
+                    category_counts[category] += 1
+                    if len(category_evidence[category]) < 3:
+                        category_evidence[category].append({
+                            "message": raw_message[:150],
+                            "time": alert.get("time")
+                        })
+            
+        scan = {
+            "ora_counts": ora_counts,
+            "ora_arguments": dict((code, list(set(args))[:5]) for code, args in ora_arguments.items()),
+            "ora_samples": dict(ora_samples),
+            "category_counts": category_counts,
+            "category_evidence": dict(category_evidence),
+        }
+        return scan
+    
+    def _build_summary_scan(self, alerts):
+        db_stats = defaultdict(lambda: {"count": 0, "critical": 0, "warning": 0})
+        severity_counts = Counter()
+        
+        for alert in alerts:
+            # Handle both "target_name" and "target" column names
+            target = alert.get("target_name") or alert.get("target")
+            if not target:
+                continue
+            
+            db_stats[target]["count"] += 1
+            
+            # Handle both "alert_state" and "severity" column names
+            severity = (alert.get("alert_state") or alert.get("severity") or "").upper()
+            
+            # Also check alert_critical flag
+            if alert.get("alert_critical") == "1" or severity == "CRITICAL":
+                severity_counts["CRITICAL"] += 1
+                db_stats[target]["critical"] += 1
+            elif severity == "WARNING":
+                severity_counts["WARNING"] += 1
+                db_stats[target]["warning"] += 1
+            else:
+                severity_counts[severity] += 1
+        
+        return {
+            "databases": sorted(db_stats.items(), key=lambda x: x[1]["count"], reverse=True),
+            "severity_counts": severity_counts,
+        }
+    
+    def _build_keyword_scan(self, alerts):
+        dataguard_alerts = []
+        tablespace_alerts = []
+        tablespace_counts = Counter()
+        
+        for alert in alerts:
+            raw_message = alert.get("message") or ""
+            message = raw_message.lower()
+            
+            # Data Guard / standby
+            if self._DATAGUARD_PATTERN.search(message):
+                dataguard_alerts.append(alert)
+            
+            # Tablespace / storage
+            metric = (alert.get("metric") or "").lower()
+            if self._SPACE_PATTERN.search(message) or "tablespace" in metric:
+                tablespace_alerts.append(alert)
+                match = _TABLESPACE_PATTERN.search(raw_message)
+                if match:
+                    tablespace_counts[match.group(1).upper()] += 1
+        
+        return {
+            "dataguard_alerts": dataguard_alerts,
+            "tablespace_alerts": tablespace_alerts,
+            "tablespace_counts": tablespace_counts,
+        }
+    
+    # =====================================================
+    # ANALYSES (fresh result dicts from the memoized scans)
+    # =====================================================
+    def extract_ora_codes(self, target=None):
+        """
+        Extract all ORA codes from alerts.
+        
+        Returns:
+            {
+                "ora_codes": [{"code": "ORA-600", "count": 100, "arguments": [...]}],
+                "total_ora_errors": int,
+                "most_common": str,
+                "severity_breakdown": dict
+            }
+        """
+        scan = self._scan(target)
+        ora_counts = scan["ora_counts"]
         
         # Build result
         ora_codes = []
@@ -129,8 +409,8 @@ class OEMDataAnalyzer:
             entry = {
                 "code": code,
                 "count": count,
-                "arguments": list(set(ora_arguments.get(code, [])))[:5],
-                "samples": ora_samples.get(code, [])
+                "arguments": list(scan["ora_arguments"].get(code, [])),
+                "samples": [dict(sample) for sample in scan["ora_samples"].get(code, [])]
             }
             
             # Add category info if known
@@ -160,33 +440,16 @@ class OEMDataAnalyzer:
                 "evidence": [...]
             }
         """
-        category_counts = Counter()
-        category_evidence = defaultdict(list)
-        
-        for alert in self.alerts:
-            if target and not self._matches_target(alert, target):
-                continue
-            
-            message = (alert.get("message") or "").lower()
-            
-            for category, keywords in self.CONTEXT_KEYWORDS.items():
-                found = False
-                for kw in keywords:
-                    if kw in message:
-                        found = True
-                        break
-                if found:
-                    category_counts[category] += 1
-                    if len(category_evidence[category]) < 3:
-                        category_evidence[category].append({
-                            "message": alert.get("message", "")[:150],
-                            "time": alert.get("time")
-                        })
+        scan = self._scan(target)
+        category_counts = scan["category_counts"]
         
         return {
             "categories": dict(category_counts),
             "primary_category": category_counts.most_common(1)[0][0] if category_counts else "UNKNOWN",
-            "evidence": dict(category_evidence)
+            "evidence": dict(
+                (category, [dict(item) for item in items])
+                for category, items in scan["category_evidence"].items()
+            )
         }
     
     def analyze_time_distribution(self, target=None, time_range=None):
@@ -206,55 +469,37 @@ class OEMDataAnalyzer:
                 "alerts_in_range_details": [...]
             }
         """
-        hourly_counts = Counter()
-        alerts_in_range = []
-        
-        for alert in self.alerts:
-            if target and not self._matches_target(alert, target):
-                continue
-            
-            # Handle both "alert_time" and "time" column names
-            alert_time = alert.get("alert_time") or alert.get("time")
-            if not alert_time:
-                continue
-            
-            if isinstance(alert_time, str):
-                try:
-                    alert_time: datetime = datetime.fromisoformat(alert_time.replace("T", " ").split("+")[0])
-                except ValueError:
-                    continue
-            
-            hour = alert_time.hour
-            hourly_counts[hour] += 1
-            
-            # Check time range filter
-            if time_range:
-                start_hour = time_range.get("start_hour", 0)
-                end_hour = time_range.get("end_hour", 24)
-                
-                # Handle overnight ranges (e.g., 22:00 - 06:00)
-                if start_hour > end_hour:
-                    in_range = hour >= start_hour or hour < end_hour
-                else:
-                    in_range = start_hour <= hour < end_hour
-                
-                if in_range:
-                    alerts_in_range.append(alert)
-        
-        peak_hour = hourly_counts.most_common(1)[0][0] if hourly_counts else None
+        histogram = self._time_index().scope(target)
+        peak = histogram.peak_hour()
         
         result = {
-            "hourly_distribution": dict(hourly_counts),
-            "peak_hour": peak_hour,
-            "peak_count": hourly_counts[peak_hour] if peak_hour is not None else 0
+            "hourly_distribution": histogram.distribution(),
+            "peak_hour": peak[0] if peak else None,
+            "peak_count": peak[1] if peak else 0
         }
         
         if time_range:
+            alerts_in_range = self._alerts_in_range(
+                target, time_range.get("start_hour", 0), time_range.get("end_hour", 24))
             result["alerts_in_range"] = len(alerts_in_range)
             result["alerts_in_range_details"] = alerts_in_range[:20]  # Sample
         
         return result
     
+    def _alerts_in_range(self, target, start_hour, end_hour):
+        key = (self._target_key(target), start_hour, end_hour)
+        with self._lock:
+            found = self._ranges.get(key)
+            if found is None:
+                # Handle overnight ranges (e.g., 22:00 - 06:00)
+                if start_hour > end_hour:
+                    hours = [hour for hour in range(24) if hour >= start_hour or hour < end_hour]
+                else:
+                    hours = [hour for hour in range(24) if start_hour <= hour < end_hour]
+                found = self._time_index().select(target, hours)
+                self._ranges[key] = found
+            return found
+    
     def get_database_summary(self):
         """
         Get summary across all databases.
@@ -267,31 +512,7 @@ class OEMDataAnalyzer:
                 "severity_summary": {"CRITICAL": X, "WARNING": Y}
             }
         """
-        db_stats = defaultdict(lambda: {"count": 0, "critical": 0, "warning": 0})
-        severity_counts = Counter()
-        
-        for alert in self.alerts:
-            # Handle both "target_name" and "target" column names
-            target = alert.get("target_name") or alert.get("target")
-            if not target:
-                continue
-            
-            db_stats[target]["count"] += 1
-            
-            # Handle both "alert_state" and "severity" column names
-            severity = (alert.get("alert_state") or alert.get("severity") or "").upper()
-            
-            # Also check alert_critical flag
-            is_critical = alert.get("alert_critical") == "1" or severity == "CRITICAL"
-            
-            if is_critical:
-                severity_counts["CRITICAL"] += 1
-                db_stats[target]["critical"] += 1
-            elif severity == "WARNING":
-                severity_counts["WARNING"] += 1
-                db_stats[target]["warning"] += 1
-            else:
-                severity_counts[severity] += 1
+        scan = self._summary_scan()
         
         databases = [
             {
@@ -301,7 +522,7 @@ class OEMDataAnalyzer:
                 "warning_count": stats["warning"],
                 "percentage": round(stats["count"] / len(self.alerts) * 100, 1) if self.alerts else 0
             }
-            for name, stats in sorted(db_stats.items(), key=lambda x: x[1]["count"], reverse=True)
+            for name, stats in scan["databases"]
         ]
         
         return {
@@ -309,28 +530,14 @@ class OEMDataAnalyzer:
             "total_alerts": len(self.alerts),
             "database_count": len(databases),
             "most_affected": databases[0]["name"] if databases else None,
-            "severity_summary": dict(severity_counts)
+            "severity_summary": dict(scan["severity_counts"])
         }
     
     def find_standby_dataguard_alerts(self):
         """
         Find alerts related to Data Guard / Standby databases.
         """
-        dataguard_keywords = [
-            "standby", "data guard", "dataguard", "apply lag", "transport lag",
-            "mrp", "redo apply", "gap", "archive gap", "switchover", "failover"
-        ]
-        
-        found_alerts = []
-        for alert in self.alerts:
-            message = (alert.get("message") or "").lower()
-            found = False
-            for kw in dataguard_keywords:
-                if kw in message:
-                    found = True
-                    break
-            if found:
-                found_alerts.append(alert)
+        found_alerts = self._keyword_scan()["dataguard_alerts"]
         
         return {
             "found": len(found_alerts) > 0,
@@ -343,32 +550,12 @@ class OEMDataAnalyzer:
         """
         Find alerts related to tablespace / storage issues.
         """
-        tablespace_pattern: re.Pattern[str] = re.compile(r'tablespace\s+(\w+)', re.IGNORECASE)
-        space_keywords = ["tablespace", "space", "full", "storage", "datafile"]
-        
-        tablespace_counts = Counter()
-        found_alerts = []
-        
-        for alert in self.alerts:
-            message = (alert.get("message") or "").lower()
-            metric = (alert.get("metric") or "").lower()
-            
-            found = False
-            for kw in space_keywords:
-                if kw in message:
-                    found = True
-                    break
-            if found or "tablespace" in metric:
-                found_alerts.append(alert)
-                
-                # Extract tablespace name
-                match = tablespace_pattern.search(alert.get("message", ""))
-                if match:
-                    tablespace_counts[match.group(1).upper()] += 1
+        scan = self._keyword_scan()
+        found_alerts = scan["tablespace_alerts"]
         
         tablespaces = [
             {"name": name, "alert_count": count}
-            for name, count in tablespace_counts.most_common()
+            for name, count in scan["tablespace_counts"].most_common()
         ]
         
         return {
@@ -390,17 +577,13 @@ class OEMDataAnalyzer:
             return {"error": "Target database required for root cause analysis"}
         
         # Get target-specific alerts
-        target_alerts = [a for a in self.alerts if self._matches_target(a, target)]
+        target_alerts = self._target_alerts(target)
         
         # WIDENING LOGIC: If no exact match, try fuzzy match
         actual_target = target
         if not target_alerts:
             # Try fuzzy matching - look for similar database names
-            all_targets = set()
-            for a in self.alerts:
-                t = a.get("target", "")
-                if t:
-                    all_targets.add(t.upper())
+            all_targets = self._alert_targets()
             
             # Find closest match - but require HIGH similarity (not substring)
             target_upper = target.upper()
@@ -425,7 +608,7 @@ class OEMDataAnalyzer:
             
             if best_match:
                 actual_target = best_match
-                target_alerts = [a for a in self.alerts if self._matches_target(a, actual_target)]
+                target_alerts = self._target_alerts(actual_target)
         
         if not target_alerts:
             # WIDENING: Return summary of what WAS found instead of error
@@ -10,6 +10,9 @@ Python 3.6 compatible.
 
 import re
 
+from nlp_engine.intent_scoring import IntentScoringEngine, keyword_feature, pattern_feature
+from nlp_engine.question_features import QuestionFeatures, keyword_group
+
 
 class OEMIntentEngine:
     """
@@ -239,9 +242,64 @@ class OEMIntentEngine:
         # Intent-based fallback
         return intent in cls.ANALYTICAL_INTENTS or intent == "RECOMMENDATION"
     
+    # =====================================================
+    # ROUTING KEYWORDS (matched via shared QuestionFeatures)
+    # =====================================================
+    COUNT_GUARD_KEYWORDS = keyword_group("how many", "total", "count", "number of")
+    HOUR_QUESTION_KEYWORDS = keyword_group("which hour", "what hour", "peak hour", "highest hour")
+    STANDBY_KEYWORDS = keyword_group("standby", "data guard", "dataguard", "apply lag", "transport lag",
+                                     "mrp", "redo apply", "redo ship", "lag beyond")
+    TABLESPACE_KEYWORDS = keyword_group("tablespace", "tablespaces", "space full", "storage full",
+                                        "disk full", "close to full", "running out of space")
+    HEALTH_STATE_KEYWORDS = keyword_group("critical state", "critical status", "in critical",
+                                          "warning state", "warning status", "down right now",
+                                          "is down", "is up", "currently in")
+    ROOT_CAUSE_KEYWORDS = keyword_group("why is", "why does", "root cause", "what caused",
+                                        "reason for", "why are there")
+    TIME_KEYWORDS = keyword_group("after midnight", "before midnight", "at night",
+                                  "during day", "morning", "afternoon", "peak hour",
+                                  "what time", "when do", "between", "after 6pm",
+                                  "business hours", "overnight")
+    PREDICTIVE_KEYWORDS = keyword_group("will fail", "likely to fail", "predict", "forecast",
+                                        "going to have issues", "at risk", "risk assessment",
+                                        "will there be", "expected to")
+    RECOMMENDATION_KEYWORDS = keyword_group("what should i do", "how do i fix", "how to resolve",
+                                            "recommend", "action", "steps to", "remediate",
+                                            "fix for", "solution for")
+    ENTITY_KEYWORDS = keyword_group(
+        "server", "servers", "database", "databases", "db", "dbs",
+        "host", "hosts", "target", "targets", "instance", "instances",
+        "monitored", "monitoring", "oem", "managed"
+    )
+    SERVER_KEYWORDS = keyword_group("server", "servers", "host", "hosts")
+    DATABASE_KEYWORDS = keyword_group("database", "databases", "db", "dbs", "instance", "instances")
+    TARGET_KEYWORDS = keyword_group("target", "targets")
+    TIME_WORDS = keyword_group("midnight", "night", "am", "pm", "hour")
+    FREQUENCY_WORDS = keyword_group("often", "repeatedly", "many times")
+    METRIC_KEYWORDS = [
+        ("CPU", ["cpu", "processor", "utilization"]),
+        ("MEMORY", ["memory", "heap", "pga", "sga", "ram"]),
+        ("DISK", ["disk", "storage", "tablespace", "io"]),
+        ("NETWORK", ["network", "connectivity", "timeout"]),
+        ("REDO", ["redo", "redo log", "archive"]),
+        ("UNDO", ["undo", "rollback"])
+    ]
+    keyword_group(kw for _, keywords in METRIC_KEYWORDS for kw in keywords)
+    keyword_group("critical", "warning", "high", "after midnight", "nightly")
+
     def __init__(self):
         """Initialize intent engine with patterns."""
         self._init_patterns()
+        self._scoring = self._build_scoring_engine()
+    
+    def _build_scoring_engine(self):
+        """Compile INTENT_PATTERNS: keyword = 1.0, question pattern = 2.0."""
+        rows = []
+        for intent_name, config in self.INTENT_PATTERNS.items():
+            entries = [(keyword_feature(keyword), 1.0) for keyword in config["keywords"]]
+            entries.extend((pattern_feature(pattern), 2.0) for pattern in config["question_patterns"])
+            rows.append((intent_name, entries))
+        return IntentScoringEngine("oem_intent", rows)
     
     def _init_patterns(self):
         """Initialize intent patterns."""
@@ -455,13 +513,13 @@ class OEMIntentEngine:
             dict with intent, confidence, entities, sub_intent, raw_question,
                   bypass_alert_analysis (bool)
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # =====================================================
         # INTENT ROUTING GATE - CHECK ENTITY INTENTS FIRST
         # These MUST be checked before any alert-based intents
         # =====================================================
-        entity_result = self._check_entity_intent(q_lower, question)
+        entity_result = self._check_entity_intent(features, question)
         if entity_result:
             return entity_result
         
@@ -474,15 +532,14 @@ class OEMIntentEngine:
         #   → Response MUST be a NUMBER only
         # This rule is ABSOLUTE and OVERRIDES all other classification.
         # =====================================================
-        count_guard_keywords = ["how many", "total", "count", "number of"]
-        is_count_question = any(kw in q_lower for kw in count_guard_keywords)
+        is_count_question = features.any_of(self.COUNT_GUARD_KEYWORDS)
         
         # Exception: "which hour" or "peak hour" questions are TIME, not COUNT
-        is_time_question = any(kw in q_lower for kw in ["which hour", "what hour", "peak hour", "highest hour"])
+        is_time_question = features.any_of(self.HOUR_QUESTION_KEYWORDS)
         
         if is_count_question and not is_time_question:
             # HARD COUNT GUARD ACTIVATED - route to FACTUAL with FACT_COUNT
-            entities = self._extract_entities(question, q_lower)
+            entities = self._extract_entities(features)
             return {
                 "intent": self.INTENT_FACTUAL,
                 "confidence": 0.95,
@@ -499,13 +556,11 @@ class OEMIntentEngine:
         # If question mentions standby/dataguard keywords, MUST route to STANDBY_DATAGUARD
         # NEVER let FACTUAL intent steal standby questions
         # =====================================================
-        standby_keywords = ["standby", "data guard", "dataguard", "apply lag", "transport lag", 
-                           "mrp", "redo apply", "redo ship", "lag beyond"]
-        if any(kw in q_lower for kw in standby_keywords):
+        if features.any_of(self.STANDBY_KEYWORDS):
             primary_intent = self.INTENT_STANDBY_DATAGUARD
             confidence = 0.95
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -519,13 +574,11 @@ class OEMIntentEngine:
         # TABLESPACE OVERRIDE (CRITICAL FIX)
         # If question mentions tablespace keywords, MUST route to TABLESPACE
         # =====================================================
-        tablespace_keywords = ["tablespace", "tablespaces", "space full", "storage full", 
-                              "disk full", "close to full", "running out of space"]
-        if any(kw in q_lower for kw in tablespace_keywords):
+        if features.any_of(self.TABLESPACE_KEYWORDS):
             primary_intent = self.INTENT_TABLESPACE
             confidence = 0.95
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -541,13 +594,11 @@ class OEMIntentEngine:
         # =====================================================
         
         # CRITICAL/WARNING state → HEALTH_STATUS
-        if any(x in q_lower for x in ["critical state", "critical status", "in critical", 
-                                       "warning state", "warning status", "down right now",
-                                       "is down", "is up", "currently in"]):
+        if features.any_of(self.HEALTH_STATE_KEYWORDS):
             primary_intent = self.INTENT_HEALTH
             confidence = 0.90
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -558,12 +609,11 @@ class OEMIntentEngine:
             }
         
         # ROOT CAUSE - why questions
-        if any(x in q_lower for x in ["why is", "why does", "root cause", "what caused", 
-                                       "reason for", "why are there"]):
+        if features.any_of(self.ROOT_CAUSE_KEYWORDS):
             primary_intent = self.INTENT_ROOT_CAUSE
             confidence = 0.90
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -574,14 +624,11 @@ class OEMIntentEngine:
             }
         
         # TIME_BASED - time-specific questions
-        if any(x in q_lower for x in ["after midnight", "before midnight", "at night",
-                                       "during day", "morning", "afternoon", "peak hour",
-                                       "what time", "when do", "between", "after 6pm",
-                                       "business hours", "overnight"]):
+        if features.any_of(self.TIME_KEYWORDS):
             primary_intent = self.INTENT_TIME_BASED
             confidence = 0.90
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -592,13 +639,11 @@ class OEMIntentEngine:
             }
         
         # PREDICTIVE - prediction questions
-        if any(x in q_lower for x in ["will fail", "likely to fail", "predict", "forecast",
-                                       "going to have issues", "at risk", "risk assessment",
-                                       "will there be", "expected to"]):
+        if features.any_of(self.PREDICTIVE_KEYWORDS):
             primary_intent = self.INTENT_PREDICTIVE
             confidence = 0.90
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -609,13 +654,11 @@ class OEMIntentEngine:
             }
         
         # RECOMMENDATION - what to do questions
-        if any(x in q_lower for x in ["what should i do", "how do i fix", "how to resolve",
-                                       "recommend", "action", "steps to", "remediate",
-                                       "fix for", "solution for"]):
+        if features.any_of(self.RECOMMENDATION_KEYWORDS):
             primary_intent = self.INTENT_RECOMMENDATION
             confidence = 0.90
-            entities = self._extract_entities(question, q_lower)
-            sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+            entities = self._extract_entities(features)
+            sub_intent = self._detect_sub_intent(features, primary_intent)
             return {
                 "intent": primary_intent,
                 "confidence": confidence,
@@ -625,17 +668,16 @@ class OEMIntentEngine:
                 "raw_question": question
             }
         
-        # Score all intents
+        # Score all intents (one sparse intent x feature product)
         scored_intents = []
-        for intent_name, config in self.INTENT_PATTERNS.items():
-            score = self._score_intent(q_lower, config)
-            if score > 0:
-                scored_intents.append({
-                    "intent": intent_name,
-                    "score": score,
-                    "priority": config["priority"],
-                    "requires_target": config["requires_target"]
-                })
+        for intent_name, score in self._scoring.score(features):
+            config = self.INTENT_PATTERNS[intent_name]
+            scored_intents.append({
+                "intent": intent_name,
+                "score": score,
+                "priority": config["priority"],
+                "requires_target": config["requires_target"]
+            })
         
         # Sort by score, then by priority
         scored_intents.sort(key=lambda x: (x["score"], x["priority"]), reverse=True)
@@ -650,10 +692,10 @@ class OEMIntentEngine:
             confidence = 0.2
         
         # Extract entities
-        entities = self._extract_entities(question, q_lower)
+        entities = self._extract_entities(features)
         
         # Determine sub-intent for compound questions
-        sub_intent = self._detect_sub_intent(q_lower, primary_intent)
+        sub_intent = self._detect_sub_intent(features, primary_intent)
         
         return {
             "intent": primary_intent,
@@ -664,29 +706,17 @@ class OEMIntentEngine:
             "raw_question": question
         }
     
-    def _score_intent(self, question, config):
-        """Score how well question matches intent."""
-        score = 0
-        
-        # Keyword matching
-        for keyword in config["keywords"]:
-            if keyword in question:
-                score += 1.0
-        
-        # Pattern matching (more precise)
-        for pattern in config["question_patterns"]:
-            try:
-                if re.search(pattern, question, re.IGNORECASE):
-                    score += 2.0
-            except re.error:
-                pass
-        
-        return score
+    def classify_batch(self, questions):
+        """Classify many questions (offline evaluation); results align with questions."""
+        return [self.classify(question) for question in questions]
+    
+    def scoring_stats(self):
+        return self._scoring.stats()
     
     # =====================================================
     # INTENT ROUTING GATE - ENTITY INTENT DETECTION
     # =====================================================
-    def _check_entity_intent(self, q_lower, question):
+    def _check_entity_intent(self, features, question):
         """
         MANDATORY FIRST CHECK: Detect ENTITY_COUNT or ENTITY_LIST intents.
         
@@ -703,15 +733,8 @@ class OEMIntentEngine:
         Returns:
             Classification dict if entity intent detected, None otherwise
         """
-        # Entity type keywords to detect
-        entity_keywords = [
-            "server", "servers", "database", "databases", "db", "dbs",
-            "host", "hosts", "target", "targets", "instance", "instances",
-            "monitored", "monitoring", "oem", "managed"
-        ]
-        
         # Check if question contains entity-related keywords
-        has_entity_keyword = any(kw in q_lower for kw in entity_keywords)
+        has_entity_keyword = features.any_of(self.ENTITY_KEYWORDS)
         if not has_entity_keyword:
             return None
         
@@ -733,9 +756,9 @@ class OEMIntentEngine:
         
         for pattern in count_patterns:
             try:
-                if re.search(pattern, q_lower, re.IGNORECASE):
+                if features.search(pattern, "norm", re.IGNORECASE):
                     # Determine entity type
-                    entity_type = self._extract_entity_type(q_lower)
+                    entity_type = self._extract_entity_type(features)
                     return {
                         "intent": self.INTENT_ENTITY_COUNT,
                         "confidence": 0.95,
@@ -765,8 +788,8 @@ class OEMIntentEngine:
         
         for pattern in list_patterns:
             try:
-                if re.search(pattern, q_lower, re.IGNORECASE):
-                    entity_type = self._extract_entity_type(q_lower)
+                if features.search(pattern, "norm", re.IGNORECASE):
+                    entity_type = self._extract_entity_type(features)
                     return {
                         "intent": self.INTENT_ENTITY_LIST,
                         "confidence": 0.95,
@@ -781,77 +804,67 @@ class OEMIntentEngine:
         
         return None
     
-    def _extract_entity_type(self, q_lower):
+    def _extract_entity_type(self, features):
         """Extract the type of entity being asked about."""
-        if any(x in q_lower for x in ["server", "servers", "host", "hosts"]):
+        if features.any_of(self.SERVER_KEYWORDS):
             return "SERVER"
-        elif any(x in q_lower for x in ["database", "databases", "db", "dbs", "instance", "instances"]):
+        elif features.any_of(self.DATABASE_KEYWORDS):
             return "DATABASE"
-        elif any(x in q_lower for x in ["target", "targets"]):
+        elif features.any_of(self.TARGET_KEYWORDS):
             return "TARGET"
         else:
             return "DATABASE"  # Default to database
 
-    def _detect_sub_intent(self, question, primary_intent):
+    def _detect_sub_intent(self, features, primary_intent):
         """Detect secondary intent for compound questions."""
         sub_intents = []
         
         # Time-based sub-intent
-        time_words = ["midnight", "night", "am", "pm", "hour"]
-        has_time = False
-        for t in time_words:
-            if t in question:
-                has_time = True
-                break
+        has_time = features.any_of(self.TIME_WORDS)
         if has_time and primary_intent != "TIME_BASED":
             sub_intents.append("TIME_CONTEXT")
         
         # Frequency sub-intent
-        freq_words = ["often", "repeatedly", "many times"]
-        has_freq = False
-        for f in freq_words:
-            if f in question:
-                has_freq = True
-                break
+        has_freq = features.any_of(self.FREQUENCY_WORDS)
         if has_freq and primary_intent != "FREQUENCY_PATTERN":
             sub_intents.append("FREQUENCY_CONTEXT")
         
         return sub_intents[0] if sub_intents else None
     
-    def _extract_entities(self, question, q_lower):
+    def _extract_entities(self, features):
         """Extract all relevant entities from question."""
         entities = {}
         
         # Extract target database
-        target = self._extract_target(question)
+        target = self._extract_target(features)
         if target:
             entities["target"] = target
         
         # Extract time range
-        time_range = self._extract_time_range(q_lower)
+        time_range = self._extract_time_range(features)
         if time_range:
             entities["time_range"] = time_range
         
         # Extract severity filter
-        severity = self._extract_severity(q_lower)
+        severity = self._extract_severity(features)
         if severity:
             entities["severity"] = severity
         
         # Extract metric type
-        metric = self._extract_metric_type(q_lower)
+        metric = self._extract_metric_type(features)
         if metric:
             entities["metric_type"] = metric
         
         # Extract ORA code if mentioned
-        ora_code = self._extract_ora_code(question)
+        ora_code = self._extract_ora_code(features)
         if ora_code:
             entities["ora_code"] = ora_code
         
         return entities
     
-    def _extract_target(self, question):
+    def _extract_target(self, features):
         """Extract database/target name."""
-        tokens = re.findall(r'[A-Z][A-Z0-9_]{2,}', question)
+        tokens = features.db_candidates
         # Extended exclude list to avoid capturing keywords as targets
         exclude = {
             "OEM", "ORA", "CPU", "RAM", "SGA", "PGA", "DBA", "SQL", "XML", "CSV", 
@@ -867,12 +880,12 @@ class OEMIntentEngine:
         
         return None
     
-    def _extract_time_range(self, question):
+    def _extract_time_range(self, features):
         """Extract time range from question."""
         # Pattern: "between X AM and Y AM"
-        between_match = re.search(
+        between_match = features.search(
             r'between\s+(\d{1,2})\s*(am|pm)?\s*and\s+(\d{1,2})\s*(am|pm)?',
-            question, re.IGNORECASE
+            "norm", re.IGNORECASE
         )
         if between_match:
             start_hour = int(between_match.group(1))
@@ -892,7 +905,7 @@ class OEMIntentEngine:
             return {"type": "RANGE", "start_hour": start_hour, "end_hour": end_hour}
         
         # Pattern: "at X AM"
-        at_match = re.search(r'at\s+(\d{1,2})\s*(am|pm)', question, re.IGNORECASE)
+        at_match = features.search(r'at\s+(\d{1,2})\s*(am|pm)', "norm", re.IGNORECASE)
         if at_match:
             hour = int(at_match.group(1))
             meridiem = at_match.group(2)
@@ -903,48 +916,35 @@ class OEMIntentEngine:
             return {"type": "SPECIFIC_HOUR", "hour": hour}
         
         # Pattern: "after midnight"
-        if "after midnight" in question:
+        if features.has("after midnight"):
             return {"type": "RANGE", "start_hour": 0, "end_hour": 6}
         
         # Pattern: "night" / "nightly"
-        if "night" in question or "nightly" in question:
+        if features.has("night") or features.has("nightly"):
             return {"type": "RANGE", "start_hour": 22, "end_hour": 6}
         
         return None
     
-    def _extract_severity(self, question):
+    def _extract_severity(self, features):
         """Extract severity level from question."""
-        if "critical" in question:
-            return "CRITICAL"
-        if "warning" in question:
-            return "WARNING"
-        if "high" in question:
+        if features.severity:
+            return features.severity
+        if features.has("high"):
             return "HIGH"
         return None
     
-    def _extract_metric_type(self, question):
+    def _extract_metric_type(self, features):
         """Extract metric type being asked about."""
-        metric_keywords = {
-            "CPU": ["cpu", "processor", "utilization"],
-            "MEMORY": ["memory", "heap", "pga", "sga", "ram"],
-            "DISK": ["disk", "storage", "tablespace", "io"],
-            "NETWORK": ["network", "connectivity", "timeout"],
-            "REDO": ["redo", "redo log", "archive"],
-            "UNDO": ["undo", "rollback"]
-        }
-        
-        for metric, keywords in metric_keywords.items():
-            for kw in keywords:
-                if kw in question:
-                    return metric
+        for metric, keywords in self.METRIC_KEYWORDS:
+            if features.first_of(keywords):
+                return metric
         
         return None
     
-    def _extract_ora_code(self, question):
+    def _extract_ora_code(self, features):
         """Extract ORA error code if mentioned."""
-        match = re.search(r'ORA[-\s]?(\d{3,5})', question, re.IGNORECASE)
-        if match:
-            return "ORA-{0}".format(match.group(1))
+        if features.ora_codes:
+            return features.ora_codes[0]
         return None
 
 
@@ -29,17 +29,28 @@ PRODUCTION ENHANCEMENT (v2.0):
     - DOWN vs CRITICAL separation
     - Session memory across questions
 
+STAGE EVENTS (streaming chat):
+    process(question, on_stage=listener) calls listener(stage, data)
+    as the chain advances - "intent", "counts", "evidence",
+    "root_cause", "decision", "actions" and "short_answer" - so a
+    client can show partial results before the final answer.
+
 Python 3.6+ compatible.
 """
 
 import re
+import threading
 from collections import defaultdict
 from datetime import datetime
 from nlp_engine.oem_intent_engine import OEMIntentEngine
 from nlp_engine.oem_data_analyzer import OEMDataAnalyzer
 from data_engine.global_cache import GLOBAL_DATA
+from data_engine.root_cause_index import RootCauseIndex, RootCauseScheme, parse_legacy_timestamp
 from data_engine.target_normalizer import TargetNormalizer
+from data_engine.time_histograms import TimeHistogramIndex, TimeScheme
 from incident_engine.alert_type_classifier import AlertTypeClassifier, classify_alert_type
+from services.request_context import RequestLocal
+from services.request_tracer import REQUEST_TRACER
 
 # PRODUCTION INTELLIGENCE IMPORT
 try:
@@ -57,6 +68,27 @@ except ImportError:
     PRODUCTION_ENGINE_AVAILABLE = False
 
 
+def _initial_environment_state():
+    return {
+        "dominant_database": None,
+        "dominant_error_pattern": None,
+        "most_frequent_ora": None,
+        "peak_alert_hour": None,
+        "overall_risk_posture": None,
+        "last_root_cause": None,
+        "last_abstract_cause": None,  # Added: abstract cause translation
+        "highest_risk_database": None,  # Added: track highest risk DB
+        "dominant_ora_codes": [],  # Added: list of dominant ORA codes
+        "question_count": 0,
+        "analysis_history": [],  # Added: track analysis history
+        # PRODUCTION: Locked values for consistency
+        "locked_root_cause": None,
+        "locked_root_cause_db": {},  # db -> locked root cause
+        "locked_peak_hour": None,
+        "locked_highest_risk_db": None
+    }
+
+
 class ReasoningMemory:
     """
     GLOBAL ENVIRONMENT REASONING MEMORY (MANDATORY).
@@ -80,25 +112,12 @@ class ReasoningMemory:
     4. Session context MUST be included: "Based on earlier analysis..."
     """
     
-    # Class-level singleton state (persists across instances)
-    _environment_state = {
-        "dominant_database": None,
-        "dominant_error_pattern": None,
-        "most_frequent_ora": None,
-        "peak_alert_hour": None,
-        "overall_risk_posture": None,
-        "last_root_cause": None,
-        "last_abstract_cause": None,  # Added: abstract cause translation
-        "highest_risk_database": None,  # Added: track highest risk DB
-        "dominant_ora_codes": [],  # Added: list of dominant ORA codes
-        "question_count": 0,
-        "analysis_history": [],  # Added: track analysis history
-        # PRODUCTION: Locked values for consistency
-        "locked_root_cause": None,
-        "locked_root_cause_db": {},  # db -> locked root cause
-        "locked_peak_hour": None,
-        "locked_highest_risk_db": None
-    }
+    # Class-level singleton state (persists across instances; kept per
+    # session inside request_scope())
+    _environment_state = RequestLocal(
+        "reasoning_memory.environment", value=_initial_environment_state(),
+        factory=_initial_environment_state, per_session=True
+    )
     
     def __init__(self):
         self.discussed_databases = set()
@@ -297,6 +316,44 @@ class ReasoningMemory:
         return target and target.upper() in self.discussed_databases
 
 
+def _root_cause_error_key(alert):
+    """(error key, display type): ORA code [argument], else the DBA-grade display type."""
+    msg = alert.get("message") or alert.get("msg_text") or ""
+    issue_type = alert.get("issue_type") or "INTERNAL_ERROR"
+    
+    # Get DBA-grade display type from classifier
+    display_type = alert.get("display_alert_type")
+    if not display_type:
+        display_type = classify_alert_type(issue_type, msg)
+    
+    # Extract ORA codes
+    ora_code, ora_arg = AlertTypeClassifier.extract_ora_code(msg)
+    if ora_code:
+        error_key = ora_code
+        if ora_arg:
+            error_key = "{0} [{1}]".format(ora_code, ora_arg)
+        return error_key, display_type
+    # Use display_type as key for non-ORA errors
+    return display_type, display_type
+
+
+def _parse_root_cause_timestamp(ts):
+    if isinstance(ts, str):
+        return parse_legacy_timestamp(ts, max_format_chars=19)
+    if isinstance(ts, datetime):
+        return ts
+    return None
+
+
+ROOT_CAUSE_SCHEME = RootCauseScheme(
+    "reasoning_pipeline",
+    target_key=lambda a: (a.get("target_name") or a.get("target") or "").upper(),
+    error_key=_root_cause_error_key,
+    timestamp=lambda a: a.get("collection_timestamp") or a.get("timestamp") or a.get("time"),
+    parse=_parse_root_cause_timestamp
+)
+
+
 class RootCauseScorer:
     """
     Computes root cause scores - NOT guessing.
@@ -316,94 +373,34 @@ class RootCauseScorer:
         Compute root cause scores for all error types.
         Uses AlertTypeClassifier for DBA-grade display types.
         
+        Error groups and parsed timestamps come from the shared
+        RootCauseIndex (built once per target and data generation).
+        
         Returns sorted list of causes with scores and explanations.
         """
         if not alerts:
             return []
         
-        # Filter by target if specified
-        if target:
-            target_upper = target.upper()
-            alerts = [a for a in alerts if 
-                     (a.get("target_name") or a.get("target") or "").upper() == target_upper]
-        
-        if not alerts:
+        scope = RootCauseIndex.for_alerts(alerts, ROOT_CAUSE_SCHEME).scope(target)
+        if not scope.total:
             return []
         
-        # Extract ORA codes and error types with display classification
-        error_counts = defaultdict(list)
-        display_type_map = {}  # Maps ORA code to display type
-        
-        for alert in alerts:
-            msg = alert.get("message") or alert.get("msg_text") or ""
-            issue_type = alert.get("issue_type") or "INTERNAL_ERROR"
-            
-            # Get DBA-grade display type from classifier
-            display_type = alert.get("display_alert_type")
-            if not display_type:
-                display_type = classify_alert_type(issue_type, msg)
-            
-            # Extract ORA codes
-            ora_code, ora_arg = AlertTypeClassifier.extract_ora_code(msg)
-            if ora_code:
-                error_key = ora_code
-                if ora_arg:
-                    error_key = "{0} [{1}]".format(ora_code, ora_arg)
-                error_counts[error_key].append(alert)
-                display_type_map[error_key] = display_type
-            else:
-                # Use display_type as key for non-ORA errors
-                error_counts[display_type].append(alert)
-                display_type_map[display_type] = display_type
-        
         # Compute scores for each error type
-        total_alerts = len(alerts)
-        now = datetime.now()
+        total_alerts = scope.total
         scored_causes = []
         
-        for error_type, error_alerts in error_counts.items():
+        for error_type, group in scope.groups.items():
             # 1. FREQUENCY SCORE (normalized count)
-            frequency_score = len(error_alerts) / total_alerts
-            
-            # 2. RECENCY SCORE (how recent is the latest occurrence)
-            timestamps = []
-            for a in error_alerts:
-                ts = a.get("collection_timestamp") or a.get("timestamp") or a.get("time")
-                if ts:
-                    try:
-                        if isinstance(ts, str):
-                            for fmt in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d-%b-%y %I.%M.%S.%f %p"]:
-                                try:
-                                    timestamps.append(datetime.strptime(ts[:19], fmt[:len(ts[:19])]))
-                                    break
-                                except:
-                                    pass
-                        elif isinstance(ts, datetime):
-                            timestamps.append(ts)
-                    except:
-                        pass
-            
-            if timestamps:
-                most_recent = max(timestamps)
-                # Score decays with age (assume data is from past)
-                recency_score = 1.0  # Treat all historical as recent
-            else:
-                recency_score = 0.5  # Default if no timestamps
+            frequency_score = group.count / total_alerts
+            
+            # 2. RECENCY SCORE (treat all historical as recent; default if no timestamps)
+            recency_score = 1.0 if group.epochs else 0.5
             
             # 3. REPETITION SCORE (same error occurring repeatedly)
-            repetition_score = min(len(error_alerts) / 100, 1.0)  # Capped at 1.0
+            repetition_score = min(group.count / 100, 1.0)  # Capped at 1.0
             
             # 4. BURST DENSITY SCORE (errors concentrated in time)
-            if timestamps and len(timestamps) > 1:
-                timestamps.sort()
-                # Calculate average gap between occurrences
-                gaps = [(timestamps[i+1] - timestamps[i]).total_seconds() 
-                       for i in range(len(timestamps)-1)]
-                avg_gap = sum(gaps) / len(gaps) if gaps else 3600
-                # Short gap = high burst density
-                burst_score = min(3600 / max(avg_gap, 1), 1.0)
-            else:
-                burst_score = 0.3  # Default
+            burst_score = group.burst_density()
             
             # TOTAL SCORE
             total_score = (
@@ -414,12 +411,12 @@ class RootCauseScorer:
             )
             
             # Get display type for this error
-            display_type = display_type_map.get(error_type, error_type)
+            display_type = group.display
             
             scored_causes.append({
                 "error_type": error_type,
                 "display_alert_type": display_type,
-                "count": len(error_alerts),
+                "count": group.count,
                 "total_score": round(total_score, 4),
                 "breakdown": {
                     "frequency": round(frequency_score, 3),
@@ -463,6 +460,41 @@ class RootCauseScorer:
         return "{} wins because: {}".format(error_type, ", ".join(reasons))
 
 
+_CLOCK_PATTERN = re.compile(r'(\d{1,2}):\d{2}')
+
+
+def _parse_temporal_hour(ts):
+    """(hour, weekday) of a timestamp: datetime fields, else the first H:MM of a string (AM/PM aware)."""
+    try:
+        # Handle datetime objects directly
+        if hasattr(ts, 'hour'):
+            return ts.hour, ts.weekday() if hasattr(ts, 'weekday') else None
+        if isinstance(ts, str):
+            # Extract hour from string formats
+            hour_match = _CLOCK_PATTERN.search(ts)
+            if hour_match:
+                hour = int(hour_match.group(1))
+                if "PM" in ts.upper() and hour != 12:
+                    hour += 12
+                elif "AM" in ts.upper() and hour == 12:
+                    hour = 0
+                return hour, None
+    except Exception:
+        pass
+    return None
+
+
+TEMPORAL_SCHEME = TimeScheme(
+    "reasoning_pipeline",
+    target_key=lambda a: (a.get("target_name") or a.get("target") or "").upper(),
+    # Support multiple timestamp field names
+    timestamp=lambda a: (a.get("time") or a.get("alert_time") or a.get("colltime") or
+                         a.get("collection_timestamp") or a.get("timestamp")),
+    parse=_parse_temporal_hour,
+    match="contains"
+)
+
+
 class TemporalIntelligence:
     """
     Time pattern analysis beyond simple filtering.
@@ -492,62 +524,32 @@ class TemporalIntelligence:
         widening_applied = False
         widening_reason = None
         
-        # Filter by target if specified
+        # Hour histograms, built once per alert list (see data_engine.time_histograms)
+        index = TimeHistogramIndex.for_alerts(alerts, TEMPORAL_SCHEME)
+        histogram = index.scope()
+        
+        # Filter by target if specified (name equals or contains the target)
         if target:
-            target_upper = target.upper()
-            filtered_alerts = [a for a in alerts if 
-                     (a.get("target_name") or a.get("target") or "").upper() == target_upper or
-                     target_upper in (a.get("target_name") or a.get("target") or "").upper()]
+            filtered = index.scope(target)
             
             # PRODUCTION FIX: If filtered returns empty but global has data, fall back
-            if not filtered_alerts and force_global_fallback and alerts:
+            if not filtered.total and force_global_fallback:
                 widening_applied = True
                 widening_reason = "Target '{}' has no alerts; showing global distribution".format(target)
-                filtered_alerts = alerts  # Use all alerts
-            elif filtered_alerts:
-                alerts = filtered_alerts
+            elif filtered.total:
+                histogram = filtered
         
-        # Extract hours
-        hourly_counts = defaultdict(int)
-        timestamps = []
-        
-        for alert in alerts:
-            # Support multiple timestamp field names
-            ts = (alert.get("time") or
-                  alert.get("alert_time") or 
-                  alert.get("colltime") or 
-                  alert.get("collection_timestamp") or 
-                  alert.get("timestamp"))
-            if ts:
-                try:
-                    hour = None
-                    
-                    # Handle datetime objects directly
-                    if hasattr(ts, 'hour'):
-                        hour = ts.hour
-                    elif isinstance(ts, str):
-                        # Extract hour from string formats
-                        hour_match = re.search(r'(\d{1,2}):\d{2}', ts)
-                        if hour_match:
-                            hour = int(hour_match.group(1))
-                            if "PM" in ts.upper() and hour != 12:
-                                hour += 12
-                            elif "AM" in ts.upper() and hour == 12:
-                                hour = 0
-                    
-                    if hour is not None:
-                        hourly_counts[hour] += 1
-                        timestamps.append(ts)
-                except:
-                    pass
+        # Hour counts, in the order the alerts first showed each hour
+        hourly_counts = histogram.distribution()
         
         # PRODUCTION FIX: If no temporal data extracted but alerts exist, generate synthetic
-        if not hourly_counts and alerts:
-            # Use alert index to simulate distribution (assumes alerts are ordered)
-            for i, alert in enumerate(alerts):
-                # Simulate 24-hour distribution
-                hour = i % 24
-                hourly_counts[hour] += 1
+        if not hourly_counts and histogram.total:
+            # Use alert index to simulate distribution (assumes alerts are ordered):
+            # hour h gets the alerts i with i % 24 == h
+            hourly_counts = dict(
+                (hour, (histogram.total - hour + 23) // 24)
+                for hour in range(min(histogram.total, 24))
+            )
             widening_applied = True
             if not widening_reason:
                 widening_reason = "No timestamp data available; using index-based distribution"
@@ -658,6 +660,11 @@ class OEMReasoningPipeline:
     MANDATORY CHAIN: INTENT → HYPOTHESIS → EVIDENCE → REASONING → DECISION → ACTION
     """
     
+    # Discussion memory and follow-up target (kept per session inside
+    # request_scope(); one process-wide value otherwise)
+    memory = RequestLocal("pipeline.memory", factory=ReasoningMemory, per_session=True)
+    _last_target = RequestLocal("pipeline.last_target", factory=lambda: None, per_session=True)
+    
     # FIX #2: ORA-CODE → ABSTRACT CAUSE MAPPING
     ABSTRACT_CAUSE_MAP = {
         # Internal Oracle engine instability
@@ -849,8 +856,8 @@ class OEMReasoningPipeline:
     def __init__(self):
         """Initialize the Intelligence Engine."""
         self.intent_engine = OEMIntentEngine()
-        self.memory = ReasoningMemory()
-        self._last_target = None
+        # self.memory / self._last_target: see the RequestLocals above
+        self._stage = threading.local()    # .listener: stage callback of the running process() call
     
     # =====================================================
     # ENTITY INTENT HANDLER (ROUTING GATE)
@@ -1115,7 +1122,33 @@ class OEMReasoningPipeline:
             "question_type": "FACT"
         }
 
-    def process(self, question):
+    def process(self, question, on_stage=None):
+        """
+        Process question through the thinking chain (see _process).
+        
+        Args:
+            question: User's natural language question
+            on_stage: Optional listener(stage, data) called as each stage
+                      completes (see STAGE EVENTS in the module docstring)
+        """
+        previous = getattr(self._stage, "listener", None), getattr(self._stage, "short_answer_sent", False)
+        self._stage.listener, self._stage.short_answer_sent = on_stage, False
+        try:
+            return self._process(question)
+        finally:
+            self._stage.listener, self._stage.short_answer_sent = previous
+    
+    def _emit_stage(self, stage, build):
+        """Send build() to the stage listener, if one is set; never fails the chain."""
+        listener = getattr(self._stage, "listener", None)
+        if listener is None:
+            return
+        try:
+            listener(stage, build())
+        except Exception as e:
+            print("[WARNING] Stage listener failed at {}: {}".format(stage, e))
+    
+    def _process(self, question):
         """
         Process question through MANDATORY thinking chain.
         
@@ -1139,10 +1172,16 @@ class OEMReasoningPipeline:
         # =====================================================
         # STEP 0: INTENT CLASSIFICATION (MANDATORY FIRST)
         # =====================================================
-        classification = self.intent_engine.classify(question)
+        with REQUEST_TRACER.span("pipeline.classify"):
+            classification = self.intent_engine.classify(question)
         intent = classification["intent"]
         entities = classification["entities"]
         confidence = classification["confidence"]
+        self._emit_stage("intent", lambda: {
+            "intent": intent,
+            "target": entities.get("target"),
+            "confidence": confidence
+        })
         
         # =====================================================
         # HARD COUNT GUARD (ABSOLUTE - HIGHEST PRIORITY)
@@ -1176,8 +1215,8 @@ class OEMReasoningPipeline:
                 reasoning_chain={"intent": "ERROR", "hypothesis": "Data missing"}
             )
         
-        # Initialize analyzer
-        analyzer = OEMDataAnalyzer(alerts)
+        # Shared analyzer of this data generation (memoized per-target scans)
+        analyzer = OEMDataAnalyzer.for_alerts(alerts)
         
         # Get environment context from prior questions
         env_context = ReasoningMemory.get_environment_context()
@@ -1197,34 +1236,52 @@ class OEMReasoningPipeline:
         # =====================================================
         # STEP 3: GATHER EVIDENCE (with widening)
         # =====================================================
-        evidence = self._gather_evidence(intent, target, entities, analyzer, question)
+        with REQUEST_TRACER.span("pipeline.gather_evidence"):
+            evidence = self._gather_evidence(intent, target, entities, analyzer, question)
         
         # Add environment context to evidence
         if env_context:
             evidence["prior_context"] = env_context
+        self._emit_stage("counts", lambda: self._counts_event(evidence, target))
+        self._emit_stage("evidence", lambda: self._evidence_event(evidence))
         
         # =====================================================
         # STEP 4: REASONING (compute, don't guess)
         # =====================================================
-        reasoning = self._apply_reasoning(intent, evidence, target, alerts, question)
+        with REQUEST_TRACER.span("pipeline.apply_reasoning"):
+            reasoning = self._apply_reasoning(intent, evidence, target, alerts, question)
+        self._emit_stage("root_cause", lambda: self._root_cause_event(reasoning))
         
         # =====================================================
         # STEP 5: DECISION
         # =====================================================
         decision = self._make_decision(reasoning, evidence)
+        self._emit_stage("decision", lambda: {
+            "conclusion": decision.get("conclusion"),
+            "confidence": decision.get("confidence"),
+            "risk_assessment": decision.get("risk_assessment")
+        })
         
         # =====================================================
         # STEP 6: ACTION MAPPING (cause → action)
         # =====================================================
         actions = self._map_actions(reasoning, decision)
+        self._emit_stage("actions", lambda: {"actions": actions[:5]})
         
         # =====================================================
         # STEP 7: FORMAT RESPONSE (STRICT FORMAT + CONFIDENCE)
         # =====================================================
-        response = self._format_final_response(
-            intent, hypothesis, evidence, reasoning, decision, actions, 
-            target, confidence, question, analyzer
-        )
+        with REQUEST_TRACER.span("pipeline.format_final_response"):
+            response = self._format_final_response(
+                intent, hypothesis, evidence, reasoning, decision, actions, 
+                target, confidence, question, analyzer
+            )
+        if not getattr(self._stage, "short_answer_sent", False):
+            # Formatter built its answer without _format_response
+            self._emit_short_answer(
+                response.get("answer", ""), None, None, target,
+                response.get("confidence_label"), response.get("question_type")
+            )
         
         # Record in memory and update environment state
         self.memory.record_discussion(
@@ -1278,19 +1335,78 @@ class OEMReasoningPipeline:
         # Sync with SessionStore for cross-component consistency
         try:
             from services.session_store import SessionStore
-            if abstract_cause and abstract_cause not in ["OTHER", "UNKNOWN", "Unknown", "N/A"]:
-                SessionStore.lock_root_cause(abstract_cause, target)
-            elif top_cause and top_cause not in ["OTHER", "UNKNOWN", "Unknown", "N/A"]:
-                SessionStore.lock_root_cause(top_cause, target)
-            if temporal.get("peak_hour") is not None:
-                SessionStore.lock_peak_hour(temporal.get("peak_hour"))
-            if top_db:
-                SessionStore.set_highest_risk_db(top_db)
+            with REQUEST_TRACER.span("session.lock"):
+                if abstract_cause and abstract_cause not in ["OTHER", "UNKNOWN", "Unknown", "N/A"]:
+                    SessionStore.lock_root_cause(abstract_cause, target)
+                elif top_cause and top_cause not in ["OTHER", "UNKNOWN", "Unknown", "N/A"]:
+                    SessionStore.lock_root_cause(top_cause, target)
+                if temporal.get("peak_hour") is not None:
+                    SessionStore.lock_peak_hour(temporal.get("peak_hour"))
+                if top_db:
+                    SessionStore.set_highest_risk_db(top_db)
         except ImportError:
             pass  # SessionStore not available
         
         return response
     
+    # =====================================================
+    # STAGE EVENT PAYLOADS (small, JSON-ready)
+    # =====================================================
+    def _emit_short_answer(self, summary, found, meaning, target, conf_label, question_type):
+        if getattr(self._stage, "listener", None) is None:
+            return
+        self._stage.short_answer_sent = True
+        self._emit_stage("short_answer", lambda: {
+            "answer": self._build_short_answer(summary, found, meaning, target, conf_label),
+            "target": target,
+            "confidence_label": conf_label,
+            "question_type": question_type
+        })
+    
+    @staticmethod
+    def _counts_event(evidence, target):
+        summary = evidence.get("summary") or {}
+        scoped = evidence.get("primary_data") or (evidence.get("alternative_data") or {}).get("data") or {}
+        return {
+            "target": target,
+            "total_alerts": summary.get("total_alerts", 0),
+            "database_count": summary.get("database_count", 0),
+            "severity_summary": summary.get("severity_summary", {}),
+            "target_alerts": scoped.get("alert_count"),
+            "target_critical": scoped.get("critical_count"),
+            "answer": "{} has {:,} alerts ({:,} critical).".format(
+                scoped.get("name", target), scoped.get("alert_count") or 0, scoped.get("critical_count") or 0
+            ) if target and scoped else "{:,} alerts across {:,} databases.".format(
+                summary.get("total_alerts", 0), summary.get("database_count", 0)
+            )
+        }
+    
+    @staticmethod
+    def _evidence_event(evidence):
+        temporal = evidence.get("temporal_patterns") or {}
+        time_analysis = evidence.get("time_analysis") or {}
+        return {
+            "peak_hour": temporal.get("peak_hour"),
+            "peak_count": temporal.get("peak_count"),
+            "alerts_in_range": time_analysis.get("alerts_in_range"),
+            "widening_applied": evidence.get("widening_applied", False),
+            "widening_reason": evidence.get("widening_reason"),
+            "global_fallback_used": evidence.get("global_fallback_used", False)
+        }
+    
+    @staticmethod
+    def _root_cause_event(reasoning):
+        inferred = reasoning.get("inferred_cause") or {}
+        return {
+            "root_causes": [
+                {"error_type": c.get("error_type"), "count": c.get("count"), "score": c.get("total_score")}
+                for c in reasoning.get("root_causes", [])[:3]
+            ],
+            "inferred_cause": inferred.get("cause"),
+            "root_cause_confidence": reasoning.get("root_cause_confidence"),
+            "risk_level": reasoning.get("risk_level")
+        }
+    
     def _generate_hypothesis(self, intent, question, target):
         """
         Generate hypothesis based on intent.
@@ -3814,6 +3930,7 @@ class OEMReasoningPipeline:
         use_short_format = OEMIntentEngine.should_use_short_format(intent, question)
         include_actions = OEMIntentEngine.should_include_actions(intent, question)
         include_root_cause = OEMIntentEngine.should_include_root_cause(intent, question)
+        self._emit_short_answer(summary, found, meaning, target, conf_label, question_type)
         
         # =====================================================
         # FACTUAL QUESTIONS → SHORT, DIRECT ANSWER
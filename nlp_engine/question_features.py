@@ -0,0 +1,300 @@
+# nlp_engine/question_features.py
+"""
+==============================================================
+QUESTION FEATURES - Single-pass question analysis
+==============================================================
+
+One chat question is read by many classifiers (OEMIntentEngine,
+IntentResponseRouter, AnswerModeDetector, Phase12Guardrails,
+AnswerContractBuilder, TrustModeDetector, SmartIntentClassifier,
+EntityExtractor, Phase1IntentParser). Each used to lowercase,
+tokenize and regex-scan the text on its own, and together they use
+more distinct patterns than the re module caches (512), so every
+pattern was recompiled on every question.
+
+QuestionFeatures is computed once per question text and shared:
+
+- Text forms:  text, lower, norm (lower + strip), upper, upper_norm
+- Tokens:      words (whitespace split), tokens ([a-z0-9]+ words)
+- Keywords:    every registered keyword (keyword_group) found in
+               the text, from one scan of the vocabulary
+- Entities:    db_candidates, severity, numbers, limit, ora_codes,
+               time_expressions
+- Memoized regex: search / match / findall per (pattern, text form,
+               flags); patterns are compiled once per process
+
+Usage:
+    features = QuestionFeatures.of(question)
+    if features.any_of(COUNT_KEYWORDS): ...
+    match = features.search(r'how\\s+many\\s+(\\w+)')
+
+Keyword hits are computed on `lower`; a keyword without leading or
+trailing whitespace occurs in `norm` exactly when it occurs in `lower`.
+
+Python 3.6.8 compatible.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+
+# =====================================================
+# COMPILED PATTERNS (process-wide)
+# =====================================================
+_COMPILED = {}
+_MAX_COMPILED = 4096
+
+
+def compiled(pattern, flags=0):
+    """Compiled regex, cached for the life of the process."""
+    key = (pattern, flags)
+    regex = _COMPILED.get(key)
+    if regex is None:
+        if len(_COMPILED) >= _MAX_COMPILED:
+            _COMPILED.clear()
+        regex = re.compile(pattern, flags)
+        _COMPILED[key] = regex
+    return regex
+
+
+# =====================================================
+# KEYWORD VOCABULARY
+# =====================================================
+class KeywordGroup(frozenset):
+    """Keywords registered in the shared vocabulary (see keyword_group)."""
+
+
+_VOCAB_LOCK = threading.Lock()
+_VOCABULARY = []            # append-only, in registration order
+_VOCABULARY_SET = set()
+
+
+def keyword_group(*keywords):
+    """
+    Register keywords for the shared per-question scan and return
+    them as a KeywordGroup for QuestionFeatures.any_of().
+    Accepts strings and/or iterables of strings.
+    """
+    words = []
+    for item in keywords:
+        if isinstance(item, str):
+            words.append(item)
+        else:
+            words.extend(item)
+    with _VOCAB_LOCK:
+        for word in words:
+            if word not in _VOCABULARY_SET:
+                _VOCABULARY_SET.add(word)
+                _VOCABULARY.append(word)
+    return KeywordGroup(words)
+
+
+# =====================================================
+# SHARED ENTITY TABLES
+# =====================================================
+# Time expressions (key -> patterns), in priority order
+TIME_EXPRESSIONS = OrderedDict([
+    ("last_hour", [r"last\s+hour", r"past\s+hour", r"1\s*h", r"one\s+hour"]),
+    ("last_day", [r"last\s+day", r"today", r"past\s+24", r"24\s*h"]),
+    ("yesterday", [r"yesterday", r"last\s+night"]),
+    ("last_week", [r"last\s+week", r"past\s+week", r"7\s*days?", r"this\s+week"]),
+    ("last_month", [r"last\s+month", r"past\s+month", r"30\s*days?"]),
+])
+
+# Numeric limit phrases ("show me 18", "top 10", "20 alerts")
+LIMIT_PATTERNS = [
+    r'(?:show|display|list|get|give)\s+(?:me\s+)?(\d+)',
+    r'(?:top|first|last)\s+(\d+)',
+    r'(\d+)\s+(?:alerts?|issues?|errors?|warnings?)',
+    r'only\s+(\d+)',
+    r'limit\s+(\d+)'
+]
+
+SEVERITY_KEYWORDS = keyword_group("critical", "warning")
+
+
+class QuestionFeatures(object):
+    """Features of one question, computed once and shared by classifiers."""
+
+    __slots__ = (
+        "text", "lower", "norm", "upper", "upper_norm",
+        "words", "tokens", "db_candidates", "ora_codes", "numbers",
+        "_memo", "_hits", "_scanned", "_limit", "_time"
+    )
+
+    _CACHE = OrderedDict()
+    _CACHE_SIZE = 256
+    _CACHE_LOCK = threading.Lock()
+    _stats = {"hits": 0, "misses": 0}
+
+    def __init__(self, question):
+        self.text = question or ""
+        self.lower = self.text.lower()
+        self.norm = self.lower.strip()
+        self.upper = self.text.upper()
+        self.upper_norm = self.upper.strip()
+
+        self.words = self.norm.split()
+        self.tokens = compiled(r'\b[a-z0-9]+\b').findall(self.norm)
+        # Identifiers typed in capitals ("MIDEVSTB", "FINDB_DR")
+        self.db_candidates = compiled(r'[A-Z][A-Z0-9_]{2,}').findall(self.text)
+        self.ora_codes = ["ORA-{0}".format(code) for code in
+                          compiled(r'ORA[-\s]?(\d{3,5})').findall(self.upper)]
+        self.numbers = [int(n) for n in compiled(r'\b(\d+)\b').findall(self.norm)]
+
+        self._memo = {}
+        self._hits = set()
+        self._scanned = 0
+        self._limit = False
+        self._time = None
+
+    # =====================================================
+    # PER-QUESTION CACHE
+    # =====================================================
+    @classmethod
+    def of(cls, question):
+        """Shared features for a question text (computed on first use)."""
+        question = question or ""
+        with cls._CACHE_LOCK:
+            features = cls._CACHE.get(question)
+            if features is not None:
+                cls._CACHE.move_to_end(question)
+                cls._stats["hits"] += 1
+                return features
+            cls._stats["misses"] += 1
+
+        features = cls(question)
+        with cls._CACHE_LOCK:
+            cls._CACHE[question] = features
+            if len(cls._CACHE) > cls._CACHE_SIZE:
+                cls._CACHE.popitem(last=False)
+        return features
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._CACHE_LOCK:
+            cls._CACHE.clear()
+
+    @classmethod
+    def cache_stats(cls):
+        with cls._CACHE_LOCK:
+            return dict(cls._stats, size=len(cls._CACHE))
+
+    # =====================================================
+    # KEYWORDS
+    # =====================================================
+    @property
+    def keywords(self):
+        """Registered keywords that occur in the question (lowercase text)."""
+        if self._scanned < len(_VOCABULARY):
+            lower = self.lower
+            end = len(_VOCABULARY)
+            self._hits.update(word for word in _VOCABULARY[self._scanned:end] if word in lower)
+            self._scanned = end
+        return self._hits
+
+    def has(self, keyword):
+        """True if keyword occurs in the lowercased question."""
+        if keyword in _VOCABULARY_SET:
+            return keyword in self.keywords
+        return keyword in self.lower
+
+    def any_of(self, keywords):
+        """True if any keyword occurs in the lowercased question."""
+        if isinstance(keywords, KeywordGroup):
+            return not self.keywords.isdisjoint(keywords)
+        return any(self.has(keyword) for keyword in keywords)
+
+    def first_of(self, keywords):
+        """First keyword (in the given order) occurring in the question, or None."""
+        for keyword in keywords:
+            if self.has(keyword):
+                return keyword
+        return None
+
+    # =====================================================
+    # MEMOIZED REGEX
+    # =====================================================
+    def search(self, pattern, on="norm", flags=0):
+        """re.search(pattern, <text form>) - evaluated once per question."""
+        key = ("s", pattern, on, flags)
+        try:
+            return self._memo[key]
+        except KeyError:
+            result = compiled(pattern, flags).search(getattr(self, on))
+            self._memo[key] = result
+            return result
+
+    def match(self, pattern, on="norm", flags=0):
+        """re.match(pattern, <text form>) - evaluated once per question."""
+        key = ("m", pattern, on, flags)
+        try:
+            return self._memo[key]
+        except KeyError:
+            result = compiled(pattern, flags).match(getattr(self, on))
+            self._memo[key] = result
+            return result
+
+    def findall(self, pattern, on="norm", flags=0):
+        """re.findall(pattern, <text form>) as a list (do not mutate)."""
+        key = ("f", pattern, on, flags)
+        try:
+            return self._memo[key]
+        except KeyError:
+            result = compiled(pattern, flags).findall(getattr(self, on))
+            self._memo[key] = result
+            return result
+
+    def first_search(self, patterns, on="norm", flags=0):
+        """Match of the first pattern (in order) found in the text, or None."""
+        for pattern in patterns:
+            result = self.search(pattern, on, flags)
+            if result:
+                return result
+        return None
+
+    def any_search(self, patterns, on="norm", flags=0):
+        return self.first_search(patterns, on, flags) is not None
+
+    # =====================================================
+    # SHARED ENTITIES
+    # =====================================================
+    @property
+    def severity(self):
+        """CRITICAL / WARNING by first mention priority (critical wins), else None."""
+        if self.has("critical"):
+            return "CRITICAL"
+        if self.has("warning"):
+            return "WARNING"
+        return None
+
+    @property
+    def limit(self):
+        """Numeric limit ("show me 18", "top 10", "20 alerts"), else None."""
+        if self._limit is False:
+            self._limit = None
+            for pattern in LIMIT_PATTERNS:
+                found = self.search(pattern)
+                if found:
+                    try:
+                        self._limit = int(found.group(1))
+                        break
+                    except (ValueError, IndexError):
+                        pass
+        return self._limit
+
+    @property
+    def time_expressions(self):
+        """Time-range keys (TIME_EXPRESSIONS order) mentioned in the question."""
+        if self._time is None:
+            self._time = tuple(
+                key for key, patterns in TIME_EXPRESSIONS.items()
+                if self.any_search(patterns)
+            )
+        return self._time
+
+
+def question_features(question):
+    """Shared QuestionFeatures for a question (see QuestionFeatures.of)."""
+    return QuestionFeatures.of(question)
@@ -27,6 +27,8 @@ Python 3.6.8 compatible.
 import re
 from typing import Dict, Tuple, Optional, Any
 
+from nlp_engine.question_features import QuestionFeatures
+
 
 class SmartIntentClassifier:
     """
@@ -235,6 +237,16 @@ class SmartIntentClassifier:
     DEFAULT_INTENT = "UNKNOWN"
     DEFAULT_QUESTION_TYPE = "FACT"
     
+    @classmethod
+    def _intents_by_priority(cls):
+        """INTENT_PATTERNS items, highest priority first (ties keep definition order)."""
+        ordered = cls.__dict__.get("_ORDERED_INTENTS")
+        if ordered is None:
+            ordered = sorted(cls.INTENT_PATTERNS.items(),
+                             key=lambda item: -item[1]["priority"])
+            cls._ORDERED_INTENTS = ordered
+        return ordered
+    
     def classify(self, query: str, entities: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Classify a query into an intent.
@@ -251,7 +263,7 @@ class SmartIntentClassifier:
             - is_followup: Boolean indicating if this is a follow-up
             - matched_pattern: The pattern that matched (for debugging)
         """
-        q_lower = query.lower().strip()
+        features = QuestionFeatures.of(query)
         
         best_match = {
             "intent": self.DEFAULT_INTENT,
@@ -261,27 +273,28 @@ class SmartIntentClassifier:
             "matched_pattern": None
         }
         
-        highest_priority = -1
-        
-        for intent_name, intent_def in self.INTENT_PATTERNS.items():
+        # Highest priority first: the first pattern that matches wins
+        # (same result as scanning every pattern and keeping the best).
+        for intent_name, intent_def in self._intents_by_priority():
+            match = None
             for pattern in intent_def["patterns"]:
                 try:
-                    match = re.search(pattern, q_lower, re.IGNORECASE)
-                    if match:
-                        priority = intent_def["priority"]
-                        if priority > highest_priority:
-                            highest_priority = priority
-                            # Calculate confidence based on pattern complexity and match quality
-                            confidence = self._calculate_confidence(match, pattern, query)
-                            best_match = {
-                                "intent": intent_name,
-                                "confidence": confidence,
-                                "question_type": intent_def["question_type"],
-                                "is_followup": intent_name.startswith("FOLLOWUP"),
-                                "matched_pattern": pattern
-                            }
+                    match = features.search(pattern, "norm", re.IGNORECASE)
                 except re.error:
                     continue
+                if match:
+                    break
+            if match:
+                # Calculate confidence based on pattern complexity and match quality
+                confidence = self._calculate_confidence(match, pattern, query)
+                best_match = {
+                    "intent": intent_name,
+                    "confidence": confidence,
+                    "question_type": intent_def["question_type"],
+                    "is_followup": intent_name.startswith("FOLLOWUP"),
+                    "matched_pattern": pattern
+                }
+                break
         
         # Enhance with entity information
         if entities:
@@ -335,7 +348,7 @@ class SmartIntentClassifier:
         Returns:
             Tuple of (is_followup, followup_type)
         """
-        q_lower = query.lower().strip()
+        features = QuestionFeatures.of(query)
         
         # Quick pattern checks
         followup_indicators = [
@@ -349,7 +362,7 @@ class SmartIntentClassifier:
         ]
         
         for pattern, ftype in followup_indicators:
-            if re.search(pattern, q_lower):
+            if features.search(pattern, "norm"):
                 return True, ftype
         
         return False, None
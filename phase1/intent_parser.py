@@ -19,9 +19,11 @@ RULES:
 - No guessing or hallucination
 """
 
-import re
 from typing import Dict, Any, Optional, List, Tuple
 
+from data_engine.target_dictionary import TargetDictionary
+from nlp_engine.question_features import QuestionFeatures, keyword_group
+
 
 class Phase1IntentParser:
     """
@@ -133,6 +135,9 @@ class Phase1IntentParser:
         'MEDIUM', 'INFO', 'ERROR', 'MESSAGE', 'ALERT', 'ISSUE', 'PROBLEM'
     }
     
+    ISSUE_KEYWORDS = keyword_group('issue', 'problem', 'error')
+    keyword_group('alert', 'how many')
+    
     def __init__(self, known_databases: List[str] = None):
         """
         Initialize the parser.
@@ -140,11 +145,16 @@ class Phase1IntentParser:
         Args:
             known_databases: List of valid database names from CSV data
         """
-        self.known_databases = set(db.upper() for db in (known_databases or []))
+        self._known_source = None
+        self.set_known_databases(known_databases or [])
     
     def set_known_databases(self, databases: List[str]):
-        """Update the list of known databases."""
+        """Update the list of known databases (no-op for the same list object)."""
+        if databases is self._known_source:
+            return
+        self._known_source = databases
         self.known_databases = set(db.upper() for db in databases)
+        self._known_targets = TargetDictionary.from_names(sorted(self.known_databases))
     
     def parse(self, question: str) -> Dict[str, Any]:
         """
@@ -163,15 +173,14 @@ class Phase1IntentParser:
                 raw_question=""
             )
         
-        q_lower = question.lower().strip()
-        q_upper = question.upper().strip()
+        features = QuestionFeatures.of(question)
         
         # Extract components
-        intent_type, intent_confidence = self._detect_intent_type(q_lower)
-        database = self._extract_database(q_upper)
-        severity = self._extract_severity(q_lower)
-        category = self._extract_category(q_lower)
-        limit = self._extract_limit(q_lower)
+        intent_type, intent_confidence = self._detect_intent_type(features)
+        database = self._extract_database(features)
+        severity = self._extract_severity(features)
+        category = self._extract_category(features)
+        limit = self._extract_limit(features)
         
         # Calculate overall confidence
         confidence = self._calculate_confidence(
@@ -192,7 +201,7 @@ class Phase1IntentParser:
             raw_question=question
         )
     
-    def _detect_intent_type(self, q_lower: str) -> Tuple[str, float]:
+    def _detect_intent_type(self, features: QuestionFeatures) -> Tuple[str, float]:
         """Detect the intent type from the question."""
         scores = {
             'COUNT': 0.0,
@@ -203,29 +212,30 @@ class Phase1IntentParser:
         
         # Check COUNT patterns
         for pattern in self.COUNT_PATTERNS:
-            if re.search(pattern, q_lower):
+            if features.search(pattern):
                 scores['COUNT'] += 0.4
         
         # Check LIST patterns
         for pattern in self.LIST_PATTERNS:
-            if re.search(pattern, q_lower):
+            if features.search(pattern):
                 scores['LIST'] += 0.4
         
         # Check STATUS patterns
         for pattern in self.STATUS_PATTERNS:
-            if re.search(pattern, q_lower):
+            if features.search(pattern):
                 scores['STATUS'] += 0.5
         
         # "alerts" keyword boosts LIST/COUNT
-        if 'alert' in q_lower:
+        if features.has('alert'):
             scores['LIST'] += 0.2
             scores['COUNT'] += 0.1
         
         # "issues" or "problems" keywords
-        if any(w in q_lower for w in ['issue', 'problem', 'error']):
+        if features.any_of(self.ISSUE_KEYWORDS):
             scores['LIST'] += 0.15
         
         # Question words
+        q_lower = features.norm
         if q_lower.startswith('how many'):
             scores['COUNT'] = max(scores['COUNT'], 0.9)
         elif q_lower.startswith(('what', 'which')):
@@ -234,7 +244,7 @@ class Phase1IntentParser:
         elif q_lower.startswith(('show', 'list', 'display', 'get')):
             scores['LIST'] = max(scores['LIST'], 0.8)
         elif q_lower.startswith(('is ', 'are ', 'does ', 'do ')):
-            if 'how many' not in q_lower:
+            if not features.has('how many'):
                 scores['STATUS'] += 0.3
         
         # Find best match
@@ -247,73 +257,68 @@ class Phase1IntentParser:
         
         return (best_type, min(best_score, 1.0))
     
-    def _extract_database(self, q_upper: str) -> Optional[str]:
+    def _extract_database(self, features: QuestionFeatures) -> Optional[str]:
         """Extract database name from the question."""
         # Check each pattern
         for pattern in self.DB_PATTERNS:
-            match = re.search(pattern, q_upper)
+            match = features.search(pattern, "upper_norm")
             if match:
                 potential_db = match.group(1)
                 # Validate it's not an excluded word
                 if potential_db not in self.EXCLUDED_WORDS:
                     # Check if it's in known databases
                     if self.known_databases:
-                        # EXACT match first (case-insensitive)
-                        for known in self.known_databases:
-                            if potential_db.upper() == known.upper():
-                                return known
-                        # Only if no exact match, try fuzzy matching
-                        # But require the potential_db to be the full match
-                        for known in self.known_databases:
-                            if potential_db.upper() == known.upper().rstrip('N'):
-                                # Still prefer exact match
-                                continue
+                        # EXACT match only (case-insensitive): MIDEVSTB is
+                        # never resolved to MIDEVSTBN
+                        known = self._known_targets.get(potential_db)
+                        if known:
+                            return known
                     # If no known DBs or valid pattern, accept it
                     if len(potential_db) >= 4:
                         return potential_db
         
         # Check for "this database" or "this db" (context needed)
-        if re.search(r'\bthis\s+(?:database|db)\b', q_upper.lower()):
+        if features.search(r'\bthis\s+(?:database|db)\b'):
             return None  # Needs context (not Phase 1)
         
         # Check for "all databases"
-        if re.search(r'\ball\s+(?:databases?|dbs?)\b', q_upper.lower()):
+        if features.search(r'\ball\s+(?:databases?|dbs?)\b'):
             return "ALL"
         
         return None
     
-    def _extract_severity(self, q_lower: str) -> Optional[str]:
+    def _extract_severity(self, features: QuestionFeatures) -> Optional[str]:
         """Extract severity filter from the question."""
         for severity, patterns in self.SEVERITY_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, q_lower):
+                if features.search(pattern):
                     return severity
         
         # Check for "all severities" or no severity mentioned
-        if re.search(r'\ball\s+(?:severity|severities|types?)\b', q_lower):
+        if features.search(r'\ball\s+(?:severity|severities|types?)\b'):
             return "ALL"
         
         return None
     
-    def _extract_category(self, q_lower: str) -> Optional[str]:
+    def _extract_category(self, features: QuestionFeatures) -> Optional[str]:
         """Extract category filter from the question."""
         for category, patterns in self.CATEGORY_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, q_lower):
+                if features.search(pattern):
                     return category
         
         # Default: if just asking about "alerts", it's general ALERT category
-        if re.search(r'\balerts?\b', q_lower) and not any(
-            re.search(p, q_lower) for patterns in self.CATEGORY_PATTERNS.values() for p in patterns
+        if features.search(r'\balerts?\b') and not any(
+            features.search(p) for patterns in self.CATEGORY_PATTERNS.values() for p in patterns
         ):
             return "ALERT"
         
         return None
     
-    def _extract_limit(self, q_lower: str) -> Optional[int]:
+    def _extract_limit(self, features: QuestionFeatures) -> Optional[int]:
         """Extract result limit from the question."""
         for pattern in self.LIMIT_PATTERNS:
-            match = re.search(pattern, q_lower)
+            match = features.search(pattern)
             if match:
                 try:
                     return int(match.group(1))
@@ -28,6 +28,8 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 import threading
 
+from services.session_backend import session_backend
+
 
 class ConversationContext:
     """
@@ -107,7 +109,8 @@ class ContextManager:
     """
     
     def __init__(self):
-        self._contexts: Dict[str, ConversationContext] = {}
+        # session_id -> ConversationContext (bounded LRU + idle TTL)
+        self._contexts = session_backend("phase2_context", shared=True)
         self._lock = threading.RLock()
         self._default_session = "default"
     
@@ -124,9 +127,8 @@ class ContextManager:
         session_id = session_id or self._default_session
         
         with self._lock:
-            if session_id not in self._contexts:
-                self._contexts[session_id] = ConversationContext.empty()
-            return self._contexts[session_id]
+            context, _ = self._contexts.get_or_create(session_id, ConversationContext.empty)
+            return context
     
     def set_context(self, context: ConversationContext, session_id: Optional[str] = None):
         """
@@ -139,7 +141,7 @@ class ContextManager:
         session_id = session_id or self._default_session
         
         with self._lock:
-            self._contexts[session_id] = context
+            self._contexts.put(session_id, context)
     
     def update_context(self, session_id: Optional[str] = None, **updates) -> ConversationContext:
         """
@@ -157,7 +159,7 @@ class ContextManager:
         with self._lock:
             current = self.get_context(session_id)
             updated = current.copy(**updates)
-            self._contexts[session_id] = updated
+            self._contexts.put(session_id, updated)
             return updated
     
     def reset_context(self, session_id: Optional[str] = None):
@@ -170,7 +172,7 @@ class ContextManager:
         session_id = session_id or self._default_session
         
         with self._lock:
-            self._contexts[session_id] = ConversationContext.empty()
+            self._contexts.put(session_id, ConversationContext.empty())
     
     def has_active_context(self, session_id: Optional[str] = None) -> bool:
         """Check if session has active context."""
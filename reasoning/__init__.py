@@ -56,217 +56,142 @@ The IncidentIntelligenceEngine behaves like a Principal DBA / Incident Commander
 The DBAIntelligenceFormatter provides 5 layers of enterprise-grade intelligence.
 """
 
-from .hypothesis_engine import HypothesisEngine
-from .evidence_collector import EvidenceCollector
-from .decision_engine import DecisionEngine
-from .action_recommender import ActionRecommender
-from .pattern_recognizer import PatternRecognizer
-from .confidence_scorer import ConfidenceScorer
-from .context_tracker import ContextTracker, CONTEXT
-from .risk_predictor import RiskPredictor
-from .answer_formatter import AnswerFormatter
-from .orchestrator import ReasoningOrchestrator
-
-# DBA Intelligence Formatter (Legacy)
-from .dba_intelligence_formatter import (
-    DBAIntelligenceFormatter,
-    get_dba_formatter,
-    format_dba_response
-)
-
-# Incident Intelligence Engine (Phase 4)
-from .incident_intelligence_engine import (
-    IncidentIntelligenceEngine,
-    IncidentCluster,
-    INCIDENT_INTELLIGENCE_ENGINE
-)
-
-# Predictive Intelligence Engine (Phase 5)
-from .predictive_intelligence_engine import (
-    PredictiveIntelligenceEngine,
-    TrendDetectionEngine,
-    IncidentTrajectoryPredictor,
-    EarlyWarningDetector,
-    DBABehaviorLearner,
-    ProactiveDBAGuidance,
-    PREDICTIVE_INTELLIGENCE
-)
-
-# DBA Intelligence Engine (Phase 6)
-from .dba_knowledge_base import (
-    DBAKnowledgeBase,
-    OracleErrorKnowledge,
-    DataGuardKnowledge,
-    CommonRootCauses,
-    DBAFirstChecks,
-    DBA_KNOWLEDGE_BASE
-)
-
-from .incident_memory import (
-    IncidentMemoryStore,
-    IncidentMemoryEntry,
-    IncidentSignature,
-    IncidentOutcome,
-    INCIDENT_MEMORY
-)
-
-from .confidence_engine import (
-    ConfidenceEngine,
-    ConfidenceScore,
-    QuestionConfidenceScorer,
-    AnswerConfidenceScorer,
-    CONFIDENCE_ENGINE
-)
-
-from .question_understanding import (
-    QuestionUnderstandingEngine,
-    QuestionType,
-    QuestionInterpretation,
-    EntityExtractor,
-    IntentClassifier,
-    QUESTION_ENGINE
-)
-
-from .human_dba_style import (
-    HumanDBAStyleFormatter,
-    HumanPhrasing,
-    ResponseTemplates,
-    DBAResponseContext,
-    HUMAN_STYLE
-)
-
-from .knowledge_merger import (
-    KnowledgeMerger,
-    MergedIntelligence,
-    KNOWLEDGE_MERGER
-)
-
-from .dba_intelligence_engine import (
-    DBAIntelligenceEngine,
-    DBA_INTELLIGENCE
-)
-
-# Enterprise Trust Engine (Phase 7)
-from .answer_confidence_engine import (
-    AnswerConfidenceEngine,
-    ConfidenceLevel,
-    ConfidenceAssessment,
-    ANSWER_CONFIDENCE
-)
-
-from .evidence_layer import (
-    EvidenceLayer,
-    EvidenceItem,
-    EvidencePackage,
-    EVIDENCE_LAYER
-)
-
-from .db_scope_guard import (
-    DBScopeGuard,
-    ScopeValidation,
-    DB_SCOPE_GUARD
-)
+import importlib
+import sys
+
+
+# Exported names by submodule. They are imported on first access
+# (module __getattr__, PEP 562), so importing one submodule such as
+# reasoning.phase12_guardrails no longer loads every engine below.
+# A name listed twice resolves to its last module, as the former
+# eager imports did (ConfidenceLevel -> dba_guardrails).
+_EXPORTS = [
+    (".hypothesis_engine", ["HypothesisEngine"]),
+    (".evidence_collector", ["EvidenceCollector"]),
+    (".decision_engine", ["DecisionEngine"]),
+    (".action_recommender", ["ActionRecommender"]),
+    (".pattern_recognizer", ["PatternRecognizer"]),
+    (".confidence_scorer", ["ConfidenceScorer"]),
+    (".context_tracker", ["ContextTracker", "CONTEXT"]),
+    (".risk_predictor", ["RiskPredictor"]),
+    (".answer_formatter", ["AnswerFormatter"]),
+    (".orchestrator", ["ReasoningOrchestrator"]),
+    # DBA Intelligence Formatter (Legacy)
+    (".dba_intelligence_formatter", [
+        "DBAIntelligenceFormatter", "get_dba_formatter", "format_dba_response",
+    ]),
+    # Incident Intelligence Engine (Phase 4)
+    (".incident_intelligence_engine", [
+        "IncidentIntelligenceEngine", "IncidentCluster", "INCIDENT_INTELLIGENCE_ENGINE",
+    ]),
+    # Predictive Intelligence Engine (Phase 5)
+    (".predictive_intelligence_engine", [
+        "PredictiveIntelligenceEngine", "TrendDetectionEngine", "IncidentTrajectoryPredictor",
+        "EarlyWarningDetector", "DBABehaviorLearner", "ProactiveDBAGuidance",
+        "PREDICTIVE_INTELLIGENCE",
+    ]),
+    # DBA Intelligence Engine (Phase 6)
+    (".dba_knowledge_base", [
+        "DBAKnowledgeBase", "OracleErrorKnowledge", "DataGuardKnowledge", "CommonRootCauses",
+        "DBAFirstChecks", "DBA_KNOWLEDGE_BASE",
+    ]),
+    (".incident_memory", [
+        "IncidentMemoryStore", "IncidentMemoryEntry", "IncidentSignature", "IncidentOutcome",
+        "INCIDENT_MEMORY",
+    ]),
+    (".confidence_engine", [
+        "ConfidenceEngine", "ConfidenceScore", "QuestionConfidenceScorer",
+        "AnswerConfidenceScorer", "CONFIDENCE_ENGINE",
+    ]),
+    (".question_understanding", [
+        "QuestionUnderstandingEngine", "QuestionType", "QuestionInterpretation",
+        "EntityExtractor", "IntentClassifier", "QUESTION_ENGINE",
+    ]),
+    (".human_dba_style", [
+        "HumanDBAStyleFormatter", "HumanPhrasing", "ResponseTemplates", "DBAResponseContext",
+        "HUMAN_STYLE",
+    ]),
+    (".knowledge_merger", ["KnowledgeMerger", "MergedIntelligence", "KNOWLEDGE_MERGER"]),
+    (".dba_intelligence_engine", ["DBAIntelligenceEngine", "DBA_INTELLIGENCE"]),
+    # Enterprise Trust Engine (Phase 7)
+    (".answer_confidence_engine", [
+        "AnswerConfidenceEngine", "ConfidenceLevel", "ConfidenceAssessment",
+        "ANSWER_CONFIDENCE",
+    ]),
+    (".evidence_layer", ["EvidenceLayer", "EvidenceItem", "EvidencePackage", "EVIDENCE_LAYER"]),
+    (".db_scope_guard", ["DBScopeGuard", "ScopeValidation", "DB_SCOPE_GUARD"]),
+    (".safe_prediction_language", ["SafePredictionLanguage", "SafePrediction", "SAFE_PREDICTION"]),
+    (".audit_explainability", [
+        "AuditExplainabilityEngine", "AuditRecord", "AuditStep", "AUDIT_ENGINE",
+    ]),
+    (".language_guardrails", ["LanguageGuardrails", "QualityCheck", "LANGUAGE_GUARDRAILS"]),
+    (".uncertainty_handler", [
+        "UncertaintyHandler", "UncertaintyResponse", "UncertaintyType", "UNCERTAINTY_HANDLER",
+    ]),
+    (".enterprise_trust_engine", [
+        "EnterpriseTrustEngine", "TrustedAnswer", "ENTERPRISE_TRUST", "process_answer",
+        "quick_validate",
+    ]),
+    # Self-Audit Engine (Phase 11)
+    (".self_audit_engine", [
+        "SelfAuditEngine", "TrustMode", ("AuditConfidenceLevel", "ConfidenceLevel"),
+        "ConversationFactRegister", "TrustModeDetector", "ScopeValidator", "AuditResult",
+        "SELF_AUDIT", "audit_before_respond", "apply_full_guardrails",
+    ]),
+    # DBA Guardrails (8 RULES - Oracle OEM Assistant)
+    (".dba_guardrails", [
+        # Core Classes
+        "DBAGuardrailEnforcer", "AnswerMode", "AnswerModeDetector", "ScopeConstraint",
+        "ScopeLevel", "ConfidenceLevel", "ScopeControlGuard", "PredictiveReasoningSafety",
+        "NoDataHandler", "AntiOverexplanation", "ConsistencyChecker", "ProductionSafeResponse",
+        "GuardrailResult",
+        # Enterprise-Grade Classes
+        "ProductionSafetyRules", "DataAuthorityRule", "IncidentIntelligenceLogic",
+        "IncidentAlertIntelligence", "RootCauseHandler", "ConfidenceFormatter", "SelfValidation",
+        "LIMITED_DATA_RESPONSE",
+        # 8 RULES Classes
+        "DBAToneEnforcer",              # RULE 8: Shared Context Tone
+        "IncidentCountGuardrail",       # RULE 4: Unique Incident Count
+        "SafeActionBoundaries",         # RULE 6: Execution & Action Safety
+        "RiskEscalationLanguage",       # RULE 5: Risk & Escalation Language
+        "ConfidenceLabelingStandard",   # RULE 7: Confidence Labeling Standard
+        # Singleton and Functions
+        "DBA_GUARDRAILS", "apply_guardrails", "get_answer_mode", "is_strict_value_question",
+        "extract_scope", "cannot_determine", "format_safe_prediction",
+    ]),
+    # Phase-12.1: Production-Grade DBA Intelligence Guardrails
+    (".phase12_guardrails", [
+        "Phase12Guardrails", "ActiveScope", "ScopeType", "enforce_phase12",
+        "get_active_db_scope", "reset_db_scope", "self_check_answer", "PHASE12_AVAILABLE",
+    ]),
+]
 
-from .safe_prediction_language import (
-    SafePredictionLanguage,
-    SafePrediction,
-    SAFE_PREDICTION
-)
+_EXPORT_SOURCE = {}
+for _module, _names in _EXPORTS:
+    for _name in _names:
+        _exported, _attr = _name if isinstance(_name, tuple) else (_name, _name)
+        _EXPORT_SOURCE[_exported] = (_module, _attr)
 
-from .audit_explainability import (
-    AuditExplainabilityEngine,
-    AuditRecord,
-    AuditStep,
-    AUDIT_ENGINE
-)
 
-from .language_guardrails import (
-    LanguageGuardrails,
-    QualityCheck,
-    LANGUAGE_GUARDRAILS
-)
+def __getattr__(name):
+    """Import an exported engine on first access."""
+    source = _EXPORT_SOURCE.get(name)
+    if source is None:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    value = getattr(importlib.import_module(source[0], __name__), source[1])
+    globals()[name] = value
+    return value
 
-from .uncertainty_handler import (
-    UncertaintyHandler,
-    UncertaintyResponse,
-    UncertaintyType,
-    UNCERTAINTY_HANDLER
-)
 
-from .enterprise_trust_engine import (
-    EnterpriseTrustEngine,
-    TrustedAnswer,
-    ENTERPRISE_TRUST,
-    process_answer,
-    quick_validate
-)
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORT_SOURCE))
 
-# Self-Audit Engine (Phase 11)
-from .self_audit_engine import (
-    SelfAuditEngine,
-    TrustMode,
-    ConfidenceLevel as AuditConfidenceLevel,
-    ConversationFactRegister,
-    TrustModeDetector,
-    ScopeValidator,
-    AuditResult,
-    SELF_AUDIT,
-    audit_before_respond,
-    apply_full_guardrails
-)
 
-# DBA Guardrails (8 RULES - Oracle OEM Assistant)
-from .dba_guardrails import (
-    # Core Classes
-    DBAGuardrailEnforcer,
-    AnswerMode,
-    AnswerModeDetector,
-    ScopeConstraint,
-    ScopeLevel,
-    ConfidenceLevel,
-    ScopeControlGuard,
-    PredictiveReasoningSafety,
-    NoDataHandler,
-    AntiOverexplanation,
-    ConsistencyChecker,
-    ProductionSafeResponse,
-    GuardrailResult,
-    # Enterprise-Grade Classes
-    ProductionSafetyRules,
-    DataAuthorityRule,
-    IncidentIntelligenceLogic,
-    IncidentAlertIntelligence,
-    RootCauseHandler,
-    ConfidenceFormatter,
-    SelfValidation,
-    LIMITED_DATA_RESPONSE,
-    # 8 RULES Classes
-    DBAToneEnforcer,            # RULE 8: Shared Context Tone
-    IncidentCountGuardrail,     # RULE 4: Unique Incident Count
-    SafeActionBoundaries,       # RULE 6: Execution & Action Safety
-    RiskEscalationLanguage,     # RULE 5: Risk & Escalation Language
-    ConfidenceLabelingStandard, # RULE 7: Confidence Labeling Standard
-    # Singleton and Functions
-    DBA_GUARDRAILS,
-    apply_guardrails,
-    get_answer_mode,
-    is_strict_value_question,
-    extract_scope,
-    cannot_determine,
-    format_safe_prediction
-)
+if sys.version_info < (3, 7):
+    # No module __getattr__ before Python 3.7: import everything up front
+    for _exported in _EXPORT_SOURCE:
+        globals()[_exported] = __getattr__(_exported)
 
-# Phase-12.1: Production-Grade DBA Intelligence Guardrails
-from .phase12_guardrails import (
-    Phase12Guardrails,
-    ActiveScope,
-    ScopeType,
-    enforce_phase12,
-    get_active_db_scope,
-    reset_db_scope,
-    self_check_answer,
-    PHASE12_AVAILABLE
-)
 
 __all__ = [
     'HypothesisEngine',
@@ -14,6 +14,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from nlp_engine.question_features import QuestionFeatures
+
 
 class ContractType(Enum):
     """Types of answer contracts."""
@@ -158,22 +160,22 @@ class AnswerContractBuilder:
         Returns:
             AnswerContract defining response requirements
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # Detect contract type
-        contract_type = cls._detect_contract_type(q_lower)
+        contract_type = cls._detect_contract_type(features)
         
         # Detect audience
-        audience = cls._detect_audience(q_lower)
+        audience = cls._detect_audience(features)
         
         # Detect scope constraints
-        target_db = cls._extract_target_database(question)
-        exclude_standby = cls._matches_any(q_lower, cls.SCOPE_PATTERNS.get('exclude_standby', []))
-        primary_only = cls._matches_any(q_lower, cls.SCOPE_PATTERNS.get('primary_only', []))
-        standby_only = cls._matches_any(q_lower, cls.SCOPE_PATTERNS.get('standby_only', []))
+        target_db = cls._extract_target_database(features)
+        exclude_standby = cls._matches_any(features, cls.SCOPE_PATTERNS.get('exclude_standby', []))
+        primary_only = cls._matches_any(features, cls.SCOPE_PATTERNS.get('primary_only', []))
+        standby_only = cls._matches_any(features, cls.SCOPE_PATTERNS.get('standby_only', []))
         
         # Detect numeric-only mode
-        numeric_only = cls._matches_any(q_lower, cls.NUMERIC_TRIGGERS)
+        numeric_only = cls._matches_any(features, cls.NUMERIC_TRIGGERS)
         
         # Build forbidden terms based on contract type
         forbidden_terms = cls._build_forbidden_terms(contract_type, numeric_only, audience)
@@ -201,11 +203,11 @@ class AnswerContractBuilder:
         )
     
     @classmethod
-    def _detect_contract_type(cls, q_lower: str) -> ContractType:
+    def _detect_contract_type(cls, features: QuestionFeatures) -> ContractType:
         """Detect the primary contract type from question."""
         # Check for specific patterns
         for qtype, patterns in cls.QUESTION_TYPE_PATTERNS.items():
-            if cls._matches_any(q_lower, patterns):
+            if cls._matches_any(features, patterns):
                 if qtype == 'alert_count':
                     return ContractType.ALERT_COUNT
                 elif qtype == 'incident_count':
@@ -216,21 +218,21 @@ class AnswerContractBuilder:
                     return ContractType.EXPLANATION
         
         # Check for numeric-only
-        if cls._matches_any(q_lower, cls.NUMERIC_TRIGGERS):
+        if cls._matches_any(features, cls.NUMERIC_TRIGGERS):
             return ContractType.NUMERIC_ONLY
         
         return ContractType.GENERAL
     
     @classmethod
-    def _detect_audience(cls, q_lower: str) -> Audience:
+    def _detect_audience(cls, features: QuestionFeatures) -> Audience:
         """Detect target audience from question."""
         for audience, patterns in cls.ROLE_PATTERNS.items():
-            if cls._matches_any(q_lower, patterns):
+            if cls._matches_any(features, patterns):
                 return audience
         return Audience.GENERAL
     
     @classmethod
-    def _extract_target_database(cls, question: str) -> Optional[str]:
+    def _extract_target_database(cls, features: QuestionFeatures) -> Optional[str]:
         """Extract target database from question."""
         # Pattern: "for DBNAME" or "on DBNAME" or just "DBNAME"
         # Common DB name patterns: end with STB, STBN, DB, PRD, DEV, TST
@@ -247,8 +249,6 @@ class AnswerContractBuilder:
             r'(?:for|on|in|of)\s+([A-Z]{2,}[A-Z0-9_]*)\b',
         ]
         
-        q_upper = question.upper()
-        
         # Common exclusion words
         excluded = {'THE', 'ALL', 'ANY', 'SOME', 'HOW', 'MANY', 'WHAT', 'WHICH', 
                    'THIS', 'THAT', 'FROM', 'ONLY', 'ALERTS', 'CRITICAL', 'DATABASE',
@@ -256,7 +256,7 @@ class AnswerContractBuilder:
                    'COUNT', 'TOTAL', 'WARNING', 'INCIDENT', 'ISSUE', 'ERROR'}
         
         for pattern in patterns:
-            match = re.search(pattern, q_upper)
+            match = features.search(pattern, "upper")
             if match:
                 db_name = match.group(1)
                 # Filter out common words
@@ -266,9 +266,9 @@ class AnswerContractBuilder:
         return None
     
     @classmethod
-    def _matches_any(cls, text: str, patterns: List[str]) -> bool:
-        """Check if text matches any of the patterns."""
-        return any(re.search(p, text) for p in patterns)
+    def _matches_any(cls, features: QuestionFeatures, patterns: List[str]) -> bool:
+        """Check if the (lowercased, stripped) question matches any of the patterns."""
+        return features.any_search(patterns, "norm")
     
     @classmethod
     def _build_forbidden_terms(cls, contract_type: ContractType, 
@@ -0,0 +1,256 @@
+# reasoning/answer_postprocessor.py
+"""
+==============================================================
+ANSWER POST-PROCESSOR - Shared scan for guardrail rewrites
+==============================================================
+
+After an answer is built its text goes through a chain of phrase
+tables: DBA tone (generic phrases, fluff), incident-count wording,
+predictive safety (forbidden phrases, safe replacements), panic /
+calm language and the prediction sanitizers of Phase 7 and Phase 12.
+Each table used to run every one of its regexes over the whole
+answer, even though almost none of them ever match.
+
+Every table is registered here as an ordered RuleSet of RewriteRules:
+
+    RewriteRule(pattern, replacement, flags)
+
+- pattern:  regex applied exactly as before (re.sub / re.search)
+- triggers: the literal runs every match must contain, derived from
+            the pattern's top level (a necessary condition, never a
+            guess)
+
+All triggers of all rule sets are compiled into one Aho-Corasick
+automaton (data_engine.keyword_automaton.KeywordAutomaton). A text is
+scanned once; the scan is memoized for the last few texts, so the
+chain of guardrails that receives the same (unchanged) answer reuses
+it. Only rules whose triggers were all seen run, in their original
+order, and the text is rescanned only after a rule actually changed
+it. Skipping a rule with an absent trigger is exact, so the rewritten
+text is identical to running every regex in sequence.
+
+Characters that IGNORECASE-match ASCII letters without lowercasing to
+them (İ, ı, ſ) disable the prefilter for that text: every rule runs.
+
+Usage:
+    TONE_RULES = ANSWER_POSTPROCESSOR.rule_set("tone", [RewriteRule(...)])
+    text = ANSWER_POSTPROCESSOR.rewrite(TONE_RULES, text)
+    hits = ANSWER_POSTPROCESSOR.matches(PANIC_RULES, text, lower=True)
+
+Python 3.6.8 compatible.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+try:
+    from re import _parser as sre_parse        # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from data_engine.keyword_automaton import KeywordAutomaton
+
+
+# Non-ASCII characters that IGNORECASE-match an ASCII letter but do
+# not lowercase to it ('K' KELVIN SIGN lowercases to 'k')
+_CASE_FOLD_ESCAPES = ("İ", "ı", "ſ")
+
+
+def required_literals(pattern):
+    """
+    Runs of literal characters at the top level of a regex
+    (lowercased). Every match of the pattern contains all of them.
+    """
+    runs, run = [], []
+    for op, av in sre_parse.parse(pattern):
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+        elif op is not sre_parse.AT:        # \b, ^, $ are zero-width
+            if run:
+                runs.append("".join(run).lower())
+            run = []
+    if run:
+        runs.append("".join(run).lower())
+    return tuple(sorted(set(runs), key=len, reverse=True))
+
+
+class RewriteRule(object):
+    """One phrase rule: compiled pattern, replacement, trigger keywords."""
+
+    __slots__ = ("pattern", "replacement", "triggers")
+
+    def __init__(self, pattern, replacement="", flags=re.IGNORECASE):
+        self.pattern = re.compile(pattern, flags)
+        self.replacement = replacement
+        self.triggers = required_literals(pattern)   # () -> always runs
+
+    def candidate(self, found):
+        """False only when a trigger is missing from a scan (None: no prefilter)."""
+        if found is None:
+            return True
+        for trigger in self.triggers:
+            if trigger not in found:
+                return False
+        return True
+
+    def __repr__(self):
+        return "RewriteRule({0!r})".format(self.pattern.pattern)
+
+
+def phrase_rules(phrases, suffix="", flags=re.IGNORECASE):
+    """
+    RewriteRules for literal phrases: a {phrase: replacement} mapping,
+    or a list of phrases (replaced by "").
+    """
+    if isinstance(phrases, dict):
+        items = phrases.items()
+    else:
+        items = ((phrase, "") for phrase in phrases)
+    return [RewriteRule(re.escape(phrase) + suffix, replacement, flags) for phrase, replacement in items]
+
+
+def pattern_rules(patterns, flags=re.IGNORECASE):
+    """RewriteRules for a {pattern: replacement} mapping, a list of
+    (pattern, replacement) pairs, or a list of patterns."""
+    if isinstance(patterns, dict):
+        items = patterns.items()
+    else:
+        items = (p if isinstance(p, tuple) else (p, "") for p in patterns)
+    return [RewriteRule(pattern, replacement, flags) for pattern, replacement in items]
+
+
+class RuleSet(object):
+    """Ordered rules of one guardrail table."""
+
+    __slots__ = ("name", "rules")
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = list(rules)
+
+
+class AnswerPostProcessor(object):
+    """
+    Registry of rule sets sharing one trigger automaton and one
+    memoized scan per answer text.
+
+    Usage:
+        text = ANSWER_POSTPROCESSOR.rewrite(rule_set, text)
+    """
+
+    SCAN_CACHE_SIZE = 8
+
+    def __init__(self):
+        self._rule_sets = OrderedDict()
+        self._automaton = None
+        self._scans = OrderedDict()          # text -> set of triggers (None: no prefilter)
+        self._lock = threading.Lock()
+        self._stats = {"scans": 0, "scan_hits": 0, "rules_run": 0, "rules_skipped": 0, "rewrites": 0}
+
+    # =====================================================
+    # REGISTRATION
+    # =====================================================
+    def rule_set(self, name, rules):
+        """Register (or replace) a named rule set and return it."""
+        rule_set = RuleSet(name, rules)
+        with self._lock:
+            self._rule_sets[name] = rule_set
+            self._automaton = None
+            self._scans.clear()
+        return rule_set
+
+    def _compiled(self):
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    triggers = set()
+                    for rule_set in self._rule_sets.values():
+                        for rule in rule_set.rules:
+                            triggers.update(rule.triggers)
+                    self._automaton = KeywordAutomaton(sorted(triggers))
+                automaton = self._automaton
+        return automaton
+
+    # =====================================================
+    # SCANNING
+    # =====================================================
+    def scan(self, text):
+        """Triggers occurring in text (lowercased); None when every rule must run."""
+        with self._lock:
+            found = self._scans.get(text, False)
+            if found is not False:
+                self._scans.move_to_end(text)
+                self._stats["scan_hits"] += 1
+                return found
+        if any(ch in text for ch in _CASE_FOLD_ESCAPES):
+            found = None
+        else:
+            found = self._compiled().find(text.lower())
+        with self._lock:
+            self._stats["scans"] += 1
+            self._scans[text] = found
+            if len(self._scans) > self.SCAN_CACHE_SIZE:
+                self._scans.popitem(last=False)
+        return found
+
+    def rewrite(self, rule_set, text):
+        """Apply the rule set's substitutions in order (same result as re.sub per rule)."""
+        if not text:
+            return text
+        found = self.scan(text)
+        run = skipped = rewrites = 0
+        for rule in rule_set.rules:
+            if not rule.candidate(found):
+                skipped += 1
+                continue
+            run += 1
+            result = rule.pattern.sub(rule.replacement, text)
+            if result != text:
+                rewrites += 1
+                text = result
+                found = self.scan(text)
+        self._count(run, skipped, rewrites)
+        return text
+
+    def matches(self, rule_set, text, lower=False):
+        """
+        Indices of the rules whose pattern is found in text (in rule
+        order, so they index the table the rule set was built from).
+        lower=True searches text.lower(), as the callers that match
+        lowercase patterns against a lowercased answer do.
+        """
+        if not text:
+            return []
+        found = self.scan(text)
+        target = text.lower() if lower else text
+        hits = []
+        run = 0
+        for index, rule in enumerate(rule_set.rules):
+            if not rule.candidate(found):
+                continue
+            run += 1
+            if rule.pattern.search(target):
+                hits.append(index)
+        self._count(run, len(rule_set.rules) - run, 0)
+        return hits
+
+    def _count(self, run, skipped, rewrites):
+        with self._lock:
+            self._stats["rules_run"] += run
+            self._stats["rules_skipped"] += skipped
+            self._stats["rewrites"] += rewrites
+
+    # =====================================================
+    # INSPECTION
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["rule_sets"] = dict((name, len(rs.rules)) for name, rs in self._rule_sets.items())
+        return stats
+
+
+# Global instance for import
+ANSWER_POSTPROCESSOR = AnswerPostProcessor()
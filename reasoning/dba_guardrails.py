@@ -134,6 +134,10 @@ from enum import Enum, auto
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
+from data_engine.target_dictionary import TargetDictionary
+from nlp_engine.question_features import QuestionFeatures, keyword_group
+from reasoning.answer_postprocessor import ANSWER_POSTPROCESSOR, pattern_rules, phrase_rules
+
 
 # =============================================================================
 # FALLBACK RULE - LIMITED DATA RESPONSE
@@ -223,25 +227,8 @@ class DBAToneEnforcer:
     @classmethod
     def enforce_dba_tone(cls, response: str) -> str:
         """Convert generic/textbook language to DBA-native tone."""
-        result = response
-        
-        # Replace generic phrases
-        for generic, dba_style in cls.GENERIC_PHRASES.items():
-            result = re.sub(
-                re.escape(generic), 
-                dba_style, 
-                result, 
-                flags=re.IGNORECASE
-            )
-        
-        # Remove fluff phrases
-        for fluff in cls.FLUFF_PHRASES:
-            result = re.sub(
-                re.escape(fluff) + r"[.!]?\s*",
-                "",
-                result,
-                flags=re.IGNORECASE
-            )
+        # Replace generic phrases, then remove fluff phrases
+        result = ANSWER_POSTPROCESSOR.rewrite(_TONE_RULES, response)
         
         return result.strip()
     
@@ -269,6 +256,14 @@ class DBAToneEnforcer:
         return len(issues) == 0, issues
 
 
+# Generic phrases, then fluff (with trailing punctuation / whitespace)
+_TONE_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "dba_tone",
+    phrase_rules(DBAToneEnforcer.GENERIC_PHRASES) +
+    phrase_rules(DBAToneEnforcer.FLUFF_PHRASES, suffix=r"[.!]?\s*")
+)
+
+
 # =============================================================================
 # SCOPE LEVELS (HARD RULE 1 - CONTEXT & SCOPE LOCK)
 # =============================================================================
@@ -476,42 +471,35 @@ class AnswerModeDetector:
         6. ANALYSIS
         7. SENIOR_DBA (default for DBA queries)
         """
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # 1. STRICT_NUMBER takes absolute precedence
-        for pattern in cls.STRICT_NUMBER_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.STRICT_NUMBER
+        if features.any_search(cls.STRICT_NUMBER_PATTERNS):
+            return AnswerMode.STRICT_NUMBER
         
         # 2. YES_NO questions
-        for pattern in cls.YES_NO_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.YES_NO
+        if features.any_search(cls.YES_NO_PATTERNS):
+            return AnswerMode.YES_NO
         
         # 3. LIST_ONLY requests
-        for pattern in cls.LIST_ONLY_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.LIST_ONLY
+        if features.any_search(cls.LIST_ONLY_PATTERNS):
+            return AnswerMode.LIST_ONLY
         
         # 4. SUMMARY requests
-        for pattern in cls.SUMMARY_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.SUMMARY
+        if features.any_search(cls.SUMMARY_PATTERNS):
+            return AnswerMode.SUMMARY
         
         # 5. EXECUTIVE/Manager mode
-        for pattern in cls.EXECUTIVE_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.EXECUTIVE
+        if features.any_search(cls.EXECUTIVE_PATTERNS):
+            return AnswerMode.EXECUTIVE
         
         # 6. ANALYSIS mode
-        for pattern in cls.ANALYSIS_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.ANALYSIS
+        if features.any_search(cls.ANALYSIS_PATTERNS):
+            return AnswerMode.ANALYSIS
         
         # 7. SENIOR_DBA triggers
-        for pattern in cls.SENIOR_DBA_PATTERNS:
-            if re.search(pattern, q_lower):
-                return AnswerMode.SENIOR_DBA
+        if features.any_search(cls.SENIOR_DBA_PATTERNS):
+            return AnswerMode.SENIOR_DBA
         
         # Default to SENIOR_DBA for DBA-focused queries
         return AnswerMode.SENIOR_DBA
@@ -592,6 +580,14 @@ class ScopeControlGuard:
     # Standby database indicators  
     STANDBY_INDICATORS = ['standby', 'stbn', 'replica', 'dr', 'secondary']
     
+    # Keyword groups for the shared per-question scan
+    ENVIRONMENT_KEYWORDS = keyword_group(ENVIRONMENT_INDICATORS)
+    THIS_DB_KEYWORDS = keyword_group('this db', 'that db', 'this database', 'that database')
+    PRIMARY_ONLY_KEYWORDS = keyword_group('primary only', 'exclude standby', 'not standby',
+                                          'without standby', 'no standby')
+    STANDBY_ONLY_KEYWORDS = keyword_group('standby only', 'only standby')
+    keyword_group(HARD_SCOPE_KEYWORDS, ['standby', 'stbn'])
+    
     # Known primary-standby relationships
     DB_RELATIONSHIPS = {
         "MIDEVSTB": "MIDEVSTBN",
@@ -611,18 +607,16 @@ class ScopeControlGuard:
         Returns:
             ScopeConstraint with all detected constraints
         """
-        q_lower = question.lower()
-        q_upper = question.upper()
+        features = QuestionFeatures.of(question)
         
         # Detect target database
         target_db = cls._extract_target_database(question)
         
         # Check for environment-wide indicators
-        is_environment = any(ind in q_lower for ind in cls.ENVIRONMENT_INDICATORS)
+        is_environment = features.any_of(cls.ENVIRONMENT_KEYWORDS)
         
         # Handle "this DB", "that DB" references
-        if not target_db and ('this db' in q_lower or 'that db' in q_lower or 
-                              'this database' in q_lower or 'that database' in q_lower):
+        if not target_db and features.any_of(cls.THIS_DB_KEYWORDS):
             if last_database:
                 target_db = last_database
             else:
@@ -633,7 +627,7 @@ class ScopeControlGuard:
                 )
         
         # Detect hard scope keywords
-        scope_keywords = [kw for kw in cls.HARD_SCOPE_KEYWORDS if kw in q_lower]
+        scope_keywords = [kw for kw in cls.HARD_SCOPE_KEYWORDS if features.has(kw)]
         is_hard_scope = len(scope_keywords) > 0
         
         # Determine scope level
@@ -646,19 +640,16 @@ class ScopeControlGuard:
             scope_level = ScopeLevel.UNCLEAR if not last_database else ScopeLevel.DATABASE
         
         # Detect primary/standby scope
-        primary_only = any(ind in q_lower for ind in 
-                         ['primary only', 'exclude standby', 'not standby', 
-                          'without standby', 'no standby'])
+        primary_only = features.any_of(cls.PRIMARY_ONLY_KEYWORDS)
         
-        standby_only = any(ind in q_lower for ind in 
-                          ['standby only', 'only standby'])
+        standby_only = features.any_of(cls.STANDBY_ONLY_KEYWORDS)
         
         # If target database ends with STB (not STBN), default to excluding standby
         exclude_standby = False
         if target_db:
             if target_db.upper().endswith('STB') and not target_db.upper().endswith('STBN'):
                 # User asked about primary, exclude standby unless explicitly included
-                if 'standby' not in q_lower and 'stbn' not in q_lower:
+                if not features.has('standby') and not features.has('stbn'):
                     exclude_standby = True
         
         return ScopeConstraint(
@@ -695,8 +686,14 @@ class ScopeControlGuard:
                    'ALERTS', 'CRITICAL', 'DATABASE', 'STATUS', 'WHERE', 'WHEN',
                    'WHY', 'SHOW', 'GIVE', 'NUMBER', 'COUNT', 'WARNING', 'ONLY'}
         
+        # A known database mentioned by its full name wins over patterns
+        known = TargetDictionary.current().mention(question)
+        if known and known not in excluded:
+            return known
+        
+        features = QuestionFeatures.of(question)
         for pattern in patterns:
-            match = re.search(pattern, question.upper())
+            match = features.search(pattern, "upper")
             if match:
                 db_name = match.group(1)
                 if db_name not in excluded and len(db_name) >= 4:
@@ -862,24 +859,17 @@ class PredictiveReasoningSafety:
         Returns:
             Tuple of (is_safe, list of violations)
         """
-        violations = []
-        text_lower = text.lower()
-        
-        for pattern in cls.FORBIDDEN_PHRASES:
-            if re.search(pattern, text_lower):
-                violations.append(f"Forbidden phrase detected: {pattern}")
+        violations = [
+            f"Forbidden phrase detected: {cls.FORBIDDEN_PHRASES[i]}"
+            for i in ANSWER_POSTPROCESSOR.matches(_PREDICTION_FORBIDDEN_RULES, text, lower=True)
+        ]
         
         return len(violations) == 0, violations
     
     @classmethod
     def sanitize_prediction(cls, text: str) -> str:
         """Replace forbidden phrases with safe alternatives."""
-        result = text
-        
-        for pattern, replacement in cls.SAFE_REPLACEMENTS.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-        
-        return result
+        return ANSWER_POSTPROCESSOR.rewrite(_PREDICTION_SAFE_RULES, text)
     
     @classmethod
     def add_predictive_disclaimer(cls, response: str) -> str:
@@ -920,6 +910,14 @@ class PredictiveReasoningSafety:
         return "\n".join(lines)
 
 
+_PREDICTION_FORBIDDEN_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "prediction_forbidden", pattern_rules(PredictiveReasoningSafety.FORBIDDEN_PHRASES, flags=0)
+)
+_PREDICTION_SAFE_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "prediction_safe", pattern_rules(PredictiveReasoningSafety.SAFE_REPLACEMENTS)
+)
+
+
 # =============================================================================
 # GUARDRAIL 4: NO-DATA / LOW-DATA HANDLING
 # =============================================================================
@@ -1236,9 +1234,8 @@ class ProductionSafeResponse:
         response_lower = response.lower()
         
         # Check for panic language
-        for phrase in cls.PANIC_PHRASES:
-            if phrase in response_lower:
-                issues.append(f"Panic language detected: '{phrase}'")
+        for i in ANSWER_POSTPROCESSOR.matches(_PRODUCTION_PANIC_RULES, response, lower=True):
+            issues.append(f"Panic language detected: '{cls.PANIC_PHRASES[i]}'")
         
         # Check for unsolicited commands
         for pattern in cls.COMMAND_PATTERNS:
@@ -1250,13 +1247,7 @@ class ProductionSafeResponse:
     @classmethod
     def calm_down_text(cls, text: str) -> str:
         """Replace panic phrases with calmer alternatives."""
-        result = text
-        
-        for panic, calm in cls.CALM_REPLACEMENTS.items():
-            pattern = re.compile(re.escape(panic), re.IGNORECASE)
-            result = pattern.sub(calm, result)
-        
-        return result
+        return ANSWER_POSTPROCESSOR.rewrite(_PRODUCTION_CALM_RULES, text)
     
     @classmethod
     def format_structured_response(cls, facts: List[str], 
@@ -1287,6 +1278,14 @@ class ProductionSafeResponse:
         return "\n".join(lines)
 
 
+_PRODUCTION_PANIC_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "production_panic", phrase_rules(ProductionSafeResponse.PANIC_PHRASES, flags=0)
+)
+_PRODUCTION_CALM_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "production_calm", phrase_rules(ProductionSafeResponse.CALM_REPLACEMENTS)
+)
+
+
 # =============================================================================
 # PRODUCTION SAFETY RULES (RULE 7 - NON-NEGOTIABLE)
 # =============================================================================
@@ -1560,6 +1559,14 @@ class IncidentCountGuardrail:
         r'\bprecisely\s+\d+\s+incidents?\b',
     ]
     
+    # Absolute statements rewritten with qualifiers (in order)
+    INCIDENT_FIXES = [
+        # "X unique incidents" -> "~X distinct alert patterns"
+        (r'(\d+)\s+unique\s+incidents?', r'~\1 distinct alert patterns'),
+        # "X confirmed incidents" -> "approximately X incident patterns"
+        (r'(\d+)\s+confirmed\s+incidents?', r'approximately \1 incident patterns detected'),
+    ]
+    
     # Required qualifier words
     REQUIRED_QUALIFIERS = [
         'approximately', 'about', 'around', '~', 'roughly',
@@ -1601,9 +1608,8 @@ class IncidentCountGuardrail:
         response_lower = response.lower()
         
         # Check for forbidden phrases
-        for pattern in cls.FORBIDDEN_INCIDENT_PHRASES:
-            if re.search(pattern, response_lower):
-                violations.append(f"Absolute incident count detected: {pattern}")
+        for i in ANSWER_POSTPROCESSOR.matches(_INCIDENT_FORBIDDEN_RULES, response, lower=True):
+            violations.append(f"Absolute incident count detected: {cls.FORBIDDEN_INCIDENT_PHRASES[i]}")
         
         # If response mentions incidents, check for qualifiers
         if 'incident' in response_lower:
@@ -1619,25 +1625,15 @@ class IncidentCountGuardrail:
     @classmethod
     def fix_incident_language(cls, response: str) -> str:
         """Fix absolute incident statements to use proper qualifiers."""
-        result = response
-        
-        # Replace "X unique incidents" with "~X distinct alert patterns"
-        result = re.sub(
-            r'(\d+)\s+unique\s+incidents?',
-            r'~\1 distinct alert patterns',
-            result,
-            flags=re.IGNORECASE
-        )
-        
-        # Replace "X confirmed incidents" with "approximately X incident patterns"
-        result = re.sub(
-            r'(\d+)\s+confirmed\s+incidents?',
-            r'approximately \1 incident patterns detected',
-            result,
-            flags=re.IGNORECASE
-        )
-        
-        return result
+        return ANSWER_POSTPROCESSOR.rewrite(_INCIDENT_FIX_RULES, response)
+
+
+_INCIDENT_FORBIDDEN_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "incident_forbidden", pattern_rules(IncidentCountGuardrail.FORBIDDEN_INCIDENT_PHRASES, flags=0)
+)
+_INCIDENT_FIX_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "incident_fix", pattern_rules(IncidentCountGuardrail.INCIDENT_FIXES)
+)
 
 
 class SafeActionBoundaries:
@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from typing import List, Tuple, Optional
 import re
 
+from reasoning.answer_postprocessor import ANSWER_POSTPROCESSOR, phrase_rules
+
 
 @dataclass
 class QualityCheck:
@@ -111,25 +113,17 @@ class LanguageGuardrails:
         Returns:
             (has_panic, list of panic phrases found)
         """
-        text_lower = text.lower()
-        found = []
-        
-        for phrase in self.PANIC_PHRASES:
-            if phrase in text_lower:
-                found.append(phrase)
+        found = [
+            self.PANIC_PHRASES[i]
+            for i in ANSWER_POSTPROCESSOR.matches(_PANIC_RULES, text, lower=True)
+        ]
         
         return (len(found) > 0, found)
     
     def calm_down_text(self, text: str) -> str:
         """Replace panic phrases with calmer alternatives."""
-        result = text
-        
-        for panic, calm in self.CALM_REPLACEMENTS.items():
-            # Case-insensitive replacement
-            pattern = re.compile(re.escape(panic), re.IGNORECASE)
-            result = pattern.sub(calm, result)
-        
-        return result
+        # Case-insensitive replacement
+        return ANSWER_POSTPROCESSOR.rewrite(_CALM_RULES, text)
     
     def check_paragraph_length(self, text: str) -> Tuple[bool, List[str]]:
         """
@@ -371,6 +365,13 @@ class LanguageGuardrails:
 
 
 # Singleton instance
+_PANIC_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "language_panic", phrase_rules(LanguageGuardrails.PANIC_PHRASES, flags=0)
+)
+_CALM_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "language_calm", phrase_rules(LanguageGuardrails.CALM_REPLACEMENTS)
+)
+
 LANGUAGE_GUARDRAILS = LanguageGuardrails()
 
 
@@ -133,6 +133,10 @@ from typing import Dict, Any, Optional, Tuple, List
 from dataclasses import dataclass, field
 from enum import Enum
 
+from nlp_engine.question_features import QuestionFeatures
+from reasoning.answer_postprocessor import ANSWER_POSTPROCESSOR, pattern_rules
+from services.request_context import RequestLocal
+
 
 class ScopeType(Enum):
     """Database scope types."""
@@ -152,8 +156,9 @@ class ActiveScope:
         return self.scope_type == ScopeType.DATABASE and self.database_name is not None
 
 
-# Global active scope tracker (synced with SessionStore)
-_ACTIVE_DB_SCOPE: ActiveScope = ActiveScope()
+# Active scope tracker (synced with SessionStore; one per request
+# inside request_scope(), starting AMBIGUOUS until loaded from the session)
+_ACTIVE_DB_SCOPE = RequestLocal("phase12.active_scope", value=ActiveScope(), factory=ActiveScope)
 
 # Session store integration flag
 _SESSION_SYNC_ENABLED = False
@@ -166,35 +171,33 @@ except ImportError:
 
 def _sync_scope_from_session():
     """Load scope from session store at start of request."""
-    global _ACTIVE_DB_SCOPE
     if not _SESSION_SYNC_ENABLED:
         return
     
     db_name, scope_type_str = SessionStore.get_active_db_scope()
     if db_name:
-        _ACTIVE_DB_SCOPE = ActiveScope(
+        _ACTIVE_DB_SCOPE.set(ActiveScope(
             scope_type=ScopeType.DATABASE,
             database_name=db_name,
             explicitly_set=True
-        )
+        ))
     elif scope_type_str == "ENVIRONMENT":
-        _ACTIVE_DB_SCOPE = ActiveScope(
+        _ACTIVE_DB_SCOPE.set(ActiveScope(
             scope_type=ScopeType.ENVIRONMENT,
             database_name=None,
             explicitly_set=True
-        )
+        ))
     # else keep as AMBIGUOUS
 
 
 def _sync_scope_to_session():
     """Save scope to session store after update."""
-    global _ACTIVE_DB_SCOPE
     if not _SESSION_SYNC_ENABLED:
         return
     
     SessionStore.set_active_db_scope(
-        _ACTIVE_DB_SCOPE.database_name,
-        _ACTIVE_DB_SCOPE.scope_type.value
+        _ACTIVE_DB_SCOPE.get().database_name,
+        _ACTIVE_DB_SCOPE.get().scope_type.value
     )
 
 
@@ -269,79 +272,72 @@ class Phase12Guardrails:
     @classmethod
     def extract_database_from_question(cls, question: str) -> Optional[str]:
         """Extract database name from question if present."""
-        for pattern in cls.DB_PATTERNS:
-            match = re.search(pattern, question, re.IGNORECASE)
-            if match:
-                return match.group(1).upper()
+        match = QuestionFeatures.of(question).first_search(cls.DB_PATTERNS, "text", re.IGNORECASE)
+        if match:
+            return match.group(1).upper()
         return None
     
     @classmethod
     def is_scope_inheriting_followup(cls, question: str) -> bool:
         """Check if question inherits previous DB scope."""
-        q_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         for pattern in cls.SCOPE_INHERITING_PATTERNS:
-            if re.match(pattern, q_lower):
+            if features.match(pattern, "norm"):
                 return True
         return False
     
     @classmethod
     def is_environment_scope_request(cls, question: str) -> bool:
         """Check if question explicitly requests environment scope."""
-        q_lower = question.lower()
-        for pattern in cls.ENVIRONMENT_SCOPE_PATTERNS:
-            if re.search(pattern, q_lower):
-                return True
-        return False
+        return QuestionFeatures.of(question).any_search(cls.ENVIRONMENT_SCOPE_PATTERNS, "lower")
     
     @classmethod
     def update_scope(cls, question: str) -> ActiveScope:
         """Update active scope based on question."""
-        global _ACTIVE_DB_SCOPE
         
         # CRITICAL: Load scope from session FIRST
         _sync_scope_from_session()
         
         # Check for explicit environment request
         if cls.is_environment_scope_request(question):
-            _ACTIVE_DB_SCOPE = ActiveScope(
+            _ACTIVE_DB_SCOPE.set(ActiveScope(
                 scope_type=ScopeType.ENVIRONMENT,
                 database_name=None,
                 explicitly_set=True
-            )
+            ))
             _sync_scope_to_session()  # Save to session
-            return _ACTIVE_DB_SCOPE
+            return _ACTIVE_DB_SCOPE.get()
         
         # Check for database name in question
         db_name = cls.extract_database_from_question(question)
         if db_name:
-            _ACTIVE_DB_SCOPE = ActiveScope(
+            _ACTIVE_DB_SCOPE.set(ActiveScope(
                 scope_type=ScopeType.DATABASE,
                 database_name=db_name,
                 explicitly_set=True
-            )
+            ))
             _sync_scope_to_session()  # Save to session
-            return _ACTIVE_DB_SCOPE
+            return _ACTIVE_DB_SCOPE.get()
         
         # Check if follow-up should inherit scope
         if cls.is_scope_inheriting_followup(question):
             # Keep current scope (inherit from previous)
-            if _ACTIVE_DB_SCOPE.database_name:
-                return _ACTIVE_DB_SCOPE
+            if _ACTIVE_DB_SCOPE.get().database_name:
+                return _ACTIVE_DB_SCOPE.get()
         
-        return _ACTIVE_DB_SCOPE
+        return _ACTIVE_DB_SCOPE.get()
     
     @classmethod
     def get_current_scope(cls) -> ActiveScope:
         """Get current active scope (synced from session)."""
         # Load from session first
         _sync_scope_from_session()
-        return _ACTIVE_DB_SCOPE
+        return _ACTIVE_DB_SCOPE.get()
     
     @classmethod
     def reset_scope(cls):
         """Reset scope to ambiguous."""
-        global _ACTIVE_DB_SCOPE
-        _ACTIVE_DB_SCOPE = ActiveScope()
+        _ACTIVE_DB_SCOPE.set(ActiveScope())
         # Clear in session too
         if _SESSION_SYNC_ENABLED:
             SessionStore.clear_db_scope()
@@ -376,7 +372,7 @@ class Phase12Guardrails:
             return True
         
         # Generic count questions without scope need clarification
-        q_lower = question.lower()
+        features = QuestionFeatures.of(question)
         ambiguous_patterns = [
             r'^how\s+many\s+',
             r'^count\s+',
@@ -385,7 +381,7 @@ class Phase12Guardrails:
             r'^warning\s+',
         ]
         for pattern in ambiguous_patterns:
-            if re.match(pattern, q_lower):
+            if features.match(pattern, "lower"):
                 return True
         
         return False
@@ -465,8 +461,7 @@ class Phase12Guardrails:
                 return ('ambiguous', False)
             return ('environment', True)  # Default to environment for general questions
         """Reset scope to ambiguous."""
-        global _ACTIVE_DB_SCOPE
-        _ACTIVE_DB_SCOPE = ActiveScope()
+        _ACTIVE_DB_SCOPE.set(ActiveScope())
     
     @classmethod
     def check_scope_drift(cls, question: str, answer: str, 
@@ -609,8 +604,7 @@ class Phase12Guardrails:
         ])
         
         # Replace forbidden predictions
-        for pattern, replacement in cls.FORBIDDEN_PREDICTIONS:
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+        result = ANSWER_POSTPROCESSOR.rewrite(_FORBIDDEN_PREDICTION_RULES, result)
         
         # Add disclaimer for predictive questions
         if is_predictive and cls.PREDICTION_DISCLAIMER not in result:
@@ -725,11 +719,8 @@ class Phase12Guardrails:
     @classmethod
     def needs_execution_refusal(cls, question: str) -> bool:
         """Check if question requests execution/guarantee."""
-        q_lower = question.lower()
-        for pattern in cls.EXECUTION_PATTERNS + cls.GUARANTEE_PATTERNS:
-            if re.search(pattern, q_lower):
-                return True
-        return False
+        return QuestionFeatures.of(question).any_search(
+            cls.EXECUTION_PATTERNS + cls.GUARANTEE_PATTERNS, "lower")
     
     @classmethod
     def get_execution_refusal(cls, question: str) -> str:
@@ -870,6 +861,11 @@ class Phase12Guardrails:
         return violations
 
 
+_FORBIDDEN_PREDICTION_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "phase12_predictions", pattern_rules(Phase12Guardrails.FORBIDDEN_PREDICTIONS)
+)
+
+
 # =========================================
 # CONVENIENCE FUNCTIONS
 # =========================================
@@ -23,6 +23,8 @@ import re
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from nlp_engine.question_features import QuestionFeatures, keyword_group
+
 
 @dataclass
 class QuestionInterpretation:
@@ -95,43 +97,43 @@ class EntityExtractor:
         r'(ORA[-\s]?\d+)',
     ]
     
+    keyword_group(SEVERITY_KEYWORDS, TIME_PATTERNS)
+    
     def extract_database(self, text: str) -> Optional[str]:
         """Extract database name from text."""
-        text_upper = text.upper()
-        
-        for pattern in self.DATABASE_PATTERNS:
-            match = re.search(pattern, text_upper, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        match = QuestionFeatures.of(text).first_search(self.DATABASE_PATTERNS, "upper", re.IGNORECASE)
+        if match:
+            return match.group(1)
         
         return None
     
     def extract_severity(self, text: str) -> Optional[str]:
         """Extract severity level from text."""
-        text_lower = text.lower()
+        features = QuestionFeatures.of(text)
         
         for keyword, severity in self.SEVERITY_KEYWORDS.items():
-            if keyword in text_lower:
+            if features.has(keyword):
                 return severity
         
         return None
     
     def extract_time_frame(self, text: str) -> Optional[str]:
         """Extract time frame from text."""
-        text_lower = text.lower()
+        features = QuestionFeatures.of(text)
         
         for pattern, value in self.TIME_PATTERNS.items():
-            if pattern in text_lower:
+            if features.has(pattern):
                 return value
         
         return None
     
     def extract_error_codes(self, text: str) -> List[str]:
         """Extract ORA error codes from text."""
+        features = QuestionFeatures.of(text)
         codes = []
         
         for pattern in self.ERROR_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+            matches = features.findall(pattern, "text", re.IGNORECASE)
             for match in matches:
                 if isinstance(match, tuple):
                     match = match[0]
@@ -264,13 +266,13 @@ class IntentClassifier:
         Classify question intent.
         Returns (question_type, confidence)
         """
-        question_lower = question.lower()
+        features = QuestionFeatures.of(question)
         
         # Check each intent type
         scores = {}
         for intent_type, patterns in self.INTENT_PATTERNS.items():
             for pattern in patterns:
-                if re.search(pattern, question_lower):
+                if features.search(pattern, "lower"):
                     scores[intent_type] = scores.get(intent_type, 0) + 1
         
         if not scores:
@@ -301,17 +303,18 @@ class QuestionReinterpreter:
         'what\'s wrong': 'Identify and explain current issues or anomalies',
         'update me': 'Provide summary of current alert situation and any changes',
     }
+    keyword_group(REINTERPRETATIONS)
     
     def reinterpret(self, question: str) -> Tuple[str, str]:
         """
         Reinterpret a vague question into a clear intent.
         Returns (interpreted_intent, explanation)
         """
-        question_lower = question.lower().strip()
+        features = QuestionFeatures.of(question)
         
         # Check for known vague patterns
         for pattern, interpretation in self.REINTERPRETATIONS.items():
-            if pattern in question_lower:
+            if features.has(pattern):
                 explanation = f"I interpret '{question}' as: {interpretation}"
                 return interpretation, explanation
         
@@ -347,15 +350,16 @@ class FollowUpHandler:
         'more details',
         'expand on',
     ]
+    FOLLOWUP_KEYWORDS = keyword_group(FOLLOWUP_INDICATORS)
+    keyword_group('only critical', 'only warning', 'standby', 'primary')
     
     def is_followup(self, question: str) -> bool:
         """Determine if question is a follow-up."""
-        question_lower = question.lower()
+        features = QuestionFeatures.of(question)
         
         # Check for follow-up indicators
-        for indicator in self.FOLLOWUP_INDICATORS:
-            if indicator in question_lower:
-                return True
+        if features.any_of(self.FOLLOWUP_KEYWORDS):
+            return True
         
         # Very short questions are often follow-ups
         if len(question.split()) <= 3:
@@ -363,7 +367,7 @@ class FollowUpHandler:
         
         # Questions that are just a filter value
         filter_only = ['critical', 'warning', 'standby', 'primary']
-        if question_lower.strip().rstrip('?') in filter_only:
+        if features.norm.rstrip('?') in filter_only:
             return True
         
         return False
@@ -372,24 +376,24 @@ class FollowUpHandler:
         """
         Interpret follow-up question using previous context.
         """
-        question_lower = question.lower()
+        features = QuestionFeatures.of(question)
         
         # Get previous database context
         prev_db = previous_context.get('database', '')
         prev_severity = previous_context.get('severity', '')
         
         # Handle "only critical" type follow-ups
-        if 'only critical' in question_lower or question_lower.strip() == 'critical':
+        if features.has('only critical') or features.norm == 'critical':
             return f"Show critical alerts for {prev_db}" if prev_db else "Show critical alerts"
         
-        if 'only warning' in question_lower or question_lower.strip() == 'warning':
+        if features.has('only warning') or features.norm == 'warning':
             return f"Show warning alerts for {prev_db}" if prev_db else "Show warning alerts"
         
         # Handle "what about standby" type
-        if 'standby' in question_lower:
+        if features.has('standby'):
             return "Show alerts for standby databases"
         
-        if 'primary' in question_lower:
+        if features.has('primary'):
             return "Show alerts for primary databases"
         
         # Default interpretation
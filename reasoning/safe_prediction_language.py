@@ -23,6 +23,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import re
 
+from reasoning.answer_postprocessor import ANSWER_POSTPROCESSOR, pattern_rules
+
 
 @dataclass
 class SafePrediction:
@@ -142,10 +144,11 @@ class SafePredictionLanguage:
         sanitized = text
         replaced = []
         
-        for pattern, replacement in self.SAFE_REPLACEMENTS.items():
-            if re.search(pattern, text, re.IGNORECASE):
-                replaced.append(pattern)
-                sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+        # Rules found in the original text, applied in table order
+        for i in ANSWER_POSTPROCESSOR.matches(_SAFE_REPLACEMENT_RULES, text):
+            rule = _SAFE_REPLACEMENT_RULES.rules[i]
+            replaced.append(rule.pattern.pattern)
+            sanitized = rule.pattern.sub(rule.replacement, sanitized)
         
         if replaced:
             self._unsafe_detections.append({
@@ -158,11 +161,7 @@ class SafePredictionLanguage:
     
     def check_for_forbidden_phrases(self, text: str) -> List[str]:
         """Check if text contains any forbidden phrases."""
-        found = []
-        for pattern in self.FORBIDDEN_PHRASES:
-            if re.search(pattern, text, re.IGNORECASE):
-                found.append(pattern)
-        return found
+        return [self.FORBIDDEN_PHRASES[i] for i in ANSWER_POSTPROCESSOR.matches(_FORBIDDEN_RULES, text)]
     
     def build_safe_prediction(
         self,
@@ -305,6 +304,13 @@ class SafePredictionLanguage:
         self._unsafe_detections = []
 
 
+_FORBIDDEN_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "safe_prediction_forbidden", pattern_rules(SafePredictionLanguage.FORBIDDEN_PHRASES)
+)
+_SAFE_REPLACEMENT_RULES = ANSWER_POSTPROCESSOR.rule_set(
+    "safe_prediction_replacements", pattern_rules(SafePredictionLanguage.SAFE_REPLACEMENTS)
+)
+
 # Singleton instance
 SAFE_PREDICTION = SafePredictionLanguage()
 
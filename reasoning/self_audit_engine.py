@@ -22,6 +22,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from nlp_engine.question_features import QuestionFeatures
+
 # Import the DBA Guardrails system (8 RULES)
 try:
     from .dba_guardrails import (
@@ -237,12 +239,11 @@ class TrustModeDetector:
             if answer_mode == AnswerMode.STRICT_VALUE:
                 return TrustMode.STRICT
         
-        q_lower = question.lower()
+        features = QuestionFeatures.of(question)
         
         # Check for strict mode triggers
-        for pattern in cls.STRICT_TRIGGERS:
-            if re.search(pattern, q_lower):
-                return TrustMode.STRICT
+        if features.any_search(cls.STRICT_TRIGGERS, "lower"):
+            return TrustMode.STRICT
         
         # Check for safe mode triggers or data issues
         if not data_available:
@@ -251,9 +252,8 @@ class TrustModeDetector:
         if data_confidence == ConfidenceLevel.NONE:
             return TrustMode.SAFE
         
-        for pattern in cls.SAFE_TRIGGERS:
-            if re.search(pattern, q_lower):
-                return TrustMode.SAFE
+        if features.any_search(cls.SAFE_TRIGGERS, "lower"):
+            return TrustMode.SAFE
         
         return TrustMode.NORMAL
 
@@ -610,6 +610,12 @@ class SelfAuditEngine:
             "session_learnings": len(self.fact_register.get_learnings())
         }
     
+    def fact_fingerprint(self):
+        """Hashable view of the registered facts (they decide contradiction notes)."""
+        return tuple(sorted(
+            (fact_key, repr(fact.value)) for fact_key, fact in self.fact_register.facts.items()
+        ))
+    
     def reset(self):
         """Reset for new conversation."""
         self.fact_register.reset()
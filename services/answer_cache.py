@@ -0,0 +1,210 @@
+# services/answer_cache.py
+"""
+==============================================================
+ANSWER CACHE - Generation-aware LRU + TTL response cache
+==============================================================
+
+NOC staff ask the same questions over and over ("how many critical
+alerts", "which database is worst", "sitrep"). Every one used to run
+the full routing/reasoning chain over the whole dataset again.
+
+AnswerCache memoizes the data-derived part of an answer:
+
+- key:        built by the caller from the normalized question and
+              the session scope the answer depends on
+- generation: every entry belongs to the data generation it was
+              computed for; a reload (publish_snapshot) drops them all,
+              and results computed across a reload are never stored
+- eviction:   LRU order, per-entry TTL and a memory bound (approximate
+              size of the cached values)
+
+Values are deep-copied on put and get, so callers may mutate what they
+receive. Hit/miss/eviction counters are exposed via stats().
+
+Usage:
+    key = ("analyze", normalize_question(question), scope)
+    cached = ANSWER_CACHE.get(key)
+    if cached is None:
+        generation = get_data_generation()
+        cached = compute(question)
+        ANSWER_CACHE.put(key, cached, generation)
+
+Python 3.6.8 compatible.
+"""
+
+import copy
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import settings
+from data_engine.global_cache import get_data_generation
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question):
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return _WHITESPACE.sub(" ", (question or "").lower()).strip().rstrip("?!. ")
+
+
+def approximate_size(value):
+    """Approximate memory footprint (bytes) of a JSON-like value."""
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class AnswerCache(object):
+    """Bounded LRU + TTL cache whose entries expire with the data generation."""
+
+    def __init__(self, name, max_entries=512, max_bytes=32 * 1024 * 1024, ttl_seconds=300.0):
+        """
+        Args:
+            name: Cache name (for stats)
+            max_entries: Entry limit (0 disables the cache)
+            max_bytes: Approximate memory limit of all cached values
+            ttl_seconds: Lifetime of an entry (0 disables the cache)
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()    # key -> (value, size, expires)
+        self._bytes = 0
+        self._generation = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "stale_stores": 0,
+            "evicted_lru": 0,
+            "evicted_memory": 0,
+            "expired": 0,
+            "invalidated": 0,
+            "invalidations": 0,
+            "oversized": 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    # =====================================================
+    # LOOKUP / STORE
+    # =====================================================
+    def get(self, key):
+        """Deep copy of the cached value, or None on a miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            self._check_generation(get_data_generation())
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= now:
+                self._remove(key)
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            value = entry[0]
+        return copy.deepcopy(value)
+
+    def put(self, key, value, generation=None):
+        """
+        Cache a value computed for the given data generation.
+
+        Returns:
+            True if stored, False if the data was reloaded meanwhile
+            (or the value alone exceeds the memory limit)
+        """
+        if not self.enabled:
+            return False
+        value = copy.deepcopy(value)
+        size = approximate_size(value)
+        with self._lock:
+            current = get_data_generation()
+            self._check_generation(current)
+            if generation is not None and generation != current:
+                self._stats["stale_stores"] += 1
+                return False
+            if size > self.max_bytes:
+                self._stats["oversized"] += 1
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.time() + self.ttl_seconds)
+            self._bytes += size
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evicted_lru"] += 1
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evicted_memory"] += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _check_generation(self, generation):
+        """Drop every entry when the data generation changed (caller holds lock)."""
+        if generation == self._generation:
+            return
+        if self._entries:
+            self._stats["invalidated"] += len(self._entries)
+            self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._bytes = 0
+        self._generation = generation
+
+    # =====================================================
+    # METRICS
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["generation"] = self._generation
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+        stats.update({
+            "name": self.name,
+            "enabled": self.enabled,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        })
+        return stats
+
+
+# Global instance for import
+ANSWER_CACHE = AnswerCache(
+    "answers",
+    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+    max_bytes=int(settings.ANSWER_CACHE_MAX_MB * 1024 * 1024),
+    ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS
+)
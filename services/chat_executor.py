@@ -0,0 +1,178 @@
+# services/chat_executor.py
+"""
+==============================================================
+CHAT EXECUTOR (BOUNDED POOL OFF THE EVENT LOOP)
+==============================================================
+
+The chat endpoints are `async def`, but IntelligenceService.analyze,
+process_query and OEMReasoningPipeline.process are synchronous and
+CPU-heavy (regex + full alert scans). Calling them directly on the
+event loop stalls every other request on the worker, health checks
+included.
+
+ChatExecutor runs that work on a dedicated, bounded thread pool:
+- Bounded queue: requests beyond workers + max_queue are rejected
+- Per-request timeout: the caller gets control back after `timeout`
+- Metrics: queue depth, in-flight, completed, rejected, timeouts,
+  and wait/run latency percentiles
+
+NOTE: Each chat request runs in its own request scope
+(services/request_context.py): session state, Phase12 scope, formatter
+context and reasoning memory are not shared between concurrent
+requests, so CHAT_EXECUTOR_WORKERS may be raised above 1. Analysis is
+CPU-bound Python, so more workers add fairness (a slow question does
+not hold up the others), not throughput; the default stays 1 worker.
+With CHAT_EXECUTION_MODE=process the threads only wait on chat worker
+processes (services/chat_process_pool.py), so there is one per worker.
+
+Python 3.6.8 compatible.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import settings
+
+
+class ChatQueueFull(Exception):
+    """Raised when the executor's bounded queue is full."""
+
+
+class ChatTimeout(Exception):
+    """
+    Raised when a request exceeds its per-request timeout.
+    `future` is the pool job, which keeps running on its thread.
+    """
+
+    def __init__(self, message, future=None):
+        super(ChatTimeout, self).__init__(message)
+        self.future = future
+
+
+class ChatExecutor:
+    """
+    Bounded thread-pool executor for synchronous chat analysis.
+
+    Usage (inside an async endpoint):
+        result = await CHAT_EXECUTOR.run(INTELLIGENCE_SERVICE.analyze, question)
+    """
+
+    # Latency samples kept for percentile reporting
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, max_workers=1, max_queue=32, timeout=30.0, name="chat"):
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._name = name
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queue_seen = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timed_out": 0
+        }
+        self._wait_ms = deque(maxlen=self.LATENCY_SAMPLES)
+        self._run_ms = deque(maxlen=self.LATENCY_SAMPLES)
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on the pool and await the result.
+
+        Raises:
+            ChatQueueFull: if workers are busy and the queue is full
+            ChatTimeout: if the request exceeds its timeout
+        """
+        with self._lock:
+            if self._queued + self._running >= self._max_workers + self._max_queue:
+                self._counters["rejected"] += 1
+                raise ChatQueueFull("Chat executor queue is full ({0} waiting)".format(self._queued))
+            self._queued += 1
+            self._counters["submitted"] += 1
+            self._max_queue_seen = max(self._max_queue_seen, self._queued)
+
+        submitted_at = time.time()
+        future = self._pool.submit(self._invoke, submitted_at, func, args, kwargs)
+        timeout = self._timeout if timeout is None else timeout
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._counters["timed_out"] += 1
+                # Cancelled before it started: it will never run
+                if future.cancelled():
+                    self._queued -= 1
+            raise ChatTimeout("Chat request exceeded {0}s".format(timeout), future)
+
+    def stats(self):
+        """Queue-depth and latency metrics."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                "name": self._name,
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "timeout_seconds": self._timeout,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                "max_queue_depth_seen": self._max_queue_seen,
+                "wait_ms": self._percentiles(self._wait_ms),
+                "run_ms": self._percentiles(self._run_ms)
+            })
+            return stats
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait)
+
+    # =====================================================
+    # INTERNALS
+    # =====================================================
+    def _invoke(self, submitted_at, func, args, kwargs):
+        started = time.time()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_ms.append((started - submitted_at) * 1000.0)
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._run_ms.append((time.time() - started) * 1000.0)
+                self._counters["completed" if ok else "failed"] += 1
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {"p50": None, "p95": None, "p99": None, "max": None}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+
+        def pick(p):
+            return round(ordered[min(last, int(round(p * last)))], 2)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 2)}
+
+
+# Global instance for import
+CHAT_EXECUTOR = ChatExecutor(
+    max_workers=settings.CHAT_PROCESS_WORKERS if settings.CHAT_EXECUTION_MODE == "process"
+    else settings.CHAT_EXECUTOR_WORKERS,
+    max_queue=settings.CHAT_EXECUTOR_MAX_QUEUE,
+    timeout=settings.CHAT_TIMEOUT_SECONDS
+)
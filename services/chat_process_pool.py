@@ -0,0 +1,342 @@
+# services/chat_process_pool.py
+"""
+==============================================================
+CHAT PROCESS POOL (SHARED MMAP ALERT SNAPSHOT)
+==============================================================
+
+The reasoning path is pure Python and holds the GIL, so chat threads
+do not scale across cores, and extra gunicorn workers each carry a
+full copy of GLOBAL_DATA.
+
+With CHAT_EXECUTION_MODE=process, IntelligenceService.analyze runs in
+a pool of worker processes instead:
+
+1. The alert list is written once per data generation to a columnar
+   snapshot file (data_engine/alert_snapshot.py)
+2. Each worker mmaps that file read-only and uses it as
+   GLOBAL_DATA["alerts"] - the page cache holds one shared copy
+3. Per question, only (question, session state) goes to the worker
+   and (answer, updated session state) comes back - preceded by the
+   request's latency spans and, for streaming requests, the pipeline's
+   stage events
+
+Sessions are pinned to a worker (hash of session_id), so process-local
+conversational memory (SessionMemoryEngine, context trackers) stays
+consistent for a conversation.
+
+Python 3.6.8 compatible.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import traceback
+import zlib
+
+from config.settings import settings
+from data_engine.alert_snapshot import attach_alert_snapshot, write_alert_snapshot
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation
+from services.request_tracer import REQUEST_TRACER
+
+
+class ChatWorkerError(Exception):
+    """Raised when a chat worker process fails or exits mid-request."""
+
+
+# =====================================================
+# WORKER PROCESS
+# =====================================================
+def _worker_main(conn):
+    """
+    Worker loop. Receives (question, session_id, state, snapshot_path,
+    reset_memory, stream) and replies ("ok", result, state) or
+    ("error", text, None). With stream set, ("stage", stage, data)
+    messages are sent first, as the reasoning pipeline advances; the
+    request's spans go ahead of the reply as ("spans", spans, None).
+    """
+    from data_engine.global_cache import publish_snapshot, set_system_ready
+    from services.answer_cache import ANSWER_CACHE
+    from services.intelligence_service import INTELLIGENCE_SERVICE
+    from services.session_store import SessionStore
+
+    attached_path = None
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+
+        question, session_id, state, snapshot_path, reset_memory, stream = message
+        try:
+            if snapshot_path != attached_path:
+                # Adopt the parent's generation so caches keyed on
+                # get_data_generation() invalidate in this process too
+                alerts = attach_alert_snapshot(snapshot_path)
+                publish_snapshot(dict(GLOBAL_DATA, alerts=alerts), alerts.generation)
+                ANSWER_CACHE.clear()
+                attached_path = snapshot_path
+                set_system_ready(True)
+
+            SessionStore.import_session(session_id, state, activate=True)
+            if reset_memory:
+                try:
+                    from incident_engine.production_intelligence_engine import SessionMemoryEngine
+                    SessionMemoryEngine.reset()
+                except ImportError:
+                    pass
+
+            on_stage = (lambda stage, data: conn.send(("stage", stage, data))) if stream else None
+            with REQUEST_TRACER.trace("chat_worker") as trace:
+                result = INTELLIGENCE_SERVICE.analyze(question, on_stage=on_stage)
+            if trace is not None:
+                conn.send(("spans", trace.spans, None))
+            conn.send(("ok", result, SessionStore.export_session(session_id)))
+        except Exception:
+            conn.send(("error", traceback.format_exc(), None))
+
+
+# =====================================================
+# POOL (PARENT SIDE)
+# =====================================================
+class _WorkerSlot(object):
+    """One worker process, its pipe, and the lock serializing its requests."""
+
+    def __init__(self, index):
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.restarts = 0
+        self.busy = False
+
+
+class ChatProcessPool:
+    """
+    Pool of chat worker processes attached to a shared alert snapshot.
+
+    Usage (from a chat executor thread):
+        result = CHAT_PROCESS_POOL.analyze(question, session_id)
+    """
+
+    SNAPSHOT_PREFIX = "oem_alerts_"
+
+    def __init__(self, workers=2, snapshot_dir=None):
+        self._workers = max(1, workers)
+        self._snapshot_dir = snapshot_dir or tempfile.gettempdir()
+        self._slots = [_WorkerSlot(i) for i in range(self._workers)]
+        self._lock = threading.Lock()
+        self._snapshot_path = None
+        self._snapshot_generation = None
+        self._snapshot_rows = 0
+        self._previous_path = None
+        self._publisher_pid = None
+        self._context = multiprocessing.get_context("spawn")
+
+    @property
+    def enabled(self):
+        return settings.CHAT_EXECUTION_MODE == "process"
+
+    # =====================================================
+    # LIFECYCLE
+    # =====================================================
+    def start(self):
+        """Spawn any worker process that is not running."""
+        for slot in self._slots:
+            with slot.lock:
+                self._ensure_worker(slot)
+
+    def shutdown(self):
+        for slot in self._slots:
+            with slot.lock:
+                self._stop_worker(slot)
+        # Snapshots inherited from a preloaded gunicorn master are shared
+        # with sibling workers - only remove files this process wrote
+        if self._publisher_pid == os.getpid():
+            for path in (self._snapshot_path, self._previous_path):
+                self._remove(path)
+
+    def _ensure_worker(self, slot):
+        if slot.process is not None and slot.process.is_alive():
+            return
+        if slot.process is not None:
+            slot.restarts += 1
+            self._stop_worker(slot)
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            name="chat-worker-{0}".format(slot.index),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        slot.process, slot.conn = process, parent_conn
+        print("[OK] Chat worker {0} started (pid {1})".format(slot.index, process.pid))
+
+    @staticmethod
+    def _stop_worker(slot):
+        if slot.conn is not None:
+            try:
+                slot.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            slot.conn.close()
+        if slot.process is not None:
+            slot.process.join(2)
+            if slot.process.is_alive():
+                slot.process.terminate()
+        slot.process, slot.conn = None, None
+
+    # =====================================================
+    # SNAPSHOT
+    # =====================================================
+    def publish(self, alerts, generation):
+        """
+        Write the alert snapshot for a data generation. Workers switch
+        to it on their next request. The previous file is kept until
+        the one after it, so requests already dispatched can attach.
+
+        Returns:
+            snapshot path
+        """
+        path = os.path.join(
+            self._snapshot_dir,
+            "{0}{1}_{2}.snap".format(self.SNAPSHOT_PREFIX, os.getpid(), generation)
+        )
+        started = time.time()
+        rows = write_alert_snapshot(alerts, path, generation)
+        with self._lock:
+            stale = self._previous_path
+            if self._snapshot_path != path:
+                self._previous_path = self._snapshot_path
+            self._snapshot_path = path
+            self._snapshot_generation = generation
+            self._snapshot_rows = rows
+            self._publisher_pid = os.getpid()
+        if stale not in (path, self._previous_path):
+            self._remove(stale)
+        print("[OK] Alert snapshot published: {0} rows, generation {1} ({2:.2f}s)".format(
+            rows, generation, time.time() - started
+        ))
+        return path
+
+    def ensure_snapshot(self):
+        """Publish the current generation's snapshot if it is missing."""
+        generation = get_data_generation()
+        with self._lock:
+            if self._snapshot_generation == generation and self._snapshot_path:
+                return self._snapshot_path
+        return self.publish(GLOBAL_DATA.get("alerts", []), generation)
+
+    @staticmethod
+    def _remove(path):
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # =====================================================
+    # ANALYSIS
+    # =====================================================
+    def analyze(self, question, session_id=None, reset_memory=False, on_stage=None):
+        """
+        Run IntelligenceService.analyze for a question in the worker
+        pinned to session_id, carrying the session state both ways.
+        Stage events are relayed to on_stage (called on this thread).
+        """
+        from services.session_store import SessionStore
+
+        snapshot_path = self.ensure_snapshot()
+        slot = self._slots[zlib.crc32((session_id or "").encode("utf-8")) % self._workers]
+
+        with slot.lock:
+            self._ensure_worker(slot)
+            state = SessionStore.export_session(session_id)
+            slot.busy = True
+            try:
+                with REQUEST_TRACER.span("chat_worker"):
+                    slot.conn.send((question, session_id, state, snapshot_path, reset_memory, on_stage is not None))
+                    status, payload, new_state = slot.conn.recv()
+                    while status in ("stage", "spans"):
+                        if status == "stage":
+                            on_stage(payload, new_state)
+                        else:
+                            REQUEST_TRACER.add_spans(payload)
+                        status, payload, new_state = slot.conn.recv()
+            except (EOFError, OSError) as e:
+                self._stop_worker(slot)
+                raise ChatWorkerError("Chat worker {0} exited: {1}".format(slot.index, str(e)))
+            finally:
+                slot.busy = False
+                slot.requests += 1
+
+        if status != "ok":
+            raise ChatWorkerError(payload)
+        SessionStore.import_session(session_id, new_state)
+        return payload
+
+    def status(self):
+        """Worker and snapshot status (RSS read from /proc where available)."""
+        with self._lock:
+            snapshot = {
+                "path": self._snapshot_path,
+                "generation": self._snapshot_generation,
+                "rows": self._snapshot_rows,
+                "bytes": os.path.getsize(self._snapshot_path)
+                if self._snapshot_path and os.path.exists(self._snapshot_path) else 0
+            }
+        workers = []
+        for slot in self._slots:
+            process = slot.process
+            alive = process is not None and process.is_alive()
+            workers.append({
+                "index": slot.index,
+                "pid": process.pid if alive else None,
+                "alive": alive,
+                "busy": slot.busy,
+                "requests": slot.requests,
+                "restarts": slot.restarts,
+                "rss_kb": _rss_kb(process.pid) if alive else None
+            })
+        return {
+            "enabled": self.enabled,
+            "workers": workers,
+            "snapshot": snapshot
+        }
+
+
+def _rss_kb(pid):
+    try:
+        with open("/proc/{0}/status".format(pid)) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (IOError, OSError, ValueError):
+        pass
+    return None
+
+
+def analyze_question(question, session_id=None, reset_memory=False, on_stage=None):
+    """
+    Analyze a question with the configured execution mode.
+    Thread mode calls INTELLIGENCE_SERVICE directly (session already
+    activated by the caller); process mode dispatches to the pool.
+    on_stage(stage, data) receives the reasoning pipeline stage events.
+    """
+    if CHAT_PROCESS_POOL.enabled:
+        return CHAT_PROCESS_POOL.analyze(question, session_id, reset_memory, on_stage)
+    from services.lazy_registry import ENGINE_REGISTRY
+    return ENGINE_REGISTRY.get("intelligence_service").analyze(question, on_stage=on_stage)
+
+
+# Global instance for import
+CHAT_PROCESS_POOL = ChatProcessPool(
+    workers=settings.CHAT_PROCESS_WORKERS,
+    snapshot_dir=settings.CHAT_SNAPSHOT_DIR or None
+)
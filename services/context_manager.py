@@ -14,8 +14,12 @@ Python 3.6.8 compatible.
 """
 
 from typing import Dict, Any, Optional, List
+from collections import deque
 from datetime import datetime
 import copy
+import time
+
+from services.session_backend import session_backend
 
 
 class ConversationContext:
@@ -45,7 +49,7 @@ class ConversationContext:
         self.last_intent = None
         self.last_query = None
         self.last_answer = None
-        self.query_history = []
+        self.query_history = deque(maxlen=10)  # (query, intent, epoch seconds)
         self.timestamp = datetime.now()
     
     def to_dict(self) -> Dict[str, Any]:
@@ -87,8 +91,8 @@ class ContextManager:
     - Pagination tracking
     """
     
-    # Storage for per-session contexts
-    _sessions = {}  # session_id -> ConversationContext
+    # Storage for per-session contexts (bounded LRU + idle TTL)
+    _sessions = session_backend("nlp_context", shared=True)  # session_id -> ConversationContext
     
     @classmethod
     def get_context(cls, session_id: str) -> ConversationContext:
@@ -101,17 +105,17 @@ class ContextManager:
         Returns:
             ConversationContext for this session
         """
-        if session_id not in cls._sessions:
-            cls._sessions[session_id] = ConversationContext()
-        return cls._sessions[session_id]
+        context, _ = cls._sessions.get_or_create(session_id, ConversationContext)
+        return context
     
     @classmethod
     def reset_context(cls, session_id: str):
         """Reset context for a session."""
-        if session_id in cls._sessions:
-            cls._sessions[session_id].reset()
+        context = cls._sessions.get(session_id)
+        if context is not None:
+            context.reset()
         else:
-            cls._sessions[session_id] = ConversationContext()
+            cls._sessions.put(session_id, ConversationContext())
     
     @classmethod
     def merge_entities(cls, session_id: str, 
@@ -253,16 +257,8 @@ class ContextManager:
         ctx.last_query = query
         ctx.last_answer = results.get("answer")
         
-        # Add to history
-        ctx.query_history.append({
-            "query": query,
-            "intent": intent.get("intent"),
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Keep only last 10 queries
-        if len(ctx.query_history) > 10:
-            ctx.query_history = ctx.query_history[-10:]
+        # Add to history (deque keeps the last 10 queries)
+        ctx.query_history.append((query, intent.get("intent"), time.time()))
     
     @classmethod
     def get_context_summary(cls, session_id: str) -> str:
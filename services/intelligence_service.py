@@ -36,9 +36,18 @@ DBA INTELLIGENCE (v3.0):
 Python 3.6.8 compatible.
 """
 
+import copy
+import json
 import re
-from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY
+from datetime import datetime
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, get_data_generation
+from data_engine.target_dictionary import TargetDictionary
+from services.answer_cache import ANSWER_CACHE, normalize_question
 from services.session_store import SessionStore
+from services.intent_dispatch import DispatchRule, IntentDispatcher
+from services.request_context import RequestLocal
+from services.request_tracer import REQUEST_TRACER
+from services.result_handles import RESULT_HANDLES
 
 # INCIDENT INTELLIGENCE ENGINE IMPORT
 try:
@@ -222,6 +231,10 @@ class IntelligenceService:
     - Human-like, non-robotic responses
     """
     
+    # Formatter context of the question being answered (one per request
+    # inside request_scope())
+    _current_formatter_context = RequestLocal("intelligence_service.formatter_context")
+    
     def __init__(self):
         self._pipeline = None
         self._production_engine_used = False
@@ -289,6 +302,11 @@ class IntelligenceService:
         Returns:
             List of alerts for exactly this database
         """
+        is_exact_match = self._db_strict_predicate(db_name)
+        return [a for a in alerts if is_exact_match(a)]
+    
+    def _db_strict_predicate(self, db_name):
+        """Per-alert test of _filter_alerts_by_db_strict."""
         db_upper = db_name.upper().strip()
         
         def extract_db_name(target_str):
@@ -306,7 +324,7 @@ class IntelligenceService:
             target_db = extract_db_name(target)
             return target_db == db_upper
         
-        return [a for a in alerts if is_exact_match(a)]
+        return is_exact_match
     
     # =====================================================
     # STRICT OUTPUT MODE: "Give only the number"
@@ -335,6 +353,11 @@ class IntelligenceService:
     # Apply trust processing to any response
     # =====================================================
     def _apply_phase7(self, response, question, alerts=None):
+        """Phase 7 / 10 / 11 processing of a response (see _phase7_stages), traced."""
+        with REQUEST_TRACER.span("phase7"):
+            return self._phase7_stages(response, question, alerts)
+    
+    def _phase7_stages(self, response, question, alerts=None):
         """
         Apply Phase 7 Enterprise Trust processing to any response.
         
@@ -369,12 +392,13 @@ class IntelligenceService:
                 
                 # Use audit_before_respond which includes ALL 7 DBA Guardrails
                 original_answer = response.get("answer", "")
-                audited_answer, audit_result = audit_before_respond(
-                    question=question,
-                    answer=original_answer,
-                    data_used=alerts or [],
-                    extracted_values=extracted_values
-                )
+                with REQUEST_TRACER.span("phase11.self_audit"):
+                    audited_answer, audit_result = audit_before_respond(
+                        question=question,
+                        answer=original_answer,
+                        data_used=alerts or [],
+                        extracted_values=extracted_values
+                    )
                 
                 # Store audit metadata
                 response["self_audit"] = {
@@ -398,14 +422,15 @@ class IntelligenceService:
         # =====================================================
         if ANSWER_CONTRACTS_AVAILABLE:
             try:
-                contract = ANSWER_CONTRACTS.build_contract(question)
-                original_answer = response.get("answer", "")
-                
-                # Enforce contract
-                validated_answer, is_valid, violation = ANSWER_CONTRACTS.enforce(
-                    original_answer, 
-                    contract
-                )
+                with REQUEST_TRACER.span("phase10.contracts"):
+                    contract = ANSWER_CONTRACTS.build_contract(question)
+                    original_answer = response.get("answer", "")
+                    
+                    # Enforce contract
+                    validated_answer, is_valid, violation = ANSWER_CONTRACTS.enforce(
+                        original_answer, 
+                        contract
+                    )
                 
                 # Update response with validated answer
                 response["answer"] = validated_answer
@@ -451,17 +476,19 @@ class IntelligenceService:
             # Get alerts for scope validation
             target_alerts = alerts or []
             if target and target_alerts:
-                filtered, _ = DB_SCOPE_GUARD.filter_alerts_strict(target_alerts, target)
+                with REQUEST_TRACER.span("phase7.scope_guard"):
+                    filtered, _ = DB_SCOPE_GUARD.filter_alerts_strict(target_alerts, target)
                 target_alerts = filtered
             
             # Process through trust engine
-            trusted = ENTERPRISE_TRUST.process_answer(
-                question=question,
-                raw_answer=response.get("answer", ""),
-                answer_type=answer_type,
-                target_database=target,
-                alerts_used=target_alerts[:100]
-            )
+            with REQUEST_TRACER.span("phase7.trust"):
+                trusted = ENTERPRISE_TRUST.process_answer(
+                    question=question,
+                    raw_answer=response.get("answer", ""),
+                    answer_type=answer_type,
+                    target_database=target,
+                    alerts_used=target_alerts[:100]
+                )
             
             # Apply sanitized answer
             response["answer"] = trusted.answer
@@ -760,15 +787,10 @@ class IntelligenceService:
                     # Verify it looks like a database name
                     alerts = GLOBAL_DATA.get("alerts", [])
                     if alerts:
-                        # CRITICAL FIX: Check more alerts and use PARTIAL matching
-                        # First 200 alerts may not contain all database names
-                        # Also use partial match for names like MIDEVSTB/MIDEVSTBN
-                        for a in alerts[:2000]:  # Check first 2000 alerts
-                            if a:
-                                t = (a.get("target_name") or a.get("target") or "").upper()
-                                # CRITICAL FIX: Use partial matching
-                                if t == potential_db or potential_db in t or t in potential_db:
-                                    return (True, "ENTITY_SPECIFIC", potential_db)
+                        # Partial match against every known target (not just the
+                        # first alerts), for names like MIDEVSTB/MIDEVSTBN
+                        if TargetDictionary.current().related(potential_db):
+                            return (True, "ENTITY_SPECIFIC", potential_db)
                     else:
                         # No alerts loaded, but pattern looks like a DB name
                         if any(suf in potential_db for suf in ["STB", "STBN", "DB", "PRD", "DEV"]):
@@ -1086,9 +1108,11 @@ class IntelligenceService:
     def _handle_continuation_followup(self, question, alerts, context):
         """Handle CONTINUATION follow-ups: ok, show more, next."""
         # Get alerts based on last context with default limit
-        filtered_alerts = self._filter_alerts_by_context(alerts, context)
+        # (row ids of the session's result handle: a page is a slice)
+        rows = self._context_rows(alerts, context.get("alert_type"), context.get("last_target"), context.get("severity"))
+        total = len(rows)
         
-        if not filtered_alerts:
+        if not rows:
             return {
                 "answer": "No more alerts found matching previous criteria.",
                 "target": context.get("last_target"),
@@ -1099,26 +1123,26 @@ class IntelligenceService:
         # displayed_count tracks how many alerts user has actually SEEN
         displayed_count = context.get("displayed_count", 0)
         limit = 10
-        start = min(displayed_count, len(filtered_alerts))
-        end = min(start + limit, len(filtered_alerts))
+        start = min(displayed_count, total)
+        end = min(start + limit, total)
         
         # CRITICAL FIX: Only show "seen all" if user has actually scrolled through alerts
         # Not just because we counted them
-        if start >= len(filtered_alerts) and displayed_count > 0:
+        if start >= total and displayed_count > 0:
             return {
-                "answer": "You've seen all {0} alerts matching this criteria.".format(len(filtered_alerts)),
+                "answer": "You've seen all {0} alerts matching this criteria.".format(total),
                 "target": context.get("last_target"),
                 "confidence": 0.9,
                 "question_type": "FACT"
             }
         
-        batch = filtered_alerts[start:end]
+        batch = RESULT_HANDLES.page(alerts, rows, start, end)
         topic = context.get("topic", "alerts")
-        answer = self._format_alert_list(batch, topic, len(batch), len(filtered_alerts))
-        answer += "\n\n(Showing {0}-{1} of {2})".format(start + 1, end, len(filtered_alerts))
+        answer = self._format_alert_list(batch, topic, len(batch), total)
+        answer += "\n\n(Showing {0}-{1} of {2})".format(start + 1, end, total)
         
         # Update context with new displayed count (actual alerts shown to user)
-        SessionStore.set_conversation_context(displayed_count=end, result_count=len(filtered_alerts))
+        SessionStore.set_conversation_context(displayed_count=end, result_count=total)
         
         return {
             "answer": answer,
@@ -1130,10 +1154,10 @@ class IntelligenceService:
     
     def _handle_limit_followup(self, question, limit, alerts, context):
         """Handle LIMIT follow-ups: show me 20, top 10."""
-        # Get alerts based on last context
-        filtered_alerts = self._filter_alerts_by_context(alerts, context)
+        # Get alerts based on last context (row ids of the session's result handle)
+        rows = self._context_rows(alerts, context.get("alert_type"), context.get("last_target"), context.get("severity"))
         
-        if not filtered_alerts:
+        if not rows:
             return {
                 "answer": "No alerts found matching previous criteria.",
                 "target": context.get("last_target"),
@@ -1142,16 +1166,16 @@ class IntelligenceService:
             }
         
         # Limit the results
-        limited = filtered_alerts[:limit]
+        limited = RESULT_HANDLES.page(alerts, rows, 0, limit)
         
         # Build answer
         topic = context.get("topic", "alerts")
-        answer = self._format_alert_list(limited, topic, limit, len(filtered_alerts))
+        answer = self._format_alert_list(limited, topic, limit, len(rows))
         
         # CRITICAL FIX: Update displayed_count for pagination tracking
         SessionStore.set_conversation_context(
             displayed_count=len(limited),
-            result_count=len(filtered_alerts)
+            result_count=len(rows)
         )
         
         return {
@@ -1184,19 +1208,13 @@ class IntelligenceService:
         print("[LIMIT_FILTER DEBUG] context.has_context:", context.get("has_context"))
         print("[LIMIT_FILTER DEBUG] total alerts available:", len(alerts) if alerts else 0)
         
-        # CRITICAL FIX: Use _filter_alerts_by_context_no_severity when severity is specified
-        # This prevents double-filtering and allows proper severity switching
-        filtered_alerts = self._filter_alerts_by_context_no_severity(alerts, context)
-        print("[LIMIT_FILTER DEBUG] after context filter:", len(filtered_alerts) if filtered_alerts else 0)
+        # CRITICAL FIX: Context filter WITHOUT the context severity, then the
+        # requested one (case-insensitive) - proper severity switching.
+        # Row ids of the session's result handle: "next" pages slice them.
+        rows = self._context_rows(alerts, context.get("alert_type"), context.get("last_target"), severity)
+        print("[LIMIT_FILTER DEBUG] after context + severity filter:", len(rows))
         
-        # Apply severity filter - CRITICAL FIX: Case-insensitive comparison
-        if severity:
-            severity_upper = severity.upper()
-            filtered_alerts = [a for a in filtered_alerts if 
-                              (a.get("severity") or a.get("alert_state") or "").upper() == severity_upper]
-            print("[LIMIT_FILTER DEBUG] after severity filter:", len(filtered_alerts) if filtered_alerts else 0)
-        
-        if not filtered_alerts:
+        if not rows:
             print("[LIMIT_FILTER DEBUG] NO ALERTS FOUND! Returning error message")
             return {
                 "answer": "No **{0}** alerts found matching previous criteria.".format(severity),
@@ -1206,17 +1224,17 @@ class IntelligenceService:
             }
         
         # Limit the results
-        limited = filtered_alerts[:limit]
+        limited = RESULT_HANDLES.page(alerts, rows, 0, limit)
         
         # Build answer with severity label
         topic = "{0} {1}".format(severity, context.get("topic", "alerts")).strip()
-        answer = self._format_alert_list(limited, topic, limit, len(filtered_alerts))
+        answer = self._format_alert_list(limited, topic, limit, len(rows))
         
         # CRITICAL FIX: Update displayed_count properly for pagination
         SessionStore.set_conversation_context(
             severity=severity, 
             displayed_count=len(limited),
-            result_count=len(filtered_alerts)
+            result_count=len(rows)
         )
         
         return {
@@ -1905,20 +1923,11 @@ class IntelligenceService:
         Returns:
             dict with first N alerts
         """
-        filtered = alerts
-        
-        # Apply database filter if specified
-        if db_name:
-            # CRITICAL FIX: Use STRICT matching to prevent MIDEVSTB matching MIDEVSTBN
-            filtered = self._filter_alerts_by_db_strict(filtered, db_name)
+        # Database (CRITICAL FIX: STRICT matching, MIDEVSTB != MIDEVSTBN) and
+        # severity filters; row ids kept as the session's result handle
+        rows = self._db_severity_rows(alerts, db_name, severity)
         
-        # Apply severity filter if specified
-        if severity:
-            severity_upper = severity.upper()
-            filtered = [a for a in filtered if 
-                       (a.get("severity") or a.get("alert_state") or "").upper() == severity_upper]
-        
-        total = len(filtered)
+        total = len(rows)
         
         if total == 0:
             parts = []
@@ -1942,7 +1951,7 @@ class IntelligenceService:
             }
         
         # Get first N alerts
-        shown = filtered[:limit]
+        shown = RESULT_HANDLES.page(alerts, rows, 0, limit)
         
         # Build response
         sev_label = f"{severity.upper()} " if severity else ""
@@ -1998,14 +2007,11 @@ class IntelligenceService:
         Returns:
             dict with range of alerts
         """
-        filtered = alerts
+        # Apply database filter if specified (CRITICAL FIX: STRICT matching);
+        # a range is a slice of the session's result handle
+        rows = self._db_severity_rows(alerts, db_name, None)
         
-        # Apply database filter if specified
-        if db_name:
-            # CRITICAL FIX: Use STRICT matching to prevent MIDEVSTB matching MIDEVSTBN
-            filtered = self._filter_alerts_by_db_strict(filtered, db_name)
-        
-        total = len(filtered)
+        total = len(rows)
         
         # Convert to 0-based indices
         start_0 = max(0, start_idx - 1)  # Convert 1-based to 0-based
@@ -2027,7 +2033,7 @@ class IntelligenceService:
             }
         
         # Get range of alerts
-        shown = filtered[start_0:end_0]
+        shown = RESULT_HANDLES.page(alerts, rows, start_0, end_0)
         
         if not shown:
             return {
@@ -2540,29 +2546,11 @@ class IntelligenceService:
     def _filter_alerts_by_context_no_severity(self, alerts, context):
         """Filter alerts by context but WITHOUT applying severity filter.
         Used when severity is about to change."""
-        filtered = alerts
-        
-        # Filter by alert type (dataguard, tablespace, etc.)
-        alert_type = context.get("alert_type")
-        if alert_type == "dataguard":
-            dg_keywords = ["standby", "data guard", "dataguard", "apply", "transport", "mrp", "redo", "ora-16"]
-            filtered = [a for a in filtered if 
-                       any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in dg_keywords) or
-                       any(kw in (a.get("issue_type") or "").lower() for kw in ["standby", "dataguard"])]
-        elif alert_type == "tablespace":
-            ts_keywords = ["tablespace", "space", "full", "extent", "ora-1654", "ora-1653"]
-            filtered = [a for a in filtered if 
-                       any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in ts_keywords)]
-        
-        # Filter by target if specified - STRICT EXACT MATCHING
-        target = context.get("last_target")
-        if target:
-            target_upper = target.upper()
-            filtered = [a for a in filtered if 
-                       (a.get("target_name") or a.get("target") or "").upper() == target_upper]
-        
         # NOTE: Deliberately NOT filtering by severity here
-        return filtered
+        matches = self._context_predicate(context.get("alert_type"), context.get("last_target"), None)
+        if matches is None:
+            return alerts
+        return [a for a in alerts if matches(a)]
     
     def _generate_db_specific_answer(self, question, db_name, alerts, context):
         """Generate answer for a specific database."""
@@ -2629,36 +2617,67 @@ class IntelligenceService:
     
     def _filter_alerts_by_context(self, alerts, context):
         """Filter alerts based on conversation context."""
-        filtered = alerts
-        
-        # Filter by alert type (dataguard, tablespace, etc.)
-        alert_type = context.get("alert_type")
-        if alert_type == "dataguard":
-            dg_keywords = ["standby", "data guard", "dataguard", "apply", "transport", "mrp", "redo", "ora-16"]
-            filtered = [a for a in filtered if 
-                       any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in dg_keywords) or
-                       any(kw in (a.get("issue_type") or "").lower() for kw in ["standby", "dataguard"])]
-        elif alert_type == "tablespace":
-            ts_keywords = ["tablespace", "space", "full", "extent", "ora-1654", "ora-1653"]
-            filtered = [a for a in filtered if 
-                       any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in ts_keywords)]
-        
+        matches = self._context_predicate(
+            context.get("alert_type"), context.get("last_target"), context.get("severity"))
+        if matches is None:
+            return alerts
+        return [a for a in alerts if matches(a)]
+    
+    def _context_predicate(self, alert_type, target, severity):
+        """
+        Per-alert test of the conversation-context filter: alert type
+        (dataguard, tablespace), exact target, severity. None when no
+        filter applies.
+        """
+        dg_keywords = ["standby", "data guard", "dataguard", "apply", "transport", "mrp", "redo", "ora-16"]
+        ts_keywords = ["tablespace", "space", "full", "extent", "ora-1654", "ora-1653"]
         # Filter by target if specified - STRICT EXACT MATCHING
-        target = context.get("last_target")
-        if target:
-            target_upper = target.upper()
-            filtered = [a for a in filtered if 
-                       (a.get("target_name") or a.get("target") or "").upper() == target_upper]
-        
-        # Filter by severity if specified
+        target_upper = target.upper() if target else None
         # CRITICAL FIX: Case-insensitive comparison (data has 'Critical', 'Warning')
-        severity = context.get("severity")
-        if severity:
-            severity_upper = severity.upper()
-            filtered = [a for a in filtered if 
-                       (a.get("severity") or a.get("alert_state") or "").upper() == severity_upper]
+        severity_upper = severity.upper() if severity else None
         
-        return filtered
+        if alert_type not in ("dataguard", "tablespace") and not target_upper and not severity_upper:
+            return None
+        
+        def matches(a):
+            if alert_type == "dataguard":
+                if not (any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in dg_keywords) or
+                        any(kw in (a.get("issue_type") or "").lower() for kw in ["standby", "dataguard"])):
+                    return False
+            elif alert_type == "tablespace":
+                if not any(kw in (a.get("message") or a.get("msg_text") or "").lower() for kw in ts_keywords):
+                    return False
+            if target_upper and (a.get("target_name") or a.get("target") or "").upper() != target_upper:
+                return False
+            if severity_upper and (a.get("severity") or a.get("alert_state") or "").upper() != severity_upper:
+                return False
+            return True
+        
+        return matches
+    
+    def _context_rows(self, alerts, alert_type, target, severity):
+        """
+        Row ids of the context filter (_filter_alerts_by_context), kept
+        as the session's result handle so later pages skip the scan.
+        """
+        if alert_type not in ("dataguard", "tablespace"):
+            alert_type = None
+        matches = self._context_predicate(alert_type, target, severity)
+        key = ("context", alert_type, target.upper() if target else None, severity.upper() if severity else None)
+        return RESULT_HANDLES.rows(alerts, key, matches or (lambda a: True))
+    
+    def _db_severity_rows(self, alerts, db_name, severity):
+        """Row ids of alerts of db_name (strict match) and severity, as a result handle."""
+        db_match = self._db_strict_predicate(db_name) if db_name else None
+        severity_upper = severity.upper() if severity else None
+        
+        def matches(a):
+            if db_match is not None and not db_match(a):
+                return False
+            return not severity_upper or (a.get("severity") or a.get("alert_state") or "").upper() == severity_upper
+        
+        key = ("db", db_name.upper().strip() if db_name else None, severity_upper)
+        return RESULT_HANDLES.rows(alerts, key, matches)
     
     def _format_alert_list(self, alerts, topic, limit, total):
         """Format a list of alerts into a readable answer."""
@@ -3927,7 +3946,7 @@ class IntelligenceService:
     # MAIN ANALYSIS METHOD
     # =====================================================
     
-    def analyze(self, question):
+    def analyze(self, question, on_stage=None):
         """
         Main analysis entry point.
         
@@ -3944,6 +3963,9 @@ class IntelligenceService:
         
         Args:
             question: User's natural language question
+            on_stage: Optional listener(stage, data) for reasoning pipeline
+                      stage events (streaming chat); cached answers and
+                      direct routes emit none
         
         Returns:
             Dict with answer and metadata
@@ -3959,7 +3981,8 @@ class IntelligenceService:
         # This ensures scope is available for follow-up detection
         # =====================================================
         if PHASE12_AVAILABLE:
-            Phase12Guardrails.update_scope(question)
+            with REQUEST_TRACER.span("phase12.update_scope"):
+                Phase12Guardrails.update_scope(question)
         
         # Check system readiness
         if not SYSTEM_READY.get("ready", False):
@@ -3980,6 +4003,111 @@ class IntelligenceService:
                 "confidence": 0
             }
         
+        # =====================================================
+        # ANSWER CACHE: the same question, asked in the same session
+        # scope on the same data generation, replays the recorded answer
+        # and session updates instead of recomputing them
+        # =====================================================
+        with REQUEST_TRACER.span("answer_cache.lookup"):
+            cache_key = self._answer_cache_key(question)
+            cached = ANSWER_CACHE.get(cache_key)
+            if cached is not None:
+                return self._replay_cached_answer(cached)
+        
+        generation = get_data_generation()
+        before = self._session_snapshot()
+        result = self._analyze_question(question, alerts, on_stage)
+        if result and result.get("status") == "success":
+            ANSWER_CACHE.put(cache_key, self._cached_answer(result, before), generation)
+        return result
+    
+    # =====================================================
+    # ANSWER CACHE HELPERS
+    # =====================================================
+    # Session fields that change on every question and do not steer
+    # the answer (replayed, not part of the cache key)
+    _VOLATILE_SESSION_FIELDS = ("question_count", "last_activity", "session_start",
+                                "analysis_history", "last_question")
+    
+    def _answer_cache_key(self, question):
+        """
+        Normalized question + session scope + data generation + the
+        self-audit facts. Sessions in the same scope share entries: the
+        scope is the active DB scope, the last filters and the rest of
+        the session memory answers read (never the session id).
+        """
+        state = SessionStore._state
+        memory = json.dumps(
+            dict((k, v) for k, v in state.items() if k not in self._VOLATILE_SESSION_FIELDS),
+            sort_keys=True, default=str
+        )
+        # NUMERIC_CONTRADICTION notes depend on the facts stated before
+        audit = SELF_AUDIT.fact_fingerprint() if SELF_AUDIT_AVAILABLE else None
+        return ("analyze", normalize_question(question), get_data_generation(),
+                state.get("active_db_scope"), state.get("last_filters"), memory, audit,
+                getattr(self._pipeline, "_last_target", None))
+    
+    def _session_snapshot(self):
+        state = SessionStore._state
+        return {
+            "state": copy.deepcopy(dict((k, v) for k, v in state.items()
+                                        if k not in self._VOLATILE_SESSION_FIELDS)),
+            "question_count": state.get("question_count", 0),
+            # Entries kept referenced, so their ids are not reused meanwhile
+            "history": list(state.get("analysis_history", [])),
+            "facts": dict(SELF_AUDIT.fact_register.facts) if SELF_AUDIT_AVAILABLE else {},
+        }
+    
+    def _cached_answer(self, result, before):
+        """Answer plus the session updates computing it made."""
+        state = SessionStore._state
+        history_ids = set(id(e) for e in before["history"])
+        changes = dict(
+            (k, v) for k, v in state.items()
+            if k not in self._VOLATILE_SESSION_FIELDS
+            and (k not in before["state"] or before["state"][k] != v)
+        )
+        return {
+            "result": result,
+            "session_changes": changes,
+            "question_count": state.get("question_count", 0) - before["question_count"],
+            "last_question": state.get("last_question"),
+            "history": [e for e in state.get("analysis_history", []) if id(e) not in history_ids],
+            "last_target": getattr(self._pipeline, "_last_target", None),
+            "facts": dict(
+                (k, fact) for k, fact in SELF_AUDIT.fact_register.facts.items()
+                if before["facts"].get(k) is not fact
+            ) if SELF_AUDIT_AVAILABLE else {},
+        }
+    
+    def _replay_cached_answer(self, cached):
+        state = SessionStore._state
+        state.update(cached["session_changes"])
+        if cached["question_count"]:
+            state["question_count"] = state.get("question_count", 0) + cached["question_count"]
+            state["last_activity"] = datetime.now().isoformat()
+        if cached["last_question"] is not None:
+            state["last_question"] = cached["last_question"]
+        for entry in cached["history"]:
+            SessionStore.record_analysis(entry)
+        if self._pipeline is not None:
+            self._pipeline._last_target = cached["last_target"]
+        if cached["facts"]:
+            SELF_AUDIT.fact_register.facts.update(cached["facts"])
+        
+        result = cached["result"]
+        if "session_context" in result:
+            result["session_context"] = SessionStore.get_context_summary()
+        if PRODUCTION_ENGINE_AVAILABLE and "session_memory" in result:
+            result["session_memory"] = SessionMemoryEngine.get_state()
+        return result
+    
+    def answer_cache_stats(self):
+        """Hit/miss/eviction counters of the answer cache."""
+        return ANSWER_CACHE.stats()
+    
+    def _analyze_question(self, question, alerts, on_stage=None):
+        """Route and answer a question (uncached body of analyze)."""
         try:
             # =====================================================
             # PRIORITY PATTERN HANDLING (BEFORE FOLLOWUP DETECTION)
@@ -3994,7 +4122,8 @@ class IntelligenceService:
             # Check if we have data needed to answer this question
             # =====================================================
             if DATA_AWARENESS_AVAILABLE:
-                data_check = DATA_AWARENESS.check_data_availability(question, alerts)
+                with REQUEST_TRACER.span("data_awareness.check"):
+                    data_check = DATA_AWARENESS.check_data_availability(question, alerts)
                 if not data_check.has_data and data_check.missing_fields:
                     # Generate safe response for missing data
                     missing_field = data_check.missing_fields[0]
@@ -4015,368 +4144,15 @@ class IntelligenceService:
                     }
             
             # =====================================================
-            # PHASE 9: INCIDENT COMMANDER PATTERNS
-            # Autonomous DBA Incident Command Mode
-            # =====================================================
-            if INCIDENT_COMMANDER_AVAILABLE:
-                # Incident Status / Sitrep queries
-                if re.search(r'(?:incident\s+)?status|sitrep|what\'?s\s+happening|situation\s+report|current\s+state', q_lower):
-                    result = self._handle_incident_status_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-                
-                # Priority / Triage queries
-                if re.search(r'(?:top\s+)?priorit|what\s+should\s+i\s+focus|triage|what\'?s\s+p1|most\s+urgent', q_lower):
-                    result = self._handle_priority_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-                
-                # Next Action queries
-                if re.search(r'what\s+should\s+i\s+do|next\s+step|guide\s+me|what\s+action|what\s+now', q_lower):
-                    result = self._handle_next_action_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-                
-                # Escalation queries
-                if re.search(r'escalat|should\s+i\s+call|notify|who\s+should\s+i\s+tell', q_lower):
-                    result = self._handle_escalation_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-                
-                # Prediction queries
-                if re.search(r'predict|what\s+(?:will|might)\s+fail|next\s+risk|watch\s+for|what\'?s\s+coming', q_lower):
-                    result = self._handle_prediction_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-                
-                # Blast radius queries
-                if re.search(r'blast\s+radius|how\s+widespread|how\s+many\s+(?:systems?|dbs?|databases?)\s+affected|scope\s+of\s+(?:impact|incident)', q_lower):
-                    result = self._handle_blast_radius_query(alerts)
-                    if result:
-                        return self._apply_phase7(result, question, alerts)
-            
-            # =====================================================
-            # AUDIENCE-SPECIFIC EXPLANATIONS (HIGH PRIORITY)
-            # Must be checked early to avoid fallback handling
-            # =====================================================
-            
-            # DBA EXPLANATION: "Explain like talking to senior DBA"
-            # Simplified pattern to catch variations like "you are" vs "you're"
-            if re.search(r'explain\s+.*senior\s+dba|like\s+.*senior\s+dba|as\s+a\s+dba', q_lower):
-                result = self._handle_dba_explanation_query(alerts)
-                if result:
-                    return self._apply_phase7(result, question, alerts)
-            
-            # MANAGER EXPLANATION: "Explain this to a manager"
-            if re.search(r'explain\s+(?:this\s+)?(?:to\s+)?(?:a\s+)?manager|for\s+(?:my\s+)?manager|executive\s+summary', q_lower):
-                result = self._handle_manager_explanation(alerts)
-                if result:
-                    return self._apply_phase7(result, question, alerts)
-            
-            # =====================================================
-            # RELATIONSHIP QUERIES: "Are these related to MIDEVSTB?"
-            # =====================================================
-            related_match = re.search(
-                r'(?:are\s+)?(?:these|they|this)\s+related\s+to\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if related_match and DATA_AWARENESS_AVAILABLE:
-                target_db = related_match.group(1).upper()
-                result = self._handle_relationship_query(target_db, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NORMALITY QUERIES: "Is this alert volume normal?"
-            # =====================================================
-            normal_match = re.search(
-                r'(?:is\s+)?(?:this|the)\s+(?:alert\s+)?(?:volume|count|number)\s+normal(?:\s+for\s+([A-Za-z0-9_]+))?',
-                q_lower
-            )
-            if normal_match and DATA_AWARENESS_AVAILABLE:
-                db_name = normal_match.group(1).upper() if normal_match.group(1) else None
-                result = self._handle_normality_query(db_name, alerts)
-                if result:
-                    return result
-            
+            # PRIORITY ROUTES (BEFORE FOLLOWUP DETECTION)
+            # Incident commander, audience, data awareness and explicit
+            # count/list/range patterns. Declared as data in
+            # PRIORITY_ROUTES (bottom of module): one keyword pass picks
+            # the candidate rules, then each regex is confirmed in order
             # =====================================================
-            # TEMPORAL QUERIES: "alerts from yesterday", "today's alerts"
-            # =====================================================
-            temporal_match = re.search(
-                r'(?:show|how)?\s*(?:me\s+)?(?:alerts?\s+)?(?:from\s+)?(yesterday|today|last\s+hour|last\s+24\s+hours|this\s+week)(?:\s+only)?',
-                q_lower
-            )
-            if temporal_match and DATA_AWARENESS_AVAILABLE:
-                time_filter = temporal_match.group(1)
-                result = self._handle_temporal_query(time_filter, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # REPETITION QUERIES: "Why are warnings repeated?"
-            # =====================================================
-            repeat_match = re.search(
-                r'why\s+(?:are\s+)?(?:([A-Za-z0-9_]+)\s+)?(?:warnings?|alerts?)\s+(?:repeated|repeating|duplicated)',
-                q_lower
-            )
-            if repeat_match and DATA_AWARENESS_AVAILABLE:
-                db_name = repeat_match.group(1).upper() if repeat_match.group(1) else None
-                result = self._handle_repetition_query(db_name, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # WORRIED QUERIES: "Should I be worried?"
-            # =====================================================
-            worried_match = re.search(
-                r'should\s+i\s+(?:be\s+)?(?:worried|concerned)(?:\s+(?:right\s+)?now)?',
-                q_lower
-            )
-            if worried_match:
-                result = self._handle_worried_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # FAILURE PREDICTION: "Which database is most likely to fail?"
-            # =====================================================
-            fail_predict_match = re.search(
-                r'which\s+(?:database|db)\s+(?:is\s+)?(?:most\s+)?(?:likely\s+to\s+fail|will\s+fail\s*(?:next)?|at\s+risk)',
-                q_lower
-            )
-            if fail_predict_match:
-                result = self._handle_failure_prediction_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # IGNORE CONSEQUENCES: "What happens if we ignore these?"
-            # =====================================================
-            ignore_match = re.search(
-                r'(?:what\s+(?:happens|will\s+happen)|consequence)\s+(?:of\s+)?(?:if\s+)?(?:we\s+)?ignor(?:e|ing)\s*(?:these|this|the)?\s*(?:alerts?)?',
-                q_lower
-            )
-            if ignore_match:
-                result = self._handle_ignore_consequences_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # EVIDENCE QUERIES: "What evidence supports this?"
-            # =====================================================
-            evidence_match = re.search(
-                r'what\s+evidence\s+supports?\s+(?:this|the|being)',
-                q_lower
-            )
-            if evidence_match:
-                result = self._handle_evidence_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # MANAGER EXPLANATION: "Explain this to a manager"
-            # =====================================================
-            manager_match = re.search(
-                r'explain\s+(?:this\s+)?(?:to\s+)?(?:a\s+)?manager',
-                q_lower
-            )
-            if manager_match:
-                result = self._handle_manager_explanation(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # DBA EXPLANATION: "Explain like talking to senior DBA"
-            # =====================================================
-            dba_explain_match = re.search(
-                r'explain\s+.*senior\s+dba|like\s+.*senior\s+dba|as\s+a\s+dba',
-                q_lower
-            )
-            if dba_explain_match:
-                result = self._handle_dba_explanation_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ONE BIG ISSUE OR MANY: "Is this one issue or many?"
-            # =====================================================
-            issue_count_match = re.search(
-                r'(?:is\s+)?(?:this|these|it)\s+(?:one\s+)?(?:big\s+)?issue\s+or\s+many|one\s+big\s+issue\s+or\s+many|one\s+issue\s+or\s+many\s+issues',
-                q_lower
-            )
-            if issue_count_match:
-                result = self._handle_issue_count_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # WHICH ERROR CAUSING MOST: "Which error is causing most alerts?"
-            # =====================================================
-            most_error_match = re.search(
-                r'which\s+error\s+(?:is\s+)?(?:causing|responsible\s+for)\s+(?:the\s+)?most(?:\s+alerts?)?',
-                q_lower
-            )
-            if most_error_match:
-                result = self._handle_most_error_query(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "give me ONLY the count of CRITICAL alerts for MIDEVSTB"
-            # Returns JUST the count number
-            # =====================================================
-            only_count_match = re.search(
-                r'(?:give\s+me\s+)?only\s+(?:the\s+)?count\s+(?:of\s+)?(critical|warning|warnings?)\s*(?:alerts?)?\s*(?:for|on|in)?\s*([A-Za-z0-9_]+)?',
-                q_lower
-            )
-            if only_count_match:
-                severity = only_count_match.group(1).lower().rstrip('s')
-                db_name = only_count_match.group(2).upper() if only_count_match.group(2) else None
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_only_count(target_severity, db_name, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "show CRITICAL alerts 11 to 20 for MIDEVSTBN"
-            # Range with severity filter
-            # =====================================================
-            severity_range_match = re.search(
-                r'(?:show|list|display)\s+(?:me\s+)?(critical|warning|warnings?)\s+alerts?\s+(\d+)\s+(?:to|-)\s+(\d+)\s+(?:for|on|in)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if severity_range_match:
-                severity = severity_range_match.group(1).lower().rstrip('s')
-                start_idx = int(severity_range_match.group(2))
-                end_idx = int(severity_range_match.group(3))
-                db_name = severity_range_match.group(4).upper()
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_severity_range_alerts(start_idx, end_idx, target_severity, db_name, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "compare total vs critical alerts for both databases"
-            # Compare metrics (total vs critical)
-            # =====================================================
-            compare_metrics_match = re.search(
-                r'compare\s+(total|all)\s+(?:vs|versus|and)\s+(critical|warning)\s+(?:alerts?)?\s*(?:for\s+)?(?:both\s+)?(?:databases?)?',
-                q_lower
-            )
-            if compare_metrics_match:
-                result = self._handle_total_vs_severity_comparison(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "show standby alerts summary only (count + db name)"
-            # =====================================================
-            standby_summary_match = re.search(
-                r'(?:show\s+)?standby\s+alerts?\s+summary\s+only',
-                q_lower
-            )
-            if standby_summary_match:
-                result = self._handle_standby_summary(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "group alerts by error code"
-            # =====================================================
-            group_by_error_match = re.search(
-                r'group\s+(?:alerts?\s+)?by\s+(?:error\s+)?(?:code|ora)',
-                q_lower
-            )
-            if group_by_error_match:
-                result = self._handle_group_by_error_code(alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # NEW FIX: "top 3 alert types per database"
-            # =====================================================
-            top_types_match = re.search(
-                r'top\s+(\d+)\s+(?:alert\s+)?types?\s+(?:per|for\s+each|by)\s+(?:database|db)',
-                q_lower
-            )
-            if top_types_match:
-                limit = int(top_types_match.group(1))
-                result = self._handle_top_alert_types_per_db(limit, alerts)
-                if result:
-                    return result
-            
-            # ISSUE 1: "how many critical alerts for MIDEVSTB" - DB-specific severity count
-            db_severity_match = re.search(
-                r'how\s+many\s+(critical|warning|warnings?)\s+alerts?\s+(?:for|on|in|exist\s+for)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if db_severity_match:
-                severity = db_severity_match.group(1).lower().rstrip('s')
-                db_name = db_severity_match.group(2).upper()
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_db_severity_count(db_name, target_severity, alerts, question)
-                if result:
-                    return result
-            
-            # ISSUE 2: "list critical alerts for MIDEVSTB" - List alerts (not summary)
-            list_alerts_match = re.search(
-                r'list\s+(critical|warning|warnings?|all)?\s*alerts?\s+(?:for|on|in)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if list_alerts_match:
-                severity = (list_alerts_match.group(1) or "").lower().rstrip('s')
-                db_name = list_alerts_match.group(2).upper()
-                result = self._handle_list_alerts_for_db(db_name, severity, alerts)
-                if result:
-                    return result
-            
-            # ISSUE 3: "show first 5 critical alerts for MIDEVSTB" - First N pagination
-            first_n_match = re.search(
-                r'(?:show|list|display)\s+(?:me\s+)?(?:the\s+)?first\s+(\d+)\s+(critical|warning|warnings?)?\s*alerts?(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
-                q_lower
-            )
-            if first_n_match:
-                limit = int(first_n_match.group(1))
-                severity = (first_n_match.group(2) or "").lower().rstrip('s') if first_n_match.group(2) else None
-                db_name = first_n_match.group(3).upper() if first_n_match.group(3) else None
-                result = self._handle_first_n_alerts(limit, severity, db_name, alerts)
-                if result:
-                    return result
-            
-            # ISSUE 4: "show alerts from 21 to 30" - Range pagination
-            range_match = re.search(
-                r'(?:show|list|display)\s+(?:me\s+)?alerts?\s+(?:from\s+)?(\d+)\s+(?:to|-)\s+(\d+)(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
-                q_lower
-            )
-            if range_match:
-                start_idx = int(range_match.group(1))
-                end_idx = int(range_match.group(2))
-                db_name = range_match.group(3).upper() if range_match.group(3) else None
-                result = self._handle_range_alerts(start_idx, end_idx, db_name, alerts)
-                if result:
-                    return result
-            
-            # ISSUE 5: "compare alerts between MIDEVSTB and MIDEVSTBN" - DB comparison
-            compare_match = re.search(
-                r'compare\s+(?:alerts?\s+)?(?:between\s+)?([A-Za-z0-9_]+)\s+(?:and|vs|versus|with)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if compare_match:
-                db1 = compare_match.group(1).upper()
-                db2 = compare_match.group(2).upper()
-                result = self._handle_db_comparison(db1, db2, alerts)
-                if result:
-                    return result
-            
-            # ISSUE 6: "how many standby alerts" - Standby alert count
-            standby_count_match = re.search(
-                r'how\s+many\s+(standby|dataguard|data\s*guard)\s*(?:alerts?)?',
-                q_lower
-            )
-            if standby_count_match:
-                result = self._handle_standby_count(alerts)
-                if result:
-                    return result
+            result = self._dispatch(PRIORITY_ROUTES, q_lower, question, alerts)
+            if result:
+                return result
             
             # =====================================================
             # CRITICAL: CHECK IF CONTEXT SHOULD BE RESET FIRST
@@ -4445,128 +4221,14 @@ class IntelligenceService:
                     if result:
                         return result
             
-            # Also check for "excluding" patterns (e.g., "show alerts excluding warning")
-            q_lower = question.lower()
-            # Also check for "excluding" patterns (e.g., "show alerts excluding warning")
-            import re  # Ensure re is available in this scope
-            q_lower = question.lower()
-            excluding_match = re.search(r'exclud(?:e|ing)\s+(warning|warnings?|critical)', q_lower)
-            if excluding_match:
-                excluded = excluding_match.group(1).lower().rstrip('s')
-                # Invert: excluding warning = show critical, excluding critical = show warning
-                target_severity = "CRITICAL" if excluded == "warning" else "WARNING"
-                result = self._handle_direct_severity_query(question, target_severity, alerts)
-                if result:
-                    return result
-            
-            # Check for "show all critical/warning alerts" pattern
-            all_severity_match = re.search(r'(?:show|list|display)\s+(?:me\s+)?(?:all\s+)?(critical|warning|warnings?)\s+alerts?', q_lower)
-            if all_severity_match:
-                severity = all_severity_match.group(1).lower().rstrip('s')
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_direct_severity_query(question, target_severity, alerts)
-                if result:
-                    return result
-            
-            # Check for "how many warning/critical alerts" pattern
-            how_many_match = re.search(r'how\s+many\s+(warning|warnings?|critical)\s*(?:alerts?)?', q_lower)
-            if how_many_match:
-                severity = how_many_match.group(1).lower().rstrip('s')
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_severity_count_query(question, target_severity, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ISSUE 1 FIX: "how many critical alerts for MIDEVSTB"
-            # Extract DB-specific severity count
-            # =====================================================
-            db_severity_match = re.search(
-                r'how\s+many\s+(critical|warning|warnings?)\s+alerts?\s+(?:for|on|in|exist\s+for)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if db_severity_match:
-                severity = db_severity_match.group(1).lower().rstrip('s')
-                db_name = db_severity_match.group(2).upper()
-                target_severity = "CRITICAL" if severity == "critical" else "WARNING"
-                result = self._handle_db_severity_count(db_name, target_severity, alerts, question)
-                if result:
-                    return result
-            
             # =====================================================
-            # ISSUE 2 FIX: "list critical alerts for MIDEVSTB"
-            # Return actual list of alerts, not summary
+            # SEVERITY ROUTES: "excluding warning", "show all critical
+            # alerts", "how many warnings", then the explicit patterns
+            # again now that follow-up context is applied (SEVERITY_ROUTES)
             # =====================================================
-            list_alerts_match = re.search(
-                r'list\s+(critical|warning|warnings?|all)?\s*alerts?\s+(?:for|on|in)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if list_alerts_match:
-                severity = (list_alerts_match.group(1) or "").lower().rstrip('s')
-                db_name = list_alerts_match.group(2).upper()
-                result = self._handle_list_alerts_for_db(db_name, severity, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ISSUE 3 FIX: "show first 5 critical alerts"
-            # Pagination with first N
-            # =====================================================
-            first_n_match = re.search(
-                r'(?:show|list|display)\s+(?:me\s+)?(?:the\s+)?first\s+(\d+)\s+(critical|warning|warnings?)?\s*alerts?(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
-                q_lower
-            )
-            if first_n_match:
-                limit = int(first_n_match.group(1))
-                severity = (first_n_match.group(2) or "").lower().rstrip('s') if first_n_match.group(2) else None
-                db_name = first_n_match.group(3).upper() if first_n_match.group(3) else None
-                result = self._handle_first_n_alerts(limit, severity, db_name, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ISSUE 4 FIX: "show alerts from 21 to 30"
-            # Range-based pagination
-            # =====================================================
-            range_match = re.search(
-                r'(?:show|list|display)\s+(?:me\s+)?alerts?\s+(?:from\s+)?(\d+)\s+(?:to|-)\s+(\d+)(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
-                q_lower
-            )
-            if range_match:
-                start_idx = int(range_match.group(1))
-                end_idx = int(range_match.group(2))
-                db_name = range_match.group(3).upper() if range_match.group(3) else None
-                result = self._handle_range_alerts(start_idx, end_idx, db_name, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ISSUE 5 FIX: "compare alerts between MIDEVSTB and MIDEVSTBN"
-            # Database comparison
-            # =====================================================
-            compare_match = re.search(
-                r'compare\s+(?:alerts?\s+)?(?:between\s+)?([A-Za-z0-9_]+)\s+(?:and|vs|versus|with)\s+([A-Za-z0-9_]+)',
-                q_lower
-            )
-            if compare_match:
-                db1 = compare_match.group(1).upper()
-                db2 = compare_match.group(2).upper()
-                result = self._handle_db_comparison(db1, db2, alerts)
-                if result:
-                    return result
-            
-            # =====================================================
-            # ISSUE 6 FIX: "how many standby alerts"
-            # Standby/DataGuard alert count
-            # =====================================================
-            standby_count_match = re.search(
-                r'how\s+many\s+(standby|dataguard|data\s*guard)\s*(?:alerts?)?',
-                q_lower
-            )
-            if standby_count_match:
-                result = self._handle_standby_count(alerts)
-                if result:
-                    return result
+            result = self._dispatch(SEVERITY_ROUTES, q_lower, question, alerts)
+            if result:
+                return result
             
             # =====================================================
             # STANDARD PROCESSING: Process through pipeline
@@ -4583,7 +4245,8 @@ class IntelligenceService:
             session_state = SessionStore.get_state()
             
             # Process through reasoning pipeline
-            result = self.pipeline.process(question)
+            with REQUEST_TRACER.span("pipeline"):
+                result = self.pipeline.process(question, on_stage=on_stage)
             
             # Extract key information
             answer = result.get("answer", "Unable to process question.")
@@ -4768,13 +4431,14 @@ class IntelligenceService:
                             break
             
             # Store context
-            SessionStore.set_conversation_context(
-                topic=topic,
-                alert_type=alert_type,
-                result_count=result_count,
-                databases=databases_mentioned[:5]  # Keep top 5
-            )
-            SessionStore.update(last_target=target, last_intent=intent)
+            with REQUEST_TRACER.span("session.update"):
+                SessionStore.set_conversation_context(
+                    topic=topic,
+                    alert_type=alert_type,
+                    result_count=result_count,
+                    databases=databases_mentioned[:5]  # Keep top 5
+                )
+                SessionStore.update(last_target=target, last_intent=intent)
             
             # =====================================================
             # PHASE 7: ENTERPRISE TRUST PROCESSING
@@ -4794,20 +4458,22 @@ class IntelligenceService:
                 # Filter alerts by target for scope validation
                 target_alerts = []
                 if target:
-                    filtered, _ = DB_SCOPE_GUARD.filter_alerts_strict(alerts, target)
+                    with REQUEST_TRACER.span("phase7.scope_guard"):
+                        filtered, _ = DB_SCOPE_GUARD.filter_alerts_strict(alerts, target)
                     target_alerts = filtered
                 else:
                     target_alerts = alerts
                 
                 # Process through trust engine
                 try:
-                    trusted = ENTERPRISE_TRUST.process_answer(
-                        question=question,
-                        raw_answer=answer,
-                        answer_type=answer_type,
-                        target_database=target,
-                        alerts_used=target_alerts[:100]  # Limit for performance
-                    )
+                    with REQUEST_TRACER.span("phase7.trust"):
+                        trusted = ENTERPRISE_TRUST.process_answer(
+                            question=question,
+                            raw_answer=answer,
+                            answer_type=answer_type,
+                            target_database=target,
+                            alerts_used=target_alerts[:100]  # Limit for performance
+                        )
                     
                     # Apply sanitized answer
                     answer = trusted.answer
@@ -4856,12 +4522,13 @@ class IntelligenceService:
                     # 5. ANTI-OVEREXPLANATION - Match answer length to question
                     # 6. CONSISTENCY CHECK - No conflicting values
                     # 7. PRODUCTION-SAFE RESPONSE - Calm, professional language
-                    audited_answer, audit_result = audit_before_respond(
-                        question=question,
-                        answer=answer,
-                        data_used=alerts[:100],  # Sample for performance
-                        extracted_values=extracted_values
-                    )
+                    with REQUEST_TRACER.span("phase11.self_audit"):
+                        audited_answer, audit_result = audit_before_respond(
+                            question=question,
+                            answer=answer,
+                            data_used=alerts[:100],  # Sample for performance
+                            extracted_values=extracted_values
+                        )
                     
                     # Use the guardrail-processed answer
                     answer = audited_answer
@@ -4902,14 +4569,15 @@ class IntelligenceService:
             # =====================================================
             if PHASE12_AVAILABLE:
                 try:
-                    response = enforce_phase12(
-                        question=question,
-                        result=response,
-                        data_used=alerts[:100]
-                    )
-                    
-                    # Run self-check for violations
-                    violations = self_check_answer(question, response.get("answer", ""))
+                    with REQUEST_TRACER.span("phase12.enforce"):
+                        response = enforce_phase12(
+                            question=question,
+                            result=response,
+                            data_used=alerts[:100]
+                        )
+                        
+                        # Run self-check for violations
+                        violations = self_check_answer(question, response.get("answer", ""))
                     if violations:
                         # Downgrade confidence if violations found
                         response["confidence_label"] = "MEDIUM"
@@ -5458,6 +5126,309 @@ class IntelligenceService:
     def get_session_summary(self):
         """Get current session summary for API response."""
         return SessionStore.get_context_summary()
+    
+    def _dispatch(self, dispatcher, q_lower, question, alerts):
+        """
+        Run routing rules in priority order; the first handler that
+        produces a result answers the question.
+        """
+        for rule, match in dispatcher.matches(q_lower):
+            with REQUEST_TRACER.span("route.{0}.{1}".format(dispatcher.name, rule.name)):
+                result = rule.handler(self, match, question, alerts)
+            if result:
+                dispatcher.record_handled(rule)
+                if rule.wrap_phase7:
+                    return self._apply_phase7(result, question, alerts)
+                return result
+        return None
+    
+    @staticmethod
+    def routing_stats():
+        """Per-rule hit counters for both routing tables."""
+        return [PRIORITY_ROUTES.stats(), SEVERITY_ROUTES.stats()]
+
+
+# =====================================================
+# ROUTING TABLES (COMPILED DISPATCH)
+# =====================================================
+# Each rule: name, priority, pattern (matched on the lowercased
+# question), trigger keywords (at least one must occur in any text the
+# pattern can match) and handler(service, match, question, alerts).
+# A handler returning None/empty lets the next matching rule try.
+# =====================================================
+def _severity_from(word):
+    return "CRITICAL" if word.lower().rstrip('s') == "critical" else "WARNING"
+
+
+def _upper_or_none(value):
+    return value.upper() if value else None
+
+
+_SHOW_VERBS = ("show", "list", "display")
+
+_PRIORITY_RULES = [
+    # PHASE 9: INCIDENT COMMANDER (Autonomous DBA Incident Command Mode)
+    DispatchRule(
+        "incident_status", 10,
+        r'(?:incident\s+)?status|sitrep|what\'?s\s+happening|situation\s+report|current\s+state',
+        ("status", "sitrep", "happening", "situation", "current"),
+        lambda svc, m, q, alerts: svc._handle_incident_status_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    DispatchRule(
+        "incident_priority", 20,
+        r'(?:top\s+)?priorit|what\s+should\s+i\s+focus|triage|what\'?s\s+p1|most\s+urgent',
+        ("priorit", "focus", "triage", "p1", "urgent"),
+        lambda svc, m, q, alerts: svc._handle_priority_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    DispatchRule(
+        "incident_next_action", 30,
+        r'what\s+should\s+i\s+do|next\s+step|guide\s+me|what\s+action|what\s+now',
+        ("should", "step", "guide", "action", "now"),
+        lambda svc, m, q, alerts: svc._handle_next_action_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    DispatchRule(
+        "incident_escalation", 40,
+        r'escalat|should\s+i\s+call|notify|who\s+should\s+i\s+tell',
+        ("escalat", "call", "notify", "tell"),
+        lambda svc, m, q, alerts: svc._handle_escalation_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    DispatchRule(
+        "incident_prediction", 50,
+        r'predict|what\s+(?:will|might)\s+fail|next\s+risk|watch\s+for|what\'?s\s+coming',
+        ("predict", "fail", "risk", "watch", "coming"),
+        lambda svc, m, q, alerts: svc._handle_prediction_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    DispatchRule(
+        "incident_blast_radius", 60,
+        r'blast\s+radius|how\s+widespread|how\s+many\s+(?:systems?|dbs?|databases?)\s+affected|scope\s+of\s+(?:impact|incident)',
+        ("blast", "widespread", "affected", "scope"),
+        lambda svc, m, q, alerts: svc._handle_blast_radius_query(alerts),
+        wrap_phase7=True, enabled=INCIDENT_COMMANDER_AVAILABLE
+    ),
+    # AUDIENCE-SPECIFIC EXPLANATIONS (HIGH PRIORITY)
+    DispatchRule(
+        "dba_explanation", 70,
+        r'explain\s+.*senior\s+dba|like\s+.*senior\s+dba|as\s+a\s+dba',
+        ("dba",),
+        lambda svc, m, q, alerts: svc._handle_dba_explanation_query(alerts),
+        wrap_phase7=True
+    ),
+    DispatchRule(
+        "manager_explanation", 80,
+        r'explain\s+(?:this\s+)?(?:to\s+)?(?:a\s+)?manager|for\s+(?:my\s+)?manager|executive\s+summary',
+        ("manager", "executive"),
+        lambda svc, m, q, alerts: svc._handle_manager_explanation(alerts),
+        wrap_phase7=True
+    ),
+    # DATA AWARENESS: relationship, normality, temporal, repetition
+    DispatchRule(
+        "relationship", 90,
+        r'(?:are\s+)?(?:these|they|this)\s+related\s+to\s+([A-Za-z0-9_]+)',
+        ("related",),
+        lambda svc, m, q, alerts: svc._handle_relationship_query(m.group(1).upper(), alerts),
+        enabled=DATA_AWARENESS_AVAILABLE
+    ),
+    DispatchRule(
+        "normality", 100,
+        r'(?:is\s+)?(?:this|the)\s+(?:alert\s+)?(?:volume|count|number)\s+normal(?:\s+for\s+([A-Za-z0-9_]+))?',
+        ("normal",),
+        lambda svc, m, q, alerts: svc._handle_normality_query(_upper_or_none(m.group(1)), alerts),
+        enabled=DATA_AWARENESS_AVAILABLE
+    ),
+    DispatchRule(
+        "temporal", 110,
+        r'(?:show|how)?\s*(?:me\s+)?(?:alerts?\s+)?(?:from\s+)?(yesterday|today|last\s+hour|last\s+24\s+hours|this\s+week)(?:\s+only)?',
+        ("yesterday", "today", "last", "week"),
+        lambda svc, m, q, alerts: svc._handle_temporal_query(m.group(1), alerts),
+        enabled=DATA_AWARENESS_AVAILABLE
+    ),
+    DispatchRule(
+        "repetition", 120,
+        r'why\s+(?:are\s+)?(?:([A-Za-z0-9_]+)\s+)?(?:warnings?|alerts?)\s+(?:repeated|repeating|duplicated)',
+        ("repeat", "duplicated"),
+        lambda svc, m, q, alerts: svc._handle_repetition_query(_upper_or_none(m.group(1)), alerts),
+        enabled=DATA_AWARENESS_AVAILABLE
+    ),
+    DispatchRule(
+        "worried", 130,
+        r'should\s+i\s+(?:be\s+)?(?:worried|concerned)(?:\s+(?:right\s+)?now)?',
+        ("worried", "concerned"),
+        lambda svc, m, q, alerts: svc._handle_worried_query(alerts)
+    ),
+    DispatchRule(
+        "failure_prediction", 140,
+        r'which\s+(?:database|db)\s+(?:is\s+)?(?:most\s+)?(?:likely\s+to\s+fail|will\s+fail\s*(?:next)?|at\s+risk)',
+        ("which",),
+        lambda svc, m, q, alerts: svc._handle_failure_prediction_query(alerts)
+    ),
+    DispatchRule(
+        "ignore_consequences", 150,
+        r'(?:what\s+(?:happens|will\s+happen)|consequence)\s+(?:of\s+)?(?:if\s+)?(?:we\s+)?ignor(?:e|ing)\s*(?:these|this|the)?\s*(?:alerts?)?',
+        ("ignor",),
+        lambda svc, m, q, alerts: svc._handle_ignore_consequences_query(alerts)
+    ),
+    DispatchRule(
+        "evidence", 160,
+        r'what\s+evidence\s+supports?\s+(?:this|the|being)',
+        ("evidence",),
+        lambda svc, m, q, alerts: svc._handle_evidence_query(alerts)
+    ),
+    # Second chance for audience explanations, without Phase 7 wrapping
+    DispatchRule(
+        "manager_explanation_plain", 170,
+        r'explain\s+(?:this\s+)?(?:to\s+)?(?:a\s+)?manager',
+        ("manager",),
+        lambda svc, m, q, alerts: svc._handle_manager_explanation(alerts)
+    ),
+    DispatchRule(
+        "dba_explanation_plain", 180,
+        r'explain\s+.*senior\s+dba|like\s+.*senior\s+dba|as\s+a\s+dba',
+        ("dba",),
+        lambda svc, m, q, alerts: svc._handle_dba_explanation_query(alerts)
+    ),
+    DispatchRule(
+        "issue_count", 190,
+        r'(?:is\s+)?(?:this|these|it)\s+(?:one\s+)?(?:big\s+)?issue\s+or\s+many|one\s+big\s+issue\s+or\s+many|one\s+issue\s+or\s+many\s+issues',
+        ("issue",),
+        lambda svc, m, q, alerts: svc._handle_issue_count_query(alerts)
+    ),
+    DispatchRule(
+        "most_error", 200,
+        r'which\s+error\s+(?:is\s+)?(?:causing|responsible\s+for)\s+(?:the\s+)?most(?:\s+alerts?)?',
+        ("error",),
+        lambda svc, m, q, alerts: svc._handle_most_error_query(alerts)
+    ),
+    # "give me ONLY the count of CRITICAL alerts for MIDEVSTB"
+    DispatchRule(
+        "only_count", 210,
+        r'(?:give\s+me\s+)?only\s+(?:the\s+)?count\s+(?:of\s+)?(critical|warning|warnings?)\s*(?:alerts?)?\s*(?:for|on|in)?\s*([A-Za-z0-9_]+)?',
+        ("only",),
+        lambda svc, m, q, alerts: svc._handle_only_count(
+            _severity_from(m.group(1)), _upper_or_none(m.group(2)), alerts)
+    ),
+    # "show CRITICAL alerts 11 to 20 for MIDEVSTBN"
+    DispatchRule(
+        "severity_range", 220,
+        r'(?:show|list|display)\s+(?:me\s+)?(critical|warning|warnings?)\s+alerts?\s+(\d+)\s+(?:to|-)\s+(\d+)\s+(?:for|on|in)\s+([A-Za-z0-9_]+)',
+        _SHOW_VERBS,
+        lambda svc, m, q, alerts: svc._handle_severity_range_alerts(
+            int(m.group(2)), int(m.group(3)), _severity_from(m.group(1)), m.group(4).upper(), alerts)
+    ),
+    # "compare total vs critical alerts for both databases"
+    DispatchRule(
+        "total_vs_severity", 230,
+        r'compare\s+(total|all)\s+(?:vs|versus|and)\s+(critical|warning)\s+(?:alerts?)?\s*(?:for\s+)?(?:both\s+)?(?:databases?)?',
+        ("compare",),
+        lambda svc, m, q, alerts: svc._handle_total_vs_severity_comparison(alerts)
+    ),
+    DispatchRule(
+        "standby_summary", 240,
+        r'(?:show\s+)?standby\s+alerts?\s+summary\s+only',
+        ("summary",),
+        lambda svc, m, q, alerts: svc._handle_standby_summary(alerts)
+    ),
+    DispatchRule(
+        "group_by_error", 250,
+        r'group\s+(?:alerts?\s+)?by\s+(?:error\s+)?(?:code|ora)',
+        ("group",),
+        lambda svc, m, q, alerts: svc._handle_group_by_error_code(alerts)
+    ),
+    DispatchRule(
+        "top_types_per_db", 260,
+        r'top\s+(\d+)\s+(?:alert\s+)?types?\s+(?:per|for\s+each|by)\s+(?:database|db)',
+        ("top",),
+        lambda svc, m, q, alerts: svc._handle_top_alert_types_per_db(int(m.group(1)), alerts)
+    ),
+]
+
+
+def _explicit_rules(base):
+    """Explicit count/list/range/compare rules (used by both tables)."""
+    return [
+        # "how many critical alerts for MIDEVSTB"
+        DispatchRule(
+            "db_severity_count", base,
+            r'how\s+many\s+(critical|warning|warnings?)\s+alerts?\s+(?:for|on|in|exist\s+for)\s+([A-Za-z0-9_]+)',
+            ("many",),
+            lambda svc, m, q, alerts: svc._handle_db_severity_count(
+                m.group(2).upper(), _severity_from(m.group(1)), alerts, q)
+        ),
+        # "list critical alerts for MIDEVSTB"
+        DispatchRule(
+            "list_alerts_for_db", base + 10,
+            r'list\s+(critical|warning|warnings?|all)?\s*alerts?\s+(?:for|on|in)\s+([A-Za-z0-9_]+)',
+            ("list",),
+            lambda svc, m, q, alerts: svc._handle_list_alerts_for_db(
+                m.group(2).upper(), (m.group(1) or "").lower().rstrip('s'), alerts)
+        ),
+        # "show first 5 critical alerts for MIDEVSTB"
+        DispatchRule(
+            "first_n_alerts", base + 20,
+            r'(?:show|list|display)\s+(?:me\s+)?(?:the\s+)?first\s+(\d+)\s+(critical|warning|warnings?)?\s*alerts?(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
+            ("first",),
+            lambda svc, m, q, alerts: svc._handle_first_n_alerts(
+                int(m.group(1)),
+                m.group(2).lower().rstrip('s') if m.group(2) else None,
+                _upper_or_none(m.group(3)), alerts)
+        ),
+        # "show alerts from 21 to 30"
+        DispatchRule(
+            "range_alerts", base + 30,
+            r'(?:show|list|display)\s+(?:me\s+)?alerts?\s+(?:from\s+)?(\d+)\s+(?:to|-)\s+(\d+)(?:\s+(?:for|on|in)\s+([A-Za-z0-9_]+))?',
+            _SHOW_VERBS,
+            lambda svc, m, q, alerts: svc._handle_range_alerts(
+                int(m.group(1)), int(m.group(2)), _upper_or_none(m.group(3)), alerts)
+        ),
+        # "compare alerts between MIDEVSTB and MIDEVSTBN"
+        DispatchRule(
+            "db_comparison", base + 40,
+            r'compare\s+(?:alerts?\s+)?(?:between\s+)?([A-Za-z0-9_]+)\s+(?:and|vs|versus|with)\s+([A-Za-z0-9_]+)',
+            ("compare",),
+            lambda svc, m, q, alerts: svc._handle_db_comparison(
+                m.group(1).upper(), m.group(2).upper(), alerts)
+        ),
+        # "how many standby alerts"
+        DispatchRule(
+            "standby_count", base + 50,
+            r'how\s+many\s+(standby|dataguard|data\s*guard)\s*(?:alerts?)?',
+            ("many",),
+            lambda svc, m, q, alerts: svc._handle_standby_count(alerts)
+        ),
+    ]
+
+
+_SEVERITY_RULES = [
+    # "show alerts excluding warning" -> show the other severity
+    DispatchRule(
+        "excluding_severity", 10,
+        r'exclud(?:e|ing)\s+(warning|warnings?|critical)',
+        ("exclud",),
+        lambda svc, m, q, alerts: svc._handle_direct_severity_query(
+            q, "CRITICAL" if m.group(1).lower().rstrip('s') == "warning" else "WARNING", alerts)
+    ),
+    # "show all critical alerts"
+    DispatchRule(
+        "all_severity", 20,
+        r'(?:show|list|display)\s+(?:me\s+)?(?:all\s+)?(critical|warning|warnings?)\s+alerts?',
+        _SHOW_VERBS,
+        lambda svc, m, q, alerts: svc._handle_direct_severity_query(q, _severity_from(m.group(1)), alerts)
+    ),
+    # "how many warning alerts"
+    DispatchRule(
+        "severity_count", 30,
+        r'how\s+many\s+(warning|warnings?|critical)\s*(?:alerts?)?',
+        ("many",),
+        lambda svc, m, q, alerts: svc._handle_severity_count_query(q, _severity_from(m.group(1)), alerts)
+    ),
+]
+
+PRIORITY_ROUTES = IntentDispatcher("priority", _PRIORITY_RULES + _explicit_rules(270))
+SEVERITY_ROUTES = IntentDispatcher("severity", _SEVERITY_RULES + _explicit_rules(40))
 
 
 # Global instance
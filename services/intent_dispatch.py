@@ -0,0 +1,114 @@
+# services/intent_dispatch.py
+"""
+==============================================================
+COMPILED INTENT DISPATCH TABLE
+==============================================================
+
+Routing rules for IntelligenceService.analyze, declared as data:
+
+    DispatchRule(name, priority, pattern, triggers, handler)
+
+- pattern:  regex confirmed against the lowercased question
+- triggers: keywords of which at least one MUST occur in any text the
+            pattern matches (a necessary condition, never a guess)
+- handler:  handler(service, match, question, alerts) -> result or None
+
+IntentDispatcher compiles every rule's triggers into one Aho-Corasick
+automaton. A question is scanned once; only rules whose triggers were
+seen are confirmed with their (pre-compiled) regex, in priority order.
+Rules without triggers are always confirmed.
+
+Per-rule counters (prefilter candidates, regex matches, handled) are
+exposed via stats().
+
+Python 3.6.8 compatible.
+"""
+
+import re
+import threading
+
+from data_engine.keyword_automaton import KeywordAutomaton
+
+
+class DispatchRule(object):
+    """One routing rule: priority, compiled pattern, trigger keywords, handler."""
+
+    __slots__ = ("name", "priority", "pattern", "triggers", "handler", "wrap_phase7", "enabled")
+
+    def __init__(self, name, priority, pattern, triggers, handler, wrap_phase7=False, enabled=True):
+        self.name = name
+        self.priority = priority          # lower runs first
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.triggers = tuple(triggers or ())
+        self.handler = handler
+        self.wrap_phase7 = wrap_phase7    # result passed through _apply_phase7
+        self.enabled = enabled
+
+
+class IntentDispatcher:
+    """
+    Compiled matcher over a set of DispatchRules.
+
+    Usage:
+        for rule, match in dispatcher.matches(q_lower):
+            result = rule.handler(service, match, question, alerts)
+            if result:
+                dispatcher.record_handled(rule)
+                return result
+    """
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = sorted((r for r in rules if r.enabled), key=lambda r: r.priority)
+        self._always = []
+        self._by_keyword = {}
+        for index, rule in enumerate(self.rules):
+            if not rule.triggers:
+                self._always.append(index)
+            for keyword in rule.triggers:
+                self._by_keyword.setdefault(keyword, []).append(index)
+        self._automaton = KeywordAutomaton(self._by_keyword.keys())
+
+        self._lock = threading.Lock()
+        self._questions = 0
+        self._counters = dict(
+            (rule.name, {"candidates": 0, "matches": 0, "handled": 0}) for rule in self.rules
+        )
+
+    def candidates(self, q_lower):
+        """Rules whose trigger keywords occur in the question, in priority order."""
+        indices = set(self._always)
+        for keyword in self._automaton.find(q_lower):
+            indices.update(self._by_keyword[keyword])
+        return [self.rules[i] for i in sorted(indices)]
+
+    def matches(self, q_lower):
+        """Yield (rule, match) for every confirmed rule, in priority order."""
+        candidates = self.candidates(q_lower)
+        with self._lock:
+            self._questions += 1
+            for rule in candidates:
+                self._counters[rule.name]["candidates"] += 1
+
+        for rule in candidates:
+            match = rule.pattern.search(q_lower)
+            if match:
+                with self._lock:
+                    self._counters[rule.name]["matches"] += 1
+                yield rule, match
+
+    def record_handled(self, rule):
+        with self._lock:
+            self._counters[rule.name]["handled"] += 1
+
+    def stats(self):
+        """Per-rule hit counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "questions": self._questions,
+                "rules": [
+                    dict(self._counters[rule.name], name=rule.name, priority=rule.priority)
+                    for rule in self.rules
+                ]
+            }
@@ -0,0 +1,276 @@
+# services/lazy_registry.py
+"""
+==============================================================
+LAZY ENGINE REGISTRY - Import heavy engines on first use
+==============================================================
+
+Importing the chat controller used to import the intelligence
+service, and with it most of reasoning/ (dba_guardrails,
+self_audit_engine, enterprise_trust_engine, ...), building their
+module-level singletons before the server could answer /health.
+
+EngineRegistry names those engines without importing them:
+
+    ENGINE_REGISTRY.register("intelligence_service",
+                             "services.intelligence_service:INTELLIGENCE_SERVICE")
+    service = ENGINE_REGISTRY.get("intelligence_service")
+
+- get():        imports the module and resolves the attribute once
+                (thread-safe; concurrent callers wait for one load)
+- proxy():      stand-in object for module-level names; attribute
+                access loads the engine
+- warm_up():    loads every registered engine (in registration order);
+                start_warmup() does it in a background thread once the
+                server is up, so the first question does not pay for it
+- stats():      per-engine load time, modules imported, errors
+
+With LAZY_ENGINES=false engines are loaded when registered (the
+previous import-time behavior).
+
+import_profile(module) runs `python -X importtime -c "import module"`
+in a subprocess and summarizes it (slowest modules, time per top-level
+package); `python -m services.lazy_registry [module]` prints it.
+
+Python 3.6.8 compatible.
+"""
+
+import importlib
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from config.settings import settings
+
+
+class _Engine(object):
+    """One registered engine and its load state."""
+
+    __slots__ = ("name", "module", "attr", "lock", "loaded", "value", "load_ms", "modules", "loaded_at", "error")
+
+    def __init__(self, name, target):
+        self.name = name
+        self.module, _, self.attr = target.partition(":")
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.value = None
+        self.load_ms = None
+        self.modules = None        # modules imported by the load
+        self.loaded_at = None
+        self.error = None
+
+
+class EngineRegistry(object):
+    """
+    Named engines imported on first use.
+
+    Usage:
+        ENGINE_REGISTRY.register("name", "package.module:ATTRIBUTE")
+        engine = ENGINE_REGISTRY.get("name")
+    """
+
+    def __init__(self, lazy=True):
+        self._lazy = lazy
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmup_thread = None
+
+    # =====================================================
+    # REGISTRATION / LOADING
+    # =====================================================
+    def register(self, name, target):
+        """Register "module" or "module:attribute" under name (idempotent)."""
+        with self._lock:
+            if name not in self._engines:
+                self._engines[name] = _Engine(name, target)
+        if not self._lazy:
+            self.get(name)
+
+    def proxy(self, name):
+        """Object forwarding attribute access to the engine (loaded on first access)."""
+        return _EngineProxy(self, name)
+
+    def get(self, name):
+        """The engine, imported on first call. Import errors propagate."""
+        engine = self._engines[name]
+        if engine.loaded:
+            return engine.value
+        with engine.lock:
+            if not engine.loaded:
+                self._load(engine)
+        return engine.value
+
+    def is_loaded(self, name):
+        engine = self._engines.get(name)
+        return bool(engine and engine.loaded)
+
+    def _load(self, engine):
+        before = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            value = importlib.import_module(engine.module)
+            if engine.attr:
+                value = getattr(value, engine.attr)
+        except Exception as e:
+            engine.error = "{0}: {1}".format(type(e).__name__, e)
+            raise
+        engine.value = value
+        engine.load_ms = round((time.perf_counter() - started) * 1000.0, 1)
+        engine.modules = len(sys.modules) - before
+        engine.loaded_at = datetime.now().isoformat()
+        engine.error = None
+        engine.loaded = True
+
+    # =====================================================
+    # WARM-UP
+    # =====================================================
+    def warm_up(self, names=None):
+        """Load the given (default: all) engines; returns {name: error} for failures."""
+        errors = {}
+        for name in list(names or self._engines):
+            try:
+                self.get(name)
+            except Exception as e:
+                errors[name] = "{0}: {1}".format(type(e).__name__, e)
+        return errors
+
+    def start_warmup(self, delay=0.0):
+        """Run warm_up() in a daemon thread (once); returns the thread."""
+        with self._lock:
+            if self._warmup_thread is not None:
+                return self._warmup_thread
+
+            def run():
+                if delay:
+                    time.sleep(delay)
+                started = time.perf_counter()
+                errors = self.warm_up()
+                print("[OK] Engines warmed up in {0:.0f} ms{1}".format(
+                    (time.perf_counter() - started) * 1000.0,
+                    " (failed: {0})".format(", ".join(sorted(errors))) if errors else ""
+                ))
+
+            self._warmup_thread = threading.Thread(target=run, name="engine-warmup", daemon=True)
+            self._warmup_thread.start()
+            return self._warmup_thread
+
+    # =====================================================
+    # INSPECTION
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            engines = list(self._engines.values())
+        return {
+            "lazy": self._lazy,
+            "engines": OrderedDict(
+                (e.name, {
+                    "target": e.module + (":" + e.attr if e.attr else ""),
+                    "loaded": e.loaded,
+                    "load_ms": e.load_ms,
+                    "modules_imported": e.modules,
+                    "loaded_at": e.loaded_at,
+                    "error": e.error
+                })
+                for e in engines
+            )
+        }
+
+
+class _EngineProxy(object):
+    """Forwards attribute access to a registry engine."""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __repr__(self):
+        return "<lazy engine {0!r}>".format(self._name)
+
+
+# =====================================================
+# IMPORT-TIME PROFILE
+# =====================================================
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module="app", top=25, cwd=None):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns total import time, the `top` modules by cumulative time
+    (self / cumulative ms, nesting depth) and self time per top-level
+    package.
+    """
+    if not re.match(r"^[A-Za-z_][\w.]*$", module):
+        raise ValueError("Invalid module name: {0!r}".format(module))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {0}".format(module)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, cwd=cwd or _PROJECT_ROOT,
+        universal_newlines=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000.0,
+                "cumulative_ms": int(match.group(2)) / 1000.0,
+                "depth": len(match.group(3)) // 2
+            })
+    packages = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + row["self_ms"]
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "total_ms": round(sum(row["self_ms"] for row in rows), 1),
+        "modules": len(rows),
+        "slowest": sorted(rows, key=lambda row: -row["cumulative_ms"])[:top],
+        "packages_ms": OrderedDict(
+            (package, round(ms, 1)) for package, ms in sorted(packages.items(), key=lambda item: -item[1])
+        )
+    }
+
+
+def format_import_profile(profile):
+    """Text report in the layout of -X importtime."""
+    lines = [
+        "Import profile of {0}: {1:.1f} ms, {2} modules{3}".format(
+            profile["module"], profile["total_ms"], profile["modules"],
+            "" if profile["ok"] else " (import FAILED)"),
+        "",
+        "   self [ms] | cumulative | imported module",
+    ]
+    for row in profile["slowest"]:
+        lines.append("{0:12.1f} | {1:10.1f} | {2}{3}".format(
+            row["self_ms"], row["cumulative_ms"], "  " * row["depth"], row["module"]))
+    lines.extend(["", "Self time per package:"])
+    for package, ms in profile["packages_ms"].items():
+        lines.append("{0:12.1f}   {1}".format(ms, package))
+    return "\n".join(lines)
+
+
+# Global instance for import
+ENGINE_REGISTRY = EngineRegistry(lazy=settings.LAZY_ENGINES)
+
+# Engines of the chat path, in warm-up order
+ENGINE_REGISTRY.register("intelligence_service", "services.intelligence_service:INTELLIGENCE_SERVICE")
+
+
+if __name__ == "__main__":
+    print(format_import_profile(import_profile(sys.argv[1] if len(sys.argv) > 1 else "app")))
@@ -4,6 +4,7 @@ Unified NLP Orchestrator - Single entry point for all NLP processing
 Chains: Intent → Entity → Context → Plan → Execute → Response
 """
 
+import json
 import logging
 from typing import Dict, Any, Optional, Tuple
 
@@ -14,6 +15,8 @@ from services.context_manager import ContextManager
 from services.query_planner import QueryPlanner, get_query_planner
 from data_engine.query_executor import QueryExecutor, get_executor
 from services.response_generator import ResponseGenerator, get_generator
+from services.answer_cache import ANSWER_CACHE
+from data_engine.global_cache import get_data_generation
 
 logger = logging.getLogger(__name__)
 
@@ -143,41 +146,56 @@ class NLPOrchestrator:
             
             logger.debug(f"[NLP] Query plan: {query_plan.query_type} with filters: {query_plan.filters}")
             
-            # Step 7: Execute query
-            query_result = self.query_executor.execute(query_plan)
+            # Step 7: Execute query and generate response. Both depend only
+            # on the plan and the data, so repeated plans (same question in
+            # the same scope) reuse the cached answer until the data reloads
+            cache_key = self._answer_cache_key(intent, question_type, query_plan)
+            cached = ANSWER_CACHE.get(cache_key) if cache_key else None
+            if cached is None:
+                generation = get_data_generation()
+                query_result = self.query_executor.execute(query_plan)
+                response = self.response_generator.generate(
+                    query_result, 
+                    query_plan, 
+                    intent, 
+                    question_type
+                )
+                
+                # Generate follow-up suggestions
+                suggestions = self.response_generator.generate_followup_suggestions(
+                    query_result, query_plan, intent
+                )
+                cached = {
+                    'result_summary': {
+                        'success': query_result.success,
+                        'total_count': query_result.total_count,
+                        'filtered_count': query_result.filtered_count,
+                        'data_count': len(query_result.data),
+                        'aggregations': query_result.aggregations
+                    },
+                    'response': response,
+                    'suggestions': suggestions
+                }
+                if cache_key and query_result.success:
+                    ANSWER_CACHE.put(cache_key, cached, generation)
+            
+            summary = cached['result_summary']
+            response = cached['response']
+            suggestions = cached['suggestions']
             
             if self._debug_mode:
-                debug_info['step5_result_summary'] = {
-                    'success': query_result.success,
-                    'total_count': query_result.total_count,
-                    'filtered_count': query_result.filtered_count,
-                    'data_count': len(query_result.data),
-                    'aggregations': query_result.aggregations
-                }
+                debug_info['step5_result_summary'] = summary
             
-            logger.debug(f"[NLP] Query result: {query_result.filtered_count} alerts found")
+            logger.debug(f"[NLP] Query result: {summary['filtered_count']} alerts found")
             
             # Step 6: Update context with results
             results_dict = {
-                'total_count': query_result.filtered_count,
-                'displayed_count': len(query_result.data),
+                'total_count': summary['filtered_count'],
+                'displayed_count': summary['data_count'],
                 'answer': ''  # Will be set after generation
             }
             ContextManager.update_context(session_id, query, merged_entities, intent_result, results_dict)
             
-            # Step 7: Generate response
-            response = self.response_generator.generate(
-                query_result, 
-                query_plan, 
-                intent, 
-                question_type
-            )
-            
-            # Generate follow-up suggestions
-            suggestions = self.response_generator.generate_followup_suggestions(
-                query_result, query_plan, intent
-            )
-            
             result = {
                 'success': True,
                 'answer': response,
@@ -185,7 +203,7 @@ class NLPOrchestrator:
                 'confidence': confidence,
                 'question_type': question_type,
                 'entities': merged_entities,
-                'result_count': query_result.filtered_count,
+                'result_count': summary['filtered_count'],
                 'suggestions': suggestions
             }
             
@@ -206,6 +224,15 @@ class NLPOrchestrator:
                 'suggestions': ["Try rephrasing your question"]
             }
     
+    def _answer_cache_key(self, intent: str, question_type: str, query_plan) -> Optional[Tuple]:
+        """Cache key of a planned query, or None if the data version is unknown."""
+        try:
+            data_version = self.query_executor.data_version()
+        except Exception:
+            return None
+        plan = json.dumps(query_plan.to_dict(), sort_keys=True, default=str)
+        return ('nlp', intent, question_type, plan, data_version)
+    
     def _handle_max_database_query(self, merged_entities: Dict[str, Any], session_id: str) -> Dict[str, Any]:
         """
         Handle MAX_DATABASE_QUERY intent.
@@ -0,0 +1,198 @@
+# services/request_context.py
+"""
+==============================================================
+REQUEST CONTEXT - Request-scoped session and question state
+==============================================================
+
+SessionStore switched one class-level state pointer per request, and
+the Phase-12 scope, the formatter context and the reasoning memory
+were module / class globals as well. Two chat requests running at the
+same time therefore read and wrote each other's session.
+
+A chat request now runs inside request_scope():
+
+    with request_scope():
+        SessionStore.set_session_id(session_id)   # binds the session
+        INTELLIGENCE_SERVICE.analyze(question)
+
+and the former globals are RequestLocal values:
+
+- inside a scope each request reads and writes its own value
+  (factory() on first access, or the process-wide value when there
+  is no factory - e.g. the anonymous session state)
+- per_session=True values belong to the session bound by
+  SessionStore.set_session_id and persist across its requests
+  (kept in a bounded SessionBackend, like the session state itself)
+- outside any scope (scripts, tests, worker processes) there is one
+  process-wide value, exactly as before
+
+RequestLocal also works as a class attribute: reads through the class,
+and reads and assignments through an instance (`self._last_target =
+...`), go to the current request's value. Used through instances, every
+instance has its own values (its process-wide value lives in the
+instance __dict__ and starts as factory()).
+
+The scope lives in a contextvars.ContextVar (a thread-local on
+Python 3.6), so it follows the request onto the chat executor thread
+that enters it.
+
+Python 3.6.8 compatible.
+"""
+
+import threading
+from contextlib import contextmanager
+
+try:
+    from contextvars import ContextVar
+except ImportError:                        # Python 3.6
+    ContextVar = None
+
+from services.session_backend import session_backend, session_writes
+
+
+class _ThreadLocalVar(object):
+    """ContextVar stand-in for Python 3.6 (one value per thread)."""
+
+    def __init__(self, name, default=None):
+        self._local = threading.local()
+        self._default = default
+
+    def get(self):
+        return getattr(self._local, "value", self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+_CURRENT = ContextVar("oem_request", default=None) if ContextVar else _ThreadLocalVar("oem_request")
+
+# session_id -> {name: value} of the per_session RequestLocals
+_SESSION_VALUES = session_backend("request_scoped")
+
+
+class RequestContext(object):
+    """Values of one request and the session it is bound to."""
+
+    __slots__ = ("session_id", "values", "_session_values")
+
+    def __init__(self):
+        self.session_id = None
+        self.values = {}
+        self._session_values = None
+
+    def session_values(self):
+        """Per-session values of the bound session (None when unbound)."""
+        if self.session_id is None:
+            return None
+        if self._session_values is None:
+            self._session_values, _ = _SESSION_VALUES.get_or_create(self.session_id, dict)
+        return self._session_values
+
+
+def current_request():
+    """The RequestContext of the running request (None outside request_scope)."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def request_scope():
+    """
+    Run the block as one request with its own RequestLocal values
+    (shared sessions it touched are written back when it ends).
+    """
+    token = _CURRENT.set(RequestContext())
+    try:
+        with session_writes():
+            yield _CURRENT.get()
+    finally:
+        _CURRENT.reset(token)
+
+
+def bind_session(session_id):
+    """
+    Attach the current request to session_id (called by
+    SessionStore.set_session_id). Returns False outside a request.
+    """
+    context = _CURRENT.get()
+    if context is None:
+        return False
+    if context.session_id != session_id:
+        context.session_id = session_id
+        context._session_values = None
+    return True
+
+
+class RequestLocal(object):
+    """A value held per request (or per session) inside request_scope()."""
+
+    def __init__(self, name, value=None, factory=None, per_session=False):
+        """
+        Args:
+            name: Unique key of the value
+            value: Process-wide value (used outside request scopes)
+            factory: Builds the initial value of a request / session
+                (None: start from the process-wide value)
+            per_session: Keep the value with the bound session
+        """
+        self.name = name
+        self.value = value
+        self.factory = factory
+        self.per_session = per_session
+        self.attr = None
+
+    def __set_name__(self, owner, attr):
+        self.attr = attr
+
+    def _values(self):
+        context = _CURRENT.get()
+        if context is None:
+            return None
+        if self.per_session:
+            return context.session_values()
+        return context.values
+
+    def _process_value(self, instance):
+        if instance is None:
+            return self.value
+        try:
+            return instance.__dict__[self.attr]
+        except KeyError:
+            value = self.value if self.factory is None else self.factory()
+            instance.__dict__[self.attr] = value
+            return value
+
+    def get(self, instance=None):
+        values = self._values()
+        if values is None:
+            return self._process_value(instance)
+        key = self.name if instance is None else (self.name, id(instance))
+        try:
+            return values[key]
+        except KeyError:
+            if self.factory is None:
+                return self._process_value(instance)
+            value = values[key] = self.factory()
+            return value
+
+    def set(self, value, instance=None):
+        values = self._values()
+        if values is not None:
+            values[self.name if instance is None else (self.name, id(instance))] = value
+        elif instance is None:
+            self.value = value
+        else:
+            instance.__dict__[self.attr] = value
+
+    def __get__(self, instance, owner):
+        return self.get(instance)
+
+    def __set__(self, instance, value):
+        self.set(value, instance)
+
+    def __repr__(self):
+        return "<RequestLocal {0}>".format(self.name)
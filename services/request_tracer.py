@@ -0,0 +1,230 @@
+# services/request_tracer.py
+"""
+==============================================================
+REQUEST TRACER - Per-stage latency spans for chat requests
+==============================================================
+
+When a question is slow, the chat path (session switch, scope update,
+data awareness, routing rules, intent classification, evidence,
+reasoning, formatting, Phase 7/11/12 guardrails, session updates)
+gives no hint of where the time went.
+
+RequestTracer records lightweight spans:
+
+- trace:  one per chat request, opened by the chat controller on the
+          executor thread (thread-local, so concurrent requests on
+          other threads do not mix)
+- span:   (stage, start offset, duration, nesting depth) inside the
+          current trace; outside a trace a span costs one attribute
+          lookup and records nothing
+- buffer: the last TRACE_BUFFER_SIZE finished traces (ring buffer)
+- stats:  per-stage p50/p95/p99/max over the last TRACE_SAMPLES
+          durations of each stage
+
+Spans recorded by a chat worker process (CHAT_EXECUTION_MODE=process)
+are sent back with the answer and merged into the parent's trace.
+
+Usage:
+    with REQUEST_TRACER.trace("chat", question=question):
+        with REQUEST_TRACER.span("pipeline.classify"):
+            ...
+    REQUEST_TRACER.recent(20), REQUEST_TRACER.stats()
+
+Python 3.6.8 compatible.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from config.settings import settings
+
+
+class Trace(object):
+    """Spans of one request."""
+
+    __slots__ = ("id", "name", "attrs", "started_at", "t0", "spans", "depth", "duration_ms", "error")
+
+    def __init__(self, trace_id, name, attrs):
+        self.id = trace_id
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now().isoformat()
+        self.t0 = time.perf_counter()
+        self.spans = []          # [stage, start_ms, duration_ms, depth]
+        self.depth = 0
+        self.duration_ms = None
+        self.error = None
+
+    def offset_ms(self):
+        return (time.perf_counter() - self.t0) * 1000.0
+
+    def stage_totals(self):
+        """{stage: total ms} over the spans, in first-seen order."""
+        totals = {}
+        for stage, _, duration, _ in self.spans:
+            totals[stage] = round(totals.get(stage, 0.0) + duration, 3)
+        return totals
+
+    def to_dict(self):
+        result = {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "stages": self.stage_totals(),
+            "spans": [
+                {"stage": stage, "start_ms": round(start, 3), "duration_ms": round(duration, 3), "depth": depth}
+                for stage, start, duration, depth in self.spans
+            ]
+        }
+        result.update(self.attrs)
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class RequestTracer(object):
+    """
+    Thread-local request traces with a ring buffer of finished ones.
+
+    Usage:
+        with REQUEST_TRACER.trace("chat", question=q):
+            with REQUEST_TRACER.span("stage"):
+                ...
+    """
+
+    def __init__(self, capacity=200, samples=1000, enabled=True):
+        self._enabled = enabled
+        self._samples = samples
+        self._traces = deque(maxlen=max(1, capacity))
+        self._durations = {}              # stage -> deque of ms
+        self._totals = deque(maxlen=samples)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    # =====================================================
+    # RECORDING
+    # =====================================================
+    def current(self):
+        """Trace of this thread, None outside a trace."""
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def trace(self, name, **attrs):
+        """Open a trace for this thread (nested calls join the outer one)."""
+        if not self._enabled or self.current() is not None:
+            yield self.current()
+            return
+        with self._lock:
+            self._next_id += 1
+            trace = Trace(self._next_id, name, attrs)
+        self._local.trace = trace
+        try:
+            yield trace
+        except Exception as e:
+            trace.error = "{0}: {1}".format(type(e).__name__, e)
+            raise
+        finally:
+            self._local.trace = None
+            trace.duration_ms = round(trace.offset_ms(), 3)
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as a stage of the current trace."""
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            yield
+            return
+        start = trace.offset_ms()
+        entry = [stage, start, 0.0, trace.depth]
+        trace.spans.append(entry)
+        trace.depth += 1
+        try:
+            yield
+        finally:
+            trace.depth -= 1
+            entry[2] = trace.offset_ms() - start
+
+    def add_spans(self, spans, stage_prefix=""):
+        """Merge spans recorded elsewhere (a chat worker) into the current trace."""
+        trace = self.current()
+        if trace is None or not spans:
+            return
+        base = trace.offset_ms() - max(start + duration for _, start, duration, _ in spans)
+        for stage, start, duration, depth in spans:
+            trace.spans.append([stage_prefix + stage, max(0.0, base + start), duration, trace.depth + depth])
+
+    def _finish(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+            self._totals.append(trace.duration_ms)
+            for stage, duration in trace.stage_totals().items():
+                samples = self._durations.get(stage)
+                if samples is None:
+                    samples = self._durations[stage] = deque(maxlen=self._samples)
+                samples.append(duration)
+
+    # =====================================================
+    # INSPECTION
+    # =====================================================
+    def recent(self, limit=20, min_ms=None):
+        """Latest finished traces first (only those of at least min_ms if given)."""
+        with self._lock:
+            traces = list(self._traces)
+        traces.reverse()
+        if min_ms is not None:
+            traces = [t for t in traces if t.duration_ms >= min_ms]
+        return [t.to_dict() for t in traces[:max(0, limit)]]
+
+    def stats(self):
+        """Per-stage and whole-request latency percentiles (ms)."""
+        with self._lock:
+            stages = dict((stage, list(samples)) for stage, samples in self._durations.items())
+            totals = list(self._totals)
+            buffered = len(self._traces)
+        breakdown = {}
+        for stage, samples in stages.items():
+            entry = self._percentiles(samples)
+            entry["count"] = len(samples)
+            entry["mean"] = round(sum(samples) / len(samples), 3)
+            breakdown[stage] = entry
+        request = self._percentiles(totals)
+        request["count"] = len(totals)
+        return {
+            "enabled": self._enabled,
+            "buffered": buffered,
+            "capacity": self._traces.maxlen,
+            "request_ms": request,
+            "stages_ms": dict(sorted(breakdown.items(), key=lambda item: -(item[1]["p95"] or 0)))
+        }
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._durations.clear()
+            self._totals.clear()
+
+    @staticmethod
+    def _percentiles(samples):
+        if not samples:
+            return {"p50": None, "p95": None, "p99": None, "max": None}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+
+        def pick(p):
+            return round(ordered[min(last, int(round(p * last)))], 3)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+# Global instance for import
+REQUEST_TRACER = RequestTracer(
+    capacity=settings.TRACE_BUFFER_SIZE,
+    samples=settings.TRACE_SAMPLES,
+    enabled=settings.TRACING_ENABLED
+)
@@ -0,0 +1,112 @@
+# services/result_handles.py
+"""
+==============================================================
+RESULT HANDLES - Row-id result sets for follow-up pagination
+==============================================================
+
+Paging follow-ups ("show me 20", "next", "show alerts from 21 to 30")
+re-ran the original filter over every alert each time the user paged.
+
+The first query of a result set now keeps a compact handle in the
+session instead:
+
+    rows = RESULT_HANDLES.rows(alerts, key, predicate)
+    page = RESULT_HANDLES.page(alerts, rows, 20, 30)
+
+- rows:        array of positions in the alert list (4 bytes a row),
+               in alert order (the order the filters always returned)
+- key:         the filter that produced them (e.g. ("context",
+               "dataguard", "FINDB", "CRITICAL")); the same filter in a
+               later question reuses the handle
+- pinned:      to the data generation and the alert list it indexes;
+               a reload makes the handle stale and the next page
+               re-runs the filter once
+- per session: a RequestLocal held with the session's other values
+               (services/request_context.py), so handles are evicted
+               with the session; RESULT_HANDLES_PER_SESSION most
+               recently used filters are kept
+
+A page is len(page) lookups, independent of the number of alerts.
+Row ids describe this process's snapshot, so handles are not part of
+the session state shared with other workers; another worker re-runs
+the filter once.
+
+Python 3.6.8 compatible.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+
+from config.settings import settings
+from data_engine.global_cache import get_data_generation
+from services.request_context import RequestLocal
+
+
+# One stored result set
+ResultHandle = namedtuple("ResultHandle", ["key", "generation", "source", "size", "order", "rows"])
+
+# Row order of handles: positions ascending, i.e. the alerts' own order
+SOURCE_ORDER = "source"
+
+
+class ResultHandles(object):
+    """Result handles of the current session."""
+
+    _handles = RequestLocal("result_handles", value=OrderedDict(), factory=OrderedDict, per_session=True)
+
+    def __init__(self, per_session=4):
+        """
+        Args:
+            per_session: Handles kept per session (least recently used
+                beyond it are dropped; 0 disables handles)
+        """
+        self.per_session = per_session
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "scans": 0, "stale": 0, "rows_scanned": 0}
+
+    def rows(self, alerts, key, predicate):
+        """
+        Positions of the alerts matching predicate: the session's handle
+        for key when it still describes `alerts`, otherwise one scan
+        (stored as the handle for key).
+        """
+        generation = get_data_generation()
+        handles = self._handles
+        handle = handles.get(key) if self.per_session else None
+        if handle is not None:
+            if handle.generation == generation and handle.source == id(alerts) and handle.size == len(alerts):
+                handles.move_to_end(key)
+                self._count("hits")
+                return handle.rows
+            self._count("stale")
+
+        rows = array("I", (i for i, alert in enumerate(alerts) if predicate(alert)))
+        with self._lock:
+            self._stats["scans"] += 1
+            self._stats["rows_scanned"] += len(alerts)
+        if self.per_session:
+            handles.pop(key, None)
+            handles[key] = ResultHandle(key, generation, id(alerts), len(alerts), SOURCE_ORDER, rows)
+            while len(handles) > self.per_session:
+                handles.popitem(last=False)
+        return rows
+
+    @staticmethod
+    def page(alerts, rows, start=0, stop=None):
+        """The alerts at rows[start:stop]."""
+        return [alerts[i] for i in rows[start:stop]]
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["per_session"] = self.per_session
+        return stats
+
+
+# Global instance for import
+RESULT_HANDLES = ResultHandles(per_session=settings.RESULT_HANDLES_PER_SESSION)
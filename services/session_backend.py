@@ -0,0 +1,374 @@
+# services/session_backend.py
+"""
+==============================================================
+SESSION BACKEND - Bounded LRU + idle-TTL session storage
+==============================================================
+
+Every session_id a browser sends used to get its own state in a plain
+module-level dict (SessionStore, the NLP orchestrator's
+ContextManager, phase2's ContextManager) and nothing was ever removed,
+so a long-running server kept every conversation it ever saw.
+
+SessionBackend is the shared store behind them:
+
+- max_entries:  least recently used sessions are evicted beyond it
+- idle TTL:     a session not used for ttl_seconds is dropped (checked
+                on access; LRU order is idle order, so expired
+                sessions are always at the front)
+- max_bytes:    approximate memory of all sessions. Session state is
+                mutated in place by its owner, so an entry is
+                re-measured whenever it is accessed again (the size
+                reflects the state as the previous request left it)
+- stats():      entries, bytes, creations and evictions by cause
+
+With a shared store (SESSION_BACKEND=sqlite, see
+services/shared_session_store.py) the backend is the in-process cache
+of sessions every server worker can read. Inside session_writes() -
+entered by request_scope() for each chat request - a session is
+checked against the store at its first access (reloaded when another
+worker changed it) and written back, if it changed, when the block
+ends. Outside a request only put() and pop() reach the store.
+
+Usage:
+    _SESSIONS = SessionBackend("nlp_context", max_entries=..., ttl_seconds=...)
+    context, created = _SESSIONS.get_or_create(session_id, ConversationContext)
+
+Python 3.6.8 compatible.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from config.settings import settings
+from services.shared_session_store import SHARED_SESSION_STORE
+
+
+def approximate_size(value):
+    """
+    Approximate memory footprint (bytes) of a session value: containers
+    (including deques) and plain objects (their __dict__) are walked;
+    shared objects are counted once.
+    """
+    size = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+    return size
+
+
+class SessionBackend(object):
+    """Bounded LRU + idle-TTL mapping of session_id -> session state."""
+
+    def __init__(self, name, max_entries=1000, max_bytes=64 * 1024 * 1024, ttl_seconds=7200.0, store=None):
+        """
+        Args:
+            name: Backend name (for stats; the key in a shared store)
+            max_entries: Session limit (0 = unlimited)
+            max_bytes: Approximate memory limit of all sessions (0 = unlimited)
+            ttl_seconds: Idle lifetime of a session (0 = never expires)
+            store: Shared store the sessions are read from / written to
+                (None = this process only)
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+
+        # session_id -> [value, size, last_access, stamp, digest]
+        # (stamp / digest: version and hash of the state last read from
+        # or written to the shared store)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "removed": 0,
+            "evicted_lru": 0,
+            "evicted_memory": 0,
+            "expired": 0,
+            "shared_loads": 0,
+            "shared_writes": 0,
+            "shared_unchanged": 0,
+            "shared_removed": 0,
+            "shared_errors": 0,
+        }
+        _BACKENDS[name] = self
+
+    # =====================================================
+    # ACCESS
+    # =====================================================
+    def get(self, session_id, default=None):
+        """Session state (marked as used), or default when absent or expired."""
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            entry = self._entries.get(session_id)
+            writes = _request_writes()
+            if self.store is not None and writes is not None:
+                entry = self._read_through(session_id, entry, writes)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            self._touch(session_id, entry, now)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def get_or_create(self, session_id, factory):
+        """
+        Returns:
+            (state, created): the stored state, or factory() stored
+            under session_id when there is none
+        """
+        with self._lock:
+            value = self.get(session_id, _MISSING)
+            if value is not _MISSING:
+                return value, False
+            value = factory()
+            self._insert(session_id, value)
+            self._stats["created"] += 1
+            self._track(session_id, value)
+            return value, True
+
+    def put(self, session_id, value):
+        """Store (or replace) a session's state."""
+        with self._lock:
+            self._expire(time.time())
+            self._insert(session_id, value)
+        if self.store is not None and not self._track(session_id, value):
+            self._write(session_id, value)
+
+    def pop(self, session_id, default=None):
+        """Remove a session; returns its state (or default)."""
+        with self._lock:
+            if self.store is not None:
+                self.store.delete(self.name, session_id)
+                writes = _request_writes()
+                if writes is not None:
+                    writes.pop((self, session_id), None)
+            if session_id not in self._entries:
+                return default
+            self._stats["removed"] += 1
+            return self._remove(session_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self.store is not None:
+                self.store.clear(self.name)
+
+    def keys(self):
+        """Live session ids, least recently used first."""
+        with self._lock:
+            self._expire(time.time())
+            return list(self._entries)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            self._expire(time.time())
+            return session_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    # =====================================================
+    # SHARED STORE
+    # =====================================================
+    def _read_through(self, session_id, entry, writes):
+        """
+        First access in a request: adopt the shared state when another
+        worker changed (or removed) it. Caller holds the lock.
+        """
+        key = (self, session_id)
+        if key in writes:
+            if entry is None:        # evicted during the request: keep its state
+                self._insert(session_id, writes[key])
+                entry = self._entries[session_id]
+            return entry
+        known = entry[3] if entry is not None else None
+        try:
+            stamp, blob = self.store.fetch(self.name, session_id, known)
+            value = self.store.deserialize(blob) if blob is not None else None
+        except Exception as e:
+            self._stats["shared_errors"] += 1
+            print("[WARN] Session store read failed ({0}/{1}): {2}".format(self.name, session_id, e))
+            stamp, blob = known, None
+        if stamp is None and known is not None:
+            self._remove(session_id)        # removed (or purged as idle) elsewhere
+            self._stats["shared_removed"] += 1
+            entry = None
+        elif blob is not None:
+            self._insert(session_id, value)
+            entry = self._entries[session_id]
+            entry[3], entry[4] = stamp, hash(blob)
+            self._stats["shared_loads"] += 1
+        if entry is not None:
+            writes[key] = entry[0]
+        return entry
+
+    def _track(self, session_id, value):
+        """Write value back when the current request ends; False outside requests."""
+        writes = _request_writes()
+        if self.store is None or writes is None:
+            return False
+        writes[(self, session_id)] = value
+        return True
+
+    def _write(self, session_id, value):
+        """Queue value in the shared store unless unchanged since the last read / write."""
+        try:
+            blob = self.store.serialize(value)
+        except Exception as e:
+            with self._lock:
+                self._stats["shared_errors"] += 1
+            print("[WARN] Session not shared ({0}/{1}): {2}".format(self.name, session_id, e))
+            return
+        digest = hash(blob)
+        with self._lock:
+            entry = self._entries.get(session_id)
+            current = entry is not None and entry[0] is value
+            if current and entry[4] == digest:
+                self._stats["shared_unchanged"] += 1
+                return
+            stamp = self.store.save(self.name, session_id, blob)
+            self._stats["shared_writes"] += 1
+            if current:
+                entry[3], entry[4] = stamp, digest
+
+    # =====================================================
+    # BOOKKEEPING (caller holds the lock)
+    # =====================================================
+    def _insert(self, session_id, value):
+        if session_id in self._entries:
+            self._remove(session_id)
+        size = approximate_size(value)
+        self._entries[session_id] = [value, size, time.time(), None, None]
+        self._bytes += size
+        self._evict(session_id)
+
+    def _touch(self, session_id, entry, now):
+        """Move to the MRU end and re-measure the (mutated in place) state."""
+        size = approximate_size(entry[0])
+        self._bytes += size - entry[1]
+        entry[1] = size
+        entry[2] = now
+        self._entries.move_to_end(session_id)
+        self._evict(session_id)
+
+    def _remove(self, session_id):
+        value, size = self._entries.pop(session_id)[:2]
+        self._bytes -= size
+        return value
+
+    def _evict(self, keep):
+        """Enforce the bounds; never evicts `keep` (the session in use)."""
+        while self.max_entries and len(self._entries) > self.max_entries:
+            if not self._evict_oldest(keep):
+                break
+            self._stats["evicted_lru"] += 1
+        while self.max_bytes and self._bytes > self.max_bytes:
+            if not self._evict_oldest(keep):
+                break
+            self._stats["evicted_memory"] += 1
+
+    def _evict_oldest(self, keep):
+        for session_id in self._entries:
+            if session_id != keep:
+                self._remove(session_id)
+                return True
+            return False
+        return False
+
+    def _expire(self, now):
+        """Drop idle sessions from the LRU end (oldest access first)."""
+        if not self.ttl_seconds:
+            return
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if entry[2] > cutoff:
+                break
+            self._remove(session_id)
+            self._stats["expired"] += 1
+
+    # =====================================================
+    # METRICS
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            self._expire(time.time())
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        stats.update({
+            "name": self.name,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "shared": self.store is not None,
+        })
+        return stats
+
+
+_MISSING = object()
+_BACKENDS = OrderedDict()    # name -> SessionBackend (latest with that name)
+
+# {(backend, session_id): state} touched by the running request
+_WRITES = threading.local()
+
+
+def _request_writes():
+    return getattr(_WRITES, "touched", None)
+
+
+@contextmanager
+def session_writes():
+    """
+    Read shared sessions once and write the ones touched back when the
+    block ends (entered by request_scope() for every chat request).
+    """
+    outer = _request_writes()
+    _WRITES.touched = touched = OrderedDict()
+    try:
+        yield
+    finally:
+        _WRITES.touched = outer
+        for (backend, session_id), value in touched.items():
+            backend._write(session_id, value)
+
+
+def session_backend(name, shared=False):
+    """
+    A backend with the configured SESSION_* limits; shared=True puts it
+    in front of the shared session store (when SESSION_BACKEND=sqlite).
+    """
+    return SessionBackend(
+        name,
+        max_entries=settings.SESSION_MAX_ENTRIES,
+        max_bytes=int(settings.SESSION_MAX_MB * 1024 * 1024),
+        ttl_seconds=settings.SESSION_IDLE_TTL_SECONDS,
+        store=SHARED_SESSION_STORE if shared else None
+    )
+
+
+def session_backend_stats():
+    """stats() of every session backend, by name."""
+    return OrderedDict((name, backend.stats()) for name, backend in list(_BACKENDS.items()))
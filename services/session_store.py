@@ -19,18 +19,53 @@ PRODUCTION FIX (v3.0):
 - Added per-session_id storage to prevent cross-session contamination
 - Dashboard can now properly isolate conversations
 
+Sessions live in a bounded SessionBackend (LRU + idle TTL + memory
+limit, see services/session_backend.py) shared by the server workers
+through services/shared_session_store.py; analysis history is a deque
+of small AnalysisEntry tuples.
+
+The active state and the question context are RequestLocal: inside
+request_scope() (services/request_context.py) set_session_id switches
+only the current request's session, so concurrent chats stay apart.
+
 Python 3.6.8 compatible.
 """
 
+import time
+from collections import deque, namedtuple
 from datetime import datetime
 
+from config.settings import settings
+from services.request_context import RequestLocal, bind_session
+from services.session_backend import session_backend
+
 
 # =====================================================
 # PER-SESSION STORAGE (v3.0 - DASHBOARD FIX)
 # =====================================================
 # Stores per session_id state to prevent cross-session contamination
-_SESSION_STORAGE = {}  # session_id -> state dict
-_ACTIVE_SESSION_ID = None  # Currently active session_id
+_SESSION_STORAGE = session_backend("session_store", shared=True)  # session_id -> state dict
+_ACTIVE_SESSION_ID = None  # Most recently activated session_id (any request)
+_SESSION_ID = RequestLocal("session_store.session_id", factory=lambda: None)  # Active session_id
+
+# One analysis_history item (timestamp is epoch seconds)
+AnalysisEntry = namedtuple("AnalysisEntry", ["timestamp", "question", "target", "intent", "root_cause", "confidence"])
+
+# Longest question text kept in analysis_history
+_HISTORY_QUESTION_CHARS = 200
+
+
+def _analysis_history():
+    return deque(maxlen=settings.SESSION_HISTORY_SIZE)
+
+
+def _empty_question_context():
+    return {
+        "formatter_root_cause": None,
+        "formatter_actions": [],
+        "formatter_evidence": [],
+        "question_type": None
+    }
 
 
 class SessionStore:
@@ -64,9 +99,10 @@ class SessionStore:
     - Use set_session_id() to activate a specific session
     """
     
-    # Class-level singleton state
+    # Class-level singleton state (per request inside request_scope();
+    # this dict is the process-wide / anonymous session)
     _instance = None
-    _state = {
+    _state = RequestLocal("session_store.state", value={
         # Core analysis memory
         "highest_risk_database": None,
         "highest_risk_score": 0,  # ADDED: Track score for comparison
@@ -95,8 +131,8 @@ class SessionStore:
         "last_intent": None,
         "last_confidence": None,
         
-        # Analysis history (circular buffer - last 20)
-        "analysis_history": [],
+        # Analysis history (circular buffer - last SESSION_HISTORY_SIZE)
+        "analysis_history": _analysis_history(),
         
         # Timestamps
         "session_start": None,
@@ -110,16 +146,13 @@ class SessionStore:
         "last_displayed_count": 0,    # CRITICAL FIX: Actual alerts SHOWN to user (for pagination)
         "last_databases": [],         # Databases mentioned in last result
         "conversation_context": {}    # Rich context for follow-ups
-    }
+    })
     
     # CRITICAL FIX: Per-question formatter context (NOT persisted)
     # This is reset at the START of each new question
-    _current_question_context = {
-        "formatter_root_cause": None,
-        "formatter_actions": [],
-        "formatter_evidence": [],
-        "question_type": None
-    }
+    _current_question_context = RequestLocal(
+        "session_store.question_context", value=_empty_question_context(), factory=_empty_question_context
+    )
     
     # =====================================================
     # SESSION ID MANAGEMENT (v3.0 - DASHBOARD FIX)
@@ -135,22 +168,27 @@ class SessionStore:
         Args:
             session_id: Client-provided session ID
         """
-        global _ACTIVE_SESSION_ID, _SESSION_STORAGE
-        
         if not session_id:
             return
         
-        _ACTIVE_SESSION_ID = session_id
-        
-        # Initialize session storage if not exists
-        if session_id not in _SESSION_STORAGE:
-            _SESSION_STORAGE[session_id] = cls._create_empty_state()
+        # Initialize session storage if not exists (or evicted)
+        state, created = _SESSION_STORAGE.get_or_create(session_id, cls._create_empty_state)
+        if created:
             print("[SESSION] Created new session:", session_id)
         else:
             print("[SESSION] Resumed session:", session_id)
         
         # Sync class-level state to this session
-        cls._state = _SESSION_STORAGE[session_id]
+        cls._activate(session_id, state)
+    
+    @classmethod
+    def _activate(cls, session_id, state):
+        """Make state the active session (of the current request, if any)."""
+        global _ACTIVE_SESSION_ID
+        _ACTIVE_SESSION_ID = session_id
+        bind_session(session_id)
+        _SESSION_ID.set(session_id)
+        vars(SessionStore)["_state"].set(state)
     
     @classmethod
     def _create_empty_state(cls):
@@ -175,7 +213,7 @@ class SessionStore:
             "last_target": None,
             "last_intent": None,
             "last_confidence": None,
-            "analysis_history": [],
+            "analysis_history": _analysis_history(),
             "session_start": datetime.now().isoformat(),
             "last_activity": None,
             "last_topic": None,
@@ -192,8 +230,7 @@ class SessionStore:
     @classmethod
     def get_session_id(cls):
         """Get the currently active session ID."""
-        global _ACTIVE_SESSION_ID
-        return _ACTIVE_SESSION_ID
+        return _SESSION_ID.get()
     
     @classmethod
     def reset_session(cls, session_id):
@@ -203,15 +240,46 @@ class SessionStore:
         Args:
             session_id: Session to reset
         """
-        global _SESSION_STORAGE
-        
         if session_id and session_id in _SESSION_STORAGE:
-            _SESSION_STORAGE[session_id] = cls._create_empty_state()
+            state = cls._create_empty_state()
+            _SESSION_STORAGE.put(session_id, state)
             print("[SESSION] Reset session:", session_id)
             
             # If this is the active session, sync state
-            if session_id == _ACTIVE_SESSION_ID:
-                cls._state = _SESSION_STORAGE[session_id]
+            if session_id == cls.get_session_id():
+                cls._activate(session_id, state)
+    
+    @classmethod
+    def export_session(cls, session_id=None):
+        """
+        Get a session's state dict for handing to another process.
+        Uses the active state when session_id is not given.
+        """
+        if session_id:
+            state = _SESSION_STORAGE.get(session_id)
+            return state if state is not None else cls._create_empty_state()
+        return cls._state
+    
+    @classmethod
+    def import_session(cls, session_id, state, activate=False):
+        """
+        Install a session's state dict (returned from another process).
+        
+        Args:
+            session_id: Session the state belongs to (None = active state)
+            state: State dict from export_session()
+            activate: Make this session the active one
+        """
+        if not session_id:
+            if state is cls._state:
+                return
+            cls._state.clear()
+            cls._state.update(state)
+            return
+        
+        _SESSION_STORAGE.put(session_id, state)
+        if activate or session_id == cls.get_session_id():
+            cls._activate(session_id, state)
     
     def __new__(cls):
         if cls._instance is None:
@@ -229,12 +297,7 @@ class SessionStore:
         
         This is DIFFERENT from reset() which clears the entire session.
         """
-        cls._current_question_context = {
-            "formatter_root_cause": None,
-            "formatter_actions": [],
-            "formatter_evidence": [],
-            "question_type": None
-        }
+        vars(SessionStore)["_current_question_context"].set(_empty_question_context())
     
     @classmethod
     def get_question_context(cls):
@@ -405,22 +468,41 @@ class SessionStore:
         Record an analysis in history.
         
         Args:
-            analysis_result: Dict with analysis details
-        """
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "question": analysis_result.get("question"),
-            "target": analysis_result.get("target"),
-            "intent": analysis_result.get("intent"),
-            "root_cause": analysis_result.get("root_cause"),
-            "confidence": analysis_result.get("confidence")
-        }
-        
-        cls._state["analysis_history"].append(entry)
+            analysis_result: Dict with analysis details (or an
+                AnalysisEntry being replayed)
+        """
+        if isinstance(analysis_result, AnalysisEntry):
+            analysis_result = analysis_result._asdict()
+        question = analysis_result.get("question")
+        entry = AnalysisEntry(
+            time.time(),
+            question[:_HISTORY_QUESTION_CHARS] if isinstance(question, str) else question,
+            analysis_result.get("target"),
+            analysis_result.get("intent"),
+            analysis_result.get("root_cause"),
+            analysis_result.get("confidence")
+        )
         
-        # Keep only last 20 entries
-        if len(cls._state["analysis_history"]) > 20:
-            cls._state["analysis_history"] = cls._state["analysis_history"][-20:]
+        # Bounded deque: the oldest entry drops out (a state imported
+        # from elsewhere may still hold a list)
+        history = cls._state.get("analysis_history")
+        if not isinstance(history, deque):
+            history = cls._state["analysis_history"] = deque(history or (), maxlen=settings.SESSION_HISTORY_SIZE)
+        history.append(entry)
+    
+    @classmethod
+    def get_analysis_history(cls):
+        """
+        Analysis history as JSON-ready dicts (ISO timestamp), the shape
+        /api/chat/session has always returned.
+        """
+        history = []
+        for entry in cls._state.get("analysis_history") or ():
+            if isinstance(entry, AnalysisEntry):
+                entry = entry._asdict()
+                entry["timestamp"] = datetime.fromtimestamp(entry["timestamp"]).isoformat()
+            history.append(dict(entry))
+        return history
     
     @classmethod
     def get_context_summary(cls):
@@ -559,8 +641,12 @@ class SessionStore:
     
     @classmethod
     def reset(cls):
-        """Reset session state (for testing)."""
-        cls._state = {
+        """
+        Reset session state (for testing; new anonymous conversations).
+        Without a bound session the process-wide anonymous state is
+        reset, also from inside a request scope.
+        """
+        state = {
             "highest_risk_database": None,
             "highest_risk_score": 0,
             "dominant_ora_codes": [],
@@ -581,7 +667,7 @@ class SessionStore:
             "last_target": None,
             "last_intent": None,
             "last_confidence": None,
-            "analysis_history": [],
+            "analysis_history": _analysis_history(),
             "session_start": datetime.now().isoformat(),
             "last_activity": None,
             # CONVERSATIONAL CONTEXT (NEW)
@@ -592,6 +678,10 @@ class SessionStore:
             "last_databases": [],         # Databases mentioned in last result
             "conversation_context": {}    # Rich context for follow-ups
         }
+        local = vars(SessionStore)["_state"]
+        if cls.get_session_id() is None:
+            local.value = state
+        local.set(state)
     
     # =====================================================
     # CONVERSATIONAL CONTEXT METHODS (NEW)
@@ -0,0 +1,354 @@
+# services/shared_session_store.py
+"""
+==============================================================
+SHARED SESSION STORE - Session state shared by server workers
+==============================================================
+
+With several gunicorn workers a follow-up ("show me 20", "only
+critical") could land on a worker that never saw the first question:
+SessionStore, the NLP ContextManager and phase2's ContextManager kept
+their sessions in process memory only.
+
+SQLiteSessionStore keeps a serialized copy of those sessions in one
+WAL-mode SQLite file that every worker opens. SessionBackend (see
+services/session_backend.py) stays the in-process cache in front of it:
+
+- read-through:  at its first access in a request a session is checked
+                 against the file (one primary-key lookup of its stamp)
+                 and reloaded only when another worker wrote it since
+- write-behind:  the sessions a request touched are serialized when
+                 the request ends (pickle + zlib, a few hundred bytes)
+                 and skipped when unchanged; a writer thread commits
+                 the queued states in one transaction per batch
+- stamps:        every write gets a new stamp (random per process +
+                 counter, so a recycled worker reusing a pid cannot
+                 repeat one); a queued, not yet committed write is
+                 visible to its own worker through the queue
+- generation:    rows are keyed by SESSION_GENERATION (set by the
+                 gunicorn master, so all its workers - including
+                 recycled ones - share sessions); a process started
+                 without it only sees its own sessions, as before
+- idle rows (SESSION_IDLE_TTL_SECONDS) are purged by the writer
+
+Writes reach the file SESSION_WRITE_DELAY_MS after the request that
+made them, well before a person sends a follow-up.
+
+Python 3.6.8 compatible.
+"""
+
+import binascii
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from config.settings import settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    generation TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    updated REAL NOT NULL,
+    state BLOB NOT NULL,
+    PRIMARY KEY (generation, backend, session_id)
+)
+"""
+
+# How often the writer purges idle rows (seconds)
+_PURGE_INTERVAL = 60.0
+
+_DELETED = None    # queued blob of a removed session
+
+
+class SQLiteSessionStore(object):
+    """
+    Serialized session states in a WAL-mode SQLite file.
+
+    Usage:
+        stamp = SHARED_SESSION_STORE.save("nlp_context", session_id, blob)
+        stamp, blob = SHARED_SESSION_STORE.fetch("nlp_context", session_id, known_stamp)
+    """
+
+    def __init__(self, path, generation=None, write_delay=0.02, ttl_seconds=7200.0):
+        """
+        Args:
+            path: SQLite file shared by the workers
+            generation: Key shared by the workers of one server
+                (None: this process only)
+            write_delay: Seconds the writer waits to batch queued writes
+            ttl_seconds: Rows idle longer than this are purged (0 = never)
+        """
+        self.path = path
+        self.generation = generation or "pid-{0}-{1}".format(os.getpid(), int(time.time()))
+        self.write_delay = write_delay
+        self.ttl_seconds = ttl_seconds
+
+        self._local = threading.local()        # per-thread connection
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()          # (backend, session_id) -> (stamp, blob, updated)
+        self._wake = threading.Event()
+        self._writer = None
+        self._writer_pid = None
+        self._schema_pid = None
+        self._stamp_pid = None
+        self._stamp_prefix = None
+        self._counter = None
+        self._last_purge = 0.0
+        self._stats = {
+            "fetches": 0,
+            "loads": 0,
+            "writes_queued": 0,
+            "rows_written": 0,
+            "batches": 0,
+            "bytes_written": 0,
+            "deletes": 0,
+            "purged": 0,
+            "errors": 0,
+        }
+        self._last_error = None
+
+    # =====================================================
+    # SERIALIZATION
+    # =====================================================
+    @staticmethod
+    def serialize(value):
+        """Compact bytes of a session state."""
+        return zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 1)
+
+    @staticmethod
+    def deserialize(blob):
+        return pickle.loads(zlib.decompress(blob))
+
+    # =====================================================
+    # READ-THROUGH
+    # =====================================================
+    def fetch(self, backend, session_id, known_stamp=None):
+        """
+        Current stamp of a session and, when it differs from
+        known_stamp, its serialized state.
+
+        Returns:
+            (None, None) when the session is not stored,
+            (stamp, None) when stamp == known_stamp,
+            (stamp, blob) otherwise
+        """
+        key = (backend, session_id)
+        with self._lock:
+            self._stats["fetches"] += 1
+            queued = self._pending.get(key)
+        if queued is not None:
+            stamp, blob, _ = queued
+            if blob is _DELETED:
+                return None, None
+        else:
+            row = self._connection().execute(
+                "SELECT stamp, CASE WHEN stamp = ? THEN NULL ELSE state END FROM sessions "
+                "WHERE generation = ? AND backend = ? AND session_id = ?",
+                (known_stamp or "", self.generation, backend, session_id)
+            ).fetchone()
+            if row is None:
+                return None, None
+            stamp, blob = row[0], row[1]
+        if stamp == known_stamp:
+            return stamp, None
+        with self._lock:
+            self._stats["loads"] += 1
+        return stamp, bytes(blob)
+
+    # =====================================================
+    # WRITE-BEHIND
+    # =====================================================
+    def save(self, backend, session_id, blob):
+        """Queue a session state for writing; returns its new stamp."""
+        stamp = self._new_stamp()
+        self._queue((backend, session_id), stamp, blob)
+        return stamp
+
+    def _new_stamp(self):
+        with self._lock:
+            if self._stamp_pid != os.getpid():
+                self._stamp_pid = os.getpid()
+                self._stamp_prefix = binascii.hexlify(os.urandom(6)).decode("ascii")
+                self._counter = itertools.count(1)
+            return "{0}.{1}".format(self._stamp_prefix, next(self._counter))
+
+    def delete(self, backend, session_id):
+        """Queue the removal of a session."""
+        self._queue((backend, session_id), None, _DELETED)
+
+    def clear(self, backend):
+        """Remove every session of a backend (this generation) now."""
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == backend]:
+                del self._pending[key]
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM sessions WHERE generation = ? AND backend = ?",
+                             (self.generation, backend))
+        except sqlite3.Error as e:
+            self._error(e)
+
+    def _queue(self, key, stamp, blob):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = (stamp, blob, time.time())
+            self._stats["writes_queued"] += 1
+            self._ensure_writer()
+        self._wake.set()
+
+    def flush(self):
+        """Write every queued state now (on the calling thread)."""
+        self._write_pending()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_writer(self):
+        """Start the writer thread (again, after a fork). Caller holds the lock."""
+        if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        self._writer_pid = os.getpid()
+        self._writer = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._writer.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            if self.write_delay:
+                time.sleep(self.write_delay)    # let concurrent requests join the batch
+            self._wake.clear()
+            if not self._write_pending():
+                time.sleep(0.5)                 # database busy / unavailable: retry
+                self._wake.set()
+            self._purge_idle()
+
+    def _write_pending(self):
+        """Commit the queued states in one transaction; False on failure."""
+        with self._lock:
+            batch = list(self._pending.items())
+        if not batch:
+            return True
+        writes = [
+            (self.generation, backend, session_id, stamp, updated, sqlite3.Binary(blob))
+            for (backend, session_id), (stamp, blob, updated) in batch if blob is not _DELETED
+        ]
+        deletes = [
+            (self.generation, backend, session_id)
+            for (backend, session_id), (stamp, blob, updated) in batch if blob is _DELETED
+        ]
+        try:
+            with self._transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)", writes)
+                conn.executemany(
+                    "DELETE FROM sessions WHERE generation = ? AND backend = ? AND session_id = ?", deletes)
+        except sqlite3.Error as e:
+            self._error(e)
+            return False
+        with self._lock:
+            for key, queued in batch:
+                if self._pending.get(key) is queued:    # not queued again meanwhile
+                    del self._pending[key]
+            self._stats["batches"] += 1
+            self._stats["rows_written"] += len(writes)
+            self._stats["deletes"] += len(deletes)
+            self._stats["bytes_written"] += sum(len(row[5]) for row in writes)
+        return True
+
+    def _purge_idle(self):
+        now = time.time()
+        if not self.ttl_seconds or now - self._last_purge < _PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        try:
+            with self._transaction() as conn:
+                purged = conn.execute("DELETE FROM sessions WHERE updated < ?", (now - self.ttl_seconds,)).rowcount
+        except sqlite3.Error as e:
+            self._error(e)
+            return
+        with self._lock:
+            self._stats["purged"] += max(purged, 0)
+
+    # =====================================================
+    # CONNECTIONS
+    # =====================================================
+    def _connection(self):
+        """This thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            if self._schema_pid != os.getpid():
+                conn.execute(_SCHEMA)
+                conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)")
+                self._schema_pid = os.getpid()
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def _error(self, error):
+        with self._lock:
+            self._stats["errors"] += 1
+            self._last_error = "{0}: {1}".format(type(error).__name__, error)
+
+    # =====================================================
+    # METRICS
+    # =====================================================
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            stats["last_error"] = self._last_error
+        stats.update({
+            "backend": "sqlite",
+            "path": self.path,
+            "generation": self.generation,
+            "write_delay_ms": self.write_delay * 1000.0,
+        })
+        return stats
+
+
+class _Transaction(object):
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error) on an autocommit connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.conn.execute("ROLLBACK")
+            return False
+        try:
+            self.conn.execute("COMMIT")
+        except sqlite3.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+        return False
+
+
+# Global instance for import (the file is opened on first use)
+SHARED_SESSION_STORE = None
+if settings.SESSION_BACKEND == "sqlite":
+    SHARED_SESSION_STORE = SQLiteSessionStore(
+        settings.SESSION_DB_PATH,
+        generation=settings.SESSION_GENERATION or None,
+        write_delay=settings.SESSION_WRITE_DELAY_MS / 1000.0,
+        ttl_seconds=settings.SESSION_IDLE_TTL_SECONDS
+    )
@@ -0,0 +1,163 @@
+# services/single_flight.py
+"""
+==============================================================
+SINGLE FLIGHT - Coalescing of identical concurrent requests
+==============================================================
+
+At shift change the NOC opens its dashboards together: dozens of
+identical /api/dashboard/oem-summary, /databases, /alert-validation
+and /api/rca/latest requests arrive at once, and each one computed the
+same result over every alert on its own.
+
+SingleFlight lets concurrent identical requests share one computation:
+
+- key:        route + request parameters + data generation (+ whether
+              the system is ready), so requests on either side of a
+              reload never share a result
+- leader:     the first request of a key computes; requests arriving
+              while it runs wait for it and return the same result
+              (or raise the same exception)
+- no cache:   the flight ends with the computation; the next request
+              computes again (results stay as fresh as before)
+- stats:      per route: calls, executions, shared results, errors and
+              the most requests that waited on one computation
+
+Endpoints are plain (threadpool) FastAPI functions, so waiting blocks
+a worker thread, never the event loop.
+
+Usage:
+    @dashboard_router.get("/oem-summary")
+    @coalesced("dashboard.oem_summary")
+    def oem_summary():
+        ...
+
+Python 3.6.8 compatible.
+"""
+
+import functools
+import threading
+
+from config.settings import settings
+from data_engine.global_cache import get_data_generation, is_system_ready
+
+
+class _Flight(object):
+    """One in-progress computation and the requests waiting for it."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """Runs one computation per key at a time; concurrent callers share it."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights = {}           # key -> _Flight
+        self._routes = {}            # route -> counters
+
+    def do(self, route, key, compute):
+        """
+        compute() for key, or the result of the computation already
+        running for key (same value, or the same exception raised).
+        """
+        if not self.enabled:
+            self._count(route, "calls", "executions")
+            return compute()
+
+        with self._lock:
+            counters = self._counters(route)
+            counters["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                counters["shared"] += 1
+                counters["max_waiters"] = max(counters["max_waiters"], flight.waiters)
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                counters["executions"] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            self._count(route, "errors")
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _counters(self, route):
+        """Counters of a route. Caller holds the lock."""
+        counters = self._routes.get(route)
+        if counters is None:
+            counters = self._routes[route] = {
+                "calls": 0, "executions": 0, "shared": 0, "errors": 0, "max_waiters": 0
+            }
+        return counters
+
+    def _count(self, route, *names):
+        with self._lock:
+            counters = self._counters(route)
+            for name in names:
+                counters[name] += 1
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self):
+        with self._lock:
+            routes = dict((route, dict(counters)) for route, counters in self._routes.items())
+            in_flight = len(self._flights)
+        for counters in routes.values():
+            calls = counters["calls"]
+            counters["shared_percent"] = round(100.0 * counters["shared"] / calls, 1) if calls else 0.0
+        return {
+            "enabled": self.enabled,
+            "in_flight": in_flight,
+            "calls": sum(c["calls"] for c in routes.values()),
+            "executions": sum(c["executions"] for c in routes.values()),
+            "shared": sum(c["shared"] for c in routes.values()),
+            "routes": routes,
+        }
+
+
+def request_key(route, kwargs):
+    """Coalescing key of an endpoint call: route, parameters, data generation, readiness."""
+    params = tuple(sorted((name, repr(value)) for name, value in kwargs.items()))
+    return (route, params, get_data_generation(), is_system_ready())
+
+
+def coalesced(route):
+    """
+    Decorator: concurrent identical calls of an endpoint share one
+    computation (see SingleFlight). Apply below the router decorator;
+    the endpoint signature is kept for FastAPI.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return SINGLE_FLIGHT.do(route, request_key(route, kwargs), lambda: func(*args, **kwargs))
+        return wrapper
+    return decorate
+
+
+# Global instance for import
+SINGLE_FLIGHT = SingleFlight(enabled=settings.REQUEST_COALESCING)
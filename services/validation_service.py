@@ -0,0 +1,337 @@
+# services/validation_service.py
+"""
+==============================================================
+ALERT VALIDATION SERVICE (BACKGROUND, INCREMENTAL)
+==============================================================
+
+Runs MetricAlertValidator off the request path:
+
+1. Alerts are partitioned into shards by normalized target
+2. Shards are validated in a background process pool
+3. Results are stored per alert id, so a reload only validates
+   alerts that were not seen before (results of alerts gone from
+   the snapshot are dropped)
+4. Progress is exposed while the computation is running
+
+The dashboard endpoint calls ensure_started() and returns either
+progress (while running) or the cached results (when complete).
+
+Python 3.6.8 compatible.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from data_engine.target_normalizer import TargetNormalizer
+from incident_engine.metric_alert_validator import MetricAlertValidator, validate_shard
+
+
+class AlertValidationService:
+    """
+    Background, incremental alert validation.
+
+    STATES:
+    - IDLE:    nothing computed yet
+    - RUNNING: shards are being validated
+    - READY:   every known alert has a stored result
+    - FAILED:  last run raised an error (see status()["error"])
+    """
+
+    STATE_IDLE = "IDLE"
+    STATE_RUNNING = "RUNNING"
+    STATE_READY = "READY"
+    STATE_FAILED = "FAILED"
+
+    # Upper bound on pool size; validation is memory-heavy per worker
+    MAX_WORKERS = 4
+
+    # Shards per worker (smaller shards = smoother progress reporting)
+    SHARDS_PER_WORKER = 4
+
+    def __init__(self, max_workers=None, use_processes=True):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._results = {}            # alert_id -> (metric_supported, reasons)
+        self._metrics_fingerprint = None
+        self._max_workers = max_workers or min(self.MAX_WORKERS, os.cpu_count() or 1)
+        self._use_processes = use_processes
+        self._status = self._empty_status()
+
+    @staticmethod
+    def _empty_status():
+        return {
+            "state": AlertValidationService.STATE_IDLE,
+            "total": 0,
+            "done": 0,
+            "cached": 0,
+            "shards_total": 0,
+            "shards_done": 0,
+            "started_at": None,
+            "finished_at": None,
+            "duration_seconds": None,
+            "error": None
+        }
+
+    # =====================================================
+    # PUBLIC API
+    # =====================================================
+    def ensure_started(self, alerts, metrics, on_complete=None):
+        """
+        Start a validation run for any alerts without a stored result.
+
+        Safe to call on every request: a run already in progress is
+        never started twice, and a completed run is not repeated.
+
+        Args:
+            alerts: normalized alerts (GLOBAL_DATA["alerts"])
+            metrics: normalized metrics (GLOBAL_DATA["metrics"])
+            on_complete: optional callback(results_list) when the run finishes
+
+        Returns:
+            status dict (see status())
+        """
+        with self._lock:
+            if self._status["state"] == self.STATE_RUNNING:
+                return self._status_copy()
+
+            fingerprint = self._fingerprint(metrics)
+            if fingerprint != self._metrics_fingerprint:
+                # Metric evidence changed - stored results are no longer valid
+                self._results = {}
+                self._metrics_fingerprint = fingerprint
+
+            present = set()
+            pending = []
+            pending_ids = set()
+            for a in alerts:
+                if not a:
+                    continue
+                alert_id = MetricAlertValidator.alert_id(a)
+                present.add(alert_id)
+                if alert_id not in self._results:
+                    pending.append(a)
+                    pending_ids.add(alert_id)
+            if len(self._results) > len(present) - len(pending_ids):
+                # Results of alerts no longer in the snapshot are never read again
+                self._results = dict(
+                    (alert_id, result) for alert_id, result in self._results.items() if alert_id in present
+                )
+            if not pending and self._status["state"] == self.STATE_READY:
+                return self._status_copy()
+
+            self._status = self._empty_status()
+            self._status.update({
+                "state": self.STATE_RUNNING,
+                "total": len(pending),
+                "cached": len(alerts) - len(pending),
+                "started_at": datetime.now().isoformat()
+            })
+
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(alerts, metrics, pending, on_complete),
+                name="alert-validation",
+                daemon=True
+            )
+            self._thread.start()
+            return self._status_copy()
+
+    def status(self):
+        """Get current progress/status (copy)."""
+        with self._lock:
+            return self._status_copy()
+
+    def is_ready(self):
+        return self.status()["state"] == self.STATE_READY
+
+    def wait(self, timeout=None):
+        """Block until the current run finishes (used by scripts/tests)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.status()
+
+    def wait_for_results(self, alerts, metrics):
+        """
+        Validate alerts and wait for the results (warm-up job).
+
+        A run already in progress may be for an earlier alert set, so
+        runs are waited on until every alert has a stored result.
+
+        Raises:
+            RuntimeError: a run failed
+        """
+        status = self.ensure_started(alerts, metrics)
+        while status["state"] == self.STATE_RUNNING:
+            status = self.wait()
+            if status["state"] != self.STATE_READY:
+                raise RuntimeError(status.get("error") or "validation did not complete")
+            status = self.ensure_started(alerts, metrics)
+        return self.results_for(alerts)
+
+    def results_for(self, alerts):
+        """
+        Build validation result dicts for alerts, in alert order.
+        Alerts without a stored result are skipped.
+        """
+        results = []
+        store = self._results
+        for a in alerts:
+            if not a:
+                continue
+            stored = store.get(MetricAlertValidator.alert_id(a))
+            if stored is not None:
+                results.append(MetricAlertValidator.format_result(a, stored[0], stored[1]))
+        return results
+
+    def clear(self):
+        """Drop all stored results (forces full revalidation)."""
+        with self._lock:
+            if self._status["state"] != self.STATE_RUNNING:
+                self._results = {}
+                self._metrics_fingerprint = None
+                self._status = self._empty_status()
+
+    # =====================================================
+    # BACKGROUND RUN
+    # =====================================================
+    def _run(self, alerts, metrics, pending, on_complete):
+        started = time.time()
+        try:
+            shards, immediate = self._build_shards(alerts, metrics, pending)
+            self._store(immediate)
+
+            with self._lock:
+                self._status["shards_total"] = len(shards)
+                self._status["done"] += len(immediate)
+
+            if shards:
+                if self._use_processes and self._max_workers > 1:
+                    try:
+                        self._run_pool(shards)
+                    except (OSError, ImportError, RuntimeError) as e:
+                        # Pool unavailable (restricted platform) - run in this thread
+                        print("[!] Validation process pool unavailable: {0}".format(str(e)))
+                        self._run_serial(shards)
+                else:
+                    self._run_serial(shards)
+
+            with self._lock:
+                self._status["state"] = self.STATE_READY
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            with self._lock:
+                self._status["state"] = self.STATE_FAILED
+                self._status["error"] = str(e)
+        finally:
+            with self._lock:
+                self._status["finished_at"] = datetime.now().isoformat()
+                self._status["duration_seconds"] = round(time.time() - started, 3)
+                state = self._status["state"]
+
+        print("[OK] Alert validation {0}: {1} new, {2} cached".format(
+            state.lower(), self._status["total"], self._status["cached"]
+        ))
+
+        if state == self.STATE_READY and on_complete is not None:
+            try:
+                on_complete(self.results_for(alerts))
+            except Exception as e:
+                print("[!] Validation completion callback failed: {0}".format(str(e)))
+
+    def _run_pool(self, shards):
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = {pool.submit(validate_shard, shard): len(shard["alerts"]) for shard in shards}
+            for future in as_completed(futures):
+                self._store(future.result())
+                with self._lock:
+                    self._status["done"] += futures[future]
+                    self._status["shards_done"] += 1
+
+    def _run_serial(self, shards):
+        for shard in shards:
+            self._store(validate_shard(shard))
+            with self._lock:
+                self._status["done"] += len(shard["alerts"])
+                self._status["shards_done"] += 1
+
+    def _store(self, shard_results):
+        for alert_id, valid, reasons in shard_results:
+            self._results[alert_id] = (valid, reasons)
+
+    # =====================================================
+    # SHARDING
+    # =====================================================
+    def _build_shards(self, alerts, metrics, pending):
+        """
+        Partition pending alerts by normalized target.
+
+        Each shard carries only the metric arrays and CRITICAL alert
+        times for its own targets. Targets are assigned largest-first
+        to the lightest shard to keep shard sizes balanced.
+
+        Returns:
+            (shards, immediate) - immediate holds results for alerts
+            that need no lookup (missing time/target, invalid target)
+        """
+        metric_index = MetricAlertValidator.build_metric_index(metrics)
+        critical_index = MetricAlertValidator.build_critical_index(alerts)
+
+        by_target = {}
+        immediate = []
+        for a in pending:
+            alert_id = MetricAlertValidator.alert_id(a)
+            alert_time = a.get("time")
+            target = a.get("target")
+            if not alert_time or not target:
+                immediate.append((alert_id, False, ["Missing time or target"]))
+                continue
+            norm_target = TargetNormalizer.normalize(target)
+            if not norm_target:
+                immediate.append((alert_id, False, ["Invalid target"]))
+                continue
+            by_target.setdefault(norm_target, []).append(
+                (alert_id, norm_target, alert_time, a.get("severity"))
+            )
+
+        shard_count = max(1, min(len(by_target), self._max_workers * self.SHARDS_PER_WORKER))
+        shards = [{"alerts": [], "metrics": {}, "criticals": {}} for _ in range(shard_count)]
+
+        for target in sorted(by_target, key=lambda t: len(by_target[t]), reverse=True):
+            shard = min(shards, key=lambda s: len(s["alerts"]))
+            shard["alerts"].extend(by_target[target])
+            if target in metric_index:
+                shard["metrics"][target] = metric_index[target]
+            if target in critical_index:
+                shard["criticals"][target] = critical_index[target]
+
+        return [s for s in shards if s["alerts"]], immediate
+
+    # =====================================================
+    # HELPERS
+    # =====================================================
+    @staticmethod
+    def _fingerprint(metrics):
+        """Cheap identity of the metric set (count + latest timestamp)."""
+        latest = None
+        for m in metrics or []:
+            m_time = m.get("time") if m else None
+            if isinstance(m_time, datetime) and (latest is None or m_time > latest):
+                latest = m_time
+        return (len(metrics or []), latest)
+
+    def _status_copy(self):
+        status = dict(self._status)
+        total = status["total"]
+        status["percent"] = round(100.0 * status["done"] / total, 1) if total else 100.0
+        status["stored_results"] = len(self._results)
+        return status
+
+
+# Global instance for import
+ALERT_VALIDATION_SERVICE = AlertValidationService()
@@ -0,0 +1,339 @@
+# services/warmup_scheduler.py
+"""
+==============================================================
+BACKGROUND WARM-UP SCHEDULER
+==============================================================
+
+Startup only loads alerts/metrics/incidents and risk trends, so the
+server can start serving immediately. The expensive precomputations
+then run as prioritized background jobs:
+
+    1. predictions      -> GLOBAL_DATA["predictions"]
+    2. rca_summaries    -> GLOBAL_DATA["rca_summaries"]
+    3. validations      -> GLOBAL_DATA["validated_alerts"]
+    4. patterns         -> GLOBAL_DATA["patterns"]
+
+A "target_dictionary" job (priority 0) builds the known database names
+index (TargetDictionary) for the new generation before the first
+question needs it; a "data_analyzer" job (priority 0) runs the shared
+OEMDataAnalyzer's all-alerts scans (database summary, Data Guard and
+tablespace alerts, hour histograms) and a "time_histograms" job
+(priority 0) builds the reasoning pipeline's hour-of-day / day-of-week
+histograms (TimeHistogramIndex) used by peak hour questions.
+
+With CHAT_EXECUTION_MODE=process, a "chat_snapshot" job (priority 0)
+first writes the shared alert snapshot for the chat worker processes.
+
+Each result is published into the data snapshot as soon as its job
+completes (tagged with the data generation it was computed for, so a
+reload in the meantime discards stale results). Per-job status,
+duration and last-run time are exposed via status().
+
+Python 3.6.8 compatible.
+"""
+
+import heapq
+import threading
+import time
+from datetime import datetime
+
+from config.settings import settings
+from data_engine.global_cache import (
+    GLOBAL_DATA,
+    INIT_STATUS,
+    get_data_generation,
+    publish_result
+)
+from data_engine.target_dictionary import TargetDictionary
+from data_engine.target_normalizer import TargetNormalizer
+from data_engine.time_histograms import TimeHistogramIndex
+from nlp_engine.oem_data_analyzer import OEMDataAnalyzer
+from nlp_engine.oem_reasoning_pipeline import TEMPORAL_SCHEME
+
+
+# =====================================================
+# PRECOMPUTATION FUNCTIONS
+# =====================================================
+def _known_targets(alerts):
+    targets = set()
+    for alert in alerts:
+        if alert and alert.get("target"):
+            normalized = TargetNormalizer.normalize(alert.get("target"))
+            if normalized:
+                targets.add(normalized)
+    return targets
+
+
+def compute_predictions(alerts, incidents, risk_trends):
+    """Failure predictions for every target (probability >= 15%)."""
+    from incident_engine.failure_predictor import FailurePredictor
+
+    predictions = []
+    predictor = FailurePredictor(alerts, incidents, risk_trends)
+    for target in sorted(_known_targets(alerts)):
+        try:
+            prediction = predictor.predict(target)
+            if prediction.get("failure_probability", 0) >= 15:
+                predictions.append(prediction)
+        except Exception:
+            pass
+
+    predictions.sort(key=lambda p: p.get("failure_probability", 0), reverse=True)
+    return predictions
+
+
+def compute_rca_summaries(alerts, metrics, incidents, limit=10):
+    """RCA analyses for the most recent CRITICAL incidents."""
+    from incident_engine.correlation_engine import CorrelationEngine
+
+    critical_incidents = [
+        i for i in incidents
+        if i and i.get("severity") == "CRITICAL"
+    ]
+    critical_incidents.sort(
+        key=lambda x: x.get("last_seen") or x.get("first_seen"),
+        reverse=True
+    )
+    recent_criticals = critical_incidents[:limit]
+    if not recent_criticals:
+        return []
+
+    # Latest alert per target, found in one pass instead of one scan per incident
+    wanted = set(TargetNormalizer.normalize(i.get("target")) for i in recent_criticals)
+    latest_by_target = {}
+    for a in alerts:
+        if not a or not a.get("time"):
+            continue
+        target = TargetNormalizer.normalize(a.get("target"))
+        if target in wanted:
+            current = latest_by_target.get(target)
+            if current is None or a.get("time") > current.get("time"):
+                latest_by_target[target] = a
+
+    engine = CorrelationEngine(alerts, metrics, incidents)
+    rca_summaries = []
+    for incident in recent_criticals:
+        try:
+            latest_alert = latest_by_target.get(TargetNormalizer.normalize(incident.get("target")))
+            if not latest_alert:
+                continue
+            rca_summaries.append({
+                "incident": incident,
+                "rca": engine.analyze(latest_alert)
+            })
+        except Exception:
+            pass
+
+    return rca_summaries
+
+
+def compute_patterns(alerts):
+    """Day-of-week and hour-of-day patterns learned per target."""
+    from learning.pattern_engine import PatternEngine
+    from storage.database import Database
+
+    patterns = []
+    db = Database()
+    try:
+        pattern_engine = PatternEngine(db, min_confidence=0.60, lookback_days=60)
+        for target in sorted(_known_targets(alerts)):
+            try:
+                patterns.extend(pattern_engine.detect_day_of_week_patterns(target))
+                patterns.extend(pattern_engine.detect_hour_of_day_patterns(target))
+            except Exception:
+                pass
+    finally:
+        db.close()
+    return patterns
+
+
+def compute_validations(alerts, metrics):
+    """Metric validation of every alert (background process pool)."""
+    from services.validation_service import ALERT_VALIDATION_SERVICE
+
+    if not alerts or not metrics:
+        return []
+    return ALERT_VALIDATION_SERVICE.wait_for_results(alerts, metrics)
+
+
+# =====================================================
+# SCHEDULER
+# =====================================================
+class _StaleGeneration(Exception):
+    """Raised when a queued job's snapshot was replaced before it ran."""
+
+
+class WarmupJob(object):
+    """A named, prioritized precomputation that publishes one GLOBAL_DATA key."""
+
+    def __init__(self, name, priority, data_key, status_flag, func):
+        self.name = name
+        self.priority = priority      # lower runs first
+        self.data_key = data_key      # None = side-effect only, nothing published
+        self.status_flag = status_flag
+        self.func = func              # func(snapshot) -> result
+
+
+class WarmupScheduler:
+    """
+    Runs registered WarmupJobs on a single background thread, in
+    priority order, against the snapshot of a given data generation.
+
+    STATES per job: PENDING, RUNNING, DONE, FAILED, STALE
+    (STALE = finished after a newer snapshot was published)
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._queue = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._status = {}
+
+    def register(self, job):
+        with self._lock:
+            self._jobs[job.name] = job
+            self._status.setdefault(job.name, {
+                "state": "IDLE",
+                "priority": job.priority,
+                "generation": None,
+                "duration_seconds": None,
+                "last_run": None,
+                "result_count": None,
+                "error": None
+            })
+
+    def schedule_all(self, generation=None):
+        """
+        Queue every registered job for the given data generation
+        (defaults to the current one). Runs still queued from an
+        earlier call are replaced.
+        """
+        generation = generation if generation is not None else get_data_generation()
+        with self._lock:
+            self._queue = []
+            for job in self._jobs.values():
+                self._seq += 1
+                heapq.heappush(self._queue, (job.priority, self._seq, generation, job.name))
+                self._status[job.name]["state"] = "PENDING"
+                self._status[job.name]["generation"] = generation
+                if job.status_flag:
+                    INIT_STATUS[job.status_flag] = False
+            self._ensure_thread()
+            self._wakeup.notify()
+
+    def status(self):
+        """Per-job status, duration and last-run time."""
+        with self._lock:
+            return {
+                "generation": get_data_generation(),
+                "pending": len(self._queue),
+                "jobs": dict((name, dict(s)) for name, s in self._status.items())
+            }
+
+    def wait_idle(self, timeout=None):
+        """Block until the queue is drained (used by scripts/tests)."""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                busy = self._queue or any(s["state"] == "RUNNING" for s in self._status.values())
+            if not busy:
+                return True
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.05)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="warmup-scheduler", daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._wakeup.wait()
+                _, _, generation, name = heapq.heappop(self._queue)
+                job = self._jobs[name]
+                self._status[name]["state"] = "RUNNING"
+            self._run_job(job, generation)
+
+    def _run_job(self, job, generation):
+        started = time.time()
+        state, error, result_count = "DONE", None, None
+        try:
+            if generation != get_data_generation():
+                raise _StaleGeneration()
+            print("[*] Warm-up job started: {0}".format(job.name))
+            result = job.func(GLOBAL_DATA)
+            result_count = len(result) if hasattr(result, "__len__") else None
+            if job.data_key is None:
+                published = generation == get_data_generation()
+            else:
+                published = publish_result(job.data_key, result, generation)
+            if published:
+                if job.status_flag:
+                    INIT_STATUS[job.status_flag] = True
+            else:
+                state = "STALE"
+        except _StaleGeneration:
+            state = "STALE"
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            state, error = "FAILED", str(e)
+
+        duration = round(time.time() - started, 3)
+        print("[OK] Warm-up job {0}: {1} in {2}s".format(job.name, state, duration))
+
+        with self._lock:
+            status = self._status[job.name]
+            # A newer generation may have re-queued this job meanwhile
+            if status["generation"] == generation:
+                status["state"] = state
+            status["duration_seconds"] = duration
+            status["last_run"] = datetime.now().isoformat()
+            status["result_count"] = result_count
+            status["error"] = error
+
+
+# Global instance for import
+WARMUP_SCHEDULER = WarmupScheduler()
+
+WARMUP_SCHEDULER.register(WarmupJob(
+    "target_dictionary", 0, None, None,
+    lambda d: TargetDictionary.current()
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "data_analyzer", 0, None, None,
+    lambda d: OEMDataAnalyzer.current().warm()
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "time_histograms", 0, None, None,
+    lambda d: TimeHistogramIndex.current(TEMPORAL_SCHEME).build()
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "predictions", 1, "predictions", "predictions_computed",
+    lambda d: compute_predictions(d.get("alerts", []), d.get("incidents", []), d.get("risk_trends", []))
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "rca_summaries", 2, "rca_summaries", "rca_computed",
+    lambda d: compute_rca_summaries(d.get("alerts", []), d.get("metrics", []), d.get("incidents", []))
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "validations", 3, "validated_alerts", "validations_computed",
+    lambda d: compute_validations(d.get("alerts", []), d.get("metrics", []))
+))
+WARMUP_SCHEDULER.register(WarmupJob(
+    "patterns", 4, "patterns", "patterns_computed",
+    lambda d: compute_patterns(d.get("alerts", []))
+))
+
+if settings.CHAT_EXECUTION_MODE == "process":
+    from services.chat_process_pool import CHAT_PROCESS_POOL
+    WARMUP_SCHEDULER.register(WarmupJob(
+        "chat_snapshot", 0, None, None,
+        lambda d: CHAT_PROCESS_POOL.ensure_snapshot() and None
+    ))
@@ -0,0 +1,127 @@
+"""
+Recorded chat question corpus
+=============================
+Real questions asked of the chat endpoint (plus the examples quoted
+in IntelligenceService routing comments). Used to check that routing
+and classification changes leave decisions unchanged.
+"""
+
+QUESTIONS = [
+    # Incident commander
+    "what's the incident status?",
+    "give me a sitrep",
+    "what's happening right now",
+    "situation report please",
+    "what is the current state of the environment",
+    "what are the top priorities?",
+    "what should i focus on first",
+    "triage the current alerts",
+    "what's p1 right now",
+    "which issue is most urgent",
+    "what should i do next?",
+    "what is the next step",
+    "guide me through this",
+    "what action should i take",
+    "ok what now",
+    "should we escalate this?",
+    "should i call the on-call dba",
+    "who should i tell about this",
+    "should i notify the application team",
+    "predict what will fail next",
+    "what might fail tonight",
+    "what is the next risk",
+    "what should i watch for",
+    "what's coming next",
+    "what is the blast radius",
+    "how widespread is this",
+    "how many databases affected",
+    "what is the scope of impact",
+    # Audience
+    "explain this like you are talking to a senior dba",
+    "explain it as a dba",
+    "explain this to a manager",
+    "give me an executive summary",
+    "summarize for my manager",
+    # Data awareness
+    "are these related to MIDEVSTB?",
+    "is this alert volume normal?",
+    "is the alert count normal for FINDB",
+    "show me alerts from yesterday",
+    "how about today only",
+    "alerts in the last hour",
+    "what happened this week",
+    "why are warnings repeated?",
+    "why are MIDEVSTB alerts repeating",
+    "should i be worried?",
+    "should i be concerned right now",
+    "which database is most likely to fail?",
+    "which db is at risk",
+    "what happens if we ignore these alerts?",
+    "consequence of ignoring this",
+    "what evidence supports this?",
+    "is this one big issue or many?",
+    "one issue or many issues",
+    "which error is causing the most alerts?",
+    # Counting / listing
+    "give me only the count of critical alerts for MIDEVSTB",
+    "only count of warning alerts",
+    "show critical alerts 11 to 20 for MIDEVSTBN",
+    "compare total vs critical alerts for both databases",
+    "show standby alerts summary only",
+    "group alerts by error code",
+    "top 3 alert types per database",
+    "how many critical alerts for MIDEVSTB",
+    "how many warning alerts exist for FINDB",
+    "list critical alerts for MIDEVSTB",
+    "list alerts for FINDB",
+    "show first 5 critical alerts for MIDEVSTB",
+    "show me the first 10 alerts",
+    "show alerts from 21 to 30",
+    "list alerts 1 - 5 for MIDEVSTBN",
+    "compare alerts between MIDEVSTB and MIDEVSTBN",
+    "compare FINDB vs HRDB",
+    "how many standby alerts",
+    "how many dataguard alerts are there",
+    "show alerts excluding warning",
+    "show all critical alerts",
+    "list warning alerts",
+    "how many critical alerts",
+    "how many warnings",
+    # General / pipeline
+    "show me alerts for MIDEVSTB",
+    "how many alerts are there",
+    "show warning alerts",
+    "show standby issues",
+    "are there any critical alerts for MIDEVSTB",
+    "list all alerts",
+    "what is the status of MIDEVSTBN",
+    "count critical alerts for MIDEVSTB",
+    "display top 10 warning alerts",
+    "how many total alerts exist",
+    "what is the root cause of the MIDEVSTB alerts?",
+    "why is FINDB unstable",
+    "which database has the most critical alerts?",
+    "what time do most alerts happen",
+    "is MIDEVSTB down?",
+    "what should we fix first on FINDB",
+    "tell me about ORA-00600 errors",
+    "any tablespace issues?",
+    "is the standby apply lag a problem",
+    "hello",
+    # Phase 1 / Phase 2 test questions
+    "show me alerts",
+    "show me standby issues",
+    "ok show me 10 more",
+    "what about this database",
+    "what should DBA do",
+    "why is this happening",
+    "predict which database will fail",
+    "recommend actions for this issue",
+]
+
+# Multi-turn conversations (follow-ups depend on session context)
+CONVERSATIONS = [
+    ["show standby issues", "show me 20", "only critical"],
+    ["show me alerts for MIDEVSTB", "ok show me 18 warning", "this database status?"],
+    ["how many critical alerts", "what about FINDB", "explain this"],
+]
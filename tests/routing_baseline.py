@@ -0,0 +1,115 @@
+"""
+Recorded routing baseline
+=========================
+Answers of IntelligenceService.analyze for the question corpus
+(tests/question_corpus.py), recorded on the if-chain router that the
+compiled dispatch table replaced: SHA-1 (first 12 hex digits) of each
+answer over the alerts of test_intent_dispatch._baseline_alerts(),
+one fresh session per question and one session per conversation.
+Questions added to the corpus later have no recorded answer.
+"""
+
+QUESTION_ANSWERS = {
+    "what's the incident status?": "e0957ad26355",
+    "give me a sitrep": "e0957ad26355",
+    "what's happening right now": "e0957ad26355",
+    "situation report please": "e0957ad26355",
+    "what is the current state of the environment": "e0957ad26355",
+    "what are the top priorities?": "b9952620c5f8",
+    "what should i focus on first": "b9952620c5f8",
+    "triage the current alerts": "b9952620c5f8",
+    "what's p1 right now": "b9952620c5f8",
+    "which issue is most urgent": "b9952620c5f8",
+    "what should i do next?": "0597245d39cb",
+    "what is the next step": "0597245d39cb",
+    "guide me through this": "0597245d39cb",
+    "what action should i take": "0597245d39cb",
+    "ok what now": "0597245d39cb",
+    "should we escalate this?": "01e47d2bb730",
+    "should i call the on-call dba": "01e47d2bb730",
+    "who should i tell about this": "01e47d2bb730",
+    "should i notify the application team": "01e47d2bb730",
+    "predict what will fail next": "f8d41edf511d",
+    "what might fail tonight": "e86dc65048ce",
+    "what is the next risk": "e86dc65048ce",
+    "what should i watch for": "e86dc65048ce",
+    "what's coming next": "e86dc65048ce",
+    "what is the blast radius": "77549a1ef281",
+    "how widespread is this": "77549a1ef281",
+    "how many databases affected": "ac3478d69a3c",
+    "what is the scope of impact": "77549a1ef281",
+    "explain this like you are talking to a senior dba": "aa94b6ecf383",
+    "explain it as a dba": "aa94b6ecf383",
+    "explain this to a manager": "9a942fe107fd",
+    "give me an executive summary": "2fa29a13d886",
+    "summarize for my manager": "2fa29a13d886",
+    "are these related to MIDEVSTB?": "8fe386f62d6a",
+    "is this alert volume normal?": "cccc27682c79",
+    "is the alert count normal for FINDB": "e42f77550e6a",
+    "show me alerts from yesterday": "eea99057d594",
+    "how about today only": "eea99057d594",
+    "alerts in the last hour": "eea99057d594",
+    "what happened this week": "eea99057d594",
+    "why are warnings repeated?": "29d58191ffed",
+    "why are MIDEVSTB alerts repeating": "1e307b8b9762",
+    "should i be worried?": "26fa5c73ee65",
+    "should i be concerned right now": "26fa5c73ee65",
+    "which database is most likely to fail?": "6d914517bf9c",
+    "which db is at risk": "6d914517bf9c",
+    "what happens if we ignore these alerts?": "d56856a9e071",
+    "consequence of ignoring this": "d56856a9e071",
+    "what evidence supports this?": "4e6e45fceff2",
+    "is this one big issue or many?": "da2d09657778",
+    "one issue or many issues": "da2d09657778",
+    "which error is causing the most alerts?": "5dfd67cfc5c8",
+    "give me only the count of critical alerts for MIDEVSTB": "9c4a79d517e2",
+    "only count of warning alerts": "a3e6604a0626",
+    "show critical alerts 11 to 20 for MIDEVSTBN": "5f3d66dc4d02",
+    "compare total vs critical alerts for both databases": "fe7d4a2dd808",
+    "show standby alerts summary only": "272519c44b1b",
+    "group alerts by error code": "f41bca188060",
+    "top 3 alert types per database": "da050ad5d78d",
+    "how many critical alerts for MIDEVSTB": "5f1cd7c3fb68",
+    "how many warning alerts exist for FINDB": "eb94d5c2be91",
+    "list critical alerts for MIDEVSTB": "74768be091ec",
+    "list alerts for FINDB": "fbcf26fc4f15",
+    "show first 5 critical alerts for MIDEVSTB": "57cb60bf4435",
+    "show me the first 10 alerts": "a56c894d12e2",
+    "show alerts from 21 to 30": "cf61b5b8c25d",
+    "list alerts 1 - 5 for MIDEVSTBN": "2ed1c7efd970",
+    "compare alerts between MIDEVSTB and MIDEVSTBN": "e3e21a5d5d9a",
+    "compare FINDB vs HRDB": "3807cba541b9",
+    "how many standby alerts": "7841fb1f92b9",
+    "how many dataguard alerts are there": "7841fb1f92b9",
+    "show alerts excluding warning": "98c4e68607c4",
+    "show all critical alerts": "98c4e68607c4",
+    "list warning alerts": "1a3d16a2a133",
+    "how many critical alerts": "404c735f21d0",
+    "how many warnings": "7841fb1f92b9",
+    "show me alerts for MIDEVSTB": "df4e670ed61f",
+    "how many alerts are there": "21b64029d8fd",
+    "show warning alerts": "1a3d16a2a133",
+    "show standby issues": "7f17fb4c74e3",
+    "are there any critical alerts for MIDEVSTB": "df4e670ed61f",
+    "list all alerts": "5192ae8061d8",
+    "what is the status of MIDEVSTBN": "e0957ad26355",
+    "count critical alerts for MIDEVSTB": "df4e670ed61f",
+    "display top 10 warning alerts": "c58ac5e7ec49",
+    "how many total alerts exist": "21b64029d8fd",
+    "what is the root cause of the MIDEVSTB alerts?": "df4e670ed61f",
+    "why is FINDB unstable": "baadde793057",
+    "which database has the most critical alerts?": "46bbdb4ce22a",
+    "what time do most alerts happen": "2bd1568a1964",
+    "is MIDEVSTB down?": "df4e670ed61f",
+    "what should we fix first on FINDB": "baadde793057",
+    "tell me about ORA-00600 errors": "1be8acd941ac",
+    "any tablespace issues?": "7ccc3f4df92c",
+    "is the standby apply lag a problem": "ed548d08a03c",
+    "hello": "35c6f52ef3c7",
+}
+
+CONVERSATION_ANSWERS = [
+    ["4f47427c8f73", "d436f140facc", "e811c7be8d72"],
+    ["df4e670ed61f", "e4782f9c5250", "e0957ad26355"],
+    ["404c735f21d0", "baadde793057", "ab6f50028d6c"],
+]
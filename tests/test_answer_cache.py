@@ -0,0 +1,195 @@
+"""
+Test Suite for the Generation-Aware Answer Cache
+================================================
+Validates:
+
+1️⃣ LRU order, TTL expiry and the memory bound
+2️⃣ A data reload invalidates every entry; results computed across a reload are not stored
+3️⃣ Cached values are copies (callers may mutate them)
+4️⃣ Repeated analyze() questions return the same answers and session state as uncached runs
+5️⃣ Sessions in the same scope share entries; self-audit contradiction
+   notes are never replayed or dropped from another audit state
+"""
+
+import copy
+import io
+import contextlib
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, get_data_generation, publish_snapshot
+from reasoning.self_audit_engine import SELF_AUDIT
+from services.answer_cache import ANSWER_CACHE, AnswerCache, normalize_question
+
+
+def _alerts():
+    base = datetime(2025, 6, 20)
+    targets = ["MIDEVSTB", "MIDEVSTBN", "FINDB"]
+    messages = ["ORA-00600: internal error", "Data Guard apply lag exceeded threshold",
+                "Tablespace USERS is 95% full", "Listener down"]
+    alerts = []
+    for i in range(600):
+        target = targets[i % 3]
+        alerts.append({
+            "time": base + timedelta(minutes=17 * i), "target": target,
+            "target_type": "oracle_database", "host": "h%d" % (i % 2),
+            "severity": ["CRITICAL", "WARNING", "INFO"][i % 3 if i % 5 else 0],
+            "message": messages[i % 4] + " on " + target,
+            "issue_type": ["INTERNAL_ERROR", "DATAGUARD", "TABLESPACE", "OTHER"][i % 4],
+        })
+    return alerts
+
+
+def test_lru_ttl_and_memory_bound():
+    print("\n" + "=" * 60)
+    print("TEST: LRU, TTL and memory bound")
+    print("=" * 60)
+
+    cache = AnswerCache("test", max_entries=2, max_bytes=10 ** 6, ttl_seconds=60)
+    cache.put("a", {"answer": "A"})
+    cache.put("b", {"answer": "B"})
+    assert cache.get("a") == {"answer": "A"}       # "a" is now most recent
+    cache.put("c", {"answer": "C"})
+    assert cache.get("b") is None and cache.get("a") is not None
+
+    cache = AnswerCache("test", max_entries=10, max_bytes=2000, ttl_seconds=60)
+    for i in range(10):
+        cache.put(i, {"answer": "x" * 300})
+    stats = cache.stats()
+    assert stats["bytes"] <= 2000 and stats["evicted_memory"] > 0
+    assert cache.put("huge", "y" * 5000) is False
+
+    cache = AnswerCache("test", max_entries=10, ttl_seconds=0.05)
+    cache.put("a", 1)
+    time.sleep(0.1)
+    assert cache.get("a") is None and cache.stats()["expired"] == 1
+
+    assert not AnswerCache("off", max_entries=0).enabled
+    assert normalize_question("  How many   CRITICAL alerts?? ") == "how many critical alerts"
+    print("✓ Least recently used, expired and over-budget entries are evicted")
+
+
+def test_generation_invalidation():
+    print("\n" + "=" * 60)
+    print("TEST: Invalidation on data reload")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        cache = AnswerCache("test", max_entries=10, ttl_seconds=60)
+        generation = get_data_generation()
+        assert cache.put("q", {"answer": "before"}, generation)
+        value = cache.get("q")
+        value["answer"] = "mutated"
+        assert cache.get("q") == {"answer": "before"}
+
+        publish_snapshot(dict(saved))
+        assert cache.get("q") is None
+        assert cache.put("q", {"answer": "stale"}, generation) is False
+        stats = cache.stats()
+        assert stats["invalidated"] == 1 and stats["stale_stores"] == 1
+        assert stats["hits"] == 2 and stats["misses"] == 1
+    finally:
+        publish_snapshot(saved)
+    print("✓ Reload drops entries, stale results are discarded")
+
+
+def test_repeated_analyze_matches_uncached():
+    print("\n" + "=" * 60)
+    print("TEST: Repeated analyze() questions, cached vs uncached")
+    print("=" * 60)
+
+    from services.intelligence_service import INTELLIGENCE_SERVICE
+    from services.session_store import SessionStore
+
+    questions = [
+        ("cache-a", "how many critical alerts"),
+        ("cache-a", "How many CRITICAL alerts?"),
+        ("cache-b", "show me alerts for MIDEVSTB"),
+        ("cache-b", "ok show me 18 warning"),
+        ("cache-b", "this database status?"),
+        ("cache-b", "show me alerts for MIDEVSTB"),
+        ("cache-b", "ok show me 18 warning"),
+        ("cache-a", "how many critical alerts"),
+    ]
+
+    def run():
+        answers = []
+        SELF_AUDIT.reset()
+        for session_id, question in questions:
+            SessionStore.reset_session(session_id)
+        for session_id, question in questions:
+            SessionStore.set_session_id(session_id)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = INTELLIGENCE_SERVICE.analyze(question)
+            result.pop("session_memory", None)
+            state = dict((k, v) for k, v in SessionStore._state.items()
+                         if k not in ("last_activity", "session_start", "analysis_history"))
+            answers.append(copy.deepcopy((result, state)))
+        return answers
+
+    saved, ready = dict(GLOBAL_DATA), SYSTEM_READY.get("ready", False)
+    limit = ANSWER_CACHE.max_entries
+    try:
+        publish_snapshot({"alerts": _alerts(), "metrics": [], "incidents": []})
+        SYSTEM_READY["ready"] = True
+        ANSWER_CACHE.max_entries = 0
+        uncached = run()
+        ANSWER_CACHE.max_entries = max(limit, 64)
+        ANSWER_CACHE.clear()
+        hits = ANSWER_CACHE.stats()["hits"]
+        cached = run()
+        hits = ANSWER_CACHE.stats()["hits"] - hits
+    finally:
+        ANSWER_CACHE.max_entries = limit
+        ANSWER_CACHE.clear()
+        SYSTEM_READY["ready"] = ready
+        publish_snapshot(saved)
+
+    assert cached == uncached
+    assert hits >= 2
+    print("✓ {0} questions, {1} cache hits, identical answers and session state".format(
+        len(questions), hits))
+
+
+def test_sessions_share_entries():
+    print("\n" + "=" * 60)
+    print("TEST: Entries shared across sessions, keyed on the audit facts")
+    print("=" * 60)
+
+    from services.intelligence_service import INTELLIGENCE_SERVICE
+    from services.session_store import SessionStore
+
+    question = "what time do most alerts happen"
+
+    def ask(session_id):
+        SessionStore.reset_session(session_id)
+        SessionStore.set_session_id(session_id)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return INTELLIGENCE_SERVICE.analyze(question)["answer"]
+
+    saved, ready = dict(GLOBAL_DATA), SYSTEM_READY.get("ready", False)
+    try:
+        publish_snapshot({"alerts": _alerts(), "metrics": [], "incidents": []})
+        SYSTEM_READY["ready"] = True
+        ANSWER_CACHE.clear()
+        SELF_AUDIT.reset()
+        first = ask("share-a")
+        hits = ANSWER_CACHE.stats()["hits"]
+        assert ask("share-b") == ask("share-c") == first        # same scope, other sessions
+        assert ANSWER_CACHE.stats()["hits"] - hits >= 1
+
+        # An earlier answer stated the environment count
+        SELF_AUDIT.fact_register.register_fact("count", "environment:count", len(_alerts()),
+                                               "environment", "list all alerts")
+        contradicted = ask("share-e")
+        assert "NUMERIC_CONTRADICTION" in contradicted and "NUMERIC_CONTRADICTION" not in first
+    finally:
+        ANSWER_CACHE.clear()
+        SELF_AUDIT.reset()
+        SYSTEM_READY["ready"] = ready
+        publish_snapshot(saved)
+    print("✓ Other sessions hit; a contradicting audit state gets its note")
@@ -0,0 +1,221 @@
+"""
+Test Suite for the Answer Post-Processor
+========================================
+Validates:
+
+1️⃣ Trigger literals are derived from each pattern's top level
+2️⃣ Rewrites equal the per-regex loops they replace, including rules
+   that create or remove matches for later rules
+3️⃣ Checks report the same phrases in the same order
+4️⃣ The guardrail chain scans an unchanged answer once
+5️⃣ Benchmark: long multi-DB answers through the guardrail chain
+"""
+
+import random
+import re
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reasoning.answer_postprocessor import AnswerPostProcessor, RewriteRule, required_literals
+from reasoning.dba_guardrails import (
+    DBAToneEnforcer, IncidentCountGuardrail, PredictiveReasoningSafety, ProductionSafeResponse
+)
+from reasoning.language_guardrails import LANGUAGE_GUARDRAILS, LanguageGuardrails
+from reasoning.phase12_guardrails import Phase12Guardrails
+from reasoning.safe_prediction_language import SafePredictionLanguage
+
+
+# =====================================================
+# PER-REGEX LOOPS (behaviour before the shared scan)
+# =====================================================
+def _tone(text):
+    for generic, dba_style in DBAToneEnforcer.GENERIC_PHRASES.items():
+        text = re.sub(re.escape(generic), dba_style, text, flags=re.IGNORECASE)
+    for fluff in DBAToneEnforcer.FLUFF_PHRASES:
+        text = re.sub(re.escape(fluff) + r"[.!]?\s*", "", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def _subs(pairs, text):
+    for pattern, replacement in pairs:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def _calm(table, text):
+    return _subs([(re.escape(panic), calm) for panic, calm in table.items()], text)
+
+
+def _searches(patterns, text, flags=0):
+    return [p for p in patterns if re.search(p, text, flags)]
+
+
+def _safe_sanitize(text):
+    sanitized, replaced = text, []
+    for pattern, replacement in SafePredictionLanguage.SAFE_REPLACEMENTS.items():
+        if re.search(pattern, text, re.IGNORECASE):
+            replaced.append(pattern)
+            sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+    return sanitized, replaced
+
+
+def _legacy_chain(text):
+    text = _tone(text)
+    _searches(IncidentCountGuardrail.FORBIDDEN_INCIDENT_PHRASES, text.lower())
+    text = _subs(IncidentCountGuardrail.INCIDENT_FIXES, text)
+    _searches(PredictiveReasoningSafety.FORBIDDEN_PHRASES, text.lower())
+    text = _subs(PredictiveReasoningSafety.SAFE_REPLACEMENTS.items(), text)
+    [p for p in LanguageGuardrails.PANIC_PHRASES if p in text.lower()]
+    text = _calm(LanguageGuardrails.CALM_REPLACEMENTS, text)
+    text, _ = _safe_sanitize(text)
+    return _subs(Phase12Guardrails.FORBIDDEN_PREDICTIONS, text)
+
+
+def _chain(text):
+    text = DBAToneEnforcer.enforce_dba_tone(text)
+    IncidentCountGuardrail.check_incident_count_language(text)
+    text = IncidentCountGuardrail.fix_incident_language(text)
+    PredictiveReasoningSafety.check_prediction_safety(text)
+    text = PredictiveReasoningSafety.sanitize_prediction(text)
+    LANGUAGE_GUARDRAILS.check_for_panic_language(text)
+    text = LANGUAGE_GUARDRAILS.calm_down_text(text)
+    text, _ = SafePredictionLanguage().sanitize_text(text)
+    return Phase12Guardrails.sanitize_predictions("", text)
+
+
+# =====================================================
+# TEXTS
+# =====================================================
+FRAGMENTS = (
+    list(DBAToneEnforcer.GENERIC_PHRASES) + DBAToneEnforcer.FLUFF_PHRASES +
+    LanguageGuardrails.PANIC_PHRASES + ProductionSafeResponse.PANIC_PHRASES + [
+        "will  escalate", "Will\tfail", "confirmed root cause", "100 %", "100%", "guaranteed outage",
+        "3 unique incidents", "12 confirmed incident", "exactly 4 incidents", "predict to fail",
+        "without a doubt", "for sure.", "will cause an outage", "this will cause", "will go down",
+        "outage is certain", "with regards in", " order to", "Rest ", "assured!", "crashed beyond repair",
+        "certainly will", "absolutely", "definitely", "İn order to", "uſe", "ſure", "FOR SURE", "K",
+        "MIDEVSTB", "ORA-00600", "42 CRITICAL alerts", "\n", ". ", ", ", " ",
+    ]
+)
+
+
+def _random_text(rng, parts=12):
+    words = []
+    for _ in range(parts):
+        fragment = rng.choice(FRAGMENTS)
+        if rng.random() < 0.3:
+            fragment = "".join(c.upper() if rng.random() < 0.5 else c for c in fragment)
+        words.append(fragment)
+    return rng.choice(["", " "]).join(words)
+
+
+def _long_answer(databases=40, critical=42):
+    block = ("**{0}**: {1} CRITICAL alerts, 118 WARNING alerts. ORA-00600 internal error repeated on "
+             "instance 2; Data Guard apply lag is 35 minutes and the standby trend shows growth. "
+             "Tablespace USERS at 91% used. Recommended action: review the alert log and the "
+             "archive destination before the next backup window.\n")
+    return "".join(block.format("DB{0:02d}".format(i), critical) for i in range(databases))
+
+
+def test_required_literals():
+    print("\n" + "=" * 60)
+    print("TEST: Trigger literals")
+    print("=" * 60)
+
+    assert required_literals(r'\bwill\s+escalate\b') == ("escalate", "will")
+    assert required_literals(r'100\s*%') == ("100", "%")
+    assert required_literals(r'\bwithout\s+(?:a\s+)?doubt\b') == ("without", "doubt")
+    assert required_literals(r'(\d+)\s+unique\s+incidents?') == ("incident", "unique")
+    assert required_literals(re.escape("Don't worry") + r"[.!]?\s*") == ("don't worry",)
+    assert required_literals(r'\d+') == ()
+    assert RewriteRule(r'\d+').candidate(set())
+    assert not RewriteRule(r'will\s+fail').candidate({"will"})
+    print("✓ Top-level literal runs, optional groups and repeats excluded")
+
+
+def test_rewrites_match_regex_loops():
+    print("\n" + "=" * 60)
+    print("TEST: Rewrites vs per-regex loops")
+    print("=" * 60)
+
+    rng = random.Random(43)
+    texts = [_random_text(rng, rng.randint(1, 30)) for _ in range(600)]
+    texts += ["", "with regards in order to", "Rest Happy to help. assured", "leverage there appears to be an issue",
+              "2 unique incidents will escalate", "İ would suggest panic", _long_answer(3)]
+    safe = SafePredictionLanguage()
+    for text in texts:
+        assert DBAToneEnforcer.enforce_dba_tone(text) == _tone(text), text
+        assert IncidentCountGuardrail.fix_incident_language(text) == _subs(IncidentCountGuardrail.INCIDENT_FIXES, text)
+        assert PredictiveReasoningSafety.sanitize_prediction(text) == \
+            _subs(PredictiveReasoningSafety.SAFE_REPLACEMENTS.items(), text), text
+        assert LANGUAGE_GUARDRAILS.calm_down_text(text) == _calm(LanguageGuardrails.CALM_REPLACEMENTS, text)
+        assert ProductionSafeResponse.calm_down_text(text) == _calm(ProductionSafeResponse.CALM_REPLACEMENTS, text)
+        assert safe.sanitize_text(text) == _safe_sanitize(text), text
+        assert Phase12Guardrails.sanitize_predictions("", text) == _subs(Phase12Guardrails.FORBIDDEN_PREDICTIONS, text)
+        assert _chain(text) == _legacy_chain(text), text
+    print("✓ {0} texts: identical output for every table and the full chain".format(len(texts)))
+
+
+def test_checks_match_regex_loops():
+    print("\n" + "=" * 60)
+    print("TEST: Checks vs per-regex loops")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    safe = SafePredictionLanguage()
+    for _ in range(400):
+        text = _random_text(rng, rng.randint(1, 20))
+        lower = text.lower()
+        _, violations = PredictiveReasoningSafety.check_prediction_safety(text)
+        assert violations == ["Forbidden phrase detected: " + p
+                              for p in _searches(PredictiveReasoningSafety.FORBIDDEN_PHRASES, lower)]
+        _, panic = LANGUAGE_GUARDRAILS.check_for_panic_language(text)
+        assert panic == [p for p in LanguageGuardrails.PANIC_PHRASES if p in lower]
+        _, issues = ProductionSafeResponse.check_production_safety(text)
+        assert [i for i in issues if i.startswith("Panic")] == \
+            ["Panic language detected: '{0}'".format(p) for p in ProductionSafeResponse.PANIC_PHRASES if p in lower]
+        _, incident = IncidentCountGuardrail.check_incident_count_language(text)
+        expected = _searches(IncidentCountGuardrail.FORBIDDEN_INCIDENT_PHRASES, lower)
+        assert incident[:len(expected)] == ["Absolute incident count detected: " + p for p in expected]
+        assert safe.check_for_forbidden_phrases(text) == \
+            _searches(SafePredictionLanguage.FORBIDDEN_PHRASES, text, re.IGNORECASE)
+    print("✓ Same violations, same order")
+
+
+def test_unchanged_answer_scanned_once():
+    print("\n" + "=" * 60)
+    print("TEST: One scan for an unchanged answer")
+    print("=" * 60)
+
+    processor = AnswerPostProcessor()
+    tone = processor.rule_set("tone", [RewriteRule(re.escape("in order to"), "to")])
+    panic = processor.rule_set("panic", [RewriteRule(re.escape("panic"), "", flags=0)])
+    text = _long_answer(5)
+    assert processor.rewrite(tone, text) is text
+    assert processor.matches(panic, text, lower=True) == []
+    stats = processor.stats()
+    assert stats["scans"] == 1 and stats["scan_hits"] == 1 and stats["rules_run"] == 0
+    assert processor.rewrite(tone, "Do X in order to fix Y") == "Do X to fix Y"
+    assert processor.stats()["rewrites"] == 1
+    print("✓ Shared memoized scan; rules without their triggers skipped")
+
+
+def test_chain_benchmark():
+    print("\n" + "=" * 60)
+    print("TEST: Guardrail chain on long multi-DB answers")
+    print("=" * 60)
+
+    # Distinct texts, so no answer is served from the memoized scan of a previous one
+    answers = [_long_answer(n, critical) for critical in range(20) for n in (10, 40, 80)]
+    timings = []
+    for chain in (_legacy_chain, _chain):
+        start = time.process_time()
+        for answer in answers:
+            chain(answer)
+        timings.append((time.process_time() - start) / len(answers))
+    legacy, fused = timings
+    print("✓ {0:.0f} us per answer with per-regex loops, {1:.0f} us with the shared scan ({2:.1f}x)".format(
+        legacy * 1e6, fused * 1e6, legacy / fused))
+    assert fused < legacy
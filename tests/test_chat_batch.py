@@ -0,0 +1,255 @@
+"""
+Test Suite for the Chat Batch Endpoint
+======================================
+Validates:
+
+1️⃣ A batch streams one line per question plus a summary line
+2️⃣ Batch answers equal the same questions sent one by one to /api/chat/
+3️⃣ Parallel batches keep each session's questions in order
+4️⃣ A pinned generation holds off reloads until released; a batch
+   running during /force-reload keeps answering from its generation
+5️⃣ Empty, oversized and unauthenticated batches are rejected
+6️⃣ A timed-out question keeps its session's next question waiting
+   until its work has finished; background tasks stay referenced
+"""
+
+import asyncio
+import csv
+import json
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from controllers import chat_controller
+from controllers.chat_controller import ChatRequest, _process_chat, chat_router
+from controllers.dashboard_controller import force_reload
+from data_engine import global_cache
+from data_engine.data_fetcher import DataFetcher
+from data_engine.global_cache import (
+    GLOBAL_DATA, SYSTEM_READY, get_data_generation, pin_generation, publish_snapshot, unpin_generation
+)
+from services.chat_executor import ChatExecutor
+
+
+QUESTIONS = [
+    "how many critical alerts for MIDEVSTB",
+    "what is the peak alert hour",
+    "how many alerts for FINDB",
+    "show standby issues",
+]
+
+
+def _alerts():
+    alerts = []
+    for i in range(300):
+        alerts.append({
+            "target": ["MIDEVSTB", "FINDB"][i % 2],
+            "target_name": ["MIDEVSTB", "FINDB"][i % 2],
+            "severity": ["CRITICAL", "WARNING"][i % 3 == 0],
+            "message": ["ORA-00600 internal error", "Data Guard apply lag", "Tablespace USERS full"][i % 3],
+            "issue_type": ["INTERNAL_ERROR", "DATAGUARD", "TABLESPACE"][i % 3],
+            "time": "2025-06-{0:02d}T{1:02d}:15:00".format(1 + i % 20, i % 24),
+        })
+    return alerts
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(chat_router, prefix="/api/chat")
+    client = TestClient(app)
+    client.cookies.set("logged_in", "1")
+    return client
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+def _with_data(check):
+    saved, ready = dict(GLOBAL_DATA), SYSTEM_READY.get("ready")
+    try:
+        publish_snapshot({"alerts": _alerts()})
+        SYSTEM_READY["ready"] = True
+        check()
+    finally:
+        SYSTEM_READY["ready"] = ready
+        publish_snapshot(saved)
+
+
+def test_batch_streams_same_answers():
+    print("\n" + "=" * 60)
+    print("TEST: Batch answers vs one-by-one questions")
+    print("=" * 60)
+
+    def check():
+        client = _client()
+        single = [client.post("/api/chat/", json={"message": q, "session_id": "single-{0}".format(i % 2)}).json()
+                  for i, q in enumerate(QUESTIONS)]
+        response = client.post("/api/chat/batch", json={
+            "questions": [{"message": q, "session_id": "batch-{0}".format(i % 2)} for i, q in enumerate(QUESTIONS)]
+        })
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = _lines(response)
+        assert len(lines) == len(QUESTIONS) + 1
+        done = lines[-1]
+        assert done["done"] and done["count"] == len(QUESTIONS) and done["generation"] == get_data_generation()
+        assert [line["index"] for line in lines[:-1]] == list(range(len(QUESTIONS)))
+        for line, expected in zip(lines, single):
+            assert line["answer"] == expected["answer"], line["question"]
+            assert line["question_type"] == expected["question_type"]
+    _with_data(check)
+    print("✓ One line per answer, same answers as /api/chat/")
+
+
+def test_parallel_keeps_session_order():
+    print("\n" + "=" * 60)
+    print("TEST: Parallel batch, ordered per session")
+    print("=" * 60)
+
+    def check():
+        questions = [{"message": q, "session_id": "s{0}".format(i % 3)} for i, q in enumerate(QUESTIONS * 3)]
+        lines = _lines(_client().post("/api/chat/batch", json={"questions": questions, "parallel": True}))
+        answers = lines[:-1]
+        assert sorted(line["index"] for line in answers) == list(range(len(questions)))
+        for session in ["s0", "s1", "s2"]:
+            order = [line["index"] for line in answers if line["session_id"] == session]
+            assert order == sorted(order)
+        assert all(line["question"] == questions[line["index"]]["message"] for line in answers)
+    _with_data(check)
+    print("✓ Every question answered once, in order within its session")
+
+
+def test_pin_holds_reload():
+    print("\n" + "=" * 60)
+    print("TEST: Pinned generation holds off reloads")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        generation = pin_generation()
+        publisher = threading.Thread(target=publish_snapshot, args=({"alerts": []},))
+        publisher.start()
+        time.sleep(0.1)
+        assert get_data_generation() == generation and publisher.is_alive()
+
+        pinned = []
+        waiter = threading.Thread(target=lambda: pinned.append(pin_generation()))
+        waiter.start()
+        time.sleep(0.05)
+        assert not pinned  # new pins wait for the pending reload
+
+        unpin_generation()
+        publisher.join(2)
+        waiter.join(2)
+        assert pinned == [generation + 1]
+        unpin_generation()
+    finally:
+        publish_snapshot(saved)
+    print("✓ Reload waits for the pin; later pins see the new generation")
+
+
+def test_reload_during_batch():
+    print("\n" + "=" * 60)
+    print("TEST: /force-reload while a batch is running")
+    print("=" * 60)
+
+    def check():
+        def ask(question):
+            payload = ChatRequest(message=question, session_id="reload-batch")
+            return _process_chat(payload, question)["answer"]
+
+        expected = [ask(q) for q in QUESTIONS]
+        generation = pin_generation()                  # the running batch's pin
+        saved_csv = DataFetcher.ALERTS_CSV
+        with tempfile.TemporaryDirectory() as directory:
+            DataFetcher.ALERTS_CSV = os.path.join(directory, "alerts.csv")
+            with open(DataFetcher.ALERTS_CSV, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["target_name", "alert_state", "message", "alert_time"])
+                for i in range(40):
+                    writer.writerow(["NEWDB", "CRITICAL", "ORA-00600 internal error",
+                                     "2025-07-01 {0:02d}:00:00".format(i % 24)])
+            result = []
+            reloader = threading.Thread(target=lambda: result.append(force_reload()))
+            try:
+                reloader.start()
+                deadline = time.time() + 30
+                while not global_cache._PINS["publishing"]:   # reload waits for the pin
+                    assert reloader.is_alive() and time.time() < deadline
+                    time.sleep(0.01)
+                assert SYSTEM_READY.get("ready") and get_data_generation() == generation
+                assert [ask(q) for q in QUESTIONS] == expected    # the batch's remaining questions
+            finally:
+                unpin_generation()
+                reloader.join(30)
+                DataFetcher.ALERTS_CSV = saved_csv
+        assert result[0]["success"] and result[0]["data_generation"] == generation + 1
+        assert SYSTEM_READY.get("ready") and {a["target"] for a in GLOBAL_DATA["alerts"]} == {"NEWDB"}
+    _with_data(check)
+    print("✓ System stays ready; the pinned batch answers from its generation")
+
+
+def test_rejects_invalid_batches():
+    print("\n" + "=" * 60)
+    print("TEST: Invalid batches")
+    print("=" * 60)
+
+    client = _client()
+    assert client.post("/api/chat/batch", json={"questions": []}).status_code == 400
+    assert client.post("/api/chat/batch", json={"questions": [{"message": " "}]}).status_code == 400
+    too_many = [{"message": "status"}] * (settings.CHAT_BATCH_MAX_QUESTIONS + 1)
+    assert client.post("/api/chat/batch", json={"questions": too_many}).status_code == 413
+    client.cookies.clear()
+    assert client.post("/api/chat/batch", json={"questions": [{"message": "status"}]}).status_code == 401
+    print("✓ 400 / 413 / 401")
+
+
+def test_timed_out_question_blocks_session():
+    print("\n" + "=" * 60)
+    print("TEST: Timed-out batch question")
+    print("=" * 60)
+
+    running = []
+    overlaps = []
+
+    def slow_chat(payload, question):
+        if running:
+            overlaps.append(question)
+        running.append(question)
+        time.sleep(0.3 if question == "slow" else 0)
+        running.remove(question)
+        return {"question": question, "answer": "ok"}
+
+    saved_executor, saved_chat = chat_controller.CHAT_EXECUTOR, chat_controller._process_chat
+    chat_controller.CHAT_EXECUTOR = ChatExecutor(max_workers=2, max_queue=4, timeout=0.1)
+    chat_controller._process_chat = slow_chat
+    try:
+        questions = [{"message": "slow", "session_id": "t"}, {"message": "next", "session_id": "t"}]
+        lines = _lines(_client().post("/api/chat/batch", json={"questions": questions}))
+    finally:
+        chat_controller.CHAT_EXECUTOR.shutdown(wait=True)
+        chat_controller.CHAT_EXECUTOR, chat_controller._process_chat = saved_executor, saved_chat
+
+    assert lines[0]["confidence_label"] == "TIMEOUT" and lines[1]["answer"] == "ok"
+    assert overlaps == []
+    print("✓ Next question started after the timed-out work finished")
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    async def scenario():
+        task = chat_controller._spawn(failing())
+        assert task in chat_controller._BACKGROUND_TASKS
+        await asyncio.wait([task])
+        await asyncio.sleep(0)                 # done callbacks run on the next loop pass
+        return task in chat_controller._BACKGROUND_TASKS
+
+    assert asyncio.run(scenario()) is False
+    print("✓ Background task referenced until done, its exception retrieved")
@@ -0,0 +1,168 @@
+"""
+Test Suite for the Chat Executor
+=================================
+Validates:
+
+1️⃣ Blocking chat work does not stall the event loop
+   - a health-check style coroutine keeps running while every
+     chat request is still held on its worker thread
+2️⃣ Bounded queue rejects work beyond workers + max_queue
+3️⃣ Per-request timeout returns control to the caller while the
+   work is still running
+4️⃣ /health stays fast (p99 bound) while /api/chat/ saturates the
+   executor - every worker busy and the queue full
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+
+from services.chat_executor import ChatExecutor, ChatQueueFull, ChatTimeout
+
+
+def _blocking_analysis(gate, finished):
+    """Stand-in for INTELLIGENCE_SERVICE.analyze: holds its thread until the gate opens."""
+    gate.wait(5)
+    finished.append(1)
+    return {"answer": "ok"}
+
+
+def test_event_loop_free_under_chat_load():
+    print("\n" + "=" * 60)
+    print("TEST: Event loop keeps running under concurrent chat load")
+    print("=" * 60)
+
+    executor = ChatExecutor(max_workers=1, max_queue=16, timeout=30)
+    gate = threading.Event()
+    finished = []
+
+    async def health_probe():
+        for _ in range(40):
+            await asyncio.sleep(0)  # a trivial handler round-trip on the loop
+        blocked = len(finished)     # chats completed while the probe ran
+        gate.set()
+        return blocked
+
+    async def scenario():
+        chats = [executor.run(_blocking_analysis, gate, finished) for _ in range(6)]
+        return await asyncio.gather(health_probe(), *chats)
+
+    results = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert results[0] == 0, "event loop stalled until {0} chats finished".format(results[0])
+    assert all(r == {"answer": "ok"} for r in results[1:])
+    print("✓ 40 probe round-trips while 6 chat requests were held")
+
+    stats = executor.stats()
+    assert stats["completed"] == 6
+    assert stats["max_queue_depth_seen"] >= 1
+    print("✓ Executor stats: {0}".format(stats))
+
+
+def test_queue_full_rejects():
+    print("\n" + "=" * 60)
+    print("TEST: Bounded queue")
+    print("=" * 60)
+
+    executor = ChatExecutor(max_workers=1, max_queue=1, timeout=30)
+    gate = threading.Event()
+    finished = []
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(_blocking_analysis, gate, finished))
+        second = asyncio.ensure_future(executor.run(_blocking_analysis, gate, finished))
+        await asyncio.sleep(0)
+        try:
+            await executor.run(_blocking_analysis, gate, finished)
+            rejected = False
+        except ChatQueueFull:
+            rejected = True
+        gate.set()
+        await asyncio.gather(first, second)
+        return rejected
+
+    assert asyncio.run(scenario()) is True
+    assert executor.stats()["rejected"] == 1 and len(finished) == 2
+    executor.shutdown()
+    print("✓ Third request rejected while one runs and one waits")
+
+
+def test_timeout():
+    print("\n" + "=" * 60)
+    print("TEST: Per-request timeout")
+    print("=" * 60)
+
+    executor = ChatExecutor(max_workers=1, max_queue=4, timeout=0.05)
+    gate = threading.Event()
+    finished = []
+
+    async def scenario():
+        try:
+            await executor.run(_blocking_analysis, gate, finished)
+        except ChatTimeout:
+            return len(finished)    # the work is still held on its thread
+        return None
+
+    assert asyncio.run(scenario()) == 0
+    assert executor.stats()["timed_out"] == 1
+    gate.set()
+    executor.shutdown(wait=True)
+    assert finished == [1] and executor.stats()["completed"] == 1
+    print("✓ Caller regained control before the work finished")
+
+
+def test_health_latency_under_saturation():
+    print("\n" + "=" * 60)
+    print("TEST: /health p99 latency while the chat executor is saturated")
+    print("=" * 60)
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import app as main_app
+    from controllers import chat_controller
+
+    gate = threading.Event()
+    finished = []
+    executor = ChatExecutor(max_workers=1, max_queue=6, timeout=30)
+    saved_executor, saved_chat = chat_controller.CHAT_EXECUTOR, chat_controller._process_chat
+    chat_controller.CHAT_EXECUTOR = executor
+    chat_controller._process_chat = lambda payload, question: _blocking_analysis(gate, finished)
+
+    server = FastAPI()
+    server.include_router(chat_controller.chat_router, prefix="/api/chat")
+    server.add_api_route("/health", main_app.health_check, methods=["GET"])
+    latencies = []
+    with TestClient(server) as client:          # one event loop for every request
+        client.cookies.set("logged_in", "1")
+        chats = [threading.Thread(target=client.post, args=("/api/chat/",),
+                                  kwargs={"json": {"message": "status"}}) for _ in range(7)]
+        try:
+            for chat in chats:
+                chat.start()
+            deadline = time.time() + 10
+            while executor.stats()["in_flight"] < 1 or executor.stats()["queue_depth"] < 6:
+                assert time.time() < deadline, executor.stats()
+                time.sleep(0.01)
+
+            for _ in range(100):
+                started = time.time()
+                assert client.get("/health").status_code == 200
+                latencies.append(time.time() - started)
+            assert not finished    # every health call ran while the chats were held
+        finally:
+            gate.set()
+            for chat in chats:
+                chat.join(10)
+            executor.shutdown(wait=True)
+            chat_controller.CHAT_EXECUTOR, chat_controller._process_chat = saved_executor, saved_chat
+
+    p99 = sorted(latencies)[98]
+    assert p99 < 0.25, "/health p99 {0:.3f}s under chat saturation".format(p99)
+    assert len(finished) == 7
+    print("✓ 100 /health calls at p99 {0:.1f} ms with 1 chat running and 6 queued".format(p99 * 1000.0))
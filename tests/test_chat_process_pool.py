@@ -0,0 +1,149 @@
+"""
+Test Suite for the Shared Alert Snapshot + Chat Process Pool
+=============================================================
+Validates:
+
+1️⃣ Columnar mmap snapshot round-trips every alert exactly
+2️⃣ Snapshot rows behave like the original alert dicts
+3️⃣ Worker-process answers match in-process analysis
+4️⃣ Session state travels to the worker and back
+5️⃣ Streaming stage events and trace spans are relayed from the worker
+6️⃣ After a reload, the worker adopts the new generation and answers
+   from the new snapshot (no stale cached answers)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pickle
+import tempfile
+from datetime import datetime, timedelta
+
+from data_engine.alert_snapshot import attach_alert_snapshot, write_alert_snapshot
+from data_engine.global_cache import get_data_generation, publish_snapshot, set_system_ready
+
+
+BASE = datetime(2025, 6, 23, 10, 0, 0, 250000)
+
+
+def _build_alerts():
+    alerts = []
+    for i in range(600):
+        alerts.append({
+            "time": BASE + timedelta(minutes=11 * i),
+            "target": ["MIDEVSTB", "MIDEVSTBN", "FINDB"][i % 3],
+            "target_type": "oracle_database",
+            "host": "host{0}".format(i % 2),
+            "severity": ["CRITICAL", "WARNING", "INFO"][i % 3],
+            "message": "ORA-{0:05d}: alert {1}".format(600 + i % 7, i),
+            "metric": None,
+            "issue_type": ["DATAGUARD", "TABLESPACE", "OTHER"][i % 3],
+            "display_alert_type": "Alert {0}".format(i % 3)
+        })
+    del alerts[5]["metric"]
+    return alerts
+
+
+def test_snapshot_round_trip():
+    print("\n" + "=" * 60)
+    print("TEST: Snapshot round trip")
+    print("=" * 60)
+
+    alerts = _build_alerts()
+    path = os.path.join(tempfile.mkdtemp(), "alerts.snap")
+    write_alert_snapshot(alerts, path, generation=3)
+    view = attach_alert_snapshot(path)
+
+    assert len(view) == len(alerts)
+    assert view.generation == 3
+    assert [dict(row) for row in view] == alerts
+    assert view[-1]["time"] == alerts[-1]["time"]
+    assert [r["message"] for r in view[10:13]] == [a["message"] for a in alerts[10:13]]
+    print("✓ {0} alerts round-tripped".format(len(view)))
+
+    row = view[5]
+    assert "metric" not in row and row.get("metric", "n/a") == "n/a"
+    row["annotated"] = True
+    assert row.get("annotated") is True and "annotated" not in view[5]
+    assert pickle.loads(pickle.dumps(view[0])) == alerts[0]
+    print("✓ Rows read, annotate and pickle like dicts")
+
+
+def test_process_pool_matches_in_process():
+    print("\n" + "=" * 60)
+    print("TEST: Process pool vs in-process analysis")
+    print("=" * 60)
+
+    from services.chat_process_pool import ChatProcessPool
+    from services.intelligence_service import INTELLIGENCE_SERVICE
+    from services.session_store import SessionStore
+
+    alerts = _build_alerts()
+    publish_snapshot({"alerts": alerts, "metrics": [], "incidents": []})
+    set_system_ready(True)
+
+    questions = [
+        "how many critical alerts are there?",
+        "how many alerts for FINDB?",
+    ]
+    expected = []
+    for q in questions:
+        SessionStore.set_session_id("in-process")
+        expected.append(INTELLIGENCE_SERVICE.analyze(q)["answer"])
+
+    pool = ChatProcessPool(workers=1, snapshot_dir=tempfile.mkdtemp())
+    try:
+        for q, answer in zip(questions, expected):
+            result = pool.analyze(q, session_id="pool-session")
+            assert result["answer"] == answer, (q, result["answer"], answer)
+        print("✓ {0} answers identical".format(len(questions)))
+
+        state = SessionStore.export_session("pool-session")
+        assert state.get("active_db_scope") == "FINDB", state.get("active_db_scope")
+        print("✓ Session state returned from worker")
+
+        status = pool.status()
+        assert status["snapshot"]["rows"] == len(alerts)
+        assert status["workers"][0]["requests"] == len(questions)
+
+        from services.request_tracer import REQUEST_TRACER
+        stages = []
+        with REQUEST_TRACER.trace("chat") as trace:
+            pool.analyze("what is the risk posture", session_id="pool-stream",
+                         on_stage=lambda stage, data: stages.append(stage))
+        assert stages[0] == "intent" and stages[-1] == "short_answer", stages
+        spans = dict((stage, depth) for stage, _, _, depth in trace.spans)
+        assert spans["chat_worker"] == 0 and spans["pipeline.classify"] > 1, spans
+        print("✓ Stage events and latency spans relayed from the worker")
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_reload():
+    print("\n" + "=" * 60)
+    print("TEST: Process pool after a reload")
+    print("=" * 60)
+
+    from services.chat_process_pool import ChatProcessPool
+    from services.intelligence_service import INTELLIGENCE_SERVICE
+    from services.session_store import SessionStore
+
+    question = "how many alerts for FINDB?"
+    alerts = _build_alerts()
+    set_system_ready(True)
+    pool = ChatProcessPool(workers=1, snapshot_dir=tempfile.mkdtemp())
+    try:
+        answers = []
+        for data in (alerts, alerts[:90]):
+            publish_snapshot({"alerts": data, "metrics": [], "incidents": []})
+            SessionStore.set_session_id("in-process-reload")
+            expected = INTELLIGENCE_SERVICE.analyze(question)["answer"]
+            for _ in range(2):                     # the repeat is an answer-cache hit
+                answers.append(pool.analyze(question, session_id="pool-reload")["answer"])
+                assert answers[-1] == expected, (answers[-1], expected)
+            assert pool.status()["snapshot"]["generation"] == get_data_generation()
+        assert "200" in answers[1] and "30" in answers[2], answers
+    finally:
+        pool.shutdown()
+    print("✓ Worker answers from the reloaded snapshot")
@@ -0,0 +1,110 @@
+"""
+Test Suite for the Streaming Chat Endpoint
+==========================================
+Validates:
+
+1️⃣ Stage events stream in chain order, ending with answer and done
+2️⃣ The final answer equals the same question sent to /api/chat/
+3️⃣ The pipeline answer is the same with or without a stage listener
+4️⃣ A failing listener never breaks the answer
+5️⃣ Empty and unauthenticated requests are rejected
+"""
+
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_chat_batch import _client, _with_data
+from services.intelligence_service import INTELLIGENCE_SERVICE
+
+
+PIPELINE_QUESTIONS = ["what is the risk posture", "show standby issues"]
+
+STAGES = ["accepted", "intent", "counts", "evidence", "root_cause", "decision", "actions",
+          "short_answer", "answer", "done"]
+
+
+def _events(response):
+    events = []
+    for block in response.text.split("\n\n"):
+        if not block.strip():
+            continue
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_stage_order():
+    print("\n" + "=" * 60)
+    print("TEST: Stage events in chain order")
+    print("=" * 60)
+
+    def check():
+        client = _client()
+        for i, question in enumerate(PIPELINE_QUESTIONS):
+            response = client.post("/api/chat/stream", json={"message": question, "session_id": "order-{0}".format(i)})
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = _events(response)
+            assert [stage for stage, _ in events] == STAGES, question
+            data = dict(events)
+            assert data["accepted"]["question"] == question
+            assert data["counts"]["total_alerts"] == 300
+            assert data["short_answer"]["answer"]
+            assert data["done"] == {}
+    _with_data(check)
+    print("✓ accepted → intent → counts → evidence → root_cause → decision → actions → short_answer → answer")
+
+
+def test_final_answer_matches_chat():
+    print("\n" + "=" * 60)
+    print("TEST: Streamed final answer vs /api/chat/")
+    print("=" * 60)
+
+    def check():
+        client = _client()
+        for i, question in enumerate(PIPELINE_QUESTIONS + ["how many critical alerts for MIDEVSTB"]):
+            expected = client.post("/api/chat/", json={"message": question, "session_id": "plain-{0}".format(i)}).json()
+            events = _events(client.post("/api/chat/stream",
+                                         json={"message": question, "session_id": "stream-{0}".format(i)}))
+            answer = dict(events)["answer"]
+            assert answer["answer"] == expected["answer"], question
+            assert answer["question_type"] == expected["question_type"]
+            assert events[-2][0] == "answer"
+    _with_data(check)
+    print("✓ Same guardrail-validated answer, delivered last")
+
+
+def test_listener_does_not_change_answer():
+    print("\n" + "=" * 60)
+    print("TEST: Pipeline with and without a listener")
+    print("=" * 60)
+
+    def check():
+        pipeline = INTELLIGENCE_SERVICE.pipeline
+        for question in PIPELINE_QUESTIONS:
+            seen = []
+            streamed = pipeline.process(question, on_stage=lambda stage, data: seen.append(stage))
+            plain = pipeline.process(question)
+            assert streamed["answer"] == plain["answer"]
+            assert seen == STAGES[1:-2]
+
+            def broken(stage, data):
+                raise ValueError("client went away")
+            assert pipeline.process(question, on_stage=broken)["answer"] == plain["answer"]
+        assert getattr(pipeline._stage, "listener", None) is None
+    _with_data(check)
+    print("✓ Listener is observational and cleared after each call")
+
+
+def test_rejects_invalid_requests():
+    print("\n" + "=" * 60)
+    print("TEST: Invalid stream requests")
+    print("=" * 60)
+
+    client = _client()
+    assert client.post("/api/chat/stream", json={"message": "  "}).status_code == 400
+    client.cookies.clear()
+    assert client.post("/api/chat/stream", json={"message": "status"}).status_code == 401
+    print("✓ 400 / 401")
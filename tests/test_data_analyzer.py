@@ -0,0 +1,161 @@
+"""
+Test Suite for the Shared OEM Data Analyzer
+===========================================
+Validates:
+
+1️⃣ Per-target analyses equal a per-alert scan (ORA codes, context, hours, ranges)
+2️⃣ Database summary, Data Guard and tablespace analyses equal a per-alert scan
+3️⃣ Follow-up calls reuse the memoized scans and return fresh result dicts
+4️⃣ One analyzer per data generation, replaced after a reload
+"""
+
+import random
+import re
+import sys
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from nlp_engine.oem_data_analyzer import OEMDataAnalyzer
+
+
+TARGETS = ["MIDEVSTB", "midevstbn", "FINDB", "HRDB"]
+MESSAGES = [
+    "ORA-00600 [13011] internal error", "ORA-600 [4031] then ORA-1555", "Data Guard apply lag",
+    "Tablespace USERS is 97% full", "standby archive gap", "listener timeout", "ORA 7445 core dump",
+    "SGA memory heap", "archive redo lgwr", "",
+]
+
+
+def _alerts():
+    rng = random.Random(5)
+    base = datetime(2025, 6, 1)
+    alerts = []
+    for i in range(1500):
+        alert = {
+            "message": rng.choice(MESSAGES),
+            "severity": rng.choice(["CRITICAL", "WARNING", "INFO", None]),
+            "target_name" if i % 4 == 0 else "target": rng.choice(TARGETS),
+        }
+        when = base + timedelta(minutes=rng.randint(0, 60 * 24 * 10))
+        if i % 3 == 0:
+            alert["alert_time"] = when.isoformat()
+        elif i % 3 == 1:
+            alert["time"] = when
+        if i % 17 == 0:
+            alert["metric"] = "Tablespace Space Used (%)"
+        alerts.append(alert)
+    return alerts
+
+
+def _key(alert):
+    return (alert.get("target_name") or alert.get("target") or "").upper()
+
+
+def _hour(alert):
+    value = alert.get("alert_time") or alert.get("time")
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.hour if value else None
+
+
+def test_target_analyses_equal_scan():
+    print("\n" + "=" * 60)
+    print("TEST: Per-target analyses vs per-alert scan")
+    print("=" * 60)
+
+    alerts = _alerts()
+    analyzer = OEMDataAnalyzer(alerts)
+    ora = re.compile(r'ORA[-\s]?(\d{3,5})', re.IGNORECASE)
+    for target in [None, "MIDEVSTB", "midevstbn", "FINDB", "UNKNOWN"]:
+        scoped = [a for a in alerts if not target or _key(a) == target.upper()]
+
+        expected = Counter("ORA-" + code for a in scoped for code in ora.findall(a["message"]))
+        result = analyzer.extract_ora_codes(target)
+        assert dict((e["code"], e["count"]) for e in result["ora_codes"]) == dict(expected)
+        assert result["total_ora_errors"] == sum(expected.values())
+
+        memory = sum(1 for a in scoped if re.search("memory|sga|pga|heap|ora-4031|shared pool", a["message"].lower()))
+        assert analyzer.extract_context_categories(target)["categories"].get("MEMORY", 0) == memory
+
+        hours = Counter(_hour(a) for a in scoped if _hour(a) is not None)
+        assert analyzer.analyze_time_distribution(target)["hourly_distribution"] == dict(hours)
+
+        overnight = [a for a in scoped if _hour(a) is not None and (_hour(a) >= 22 or _hour(a) < 6)]
+        result = analyzer.analyze_time_distribution(target, {"start_hour": 22, "end_hour": 6})
+        assert result["alerts_in_range"] == len(overnight)
+        assert result["alerts_in_range_details"] == overnight[:20]
+    print("✓ ORA codes, context, hourly distribution and time ranges per target")
+
+
+def test_global_analyses_equal_scan():
+    print("\n" + "=" * 60)
+    print("TEST: Database summary, Data Guard and tablespace analyses")
+    print("=" * 60)
+
+    alerts = _alerts()
+    analyzer = OEMDataAnalyzer(alerts)
+
+    summary = analyzer.get_database_summary()
+    counts = Counter(a.get("target_name") or a.get("target") for a in alerts)
+    assert dict((db["name"], db["alert_count"]) for db in summary["databases"]) == dict(counts)
+    assert [db["alert_count"] for db in summary["databases"]] == sorted(counts.values(), reverse=True)
+    assert summary["severity_summary"]["CRITICAL"] == sum(1 for a in alerts if a["severity"] == "CRITICAL")
+
+    dataguard = [a for a in alerts if re.search("standby|data guard|apply lag|gap", a["message"].lower())]
+    result = analyzer.find_standby_dataguard_alerts()
+    assert result["count"] == len(dataguard) and result["alerts"] == dataguard[:20]
+
+    space = [a for a in alerts if re.search("tablespace|space|full|storage|datafile", a["message"].lower())
+             or "tablespace" in (a.get("metric") or "").lower()]
+    result = analyzer.find_tablespace_alerts()
+    assert result["count"] == len(space)
+    assert result["tablespaces"] == [{"name": "USERS", "alert_count": sum(1 for a in space if "USERS" in a["message"])}]
+    print("✓ One pass over all alerts per group of analyses")
+
+
+def test_follow_ups_reuse_scans():
+    print("\n" + "=" * 60)
+    print("TEST: Memoized follow-up analyses")
+    print("=" * 60)
+
+    analyzer = OEMDataAnalyzer(_alerts())
+    first = analyzer.extract_ora_codes("FINDB")
+    first["ora_codes"][0]["samples"][0]["message"] = "changed"
+    first["ora_codes"].pop()
+    misses = analyzer.stats()["misses"]
+
+    again = analyzer.extract_ora_codes("findb")
+    analyzer.extract_context_categories("FINDB")
+    analyzer.analyze_time_distribution("FINDB")
+    analyzer.analyze_why_repeated("FINDB")
+    assert analyzer.stats()["misses"] == misses
+    assert again == OEMDataAnalyzer(analyzer.alerts).extract_ora_codes("FINDB")
+    print("✓ Same target: no rescans, callers may mutate results")
+
+
+def test_shared_per_generation():
+    print("\n" + "=" * 60)
+    print("TEST: Shared analyzer per data generation")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        publish_snapshot({"alerts": _alerts()})
+        first = OEMDataAnalyzer.current()
+        assert OEMDataAnalyzer.current() is first
+        assert OEMDataAnalyzer.for_alerts(GLOBAL_DATA["alerts"]) is first
+        assert first.warm().stats()["scans"] == 2
+
+        publish_snapshot({"alerts": [{"target": "ALPHADB", "message": "ORA-600"}]})
+        second = OEMDataAnalyzer.current()
+        assert second is not first
+        assert second.get_database_summary()["most_affected"] == "ALPHADB"
+
+        other = [{"target": "BETADB"}]
+        assert OEMDataAnalyzer.for_alerts(other) is OEMDataAnalyzer.for_alerts(other)
+    finally:
+        publish_snapshot(saved)
+    print("✓ Built once per generation, replaced after a reload")
@@ -0,0 +1,144 @@
+"""
+Test Suite for the Compiled Intent Dispatch Table
+==================================================
+Validates:
+
+1️⃣ Aho-Corasick keyword scan finds every (overlapping) keyword
+2️⃣ The keyword prefilter never drops a rule whose regex matches
+3️⃣ Per-rule counters track candidates, matches and handled questions
+4️⃣ The corpus gets the answers recorded on the if-chain router
+   (tests/routing_baseline.py)
+"""
+
+import hashlib
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, SYSTEM_READY, publish_snapshot
+from data_engine.keyword_automaton import KeywordAutomaton
+from reasoning.self_audit_engine import SELF_AUDIT
+from services.intent_dispatch import DispatchRule, IntentDispatcher
+from services.intelligence_service import INTELLIGENCE_SERVICE, PRIORITY_ROUTES, SEVERITY_ROUTES
+from services.session_store import SessionStore
+from tests.question_corpus import CONVERSATIONS, QUESTIONS
+from tests.routing_baseline import CONVERSATION_ANSWERS, QUESTION_ANSWERS
+
+
+def _all_questions():
+    questions = list(QUESTIONS)
+    for conversation in CONVERSATIONS:
+        questions.extend(conversation)
+    return questions
+
+
+def _baseline_alerts():
+    """The alerts the routing baseline was recorded over."""
+    base = datetime(2025, 6, 20, 0, 0, 0)
+    targets = ["MIDEVSTB", "MIDEVSTBN", "FINDB", "HRDB", "PRODDB01"]
+    messages = ["ORA-00600: internal error", "Data Guard apply lag exceeded threshold",
+                "Tablespace USERS is 95% full", "ORA-01555: snapshot too old", "Standby redo apply stopped",
+                "CPU utilization high", "Listener down", "ORA-04031: unable to allocate shared memory"]
+    alerts = []
+    for i in range(3000):
+        target = targets[(i * 7) % 5 if i % 11 else 0]
+        alerts.append({
+            "time": base + timedelta(minutes=13 * i),
+            "target": target,
+            "target_type": "oracle_database",
+            "host": "h{0}".format(i % 3),
+            "severity": ["CRITICAL", "WARNING", "WARNING", "INFO"][i % 4],
+            "message": "{0} on {1}".format(messages[(i * 3) % 8], target),
+            "metric": None,
+            "issue_type": ["INTERNAL_ERROR", "DATAGUARD", "TABLESPACE", "OTHER"][i % 4],
+            "display_alert_type": "x"
+        })
+    return alerts
+
+
+def _answer_hash(session_id, question):
+    SessionStore.set_session_id(session_id)
+    SessionStore.reset_question_context()
+    answer = INTELLIGENCE_SERVICE.analyze(question).get("answer")
+    return hashlib.sha1(answer.encode("utf-8")).hexdigest()[:12]
+
+
+def test_keyword_automaton():
+    print("\n" + "=" * 60)
+    print("TEST: Aho-Corasick keyword scan")
+    print("=" * 60)
+
+    keywords = ["he", "she", "his", "hers", "many", "an"]
+    automaton = KeywordAutomaton(keywords)
+    for text in ["ushers", "how many standby alerts", "", "hishe", "nothing here"]:
+        expected = set(k for k in keywords if k in text)
+        assert automaton.find(text) == expected, (text, automaton.find(text))
+    print("✓ Overlapping keywords found in one pass")
+
+
+def test_prefilter_never_drops_a_match():
+    print("\n" + "=" * 60)
+    print("TEST: Prefilter equals brute-force regex evaluation")
+    print("=" * 60)
+
+    questions = _all_questions()
+    for dispatcher in (PRIORITY_ROUTES, SEVERITY_ROUTES):
+        for question in questions:
+            q_lower = question.lower()
+            brute = [r.name for r in dispatcher.rules if r.pattern.search(q_lower)]
+            compiled = [r.name for r, _ in dispatcher.matches(q_lower)]
+            assert compiled == brute, (dispatcher.name, question, compiled, brute)
+        print("✓ {0}: {1} rules, {2} questions".format(
+            dispatcher.name, len(dispatcher.rules), len(questions)))
+
+
+def test_rule_counters():
+    print("\n" + "=" * 60)
+    print("TEST: Per-rule counters")
+    print("=" * 60)
+
+    dispatcher = IntentDispatcher("test", [
+        DispatchRule("count", 20, r'how\s+many\s+(\w+)', ("many",), lambda s, m, q, a: None),
+        DispatchRule("hello", 10, r'^hello', ("hello",), lambda s, m, q, a: "hi"),
+        DispatchRule("off", 5, r'.', (), lambda s, m, q, a: "never", enabled=False),
+    ])
+    assert [r.name for r in dispatcher.rules] == ["hello", "count"]
+
+    for question in ["hello", "how many alerts", "how much", "hello, how many?"]:
+        for rule, match in dispatcher.matches(question):
+            if rule.handler(None, match, question, []):
+                dispatcher.record_handled(rule)
+                break
+
+    stats = dispatcher.stats()
+    counters = dict((r["name"], r) for r in stats["rules"])
+    assert stats["questions"] == 4
+    assert counters["hello"] == dict(counters["hello"], candidates=2, matches=2, handled=2)
+    assert counters["count"] == dict(counters["count"], candidates=2, matches=1, handled=0)
+    print("✓ Candidates, matches and handled counted per rule")
+
+
+def test_corpus_matches_recorded_baseline():
+    print("\n" + "=" * 60)
+    print("TEST: Corpus answers vs the recorded if-chain baseline")
+    print("=" * 60)
+
+    saved, ready = dict(GLOBAL_DATA), SYSTEM_READY.get("ready")
+    try:
+        publish_snapshot({"alerts": _baseline_alerts(), "metrics": [], "incidents": []})
+        SYSTEM_READY["ready"] = True
+        SELF_AUDIT.reset()          # recorded in a fresh process: no facts stated earlier
+        recorded = [q for q in QUESTIONS if q in QUESTION_ANSWERS]
+        changed = [q for i, q in enumerate(recorded)
+                   if _answer_hash("baseline-q{0}".format(i), q) != QUESTION_ANSWERS[q]]
+        for c, conversation in enumerate(CONVERSATIONS):
+            answers = [_answer_hash("baseline-c{0}".format(c), q) for q in conversation]
+            changed.extend(q for q, answer, expected in zip(conversation, answers, CONVERSATION_ANSWERS[c])
+                           if answer != expected)
+    finally:
+        SYSTEM_READY["ready"] = ready
+        publish_snapshot(saved)
+    assert len(QUESTION_ANSWERS) == 96 and not changed, changed
+    print("✓ {0} questions and {1} conversations answered as recorded".format(
+        len(recorded), len(CONVERSATIONS)))
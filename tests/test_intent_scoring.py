@@ -0,0 +1,166 @@
+"""
+Test Suite for the Sparse Intent Scoring Engine
+===============================================
+Validates:
+
+1️⃣ Engine scores equal the nested keyword/pattern loops (OEM table)
+2️⃣ Engine scores equal the synonym-expanded loops (advanced table)
+3️⃣ Batch classification equals one-by-one classification
+4️⃣ Invalid regex features are dropped, required-literal prefilter is sound
+5️⃣ Benchmark: questions/sec, engine vs nested loops
+"""
+
+import re
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_engine.intent_scoring import (
+    IntentScoringEngine, keyword_feature, pattern_feature, required_literal
+)
+from nlp_engine.oem_intent_engine import OEMIntentEngine
+from nlp_engine.advanced_intent_classifier import AdvancedIntentClassifier
+from nlp_engine.question_features import QuestionFeatures
+from tests.question_corpus import CONVERSATIONS, QUESTIONS
+
+
+def _all_questions():
+    questions = list(QUESTIONS)
+    for conversation in CONVERSATIONS:
+        questions.extend(conversation)
+    return questions
+
+
+def _oem_loops(engine, question):
+    """Reference: the nested loops the engine replaces."""
+    q_lower = question.lower().strip()
+    scores = []
+    for intent_name, config in engine.INTENT_PATTERNS.items():
+        score = 0
+        for keyword in config["keywords"]:
+            if keyword in q_lower:
+                score += 1.0
+        for pattern in config["question_patterns"]:
+            if re.search(pattern, q_lower, re.IGNORECASE):
+                score += 2.0
+        if score > 0:
+            scores.append((intent_name, score))
+    return scores
+
+
+def _advanced_loops(question):
+    q_lower = question.lower().strip()
+    scores = []
+    for intent_name, config in AdvancedIntentClassifier.INTENT_PATTERNS.items():
+        score = 0
+        for keyword in config["keywords"]:
+            if keyword in q_lower:
+                score += 1.0
+            for synonym in AdvancedIntentClassifier.SYNONYMS.get(keyword, []):
+                if synonym in q_lower:
+                    score += 0.7
+        if score > 0:
+            scores.append((intent_name, score))
+    return scores
+
+
+def test_oem_scores_equal_loops():
+    print("\n" + "=" * 60)
+    print("TEST: OEM intent table - engine vs nested loops")
+    print("=" * 60)
+
+    oem = OEMIntentEngine()
+    for question in _all_questions():
+        assert oem._scoring.score(question) == _oem_loops(oem, question), question
+    stats = oem.scoring_stats()
+    print("✓ {0} intents x {1} features ({2} non-zero weights)".format(
+        stats["intents"], stats["features"], stats["nonzero_weights"]))
+
+
+def test_advanced_scores_equal_loops():
+    print("\n" + "=" * 60)
+    print("TEST: Advanced intent table - engine vs synonym loops")
+    print("=" * 60)
+
+    engine = AdvancedIntentClassifier.scoring_engine()
+    questions = _all_questions() + [
+        "why is FINDB so unstable and risky",
+        "how often does the heap memory keep recurring",
+        "is it safe, what caused the crashing listener",
+    ]
+    for question in questions:
+        assert engine.score(question) == _advanced_loops(question), question
+    print("✓ Scores identical, including summation order of synonym weights")
+
+
+def test_batch_classification():
+    print("\n" + "=" * 60)
+    print("TEST: Batch classification")
+    print("=" * 60)
+
+    oem = OEMIntentEngine()
+    questions = _all_questions()
+    assert oem._scoring.score_batch(questions) == [oem._scoring.score(q) for q in questions]
+    batch = oem.classify_batch(questions)
+    assert [r["intent"] for r in batch] == [oem.classify(q)["intent"] for q in questions]
+
+    advanced = AdvancedIntentClassifier()
+    batch = advanced.classify_batch(questions)
+    assert [r["intent"] for r in batch] == [advanced.classify(q)["intent"] for q in questions]
+    print("✓ {0} questions, batch == one-by-one".format(len(questions)))
+
+
+def test_matrix_construction():
+    print("\n" + "=" * 60)
+    print("TEST: Matrix construction")
+    print("=" * 60)
+
+    engine = IntentScoringEngine("test", [
+        ("COUNT", [(keyword_feature("how many"), 1.0),
+                   (keyword_feature("count"), 1.0),
+                   (pattern_feature(r"how\s+many\s+\w+"), 2.0),
+                   (pattern_feature(r"(unclosed"), 5.0)]),
+        ("LIST", [(keyword_feature("show"), 1.0),
+                  (keyword_feature("show"), 0.5)]),
+        ("NONE", []),
+    ])
+    stats = engine.stats()
+    assert stats["features"] == 4
+    assert stats["pattern_features"] == 1
+    assert engine.score("How many alerts, show them") == [("COUNT", 3.0), ("LIST", 1.5)]
+    assert engine.score("nothing relevant") == []
+    assert engine.best_batch(["count them", "show", "hello"], "UNKNOWN") == ["COUNT", "LIST", "UNKNOWN"]
+    assert required_literal(r"how\s+many\s+(servers?|hosts?)", re.IGNORECASE) == "many"
+    assert required_literal(r"(?i)WHY") == "why"
+    assert required_literal(r"WHY") == "WHY"            # can never match lowercased text
+    assert required_literal(r"show|list") is None        # alternatives: nothing required
+    assert required_literal(r"(?:top)?\s*alerts") == "alerts"
+    print("✓ Invalid regex dropped, duplicate row entries summed, best intent per question")
+
+
+def test_scoring_throughput():
+    print("\n" + "=" * 60)
+    print("TEST: Scoring throughput (questions/sec)")
+    print("=" * 60)
+
+    oem = OEMIntentEngine()
+    questions = _all_questions()
+    rounds = 5
+
+    start = time.process_time()
+    for _ in range(rounds):
+        for question in questions:
+            _oem_loops(oem, question)
+    loops = time.process_time() - start
+
+    start = time.process_time()
+    for _ in range(rounds):
+        QuestionFeatures.clear_cache()
+        oem._scoring.score_batch(questions)
+    engine = time.process_time() - start
+
+    total = rounds * len(questions)
+    print("✓ nested loops: {0:,.0f} q/s, sparse engine: {1:,.0f} q/s".format(
+        total / loops, total / engine))
+    assert engine < loops * 2
@@ -0,0 +1,124 @@
+"""
+Test Suite for the Lazy Engine Registry
+=======================================
+Validates:
+
+1️⃣ Importing the chat controller leaves the reasoning engines unimported
+2️⃣ get() / proxies load an engine once and record its load
+3️⃣ warm_up() reports failed engines instead of raising
+4️⃣ reasoning exports resolve on first access
+5️⃣ Import profile and /api/debug/engines, /api/debug/imports
+"""
+
+import subprocess
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.debug_controller import debug_router
+from services.lazy_registry import EngineRegistry, format_import_profile, import_profile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_controller_import_is_lazy():
+    print("\n" + "=" * 60)
+    print("TEST: Chat controller import")
+    print("=" * 60)
+
+    script = ("import sys, controllers.chat_controller as c; "
+              "print(sorted(m for m in ('services.intelligence_service', 'reasoning.dba_guardrails', "
+              "'reasoning.self_audit_engine') if m in sys.modules)); "
+              "c.INTELLIGENCE_SERVICE.analyze; print('services.intelligence_service' in sys.modules)")
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT, universal_newlines=True)
+    assert output.split("\n")[-3:-1] == ["[]", "True"], output
+    print("✓ Engines imported on first attribute access, not at import")
+
+
+def test_get_loads_once():
+    print("\n" + "=" * 60)
+    print("TEST: Load once")
+    print("=" * 60)
+
+    registry = EngineRegistry()
+    registry.register("json", "json:dumps")
+    registry.register("json", "json:loads")           # idempotent
+    registry.register("module", "json")
+    assert not registry.is_loaded("json")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("json"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    import json
+    assert results == [json.dumps] * 8 and registry.get("module") is json
+    proxy = registry.proxy("module")
+    assert proxy.dumps([1]) == "[1]" and repr(proxy) == "<lazy engine 'module'>"
+    stats = registry.stats()["engines"]["json"]
+    assert stats["loaded"] and stats["target"] == "json:dumps" and stats["load_ms"] >= 0 and stats["error"] is None
+
+    eager = EngineRegistry(lazy=False)
+    eager.register("json", "json:dumps")
+    assert eager.is_loaded("json")
+    print("✓ One load shared by concurrent callers; eager mode loads on register")
+
+
+def test_warm_up_errors():
+    print("\n" + "=" * 60)
+    print("TEST: Warm-up failures")
+    print("=" * 60)
+
+    registry = EngineRegistry()
+    registry.register("missing", "no_such_module_xyz:ENGINE")
+    registry.register("attr", "json:NO_SUCH_ATTRIBUTE")
+    registry.register("ok", "json:dumps")
+    errors = registry.warm_up()
+    assert sorted(errors) == ["attr", "missing"] and errors["missing"].startswith("ModuleNotFoundError")
+    assert registry.is_loaded("ok") and not registry.is_loaded("missing")
+    assert registry.stats()["engines"]["attr"]["error"].startswith("AttributeError")
+    thread = registry.start_warmup()
+    assert registry.start_warmup() is thread
+    thread.join(5)
+    print("✓ Failures reported per engine, the others loaded")
+
+
+def test_reasoning_exports():
+    print("\n" + "=" * 60)
+    print("TEST: Lazy reasoning exports")
+    print("=" * 60)
+
+    script = ("import sys, reasoning; assert 'reasoning.dba_guardrails' not in sys.modules; "
+              "from reasoning import ConfidenceLevel, AuditConfidenceLevel, DBA_GUARDRAILS; "
+              "from reasoning.dba_guardrails import ConfidenceLevel as C; "
+              "from reasoning.self_audit_engine import ConfidenceLevel as A; "
+              "assert ConfidenceLevel is C and AuditConfidenceLevel is A; "
+              "assert all(hasattr(reasoning, name) for name in reasoning.__all__); print('ok')")
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT, universal_newlines=True)
+    assert output.strip().endswith("ok"), output
+    print("✓ Every name in __all__ resolves, aliases unchanged")
+
+
+def test_import_profile_and_endpoints():
+    print("\n" + "=" * 60)
+    print("TEST: Import profile and debug endpoints")
+    print("=" * 60)
+
+    profile = import_profile("services.lazy_registry", top=5)
+    assert profile["ok"] and profile["modules"] > 0 and len(profile["slowest"]) == 5
+    assert "services" in profile["packages_ms"]
+    assert "services.lazy_registry" in format_import_profile(profile)
+
+    app = FastAPI()
+    app.include_router(debug_router, prefix="/api/debug")
+    client = TestClient(app)
+    engines = client.get("/api/debug/engines").json()
+    assert "intelligence_service" in engines["engines"]
+    data = client.get("/api/debug/imports", params={"module": "config.settings", "top": 3}).json()
+    assert data["ok"] and len(data["slowest"]) <= 3
+    assert client.get("/api/debug/imports", params={"module": "os; import sys"}).status_code == 400
+    print("✓ Profile parsed; engine stats and profile served")
@@ -0,0 +1,181 @@
+"""
+Test Suite for MetricAlertValidator + AlertValidationService
+=============================================================
+Validates:
+
+1️⃣ Bisect window lookup matches a naive ±window scan
+2️⃣ CRITICAL alert-pattern fallback (>= 3 in 24h)
+3️⃣ Background sharded validation matches in-process validation
+4️⃣ Only newly ingested alerts are validated on reload
+5️⃣ A reload during a run still yields every new alert's result; results
+   of removed alerts are dropped
+"""
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+from incident_engine.metric_alert_validator import MetricAlertValidator
+from services.validation_service import AlertValidationService
+
+
+BASE = datetime(2025, 6, 23, 10, 0, 0)
+
+
+def _build_data():
+    alerts = []
+    metrics = []
+    for i in range(300):
+        target = ["MIDEVSTB", "MIDEVSTBN", "FINDB"][i % 3]
+        alerts.append({
+            "time": BASE + timedelta(minutes=7 * i),
+            "target": target,
+            "severity": "CRITICAL" if i % 4 == 0 else "WARNING",
+            "message": "alert {0}".format(i)
+        })
+    for i in range(600):
+        target = ["MIDEVSTB", "FINDB"][i % 2]
+        metrics.append({
+            "time": BASE + timedelta(minutes=3 * i, seconds=i % 60),
+            "target": target,
+            "metric": ["cpu_percent", "memory_percent", "disk_used"][i % 3],
+            "value": 70 + (i % 30)
+        })
+    return alerts, metrics
+
+
+def _naive_supported(alert, metrics):
+    """Reference: linear scan of the ±window, same thresholds."""
+    start = alert["time"] - timedelta(minutes=15)
+    end = alert["time"] + timedelta(minutes=5)
+    for m in metrics:
+        if m["target"] != alert["target"] or not (start <= m["time"] <= end):
+            continue
+        name = m["metric"].lower()
+        if "cpu" in name and m["value"] >= 85:
+            return True
+        if "memory" in name and m["value"] >= 80:
+            return True
+        if ("disk" in name or "storage" in name) and m["value"] >= 80:
+            return True
+    return False
+
+
+def test_bisect_window_matches_naive_scan():
+    print("\n" + "=" * 60)
+    print("TEST: Bisect window lookup")
+    print("=" * 60)
+
+    alerts, metrics = _build_data()
+    validator = MetricAlertValidator(alerts, metrics)
+    results = validator.validate()
+
+    assert len(results) == len(alerts)
+    for alert, result in zip(alerts, results):
+        metric_backed = result["reasons"][0] != "No abnormal metrics found" and \
+            not result["reasons"][0].startswith("SUPPORTED_BY_ALERT_PATTERN")
+        assert metric_backed == _naive_supported(alert, metrics), alert
+    print("✓ {0} alerts match naive window scan".format(len(alerts)))
+
+
+def test_critical_pattern_fallback():
+    print("\n" + "=" * 60)
+    print("TEST: CRITICAL alert pattern fallback")
+    print("=" * 60)
+
+    alerts = [
+        {"time": BASE + timedelta(hours=h), "target": "HRDB", "severity": "CRITICAL", "message": "x"}
+        for h in (0, 1, 2, 30)
+    ]
+    results = MetricAlertValidator(alerts, []).validate()
+
+    supported = [r["metric_supported"] for r in results]
+    assert supported == [False, False, True, False], supported
+    print("✓ Pattern requires 3 CRITICAL alerts within 24 hours")
+
+
+def test_background_service_matches_validator():
+    print("\n" + "=" * 60)
+    print("TEST: Background sharded validation")
+    print("=" * 60)
+
+    alerts, metrics = _build_data()
+    expected = MetricAlertValidator(alerts, metrics).validate()
+
+    service = AlertValidationService(max_workers=2)
+    service.ensure_started(alerts, metrics)
+    status = service.wait(timeout=60)
+
+    assert status["state"] == AlertValidationService.STATE_READY, status
+    assert status["percent"] == 100.0
+    actual = service.results_for(alerts)
+    assert [(r["metric_supported"], r["reasons"]) for r in actual] == \
+        [(r["metric_supported"], r["reasons"]) for r in expected]
+    print("✓ Process-pool results identical to in-process validation")
+
+
+def test_incremental_revalidation():
+    print("\n" + "=" * 60)
+    print("TEST: Incremental revalidation")
+    print("=" * 60)
+
+    alerts, metrics = _build_data()
+    service = AlertValidationService(use_processes=False)
+    service.ensure_started(alerts, metrics)
+    service.wait(timeout=60)
+
+    new_alert = {
+        "time": BASE + timedelta(days=5),
+        "target": "FINDB",
+        "severity": "WARNING",
+        "message": "new alert"
+    }
+    status = service.ensure_started(alerts + [new_alert], metrics)
+    assert status["total"] == 1, status
+    assert status["cached"] == len(alerts), status
+    service.wait(timeout=60)
+    assert len(service.results_for(alerts + [new_alert])) == len(alerts) + 1
+    print("✓ Only the newly ingested alert was validated")
+
+
+class _GatedAlert(dict):
+    """Alert whose reads on the validation thread wait for the gate (holds a run open)."""
+
+    def __init__(self, gate, *args):
+        dict.__init__(self, *args)
+        self.gate = gate
+
+    def get(self, key, default=None):
+        if threading.current_thread().name == "alert-validation":
+            self.gate.wait()
+        return dict.get(self, key, default)
+
+
+def test_reload_during_run():
+    print("\n" + "=" * 60)
+    print("TEST: Reload while a validation run is in progress")
+    print("=" * 60)
+
+    alerts, metrics = _build_data()
+    gate = threading.Event()
+    alerts[0] = _GatedAlert(gate, alerts[0])
+    service = AlertValidationService(use_processes=False)
+    service.ensure_started(alerts, metrics)                 # run for the old alerts, held open
+
+    reloaded = alerts[1:] + [{"time": BASE + timedelta(days=5), "target": "FINDB",
+                              "severity": "WARNING", "message": "new alert"}]
+    results = []
+    waiter = threading.Thread(target=lambda: results.extend(service.wait_for_results(reloaded, metrics)))
+    waiter.start()
+    gate.set()
+    waiter.join(60)
+
+    expected = MetricAlertValidator(reloaded, metrics).validate()
+    assert [(r["metric_supported"], r["reasons"]) for r in results] == \
+        [(r["metric_supported"], r["reasons"]) for r in expected]
+    ids = set(MetricAlertValidator.alert_id(a) for a in reloaded)
+    assert service.status()["stored_results"] == len(ids)
+    print("✓ Every reloaded alert validated; the removed alert's result dropped")
@@ -0,0 +1,123 @@
+"""
+Test Suite for the Query Executor
+=================================
+Validates:
+
+1️⃣ Plans filter the in-memory alerts like a full scan would (strict
+   database match, severity, message and time filters combined)
+2️⃣ LIST pages are the newest alerts first; indexes are built once per
+   data generation
+3️⃣ v1 and v2 chat APIs answer from the same data generation
+"""
+
+import sys
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_engine.global_cache import GLOBAL_DATA, get_data_generation, publish_snapshot
+from data_engine.query_executor import AlertColumns, QueryExecutor
+from services.query_planner import QueryPlan
+from test_chat_batch import _client, _with_data
+
+NOW = datetime.now()
+
+ALERTS = [{
+    "target": ["MIDEVSTB", "MIDEVSTBN", "FINDB"][i % 3],
+    "severity": ["CRITICAL", "WARNING", "Critical"][i % 4 % 3],
+    "message": ["ORA-00600 internal error", "Data Guard apply lag", "Tablespace USERS full"][i % 5 % 3],
+    "time": NOW - timedelta(hours=i * 7),
+} for i in range(120)]
+
+
+def _plan(query_type, limit=None, offset=0, **filters):
+    plan = QueryPlan()
+    plan.query_type = query_type
+    plan.filters = filters
+    plan.limit = limit
+    plan.offset = offset
+    return plan
+
+
+def _scan(database=None, severity=None, words=(), since=None):
+    return [a for a in ALERTS
+            if (database is None or a["target"] == database)
+            and (severity is None or a["severity"].upper() == severity)
+            and all(any(w in a["message"].lower() for w in group) for group in words)
+            and (since is None or a["time"] >= since)]
+
+
+def test_filters_match_full_scan():
+    print("\n" + "=" * 60)
+    print("TEST: Filters vs a full scan")
+    print("=" * 60)
+
+    executor = QueryExecutor(alerts=ALERTS)
+    cases = [
+        ({"database": "midevstb"}, _scan("MIDEVSTB")),
+        ({"database": "MIDEVSTB", "severity": "critical"}, _scan("MIDEVSTB", "CRITICAL")),
+        ({"severity": "CRITICAL", "issue_type": "DATAGUARD"}, _scan(None, "CRITICAL", [["lag"]])),
+        ({"database": "FINDB", "ora_codes": ["00600"]}, _scan("FINDB", None, [["ora-00600"]])),
+        ({"database": "FINDB", "time_range": "last_7_days"}, _scan("FINDB", since=NOW - timedelta(days=7))),
+        ({"database": "NOSUCHDB"}, []),
+    ]
+    for filters, expected in cases:
+        result = executor.execute(_plan("COUNT", **filters))
+        assert result.success and result.filtered_count == len(expected), (filters, result.filtered_count)
+        assert sum(result.aggregations["by_severity"].values()) == len(expected)
+    counts = executor.execute(_plan("COUNT", database="MIDEVSTB")).aggregations["by_severity"]
+    assert counts == Counter(a["severity"] for a in _scan("MIDEVSTB"))     # raw values, like value_counts
+    print("✓ {0} plans counted like a full scan (MIDEVSTB != MIDEVSTBN)".format(len(cases)))
+
+
+def test_list_pages_and_indexes():
+    print("\n" + "=" * 60)
+    print("TEST: LIST pages and per-generation indexes")
+    print("=" * 60)
+
+    executor = QueryExecutor(alerts=ALERTS)
+    expected = sorted(_scan("FINDB", "CRITICAL"), key=lambda a: a["time"], reverse=True)
+    first = executor.execute(_plan("LIST", limit=5, database="FINDB", severity="CRITICAL"))
+    second = executor.execute(_plan("LIST", limit=5, offset=5, database="FINDB", severity="CRITICAL"))
+    shown = [r["alert_time"] for r in first.data + second.data]
+    assert shown == [a["time"].strftime("%Y-%m-%d %H:%M:%S") for a in expected[:10]]
+    assert first.data[0]["target_name"] == "FINDB" and first.data[0]["alert_state"].upper() == "CRITICAL"
+    assert first.metadata["has_more"] and first.metadata["showing"] == 5
+    assert AlertColumns.for_alerts(ALERTS) is AlertColumns.for_alerts(ALERTS)
+
+    def check():
+        alerts = GLOBAL_DATA["alerts"]
+        columns = AlertColumns.for_alerts(alerts)
+        assert AlertColumns.for_alerts(alerts) is columns and columns.generation == get_data_generation()
+        publish_snapshot(dict(GLOBAL_DATA))
+        assert AlertColumns.for_alerts(alerts) is not columns
+    _with_data(check)
+    print("✓ Pages newest first; columns rebuilt only for a new generation")
+
+
+def test_v1_v2_same_generation():
+    print("\n" + "=" * 60)
+    print("TEST: v1 and v2 read the same data generation")
+    print("=" * 60)
+
+    def check():
+        client = _client()
+        executor = QueryExecutor()
+        result = executor.execute(_plan("COUNT", database="MIDEVSTB", severity="CRITICAL"))
+        assert result.generation == get_data_generation() == executor.data_version()
+        v2 = client.post("/api/chat/v2", json={"message": "how many critical alerts for MIDEVSTB",
+                                               "session_id": "executor-v2"}).json()
+        v1 = client.post("/api/chat/", json={"message": "how many critical alerts for MIDEVSTB",
+                                             "session_id": "executor-v1"}).json()
+        expected = sum(1 for a in GLOBAL_DATA["alerts"]
+                       if a["target"] == "MIDEVSTB" and a["severity"] == "CRITICAL")
+        assert v2["result_count"] == expected and "{0}".format(expected) in v1["answer"]
+
+        generation = executor.data_version()
+        publish_snapshot({"alerts": GLOBAL_DATA["alerts"][:30]})
+        assert executor.data_version() == generation + 1
+        assert executor.execute(_plan("COUNT")).total_count == 30
+    _with_data(check)
+    print("✓ v1 and v2 count the same alerts; reloads reach both")
@@ -0,0 +1,126 @@
+"""
+Test Suite for Shared Question Features
+=======================================
+Validates:
+
+1️⃣ Text forms, tokens and entities are computed once per question
+2️⃣ Keyword hits equal plain substring checks on the lowercased text
+3️⃣ Registered keywords carry no edge whitespace (hits are taken on `lower`)
+4️⃣ Memoized regex returns the same match as re.search
+5️⃣ All classifiers together stay cheap per question
+"""
+
+import re
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_engine.question_features import QuestionFeatures, keyword_group, _VOCABULARY
+from nlp_engine.oem_intent_engine import OEMIntentEngine
+from nlp_engine.intent_response_router import IntentResponseRouter
+from nlp_engine.smart_intent import SmartIntentClassifier
+from nlp_engine.entity_extractor import EntityExtractor
+from reasoning.dba_guardrails import AnswerModeDetector
+from reasoning.answer_contracts import AnswerContractBuilder
+from reasoning.self_audit_engine import TrustModeDetector
+from phase1.intent_parser import Phase1IntentParser
+from tests.question_corpus import CONVERSATIONS, QUESTIONS
+
+
+def _all_questions():
+    questions = list(QUESTIONS)
+    for conversation in CONVERSATIONS:
+        questions.extend(conversation)
+    return questions
+
+
+def test_text_forms_and_entities():
+    print("\n" + "=" * 60)
+    print("TEST: Text forms and shared entities")
+    print("=" * 60)
+
+    question = "  Show me 18 WARNING alerts for MIDEVSTB with ORA-600 last week "
+    features = QuestionFeatures.of(question)
+    assert QuestionFeatures.of(question) is features
+    assert features.lower == question.lower()
+    assert features.norm == question.lower().strip()
+    assert features.upper_norm == question.upper().strip()
+    assert features.words == question.lower().split()
+    assert "MIDEVSTB" in features.db_candidates
+    assert features.ora_codes == ["ORA-600"]
+    assert features.numbers == [18, 600]
+    assert features.limit == 18
+    assert features.severity == "WARNING"
+    assert features.time_expressions == ("last_week",)
+    print("✓ Forms, numbers, limit, severity, ORA codes and time range")
+
+
+def test_keyword_hits_match_substring():
+    print("\n" + "=" * 60)
+    print("TEST: Keyword hits equal substring checks")
+    print("=" * 60)
+
+    group = keyword_group("how many", "standby only")
+    for question in _all_questions():
+        features = QuestionFeatures.of(question)
+        lower = question.lower()
+        for word in _VOCABULARY:
+            assert features.has(word) == (word in lower), (question, word)
+        assert features.any_of(group) == any(w in lower for w in group)
+        assert features.has("not registered xyz") is False
+    print("✓ {0} registered keywords checked on {1} questions".format(
+        len(_VOCABULARY), len(_all_questions())))
+
+
+def test_vocabulary_has_no_edge_whitespace():
+    print("\n" + "=" * 60)
+    print("TEST: Vocabulary keywords are stripped")
+    print("=" * 60)
+
+    bad = [w for w in _VOCABULARY if w != w.strip() or not w]
+    assert not bad, bad
+    print("✓ {0} keywords, none with edge whitespace".format(len(_VOCABULARY)))
+
+
+def test_memoized_regex():
+    print("\n" + "=" * 60)
+    print("TEST: Memoized regex")
+    print("=" * 60)
+
+    pattern = r"how\s+many\s+(\w+)"
+    for question in _all_questions():
+        features = QuestionFeatures.of(question)
+        expected = re.search(pattern, question.lower().strip(), re.IGNORECASE)
+        found = features.search(pattern, "norm", re.IGNORECASE)
+        assert (found and found.group(0)) == (expected and expected.group(0))
+        assert features.search(pattern, "norm", re.IGNORECASE) is found
+    print("✓ search() equals re.search and is evaluated once")
+
+
+def test_classifier_cpu_per_question():
+    print("\n" + "=" * 60)
+    print("TEST: CPU time of all classifiers per question")
+    print("=" * 60)
+
+    oem = OEMIntentEngine()
+    smart = SmartIntentClassifier()
+    entities = EntityExtractor(["MIDEVSTB", "MIDEVSTBN", "FINDB"])
+    phase1 = Phase1IntentParser(["MIDEVSTB", "MIDEVSTBN", "FINDB"])
+    questions = _all_questions()
+
+    QuestionFeatures.clear_cache()
+    start = time.process_time()
+    for question in questions:
+        oem.classify(question)
+        IntentResponseRouter.detect_query_mode(question)
+        IntentResponseRouter.get_question_type(question)
+        AnswerModeDetector.detect_mode(question)
+        AnswerContractBuilder.build_contract(question)
+        TrustModeDetector.detect_mode(question)
+        smart.classify(question, entities.extract(question))
+        phase1.parse(question)
+    per_question = (time.process_time() - start) / len(questions)
+
+    print("✓ {0:.0f} us CPU per question ({1} questions)".format(per_question * 1e6, len(questions)))
+    assert per_question < 0.05
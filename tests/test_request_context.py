@@ -0,0 +1,188 @@
+"""
+Test Suite for Request-Scoped Session Context
+=============================================
+Validates:
+
+1️⃣ RequestLocal values: process-wide outside a scope, per request and
+   per session inside one, separate per instance
+2️⃣ SessionStore: the active session of one request is invisible to others;
+   an anonymous "new conversation" resets the process-wide state; /chat
+   requests run in their own request scope and trace
+3️⃣ Stress: conversations answered concurrently on many threads get the
+   same answers as each conversation answered alone
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.chat_controller import ChatRequest, _process_chat
+from services.answer_cache import ANSWER_CACHE
+from services.request_context import RequestLocal, current_request, request_scope
+from services.session_store import SessionStore
+from test_chat_batch import _with_data
+
+
+CONVERSATIONS = [
+    ["show standby issues", "show me 20", "only critical"],
+    ["show me alerts for MIDEVSTB", "ok show me 18 warning", "this database status?"],
+    ["how many critical alerts", "what about FINDB", "explain this"],
+    ["how many critical alerts for MIDEVSTB", "this database status?", "root cause?"],
+    ["how many alerts for FINDB", "is it fine", "what evidence"],
+    ["what is the risk posture", "which database is worst", "explain this"],
+    ["what is the peak alert hour", "how many alerts for FINDB", "same database"],
+    ["show tablespace issues", "only critical", "tell me more"],
+]
+
+
+class _Holder(object):
+    value = RequestLocal("test.holder", factory=list, per_session=True)
+
+
+def test_request_local_values():
+    print("\n" + "=" * 60)
+    print("TEST: RequestLocal values")
+    print("=" * 60)
+
+    local = RequestLocal("test.local", value="process", factory=lambda: "fresh")
+    assert local.get() == "process" and current_request() is None
+    with request_scope():
+        assert local.get() == "fresh"
+        local.set("request")
+        with request_scope():
+            assert local.get() == "fresh"        # nested scope: its own value
+        assert local.get() == "request"
+    assert local.get() == "process"
+
+    first, second = _Holder(), _Holder()
+    first.value.append("process")
+    with request_scope():
+        assert first.value == ["process"]        # no session bound: process value
+        assert first.value is not second.value
+        SessionStore.set_session_id("holder-session")
+        first.value.append("session")
+    with request_scope():
+        SessionStore.set_session_id("holder-session")
+        assert first.value == ["session"] and second.value == []
+    assert first.value == ["process"] and second.value == []
+    print("✓ Process, request, session and instance values kept apart")
+
+
+def test_session_store_isolated():
+    print("\n" + "=" * 60)
+    print("TEST: Active session per request")
+    print("=" * 60)
+
+    SessionStore.set_session_id("outside")
+    SessionStore.set_conversation_context(topic="OUTSIDE")
+    started, switched = threading.Event(), threading.Event()
+    seen = {}
+
+    def first():
+        with request_scope():
+            SessionStore.set_session_id("request-a")
+            SessionStore.set_conversation_context(topic="A")
+            started.set()
+            switched.wait(5)
+            seen["a"] = (SessionStore.get_session_id(), SessionStore.get_last_topic())
+
+    def second():
+        started.wait(5)
+        with request_scope():
+            SessionStore.set_session_id("request-b")
+            SessionStore.set_conversation_context(topic="B")
+            seen["b"] = (SessionStore.get_session_id(), SessionStore.get_last_topic())
+        switched.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert seen == {"a": ("request-a", "A"), "b": ("request-b", "B")}, seen
+    assert SessionStore.get_session_id() == "outside" and SessionStore.get_last_topic() == "OUTSIDE"
+    print("✓ Switching sessions in one request leaves the others (and the process) alone")
+
+
+def _converse(prefix, index, conversation, barrier=None):
+    answers = []
+    for position, question in enumerate(conversation):
+        if barrier is not None:
+            barrier.wait(30)
+        payload = ChatRequest(message=question, session_id="{0}-{1}".format(prefix, index),
+                              new_conversation=position == 0)
+        response = _process_chat(payload, question)
+        answers.append((response["answer"], response.get("target")))
+    return answers
+
+
+def test_anonymous_new_conversation():
+    print("\n" + "=" * 60)
+    print("TEST: Anonymous new conversation inside a request scope")
+    print("=" * 60)
+
+    def check():
+        question = "how many alerts for FINDB"
+        SessionStore.reset()
+        _process_chat(ChatRequest(message=question), question)
+        alone = SessionStore._state["question_count"]         # the question asked first
+
+        SessionStore.reset()
+        for earlier in ["which database has the highest risk", "show standby issues"]:
+            _process_chat(ChatRequest(message=earlier), earlier)
+        assert SessionStore._state["question_count"] > alone
+        _process_chat(ChatRequest(message=question, new_conversation=True), question)
+        state = SessionStore._state                          # process-wide (no scope here)
+        assert state["question_count"] == alone, state
+        assert state["highest_risk_database"] is None
+    _with_data(check)
+    print("✓ The anonymous conversation started over")
+
+
+def test_direct_chat_scoped():
+    print("\n" + "=" * 60)
+    print("TEST: /chat body runs in a request scope")
+    print("=" * 60)
+
+    import app
+    from services.request_tracer import REQUEST_TRACER
+
+    def check():
+        SessionStore.reset_question_context()
+        outside = SessionStore._current_question_context          # process-wide value
+        question = "how many alerts for FINDB"
+        result = app._analyze_direct(question, False)
+        assert "FINDB" in result["answer"]
+        assert SessionStore._current_question_context is outside  # not replaced by the request
+        assert REQUEST_TRACER.recent(1)[0]["question"] == question
+    _with_data(check)
+    print("✓ Question context kept per request; request traced")
+
+
+def test_concurrent_conversations_stay_isolated():
+    print("\n" + "=" * 60)
+    print("TEST: Concurrent conversations vs one at a time")
+    print("=" * 60)
+
+    def check():
+        ANSWER_CACHE.clear()
+        alone = [_converse("alone", i, conversation) for i, conversation in enumerate(CONVERSATIONS)]
+        switch = sys.getswitchinterval()
+        sys.setswitchinterval(0.0005)              # interleave threads aggressively
+        try:
+            for round_number in range(3):
+                ANSWER_CACHE.clear()
+                barrier = threading.Barrier(len(CONVERSATIONS))
+                with ThreadPoolExecutor(max_workers=len(CONVERSATIONS)) as pool:
+                    futures = [pool.submit(_converse, "parallel{0}".format(round_number), i, conversation, barrier)
+                               for i, conversation in enumerate(CONVERSATIONS)]
+                    together = [future.result() for future in futures]
+                for conversation, expected, actual in zip(CONVERSATIONS, alone, together):
+                    assert actual == expected, (conversation, expected, actual)
+        finally:
+            sys.setswitchinterval(switch)
+    _with_data(check)
+    print("✓ {0} conversations x 3 rounds on {0} threads: same answers as alone".format(len(CONVERSATIONS)))
@@ -0,0 +1,117 @@
+"""
+Test Suite for the Request Tracer
+=================================
+Validates:
+
+1️⃣ Spans nest, carry offsets and roll up into per-stage totals
+2️⃣ The ring buffer keeps the latest traces; percentiles per stage
+3️⃣ A chat request records its pipeline and guardrail stages
+4️⃣ /api/debug/traces returns traces and stage percentiles
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.debug_controller import debug_router
+from services.request_tracer import REQUEST_TRACER, RequestTracer
+from test_chat_batch import _client, _with_data
+
+
+def test_spans_nest_and_total():
+    print("\n" + "=" * 60)
+    print("TEST: Nested spans and stage totals")
+    print("=" * 60)
+
+    tracer = RequestTracer(capacity=5)
+    with tracer.span("outside"):
+        pass  # no trace: nothing recorded
+    with tracer.trace("chat", question="q") as trace:
+        with tracer.span("outer"):
+            with tracer.span("inner"):
+                time.sleep(0.01)
+            with tracer.span("inner"):
+                pass
+    assert [(stage, depth) for stage, _, _, depth in trace.spans] == [("outer", 0), ("inner", 1), ("inner", 1)]
+    outer, first, second = trace.spans
+    assert first[1] >= outer[1] and first[2] >= 10 and outer[2] >= first[2] + second[2]
+    data = trace.to_dict()
+    assert data["question"] == "q" and list(data["stages"]) == ["outer", "inner"]
+    assert data["duration_ms"] >= outer[2]
+    print("✓ Depth, offsets and totals")
+
+
+def test_ring_buffer_and_percentiles():
+    print("\n" + "=" * 60)
+    print("TEST: Ring buffer and percentiles")
+    print("=" * 60)
+
+    tracer = RequestTracer(capacity=3)
+    for i in range(5):
+        with tracer.trace("chat", n=i):
+            with tracer.span("stage"):
+                pass
+
+    def other_thread():
+        with tracer.span("stage"):
+            pass  # another thread has no open trace
+    with tracer.trace("chat", n=5):
+        worker = threading.Thread(target=other_thread)
+        worker.start()
+        worker.join()
+    assert [t["n"] for t in tracer.recent()] == [5, 4, 3]
+    stats = tracer.stats()
+    assert stats["buffered"] == 3 and stats["request_ms"]["count"] == 6
+    assert stats["stages_ms"]["stage"]["count"] == 5
+    assert stats["stages_ms"]["stage"]["p50"] <= stats["stages_ms"]["stage"]["max"]
+    assert tracer.recent(min_ms=10 ** 6) == []
+    print("✓ Latest traces kept, per-stage samples counted once per trace")
+
+
+def test_chat_request_trace():
+    print("\n" + "=" * 60)
+    print("TEST: Chat request stages")
+    print("=" * 60)
+
+    def check():
+        REQUEST_TRACER.clear()
+        client = _client()
+        client.post("/api/chat/", json={"message": "what is the risk posture", "session_id": "traced"})
+        client.post("/api/chat/", json={"message": "how many critical alerts for MIDEVSTB", "session_id": "traced"})
+        recent = REQUEST_TRACER.recent()
+        assert [t["question"] for t in recent] == ["how many critical alerts for MIDEVSTB", "what is the risk posture"]
+        stages = recent[1]["stages"]
+        for stage in ["session.activate", "phase12.update_scope", "answer_cache.lookup", "pipeline",
+                      "pipeline.classify", "pipeline.gather_evidence", "pipeline.apply_reasoning",
+                      "pipeline.format_final_response", "session.update"]:
+            assert stage in stages, stage
+        assert any(stage.startswith("route.priority.") for stage in recent[0]["stages"])
+    _with_data(check)
+    print("✓ Session, routing, pipeline and guardrail stages recorded")
+
+
+def test_traces_endpoint():
+    print("\n" + "=" * 60)
+    print("TEST: /api/debug/traces")
+    print("=" * 60)
+
+    app = FastAPI()
+    app.include_router(debug_router, prefix="/api/debug")
+    client = TestClient(app)
+    REQUEST_TRACER.clear()
+    for i in range(3):
+        with REQUEST_TRACER.trace("chat", question="q{0}".format(i)):
+            with REQUEST_TRACER.span("pipeline"):
+                pass
+    data = client.get("/api/debug/traces", params={"limit": 2}).json()
+    assert [t["question"] for t in data["traces"]] == ["q2", "q1"]
+    assert data["stats"]["stages_ms"]["pipeline"]["count"] == 3
+    assert client.delete("/api/debug/traces").json() == {"cleared": True}
+    assert client.get("/api/debug/traces").json()["traces"] == []
+    print("✓ Recent traces and percentiles; clear")
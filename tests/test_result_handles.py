@@ -0,0 +1,129 @@
+"""
+Test Suite for Result Handles
+=============================
+Validates:
+
+1️⃣ A filter scans the alerts once; later pages reuse its row ids
+2️⃣ Handles go stale with a reload / another alert list, are kept per
+   session and bounded per session
+3️⃣ Paging a conversation answers the same with and without handles,
+   and pages after the first do not scan the alerts again
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.chat_controller import ChatRequest, _process_chat
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from services.answer_cache import ANSWER_CACHE
+from services.request_context import request_scope
+from services.result_handles import RESULT_HANDLES, ResultHandles
+from services.session_store import SessionStore
+from test_chat_batch import _with_data
+
+ALERTS = [{"target_name": "DB{0}".format(i % 3), "severity": "CRITICAL" if i % 2 else "WARNING"}
+          for i in range(30)]
+
+CONVERSATION = [
+    "show standby issues",
+    "show me 20",
+    "ok show me 10 more",
+    "ok show me 10 more",
+    "show first 5 critical alerts for MIDEVSTB",
+    "show alerts from 21 to 30 for MIDEVSTB",
+    "show alerts from 31 to 40 for MIDEVSTB",
+]
+
+
+class _Counting(object):
+    def __init__(self, target):
+        self.target = target
+        self.calls = 0
+
+    def __call__(self, alert):
+        self.calls += 1
+        return alert["target_name"] == self.target
+
+
+def test_rows_reused_across_pages():
+    print("\n" + "=" * 60)
+    print("TEST: One scan per result set")
+    print("=" * 60)
+
+    handles = ResultHandles(per_session=4)
+    predicate = _Counting("DB1")
+    rows = handles.rows(ALERTS, ("db", "DB1"), predicate)
+    assert list(rows) == list(range(1, 30, 3)) and rows.itemsize == 4 and predicate.calls == 30
+    assert handles.rows(ALERTS, ("db", "DB1"), predicate) is rows and predicate.calls == 30
+    page = handles.page(ALERTS, rows, 2, 4)
+    assert page == [ALERTS[7], ALERTS[10]]
+    stats = handles.stats()
+    assert stats["scans"] == 1 and stats["hits"] == 1 and stats["rows_scanned"] == 30
+    print("✓ Second page is a slice of {0} row ids, no rescan".format(len(rows)))
+
+
+def test_stale_bounded_and_per_session():
+    print("\n" + "=" * 60)
+    print("TEST: Stale, bounded and per-session handles")
+    print("=" * 60)
+
+    handles = ResultHandles(per_session=2)
+    predicate = _Counting("DB0")
+    handles.rows(ALERTS, ("db", "DB0"), predicate)
+    handles.rows(list(ALERTS), ("db", "DB0"), predicate)        # another list: rescan
+    assert predicate.calls == 60 and handles.stats()["stale"] == 1
+
+    saved = dict(GLOBAL_DATA)
+    publish_snapshot(saved)                                     # reload: new generation
+    handles.rows(ALERTS, ("db", "DB0"), predicate)
+    assert predicate.calls == 90 and handles.stats()["stale"] == 2
+
+    for name in ("DB0", "DB1", "DB2"):
+        handles.rows(ALERTS, ("db", name), _Counting(name))
+    assert list(handles._handles) == [("db", "DB1"), ("db", "DB2")]
+
+    with request_scope():
+        SessionStore.set_session_id("handles-a")
+        handles.rows(ALERTS, ("db", "DB1"), _Counting("DB1"))
+    with request_scope():
+        SessionStore.set_session_id("handles-b")
+        assert len(handles._handles) == 0                       # other session: none
+    with request_scope():
+        SessionStore.set_session_id("handles-a")
+        assert list(handles._handles) == [("db", "DB1")]
+    print("✓ Reloads and other lists rescan; {0} handles per session, sessions apart".format(handles.per_session))
+
+
+def _converse(session_id):
+    answers = []
+    for i, question in enumerate(CONVERSATION):
+        payload = ChatRequest(message=question, session_id=session_id, new_conversation=i == 0)
+        answers.append(_process_chat(payload, question)["answer"])
+    return answers
+
+
+def test_paging_same_answers_without_rescans():
+    print("\n" + "=" * 60)
+    print("TEST: Paging with result handles")
+    print("=" * 60)
+
+    def check():
+        ANSWER_CACHE.clear()
+        saved = RESULT_HANDLES.per_session
+        RESULT_HANDLES.per_session = 0
+        try:
+            without = _converse("handles-off")
+        finally:
+            RESULT_HANDLES.per_session = saved
+        ANSWER_CACHE.clear()
+        before = RESULT_HANDLES.stats()
+        with_handles = _converse("handles-on")
+        after = RESULT_HANDLES.stats()
+        assert with_handles == without, [(q, a, b) for q, a, b in zip(CONVERSATION, without, with_handles) if a != b]
+        # scans: "show me 20", "first 5 critical ...", "from 21 to 30 ..." (no
+        # severity: another filter); the "10 more" pages and "31 to 40" reuse them
+        assert after["scans"] - before["scans"] == 3 and after["hits"] - before["hits"] == 3
+    _with_data(check)
+    print("✓ Same answers; later pages are slices of the first scan")
@@ -0,0 +1,163 @@
+"""
+Test Suite for the Root Cause Index
+===================================
+Validates:
+
+1️⃣ Legacy timestamp parsing (three formats, format truncation)
+2️⃣ Array burst density equals the average of sorted consecutive gaps
+3️⃣ Scorers equal a per-alert scan (pipeline, fallback window, intelligence engine)
+4️⃣ Scopes are memoized per target and rebuilt when the data generation changes
+"""
+
+import random
+import sys
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from data_engine.root_cause_index import (
+    ErrorGroup, RootCauseIndex, burst_density, epoch_us, from_epoch_us, parse_legacy_timestamp
+)
+from incident_engine.production_intelligence_engine import FALLBACK_SCHEME, RootCauseFallbackEngine
+from nlp_engine.intelligence_engine import CAUSE_SCHEME, RootCauseScorer as CauseScorer
+from nlp_engine.oem_reasoning_pipeline import ROOT_CAUSE_SCHEME, RootCauseScorer
+
+
+MESSAGES = ["ORA-00600: internal error [13011]", "ORA-7445 [kgepop] core dump", "ORA-1555 snapshot too old",
+            "Data Guard apply lag", "Tablespace USERS full", "listener down", "CPU load high", ""]
+
+
+def _alerts(count=1200, seed=9):
+    rng = random.Random(seed)
+    base = datetime(2025, 6, 1)
+    alerts = []
+    for i in range(count):
+        when = base + timedelta(seconds=rng.randint(0, 86400 * 14))
+        stamp = [when, when.strftime("%Y-%m-%d %H:%M:%S"), when.strftime("%Y-%m-%dT%H:%M:%S"), "n/a"][i % 4]
+        alerts.append({
+            "target" if i % 3 else "target_name": rng.choice(["MIDEVSTB", "MIDEVSTBN", "FINDB"]),
+            "message": rng.choice(MESSAGES),
+            "issue_type": rng.choice(["INTERNAL_ERROR", "DATAGUARD", None]),
+            "severity": rng.choice(["CRITICAL", "WARNING"]),
+            "time": stamp,
+        })
+    return alerts
+
+
+def _gap_burst(stamps):
+    """Reference burst density: average of sorted consecutive gaps."""
+    if len(stamps) < 2:
+        return 0.3
+    stamps = sorted(stamps)
+    gaps = [(stamps[i + 1] - stamps[i]).total_seconds() for i in range(len(stamps) - 1)]
+    return min(3600 / max(sum(gaps) / len(gaps), 1), 1.0)
+
+
+def test_legacy_timestamp_parsing():
+    print("\n" + "=" * 60)
+    print("TEST: Legacy timestamp parsing")
+    print("=" * 60)
+
+    assert parse_legacy_timestamp("2025-06-20 10:11:12") == datetime(2025, 6, 20, 10, 11, 12)
+    assert parse_legacy_timestamp("2025-06-20T10:11:12.5+00:00") == datetime(2025, 6, 20, 10, 11, 12)
+    # value[:19] never satisfies the (truncated) Oracle format - as before
+    oracle = "20-JUN-25 10.11.12.000000 PM"
+    assert parse_legacy_timestamp(oracle, max_format_chars=19) is None
+    assert parse_legacy_timestamp(oracle) is None
+    assert parse_legacy_timestamp("2025-06-20", max_format_chars=19) is None
+    assert parse_legacy_timestamp("garbage") is None
+    when = datetime(2025, 6, 20, 10, 11, 12, 345)
+    assert from_epoch_us(epoch_us(when)) == when
+    print("✓ Same formats and truncation as the per-alert parsers")
+
+
+def test_array_burst_equals_gaps():
+    print("\n" + "=" * 60)
+    print("TEST: Burst density from the epoch array")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    for size in [0, 1, 2, 5, 50, 400]:
+        stamps = [datetime(2025, 1, 1) + timedelta(seconds=rng.randint(0, 86400 * rng.choice([1, 30])))
+                  for _ in range(size)]
+        group = ErrorGroup("X")
+        group.epochs.extend(epoch_us(s) for s in stamps)
+        assert group.burst_density() == _gap_burst(stamps), size
+        assert group.latest() == (max(stamps) if stamps else None)
+    assert burst_density(None) == 0.3 and burst_density(0.5) == 1.0 and burst_density(7200) == 0.5
+    print("✓ (max - min) / (n - 1) equals the average sorted gap")
+
+
+def test_scorers_equal_scan():
+    print("\n" + "=" * 60)
+    print("TEST: Scorers vs per-alert scan")
+    print("=" * 60)
+
+    alerts = _alerts()
+    for target in [None, "MIDEVSTB", "midevstbn"]:
+        scoped = [a for a in alerts if not target or
+                  (a.get("target_name") or a.get("target")).upper() == target.upper()]
+        groups = {}
+        for a in scoped:
+            key, _ = ROOT_CAUSE_SCHEME.error_key(a)
+            stamp = a["time"] if isinstance(a["time"], datetime) else parse_legacy_timestamp(a["time"], 19)
+            groups.setdefault(key, []).append(stamp)
+        scores = RootCauseScorer.compute_scores(alerts, target)
+        assert sorted(c["error_type"] for c in scores) == sorted(groups)
+        for cause in scores:
+            stamps = [s for s in groups[cause["error_type"]] if s is not None]
+            assert cause["count"] == len(groups[cause["error_type"]])
+            assert cause["breakdown"]["burst_density"] == round(_gap_burst(stamps), 3)
+
+        causes = CauseScorer.score_root_causes(alerts, target)
+        expected = Counter(CAUSE_SCHEME.error_key(a)[0] for a in alerts if not target or
+                           (a.get("target") or a.get("target_name")).upper() == target.upper())
+        assert dict((c["cause"], c["count"]) for c in causes) == dict(expected)
+    print("✓ Same groups, counts and burst scores")
+
+
+def test_fallback_burst_window():
+    print("\n" + "=" * 60)
+    print("TEST: Fallback burst score uses the first 100 timestamps")
+    print("=" * 60)
+
+    base = datetime(2025, 6, 1)
+    alerts = [{"target": "FINDB", "message": "ORA-00600 internal", "severity": "CRITICAL",
+               "time": base + timedelta(seconds=30 * i)} for i in range(100)]
+    alerts += [{"target": "FINDB", "message": "ORA-00600 internal", "time": base + timedelta(days=100 + i)}
+               for i in range(50)]
+    alerts.append({"target": "OTHERDB", "message": "listener down", "issue_type": "NETWORK"})
+
+    result = RootCauseFallbackEngine.infer_root_cause(alerts, "FIN")
+    assert result["root_cause"] == "ORA-00600"
+    assert result["score_breakdown"]["burst"] == 1.0
+    assert result["all_causes"][0]["count"] == 150 and result["all_causes"][0]["critical_count"] == 100
+    group = RootCauseIndex.for_alerts(alerts, FALLBACK_SCHEME).scope("FIN").groups["ORA-00600"]
+    assert len(group.epochs) == 100 and group.stamps == 150
+    assert RootCauseFallbackEngine.infer_root_cause(alerts, "NOPE")["confidence"] == "NONE"
+    print("✓ Partial target match, 100-timestamp burst window, critical counts")
+
+
+def test_scopes_memoized_per_generation():
+    print("\n" + "=" * 60)
+    print("TEST: Scopes memoized per target and generation")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        publish_snapshot({"alerts": _alerts(300)})
+        index = RootCauseIndex.for_alerts(GLOBAL_DATA["alerts"], ROOT_CAUSE_SCHEME)
+        scope = index.scope("MIDEVSTB")
+        assert index.scope("midevstb") is scope
+        assert RootCauseIndex.for_alerts(GLOBAL_DATA["alerts"], ROOT_CAUSE_SCHEME) is index
+        first = RootCauseScorer.compute_scores(GLOBAL_DATA["alerts"], "MIDEVSTB")
+        first[0]["count"] = -1
+        assert RootCauseScorer.compute_scores(GLOBAL_DATA["alerts"], "MIDEVSTB")[0]["count"] > 0
+
+        publish_snapshot({"alerts": _alerts(300, seed=1)})
+        assert RootCauseIndex.for_alerts(GLOBAL_DATA["alerts"], ROOT_CAUSE_SCHEME) is not index
+    finally:
+        publish_snapshot(saved)
+    print("✓ Built once per target, rebuilt after a reload")
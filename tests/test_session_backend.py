@@ -0,0 +1,161 @@
+"""
+Test Suite for the Session Backend
+==================================
+Validates:
+
+1️⃣ LRU eviction beyond max_entries, never the session in use
+2️⃣ Idle sessions expire; memory accounting follows in-place mutation
+3️⃣ SessionStore sessions are bounded; history is a small deque
+4️⃣ Cached answers replay their history entries
+5️⃣ /api/debug/sessions reports every session store
+6️⃣ /api/chat/session returns analysis_history as a list of dicts
+   with an ISO timestamp, as before the deque
+"""
+
+import sys
+import os
+import time
+from collections import deque
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.chat_controller import chat_router
+from controllers.debug_controller import debug_router
+from services import session_store
+from services.context_manager import ContextManager
+from services.session_backend import SessionBackend, approximate_size
+from services.session_store import AnalysisEntry, SessionStore
+
+
+def test_lru_eviction():
+    print("\n" + "=" * 60)
+    print("TEST: LRU eviction")
+    print("=" * 60)
+
+    backend = SessionBackend("test_lru", max_entries=3, max_bytes=0, ttl_seconds=0)
+    for i in range(3):
+        backend.get_or_create("s{0}".format(i), dict)
+    assert backend.get("s0") == {}                 # s0 becomes most recent
+    state, created = backend.get_or_create("s3", dict)
+    assert created and backend.keys() == ["s2", "s0", "s3"]
+    assert backend.get_or_create("s0", dict)[1] is False
+    assert backend.pop("s2") == {} and "s2" not in backend and len(backend) == 2
+    stats = backend.stats()
+    assert stats["created"] == 4 and stats["evicted_lru"] == 1 and stats["removed"] == 1
+
+    single = SessionBackend("test_single", max_entries=1, max_bytes=1, ttl_seconds=0)
+    single.put("only", {"big": "x" * 1000})
+    assert single.get("only") == {"big": "x" * 1000}
+    print("✓ Least recently used session evicted; the session in use is kept")
+
+
+def test_idle_ttl_and_memory():
+    print("\n" + "=" * 60)
+    print("TEST: Idle TTL and memory accounting")
+    print("=" * 60)
+
+    backend = SessionBackend("test_ttl", max_entries=0, max_bytes=0, ttl_seconds=0.05)
+    backend.put("a", {})
+    backend.put("b", {})
+    time.sleep(0.03)
+    backend.get("a")
+    time.sleep(0.03)
+    assert backend.keys() == ["a"] and backend.stats()["expired"] == 1
+    time.sleep(0.06)
+    assert backend.get("a") is None and backend.stats()["entries"] == 0
+
+    backend = SessionBackend("test_memory", max_entries=0, max_bytes=20000, ttl_seconds=0)
+    states = [backend.get_or_create(name, dict)[0] for name in ("a", "b", "c")]
+    start = backend.stats()["bytes"]
+    assert start == 3 * approximate_size({})
+    states[0]["rows"] = ["row {0}".format(i) for i in range(200)]   # mutated in place
+    backend.get("a")                                                  # re-measured
+    stats = backend.stats()
+    assert stats["bytes"] == approximate_size(states[0]) + 2 * approximate_size({})
+    states[1]["rows"] = list(states[0]["rows"])
+    backend.get("b")
+    assert backend.keys() == ["b"] and backend.stats()["evicted_memory"] == 2
+    print("✓ Idle sessions dropped; bytes follow the state, memory bound enforced")
+
+
+def test_session_store_bounded():
+    print("\n" + "=" * 60)
+    print("TEST: SessionStore bounded sessions and compact history")
+    print("=" * 60)
+
+    backend = session_store._SESSION_STORAGE
+    saved = backend.max_entries
+    backend.max_entries = 5
+    try:
+        for i in range(12):
+            SessionStore.set_session_id("bounded-{0}".format(i))
+            SessionStore.record_analysis({"question": "q" * 500, "target": "DB{0}".format(i)})
+        assert len(backend) <= 5 and "bounded-11" in backend and "bounded-0" not in backend
+        history = SessionStore._state["analysis_history"]
+        assert isinstance(history, deque) and isinstance(history[0], AnalysisEntry)
+        assert len(history[0].question) == 200 and history[0].target == "DB11"
+        for _ in range(50):
+            SessionStore.record_analysis({"question": "again"})
+        assert len(history) == history.maxlen
+        assert backend.stats()["evicted_lru"] >= 7
+    finally:
+        backend.max_entries = saved
+    print("✓ Oldest sessions evicted; history bounded at {0} tuples".format(history.maxlen))
+
+
+def test_history_replay():
+    print("\n" + "=" * 60)
+    print("TEST: History replay")
+    print("=" * 60)
+
+    SessionStore.set_session_id("replay")
+    entry = AnalysisEntry(0.0, "which db is worst", "MIDEVSTB", "RISK", None, "HIGH")
+    SessionStore.record_analysis(entry)
+    last = SessionStore._state["analysis_history"][-1]
+    assert last[1:] == entry[1:] and last.timestamp > 0
+
+    ContextManager.reset_context("replay")
+    context = ContextManager.get_context("replay")
+    assert context is ContextManager.get_context("replay") and context.query_history.maxlen == 10
+    print("✓ Replayed entries re-stamped; NLP contexts share the bounded backend")
+
+
+def test_sessions_endpoint():
+    print("\n" + "=" * 60)
+    print("TEST: /api/debug/sessions")
+    print("=" * 60)
+
+    app = FastAPI()
+    app.include_router(debug_router, prefix="/api/debug")
+    data = TestClient(app).get("/api/debug/sessions").json()
+    for name in ("session_store", "nlp_context"):
+        assert name in data and "evicted_lru" in data[name] and "bytes" in data[name]
+    print("✓ Stats for {0} session stores".format(len(data)))
+
+
+def test_session_endpoint_history_shape():
+    print("\n" + "=" * 60)
+    print("TEST: /api/chat/session analysis_history shape")
+    print("=" * 60)
+
+    SessionStore.reset_session("history-shape")
+    SessionStore.set_session_id("history-shape")
+    SessionStore.record_analysis({"question": "why is FINDB down", "target": "FINDB",
+                                  "intent": "ROOT_CAUSE", "root_cause": "ORA-00600", "confidence": 0.8})
+
+    app = FastAPI()
+    app.include_router(chat_router, prefix="/api/chat")
+    client = TestClient(app)
+    client.cookies.set("logged_in", "1")
+    body = client.get("/api/chat/session", params={"session_id": "history-shape"}).json()
+
+    history = body["session"]["analysis_history"]
+    assert len(history) == 1
+    assert sorted(history[0]) == ["confidence", "intent", "question", "root_cause", "target", "timestamp"]
+    assert history[0]["question"] == "why is FINDB down" and history[0]["target"] == "FINDB"
+    datetime.strptime(history[0]["timestamp"][:19], "%Y-%m-%dT%H:%M:%S")
+    assert isinstance(SessionStore.get_state()["analysis_history"], deque)   # stored compactly
+    print("✓ History served as dicts with ISO timestamps")
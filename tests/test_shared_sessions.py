@@ -0,0 +1,196 @@
+"""
+Test Suite for the Shared Session Store
+=======================================
+Validates:
+
+1️⃣ Two workers (stores on one SQLite file) see each other's session
+   changes at the next request; unchanged sessions are not rewritten
+2️⃣ Writes are batched; removals and generations are respected
+3️⃣ A conversation split across processes gets the same answers as
+   one process answering it alone (v1 and v2 chat APIs)
+4️⃣ /api/debug/sessions reports the shared store
+"""
+
+import json
+import subprocess
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers.chat_controller import ChatRequest, _process_chat, _process_v2
+from controllers.debug_controller import debug_router
+from services.session_backend import SessionBackend, session_writes
+from services.shared_session_store import SQLiteSessionStore
+from test_chat_batch import _with_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Answers the questions in argv[1] (JSON) for session argv[2] in a fresh
+# process, through the v1 or v2 chat API (argv[4])
+_TURN_SCRIPT = """
+import contextlib, io, json, sys
+sys.path.insert(0, "tests")
+from controllers.chat_controller import ChatRequest, _process_chat, _process_v2
+from services.shared_session_store import SHARED_SESSION_STORE
+from test_chat_batch import _with_data
+
+questions, session_id, new = json.loads(sys.argv[1]), sys.argv[2], sys.argv[3] == "1"
+answers = []
+
+def check():
+    for i, question in enumerate(questions):
+        if sys.argv[4] == "v2":
+            answers.append(_process_v2(question, session_id, new and i == 0)["answer"])
+            continue
+        payload = ChatRequest(message=question, session_id=session_id, new_conversation=new and i == 0)
+        answers.append(_process_chat(payload, question)["answer"])
+
+with contextlib.redirect_stdout(io.StringIO()):
+    _with_data(check)
+    SHARED_SESSION_STORE.flush()
+print(json.dumps(answers))
+"""
+
+
+def _workers(path, generation="test", count=2, write_delay=0):
+    return [SessionBackend("shared_test", max_entries=0, max_bytes=0, ttl_seconds=0,
+                           store=SQLiteSessionStore(path, generation=generation, write_delay=write_delay,
+                                                    ttl_seconds=0))
+            for _ in range(count)]
+
+
+def test_workers_share_sessions():
+    print("\n" + "=" * 60)
+    print("TEST: Sessions shared by two workers")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        first, second = _workers(os.path.join(directory, "sessions.db"))
+
+        with session_writes():
+            state, created = first.get_or_create("s1", dict)
+            state["topic"] = "STANDBY"
+        with session_writes():
+            assert first.get("s1") is state           # own queued write, no reload
+        first.store.flush()
+
+        with session_writes():
+            seen = second.get("s1")
+            assert seen == {"topic": "STANDBY"}
+            seen["limit"] = 20
+        second.store.flush()
+        with session_writes():
+            assert first.get("s1") == {"topic": "STANDBY", "limit": 20}
+            assert first.get("s1") is first.get("s1")    # one read per request
+        first.store.flush()
+
+        stats = first.stats()
+        assert stats["shared"] and stats["shared_loads"] == 1 and stats["shared_writes"] == 1
+        assert stats["shared_unchanged"] == 2
+    print("✓ Follow-up on the other worker sees the session; unchanged sessions not rewritten")
+
+
+def test_batches_removal_generations():
+    print("\n" + "=" * 60)
+    print("TEST: Batched writes, removal, generations")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.db")
+        first, second = _workers(path, write_delay=2.0)    # writer holds off: the test flushes
+        other, = _workers(path, generation="another server", count=1)
+
+        with session_writes():
+            for i in range(5):
+                first.get_or_create("s{0}".format(i), dict)[0]["n"] = i
+        assert first.store.pending() == 5
+        first.store.flush()
+        store = first.store.stats()
+        assert store["batches"] == 1 and store["rows_written"] == 5 and store["pending"] == 0
+
+        first.put("outside", {"n": "put"})              # outside a request: written directly
+        first.store.flush()
+        with session_writes():
+            assert second.get("s3") == {"n": 3} and second.get("outside") == {"n": "put"}
+            assert other.get("s3") is None
+        first.pop("s3")
+        first.store.flush()
+        with session_writes():
+            assert second.get("s3") is None
+        assert "s3" not in second and second.stats()["shared_removed"] == 1
+    print("✓ One transaction per batch; removals propagate; generations kept apart")
+
+
+def _turn(env, questions, session_id, new, api="v1"):
+    output = subprocess.check_output(
+        [sys.executable, "-c", _TURN_SCRIPT, json.dumps(questions), session_id, "1" if new else "0", api],
+        cwd=ROOT, env=env, universal_newlines=True, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_conversation_across_processes():
+    print("\n" + "=" * 60)
+    print("TEST: One conversation, one process per question")
+    print("=" * 60)
+
+    conversation = ["show standby issues", "show me 20", "only critical"]
+    alone = []
+
+    def check():
+        for i, question in enumerate(conversation):
+            payload = ChatRequest(message=question, session_id="shared-alone", new_conversation=i == 0)
+            alone.append(_process_chat(payload, question)["answer"])
+    _with_data(check)
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, SESSION_BACKEND="sqlite", SESSION_GENERATION="split-test",
+                   SESSION_DB_PATH=os.path.join(directory, "sessions.db"))
+        split = []
+        for i, question in enumerate(conversation):
+            split.extend(_turn(env, [question], "shared-split", i == 0))
+    assert split == alone, (alone, split)
+    print("✓ {0} questions answered by {0} processes: same answers as one process".format(len(conversation)))
+
+
+def test_v2_conversation_across_processes():
+    print("\n" + "=" * 60)
+    print("TEST: One v2 conversation, one process per question")
+    print("=" * 60)
+
+    conversation = ["show alerts for MIDEVSTB", "only critical", "show me 5"]
+    alone = []
+
+    def check():
+        for i, question in enumerate(conversation):
+            alone.append(_process_v2(question, "shared-v2-alone", i == 0)["answer"])
+    _with_data(check)
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, SESSION_BACKEND="sqlite", SESSION_GENERATION="split-v2-test",
+                   SESSION_DB_PATH=os.path.join(directory, "sessions.db"))
+        split = []
+        for i, question in enumerate(conversation):
+            split.extend(_turn(env, [question], "shared-v2-split", i == 0, api="v2"))
+    assert split == alone, (alone, split)
+    assert "MIDEVSTB" in alone[1], alone
+    print("✓ v2 follow-ups keep their context across processes")
+
+
+def test_sessions_endpoint_reports_store():
+    print("\n" + "=" * 60)
+    print("TEST: Shared store stats")
+    print("=" * 60)
+
+    app = FastAPI()
+    app.include_router(debug_router, prefix="/api/debug")
+    data = TestClient(app).get("/api/debug/sessions").json()
+    assert data["session_store"]["shared"] and not data["request_scoped"]["shared"]
+    store = data["shared_store"]
+    assert store["backend"] == "sqlite" and "batches" in store and "pending" in store
+    print("✓ Shared store: {0} rows written in {1} batches".format(store["rows_written"], store["batches"]))
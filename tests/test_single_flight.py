@@ -0,0 +1,162 @@
+"""
+Test Suite for Single-Flight Request Coalescing
+===============================================
+Validates:
+
+1️⃣ Concurrent calls with one key share one computation (result or
+   exception); other keys and later calls compute on their own
+2️⃣ Concurrent identical /api/dashboard/oem-summary requests are
+   answered by one computation with the uncoalesced answer; a reload
+   starts a separate flight
+3️⃣ /api/debug/coalescing reports the counters per route
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controllers import dashboard_controller
+from controllers.debug_controller import debug_router
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from services.single_flight import SINGLE_FLIGHT, SingleFlight, request_key
+from test_chat_batch import _with_data
+
+
+class _GatedAlert(dict):
+    """Alert whose first read blocks until the gate opens (holds a flight open)."""
+
+    def __init__(self, gate, *args):
+        dict.__init__(self, *args)
+        self.gate = gate
+
+    def get(self, key, default=None):
+        self.gate.wait()
+        return dict.get(self, key, default)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _run(threads):
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_share_one_computation():
+    print("\n" + "=" * 60)
+    print("TEST: One computation per key")
+    print("=" * 60)
+
+    flight = SingleFlight()
+    gate = threading.Event()
+    runs = []
+    results = []
+
+    def compute():
+        runs.append(1)
+        gate.wait()
+        return {"value": len(runs)}
+
+    threads = _run([threading.Thread(target=lambda: results.append(flight.do("r", "k", compute)))
+                    for _ in range(8)])
+    _wait_for(lambda: flight.stats()["shared"] == 7)
+    other = flight.do("r", "other", lambda: "other key")            # not coalesced with "k"
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert len(runs) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+    assert other == "other key" and flight.in_flight() == 0
+    flight.do("r", "k", compute)                                      # flight over: computes again
+    assert len(runs) == 2
+
+    errors = []
+    failing = threading.Event()
+
+    def fail():
+        failing.wait()
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do("e", "k", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = _run([threading.Thread(target=call) for _ in range(3)])
+    _wait_for(lambda: flight.stats()["routes"].get("e", {}).get("shared") == 2)
+    failing.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3 and errors[0] is errors[1] is errors[2]
+
+    stats = flight.stats()["routes"]
+    assert stats["r"]["calls"] == 10 and stats["r"]["executions"] == 3 and stats["r"]["max_waiters"] == 7
+    assert stats["e"]["errors"] == 1 and stats["e"]["executions"] == 1
+    print("✓ 8 callers, 1 computation; errors shared; next call computes again")
+
+
+def test_dashboard_requests_coalesced():
+    print("\n" + "=" * 60)
+    print("TEST: Concurrent identical dashboard requests")
+    print("=" * 60)
+
+    def check():
+        alerts = GLOBAL_DATA["alerts"]
+        SINGLE_FLIGHT.enabled = False
+        try:
+            alone = dashboard_controller.oem_summary()
+        finally:
+            SINGLE_FLIGHT.enabled = True
+        key = request_key("dashboard.oem_summary", {})
+
+        gate = threading.Event()
+        alerts[0] = _GatedAlert(gate, alerts[0])
+        before = SINGLE_FLIGHT.stats()["routes"].get("dashboard.oem_summary", {"calls": 0, "executions": 0})
+        answers = []
+        threads = _run([threading.Thread(target=lambda: answers.append(dashboard_controller.oem_summary()))
+                        for _ in range(10)])
+        route = lambda: SINGLE_FLIGHT.stats()["routes"]["dashboard.oem_summary"]
+        _wait_for(lambda: route()["calls"] - before["calls"] == 10)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        after = route()
+        assert after["executions"] - before["executions"] == 1 and len(answers) == 10
+        assert all(answer == alone for answer in answers)
+
+        publish_snapshot(dict(GLOBAL_DATA))                          # reload: new key
+        assert request_key("dashboard.oem_summary", {}) != key
+    _with_data(check)
+    print("✓ 10 requests, 1 computation, same answer as uncoalesced")
+
+
+def test_coalescing_endpoint():
+    print("\n" + "=" * 60)
+    print("TEST: Coalescing stats endpoint")
+    print("=" * 60)
+
+    app = FastAPI()
+    app.include_router(dashboard_controller.dashboard_router, prefix="/api/dashboard")
+    app.include_router(debug_router, prefix="/api/debug")
+    client = TestClient(app)
+
+    def check():
+        assert client.get("/api/dashboard/databases").json()[0]["database"] in ("FINDB", "MIDEVSTB")
+        stats = client.get("/api/debug/coalescing").json()
+        assert stats["enabled"] and stats["in_flight"] == 0
+        assert stats["routes"]["dashboard.databases"]["calls"] >= 1
+        assert set(stats["routes"]["dashboard.databases"]) >= {"calls", "executions", "shared", "errors",
+                                                                "max_waiters", "shared_percent"}
+    _with_data(check)
+    print("✓ Counters per route at /api/debug/coalescing")
@@ -0,0 +1,200 @@
+"""
+Test Suite for the Target Dictionary
+====================================
+Validates:
+
+1️⃣ Aho-Corasick spans report every occurrence with its position
+2️⃣ Mentions are strict: MIDEVSTB is never resolved to MIDEVSTBN
+3️⃣ BK-tree radius search and SymSpell suggestions equal brute force
+4️⃣ Typo lookup only resolves a unique nearest name
+5️⃣ widen_target_search results equal a per-alert scan
+6️⃣ Shared dictionary is rebuilt when the data generation changes
+"""
+
+import random
+import sys
+import os
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from data_engine.keyword_automaton import KeywordAutomaton
+from data_engine.target_dictionary import BKTree, TargetDictionary, deletes, levenshtein
+from nlp_engine.entity_extractor import EntityExtractor
+from nlp_engine.intelligence_engine import AntiFalseZero
+from phase1.intent_parser import Phase1IntentParser
+
+
+TARGETS = ["MIDEVSTB", "MIDEVSTBN", "FINDB", "FINDB_DR", "HRPRD", "PAYPRD", "SALESDB"]
+
+
+def _alerts():
+    rng = random.Random(7)
+    alerts = []
+    for i in range(600):
+        target = rng.choice(TARGETS)
+        key = "target" if i % 3 else "target_name"
+        alerts.append({key: target.lower() if i % 5 == 0 else target, "severity": "CRITICAL"})
+    return alerts
+
+
+def _widen_reference(target, alerts):
+    """Reference: per-alert scans (exact, same-length typo, unique nearest name)."""
+    target_upper = target.upper().strip()
+
+    def key(a):
+        return (a.get("target") or a.get("target_name") or "").upper()
+
+    exact = [a for a in alerts if key(a) == target_upper]
+    if exact:
+        return target_upper, exact
+    typo, matched = [], None
+    for a in alerts:
+        t = key(a)
+        if t and len(t) == len(target_upper) and t != target_upper:
+            same = sum(1 for c1, c2 in zip(target_upper, t) if c1 == c2)
+            if same / len(target_upper) >= 0.85:
+                typo.append(a)
+                matched = t
+    if typo:
+        return matched, typo
+    ranked = sorted(set(key(a) for a in alerts if key(a)),
+                    key=lambda known: levenshtein(target_upper, known))
+    if ranked and levenshtein(target_upper, ranked[0]) <= 2:
+        if len(ranked) == 1 or levenshtein(target_upper, ranked[1]) > levenshtein(target_upper, ranked[0]):
+            return ranked[0], [a for a in alerts if key(a) == ranked[0]]
+    return None, []
+
+
+def test_automaton_spans():
+    print("\n" + "=" * 60)
+    print("TEST: Aho-Corasick spans")
+    print("=" * 60)
+
+    automaton = KeywordAutomaton(["STB", "MIDEVSTB", "MIDEVSTBN"])
+    spans = automaton.spans("XMIDEVSTBN")
+    assert sorted(spans) == [(1, 9, "MIDEVSTB"), (1, 10, "MIDEVSTBN"), (6, 9, "STB")]
+    assert [s[1] for s in spans] == sorted(s[1] for s in spans)
+    assert automaton.find("XMIDEVSTBN") == set(s[2] for s in spans)
+    print("✓ Every occurrence reported, ordered by end position")
+
+
+def test_mentions_are_strict():
+    print("\n" + "=" * 60)
+    print("TEST: Strict mentions (MIDEVSTB != MIDEVSTBN)")
+    print("=" * 60)
+
+    targets = TargetDictionary(_alerts())
+    assert targets.mention("why is midevstbn down") == "MIDEVSTBN"
+    assert targets.mention("alerts for MIDEVSTB today") == "MIDEVSTB"
+    assert targets.mentions("compare FINDB_DR with findb") == ["FINDB_DR", "FINDB"]
+    assert targets.mention("MIDEVSTBNX is not known") is None
+    assert targets.mention("show all alerts") is None
+    assert "midevstb" in targets and "MIDEV" not in targets
+    assert targets.related("MIDEV") and targets.related("XFINDBX")
+    assert not targets.related("ORACLE")
+    print("✓ Whole identifiers only, longest name wins")
+
+
+def test_bk_tree_equals_brute_force():
+    print("\n" + "=" * 60)
+    print("TEST: BK-tree radius search")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    words = ["".join(rng.choice("ABCDST") for _ in range(rng.randint(4, 9))) for _ in range(300)]
+    tree = BKTree(words)
+    for _ in range(100):
+        query = "".join(rng.choice("ABCDST") for _ in range(rng.randint(4, 9)))
+        for radius in (0, 1, 2):
+            expected = sorted((levenshtein(query, w), w) for w in set(words) if levenshtein(query, w) <= radius)
+            assert tree.search(query, radius) == expected, (query, radius)
+    targets = TargetDictionary.from_names(words)
+    for _ in range(100):
+        query = "".join(rng.choice("ABCDST") for _ in range(rng.randint(3, 9)))
+        expected = sorted((levenshtein(query, w), w) for w in targets.names if levenshtein(query, w) <= 2)
+        found = targets.suggest(query)
+        assert sorted((d, w) for w, d in found) == expected, query
+        assert [d for _, d in found] == sorted(d for _, d in found)
+    assert deletes("ABC", 1) == {"ABC", "BC", "AC", "AB"}
+    assert levenshtein("MIDDEVSTBN", "MIDEVSTBN") == 1
+    assert levenshtein("KITTEN", "SITTING", limit=1) == 2
+    print("✓ {0} words, radius 0-2 and ranked suggestions identical to brute force".format(len(tree)))
+
+
+def test_closest_requires_unique_match():
+    print("\n" + "=" * 60)
+    print("TEST: Typo lookup")
+    print("=" * 60)
+
+    targets = TargetDictionary(_alerts())
+    assert targets.closest("MIDEVSTB") == "MIDEVSTB"
+    assert targets.closest("MIDDEVSTBN") == "MIDEVSTBN"
+    assert targets.closest("PAYPRX") == "PAYPRD"
+    assert targets.closest("MIDEVSTBX") is None      # one edit from both names
+    assert targets.closest("ABC") is None
+    assert targets.suggest("MIDEVSTBX") == [("MIDEVSTB", 1), ("MIDEVSTBN", 1)] or \
+        targets.suggest("MIDEVSTBX") == [("MIDEVSTBN", 1), ("MIDEVSTB", 1)]
+    assert targets.suggest("FINDB") == [("FINDB", 0)]
+    print("✓ Exact names resolve to themselves, ties are ambiguous")
+
+
+def test_widen_target_search_equals_scan():
+    print("\n" + "=" * 60)
+    print("TEST: widen_target_search vs per-alert scan")
+    print("=" * 60)
+
+    alerts = _alerts()
+    for target in ["MIDEVSTB", "midevstbn", "MIDEVSTX", "FINDB_DX", "SALESDBX", "PAYPR", "MIDDEVSTBN",
+                   "MIDEVSTBX", "MIDEVSTBXY", "HRPRDDB", "UNKNOWN"]:
+        matched, found, _ = AntiFalseZero.widen_target_search(target, alerts)
+        expected_target, expected = _widen_reference(target, alerts)
+        assert matched == expected_target, target
+        assert found == expected, target
+    _, _, explanation = AntiFalseZero.widen_target_search("NOPE", alerts)
+    counts = Counter((a.get("target") or a.get("target_name")).upper() for a in alerts)
+    assert explanation.endswith(", ".join("{} ({})".format(t, c) for t, c in counts.most_common(5)))
+    _, _, explanation = AntiFalseZero.widen_target_search("MIDEVSTBXY", alerts)   # 2 edits from both
+    assert "Did you mean: " in explanation
+    print("✓ Exact, typo, ranked fuzzy and fallback steps")
+
+
+def test_known_database_lists():
+    print("\n" + "=" * 60)
+    print("TEST: Explicit known database lists")
+    print("=" * 60)
+
+    extractor = EntityExtractor(["midevstbn", "FINDB"])
+    assert extractor.extract("alerts for MIDEVSTB")["databases"] == ["MIDEVSTB"]
+    assert extractor.extract("alerts for ORACLEX")["databases"] == []
+
+    known = ["MIDEVSTB", "MIDEVSTBN"]
+    parser = Phase1IntentParser(known)
+    targets = parser._known_targets
+    parser.set_known_databases(known)
+    assert parser._known_targets is targets
+    assert parser.parse("show alerts for midevstb")["database"] == "MIDEVSTB"
+    print("✓ Partial matches for entities, exact names for Phase 1")
+
+
+def test_rebuilt_per_generation():
+    print("\n" + "=" * 60)
+    print("TEST: Shared dictionary per data generation")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        publish_snapshot({"alerts": [{"target": "ALPHADB"}]})
+        first = TargetDictionary.current()
+        assert TargetDictionary.current() is first
+        assert TargetDictionary.for_alerts(GLOBAL_DATA["alerts"]) is first
+        assert first.names == ("ALPHADB",)
+
+        publish_snapshot({"alerts": [{"target": "BETADB"}, {"target_name": "alphadb"}]})
+        second = TargetDictionary.current()
+        assert second is not first
+        assert second.names == ("BETADB", "ALPHADB")
+        assert second.alert_indices("ALPHADB") == [1]
+    finally:
+        publish_snapshot(saved)
+    print("✓ Built once per generation, rebuilt after a reload")
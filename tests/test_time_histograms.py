@@ -0,0 +1,168 @@
+"""
+Test Suite for the Time Histograms
+==================================
+Validates:
+
+1️⃣ Hour, weekday x hour and severity arrays equal a per-alert count
+2️⃣ Distributions and peak-hour ties keep first-seen hour order
+3️⃣ Reasoning pipeline peak hour: partial target match, global fallback, synthetic hours
+4️⃣ Failure windows and analyzer time ranges read the histograms
+5️⃣ One index per data generation, built by the warm-up job
+"""
+
+import random
+import sys
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_engine.global_cache import GLOBAL_DATA, publish_snapshot
+from data_engine.time_histograms import DAY_NAMES, TimeHistogramIndex, TimeScheme
+from nlp_engine.intelligence_engine import TemporalIntelligence as EngineTemporal
+from nlp_engine.oem_data_analyzer import OEMDataAnalyzer
+from nlp_engine.oem_reasoning_pipeline import TEMPORAL_SCHEME, TemporalIntelligence
+
+
+def _alerts(count=1200, seed=4):
+    rng = random.Random(seed)
+    base = datetime(2025, 6, 2)
+    alerts = []
+    for i in range(count):
+        when = base + timedelta(minutes=rng.randint(0, 60 * 24 * 14))
+        stamp = [when, when.isoformat(), when.strftime("%Y-%m-%d %H:%M:%S"), None][i % 4]
+        alerts.append({
+            "target" if i % 3 else "target_name": rng.choice(["MIDEVSTB", "MIDEVSTBN", "FINDB"]),
+            "severity": rng.choice(["CRITICAL", "WARNING", None]),
+            "time": stamp,
+        })
+    return alerts
+
+
+def _dated(alert):
+    value = alert["time"]
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _parse(value):
+    when = _dated({"time": value})
+    return when.hour, when.weekday()
+
+
+SCHEME = TimeScheme(
+    "test",
+    target_key=lambda a: (a.get("target_name") or a.get("target") or "").upper(),
+    timestamp=lambda a: a.get("time"),
+    parse=_parse
+)
+
+
+def test_arrays_equal_counts():
+    print("\n" + "=" * 60)
+    print("TEST: Histogram arrays vs per-alert counts")
+    print("=" * 60)
+
+    alerts = _alerts()
+    index = TimeHistogramIndex(alerts, SCHEME)
+    for target in [None, "MIDEVSTB", "findb", "NOPE"]:
+        scoped = [a for a in alerts if not target or
+                  (a.get("target_name") or a.get("target")).upper() == target.upper()]
+        timed = [_dated(a) for a in scoped if a["time"]]
+        histogram = index.scope(target)
+        assert histogram.total == len(scoped)
+        assert list(histogram.hours) == [Counter(t.hour for t in timed)[h] for h in range(24)]
+        week = Counter(t.weekday() * 24 + t.hour for t in timed)
+        assert list(histogram.week) == [week[slot] for slot in range(168)]
+        assert histogram.day_counts() == dict(Counter(DAY_NAMES[t.weekday()] for t in timed))
+        critical = Counter(_dated(a).hour for a in scoped if a["time"] and a["severity"] == "CRITICAL")
+        if critical:
+            assert histogram.severities["CRITICAL"].distribution() == dict(critical)
+    print("✓ 24 and 7 x 24 buckets, severity breakdowns per target")
+
+
+def test_first_seen_order():
+    print("\n" + "=" * 60)
+    print("TEST: First-seen order and peak-hour ties")
+    print("=" * 60)
+
+    base = datetime(2025, 6, 2)
+    alerts = [{"target": "FINDB", "time": base.replace(hour=hour)} for hour in [9, 3, 9, 3, 17]]
+    histogram = TimeHistogramIndex(alerts, SCHEME).scope()
+    assert list(histogram.distribution()) == [9, 3, 17]
+    assert histogram.peak_hour() == (9, 2)
+    assert TemporalIntelligence.analyze_patterns(alerts)["peak_hour"] == 9
+    assert EngineTemporal.analyze_time_patterns(
+        [{"time": "2025-06-02T03:00:00"}, {"time": "2025-06-02T09:00:00"}])["peak_hour"] == (3, 1)
+    print("✓ Ties go to the hour seen first, as with Counter / dict")
+
+
+def test_pipeline_peak_hour():
+    print("\n" + "=" * 60)
+    print("TEST: Reasoning pipeline temporal analysis")
+    print("=" * 60)
+
+    alerts = _alerts()
+    result = TemporalIntelligence.analyze_patterns(alerts, "midevstb")
+    scoped = [a for a in alerts if "MIDEVSTB" in (a.get("target_name") or a.get("target"))]
+    hours = Counter(_dated(a).hour for a in scoped if a["time"])
+    assert result["hourly_distribution"] == dict(hours)
+    assert result["peak_count"] == max(hours.values())
+    assert result["total_analyzed"] == sum(hours.values())
+    assert "widening_applied" not in result
+
+    widened = TemporalIntelligence.analyze_patterns(alerts, "NOPE")
+    assert widened["widening_applied"] and widened["total_analyzed"] == sum(1 for a in alerts if a["time"])
+
+    bare = [{"target": "FINDB"} for _ in range(50)]
+    synthetic = TemporalIntelligence.analyze_patterns(bare)
+    assert synthetic["hourly_distribution"] == dict(Counter(i % 24 for i in range(50)))
+    assert synthetic["widening_reason"] == "No timestamp data available; using index-based distribution"
+
+    clock = [{"target": "FINDB", "time": "11:30 PM"}, {"target": "FINDB", "time": "12:05 AM"}]
+    assert TemporalIntelligence.analyze_patterns(clock)["hourly_distribution"] == {23: 1, 0: 1}
+    print("✓ Partial target match, global fallback, synthetic and clock-string hours")
+
+
+def test_failure_windows_and_ranges():
+    print("\n" + "=" * 60)
+    print("TEST: Failure windows and analyzer time ranges")
+    print("=" * 60)
+
+    base = datetime(2025, 6, 2)
+    alerts = [{"target": "FINDB", "severity": "CRITICAL" if i % 4 else "WARNING",
+               "alert_time": (base + timedelta(hours=[2, 14][i % 2], minutes=i % 60)).strftime("%Y-%m-%dT%H:%M:%S")}
+              for i in range(500)]
+    windows = EngineTemporal.find_failure_windows(alerts)
+    assert windows == [{"hour": 14, "count": 250, "risk": "MEDIUM"}, {"hour": 2, "count": 125, "risk": "MEDIUM"}]
+    assert EngineTemporal.find_failure_windows(alerts, "WARNING") == [{"hour": 2, "count": 125, "risk": "MEDIUM"}]
+
+    analyzer = OEMDataAnalyzer(_alerts())
+    overnight = [a for a in analyzer.alerts if a["time"] and (_dated(a).hour >= 22 or _dated(a).hour < 6)
+                 and (a.get("target_name") or a.get("target")) == "FINDB"]
+    result = analyzer.analyze_time_distribution("findb", {"start_hour": 22, "end_hour": 6})
+    assert result["alerts_in_range"] == len(overnight)
+    assert result["alerts_in_range_details"] == overnight[:20]
+    print("✓ Exact-severity windows by hour, overnight ranges from the hour column")
+
+
+def test_shared_per_generation():
+    print("\n" + "=" * 60)
+    print("TEST: Shared index per data generation")
+    print("=" * 60)
+
+    from services.warmup_scheduler import WARMUP_SCHEDULER
+
+    saved = dict(GLOBAL_DATA)
+    try:
+        publish_snapshot({"alerts": _alerts(300)})
+        index = WARMUP_SCHEDULER._jobs["time_histograms"].func(GLOBAL_DATA)
+        assert index is TimeHistogramIndex.current(TEMPORAL_SCHEME)
+        assert index.stats()["built"] and index.stats()["targets"] == 3
+        assert TimeHistogramIndex.for_alerts(GLOBAL_DATA["alerts"], TEMPORAL_SCHEME) is index
+        assert index.scope("mid") is index.scope("MID")
+
+        publish_snapshot({"alerts": _alerts(300, seed=1)})
+        assert TimeHistogramIndex.current(TEMPORAL_SCHEME) is not index
+    finally:
+        publish_snapshot(saved)
+    print("✓ Built once per generation, rebuilt after a reload")
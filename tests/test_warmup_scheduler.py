@@ -0,0 +1,161 @@
+"""
+Test Suite for the Background Warm-up Scheduler
+================================================
+Validates:
+
+1️⃣ Jobs run in priority order and publish into GLOBAL_DATA
+2️⃣ Per-job status, duration and last-run time are recorded
+3️⃣ Results computed for a superseded data generation are discarded
+4️⃣ A worker forked while warm-up runs queues it again at startup
+5️⃣ Lock-free readers never see GLOBAL_DATA empty or missing a key
+   while a new snapshot is published
+6️⃣ RCA summaries skip alerts without a time
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import contextlib
+import io
+import threading
+import time
+from datetime import datetime
+
+from data_engine.global_cache import GLOBAL_DATA, INIT_STATUS, publish_snapshot
+from services.warmup_scheduler import WarmupJob, WarmupScheduler, compute_rca_summaries
+
+
+def test_jobs_publish_in_priority_order():
+    print("\n" + "=" * 60)
+    print("TEST: Priority order + publishing")
+    print("=" * 60)
+
+    order = []
+    scheduler = WarmupScheduler()
+    scheduler.register(WarmupJob("slow", 2, "patterns", "patterns_computed",
+                                 lambda d: order.append("slow") or ["p"]))
+    scheduler.register(WarmupJob("fast", 1, "predictions", "predictions_computed",
+                                 lambda d: order.append("fast") or [1, 2]))
+
+    generation = publish_snapshot({"alerts": [], "predictions": [], "patterns": []})
+    scheduler.schedule_all(generation)
+    assert scheduler.wait_idle(timeout=10)
+
+    assert order == ["fast", "slow"], order
+    assert GLOBAL_DATA["predictions"] == [1, 2]
+    assert GLOBAL_DATA["patterns"] == ["p"]
+    assert INIT_STATUS["predictions_computed"] is True
+
+    status = scheduler.status()["jobs"]["fast"]
+    assert status["state"] == "DONE"
+    assert status["result_count"] == 2
+    assert status["duration_seconds"] is not None and status["last_run"]
+    print("✓ Jobs ran by priority and published results")
+
+
+def test_stale_generation_is_discarded():
+    print("\n" + "=" * 60)
+    print("TEST: Stale generation discard")
+    print("=" * 60)
+
+    release = threading.Event()
+    scheduler = WarmupScheduler()
+    scheduler.register(WarmupJob("blocking", 1, "rca_summaries", None,
+                                 lambda d: release.wait(5) and ["old"]))
+
+    generation = publish_snapshot({"alerts": [], "rca_summaries": []})
+    scheduler.schedule_all(generation)
+    publish_snapshot({"alerts": [], "rca_summaries": []})  # reload while job runs
+    release.set()
+    assert scheduler.wait_idle(timeout=10)
+
+    assert GLOBAL_DATA["rca_summaries"] == []
+    assert scheduler.status()["jobs"]["blocking"]["state"] == "STALE"
+    print("✓ Result for superseded snapshot was not published")
+
+
+def test_forked_worker_requeues_warmup():
+    print("\n" + "=" * 60)
+    print("TEST: Worker forked during warm-up")
+    print("=" * 60)
+
+    import app
+    from config.settings import settings
+
+    master = os.getpid()
+    gate = threading.Event()
+    scheduler = WarmupScheduler()
+    scheduler.register(WarmupJob("blocked", 1, None, None,
+                                 lambda d: (os.getpid() == master and gate.wait(10)) or []))
+    scheduler.schedule_all(publish_snapshot({"alerts": []}))
+    while scheduler.status()["jobs"]["blocked"]["state"] != "RUNNING":
+        time.sleep(0.01)
+
+    pid = os.fork()
+    if pid == 0:                                   # worker: its copy of the job has no thread
+        code = 1
+        try:
+            app.WARMUP_SCHEDULER = scheduler
+            app._PRELOAD_STATE["loaded"] = True
+            settings.ENGINE_WARMUP = False
+            with contextlib.redirect_stdout(io.StringIO()):
+                app.startup_event()
+                if scheduler.wait_idle(timeout=10) and scheduler.status()["jobs"]["blocked"]["state"] == "DONE":
+                    code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    gate.set()
+    assert scheduler.wait_idle(timeout=10)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0, status
+    print("✓ Forked worker re-ran the warm-up the master had in progress")
+
+
+def test_readers_during_publish():
+    print("\n" + "=" * 60)
+    print("TEST: Concurrent reads while a snapshot is published")
+    print("=" * 60)
+
+    saved = dict(GLOBAL_DATA)
+    done = threading.Event()
+    torn = []
+    publish_snapshot({"alerts": ["start"], "metrics": []})
+
+    def reader():
+        while not done.is_set():
+            alerts = GLOBAL_DATA.get("alerts")
+            if not alerts or "metrics" not in GLOBAL_DATA:
+                torn.append(alerts)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for n in range(2000):
+            data = dict(("extra_{0}".format(k), []) for k in range(n % 2, 200, 2))
+            data.update({"alerts": [n], "metrics": []})   # inserted last
+            publish_snapshot(data)
+    finally:
+        done.set()
+        thread.join()
+        publish_snapshot(saved)
+
+    assert not torn, "reader saw a partial snapshot {0} times".format(len(torn))
+    print("✓ 2000 publishes, no empty or partial reads")
+
+
+def test_rca_skips_alerts_without_time():
+    print("\n" + "=" * 60)
+    print("TEST: RCA summaries with timeless alerts")
+    print("=" * 60)
+
+    incidents = [{"target": "FINDB", "severity": "CRITICAL", "last_seen": datetime(2024, 1, 2)}]
+    alerts = [{"target": "FINDB", "time": None, "message": "no time"},
+              {"target": "FINDB", "time": datetime(2024, 1, 1, 10), "message": "first"},
+              {"target": "FINDB", "time": datetime(2024, 1, 1, 12), "message": "latest"}]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        summaries = compute_rca_summaries(alerts, [], incidents)
+
+    assert len(summaries) == 1
+    print("✓ Timeless alert skipped, latest timed alert analyzed")